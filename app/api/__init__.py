@@ -19,6 +19,7 @@ from app.api.automations import (
     disable_automation,
     enable_automation,
     get_automation_config,
+    get_automation_configs,
     get_automation_execution_log,
     get_automations,
     reload_automations,
@@ -45,6 +46,7 @@ from app.api.integrations import (
     get_integrations,
     reload_integration,
 )
+from app.api.references import find_references, refresh_reference_index
 from app.api.scenes import (
     activate_scene,
     create_scene,
@@ -54,6 +56,7 @@ from app.api.scenes import (
 )
 from app.api.scripts import (
     get_script_config,
+    get_script_configs,
     get_scripts,
     reload_scripts,
     run_script,
@@ -82,6 +85,7 @@ __all__ = [
     "get_automations",
     "reload_automations",
     "get_automation_config",
+    "get_automation_configs",
     "create_automation",
     "update_automation",
     "delete_automation",
@@ -92,6 +96,7 @@ __all__ = [
     "validate_automation_config",
     "get_scripts",
     "get_script_config",
+    "get_script_configs",
     "run_script",
     "reload_scripts",
     "get_devices",
@@ -122,5 +127,7 @@ __all__ = [
     "update_cache_endpoint_ttl",
     "reload_cache_config",
     "call_service",
+    "find_references",
+    "refresh_reference_index",
     "test_template",
 ]
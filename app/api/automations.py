@@ -10,7 +10,7 @@ from typing import Any, cast
 
 from app.api.entities import get_entities
 from app.config import HA_URL, get_ha_headers
-from app.core import get_client
+from app.core import gather_with_concurrency, get_client
 from app.core.cache.decorator import cached, invalidate_cache
 from app.core.cache.ttl import TTL_LONG
 from app.core.decorators import handle_api_errors
@@ -54,6 +54,7 @@ async def get_automations() -> list[dict[str, Any]]:
 
 
 @handle_api_errors
+@invalidate_cache(pattern="automations:*")
 async def reload_automations() -> dict[str, Any]:
     """Reload all automations in Home Assistant"""
     client = await get_client()
@@ -105,6 +106,61 @@ async def get_automation_config(automation_id: str) -> dict[str, Any]:
     return cast(dict[str, Any], response.json())
 
 
+@handle_api_errors
+@cached(ttl=TTL_LONG, key_prefix="automations", exclude_params=["max_concurrency"])
+async def get_automation_configs(max_concurrency: int | None = None) -> dict[str, Any]:
+    """
+    Get the configuration of every automation, fetched concurrently.
+
+    This is the shared bulk loader for features that need to inspect all
+    automation configs (dependency checks, conflict analysis, tag lookups).
+    Configs are fetched with bounded concurrency and the combined result is
+    cached, so consumers reuse one snapshot instead of re-walking every
+    automation with sequential HTTP calls.
+
+    Args:
+        max_concurrency: Maximum number of config requests in flight
+                         (default: HASS_MCP_MAX_CONCURRENCY)
+
+    Returns:
+        Dictionary mapping automation entity_id to its configuration.
+        Automations whose config cannot be retrieved are omitted.
+
+    Example response:
+        {
+            "automation.turn_on_lights": {
+                "id": "turn_on_lights",
+                "alias": "Turn on lights",
+                "trigger": [...],
+                "action": [...]
+            }
+        }
+    """
+    automations = await get_automations()
+
+    # Check if we got an error response
+    if isinstance(automations, dict) and "error" in automations:
+        return automations  # Just pass through the error
+
+    entity_ids = [a["entity_id"] for a in automations if a.get("entity_id")]
+    results = await gather_with_concurrency(
+        (get_automation_config(entity_id.removeprefix("automation.")) for entity_id in entity_ids),
+        limit=max_concurrency,
+        return_exceptions=True,
+    )
+
+    configs: dict[str, Any] = {}
+    for entity_id, config in zip(entity_ids, results, strict=True):
+        if isinstance(config, BaseException) or not isinstance(config, dict):
+            logger.debug(f"Skipping config for {entity_id}: {config}")
+            continue
+        if "error" in config:
+            continue
+        configs[entity_id] = config
+
+    return configs
+
+
 @handle_api_errors
 @invalidate_cache(pattern="automations:*")
 async def create_automation(config: dict[str, Any]) -> dict[str, Any]:
@@ -4,12 +4,11 @@ This module provides functions for advanced debugging and diagnostics.
 """
 
 import logging
-import re
 from datetime import UTC, datetime
 from typing import Any
 
 from app.api.automations import (
-    get_automation_config,
+    get_automation_configs,
     get_automations,
 )
 from app.api.entities import (
@@ -17,13 +16,12 @@ from app.api.entities import (
     get_entity_state,
 )
 from app.api.integrations import get_integrations
+from app.api.references import refresh_reference_index
 from app.api.scenes import get_scenes
-from app.api.scripts import (
-    get_script_config,
-    get_scripts,
-)
-from app.api.system import get_hass_error_log
+from app.api.scripts import get_scripts
+from app.api.system import refresh_error_log
 from app.core.decorators import handle_api_errors
+from app.core.error_log import ERROR_LEVELS
 
 logger = logging.getLogger(__name__)
 
@@ -194,31 +192,19 @@ async def check_entity_dependencies(entity_id: str) -> dict[str, Any]:
     if isinstance(automations, dict) and "error" in automations:
         return dependencies
 
+    # Look up referencing items in the reference index (synced from cached configs)
+    index = await refresh_reference_index()
+
+    automation_ids = index.lookup("entity_id", entity_id, "automation")
     for automation in automations:
         automation_id = automation.get("entity_id")
-        if not automation_id:
-            continue
-        try:
-            automation_id_clean = (
-                automation_id.replace("automation.", "")
-                if "automation." in automation_id
-                else automation_id
+        if automation_id in automation_ids:
+            dependencies["automations"].append(
+                {
+                    "entity_id": automation_id,
+                    "alias": automation.get("alias", automation_id),
+                }
             )
-            config = await get_automation_config(automation_id_clean)
-            # Check for errors in config
-            if isinstance(config, dict) and "error" in config:
-                continue
-            # Search config for entity_id
-            config_str = str(config)
-            if entity_id in config_str:
-                dependencies["automations"].append(
-                    {
-                        "entity_id": automation_id,
-                        "alias": automation.get("alias", automation_id),
-                    }
-                )
-        except Exception:  # nosec B110
-            pass
 
     # Get all scripts
     scripts = await get_scripts()
@@ -227,28 +213,16 @@ async def check_entity_dependencies(entity_id: str) -> dict[str, Any]:
     if isinstance(scripts, dict) and "error" in scripts:
         return dependencies
 
+    script_ids = index.lookup("entity_id", entity_id, "script")
     for script in scripts:
         script_id = script.get("entity_id")
-        if not script_id:
-            continue
-        try:
-            script_id_clean = (
-                script_id.replace("script.", "") if "script." in script_id else script_id
+        if script_id in script_ids:
+            dependencies["scripts"].append(
+                {
+                    "entity_id": script_id,
+                    "friendly_name": script.get("friendly_name", script_id),
+                }
             )
-            config = await get_script_config(script_id_clean)
-            # Check for errors in config
-            if isinstance(config, dict) and "error" in config:
-                continue
-            config_str = str(config)
-            if entity_id in config_str:
-                dependencies["scripts"].append(
-                    {
-                        "entity_id": script_id,
-                        "friendly_name": script.get("friendly_name", script_id),
-                    }
-                )
-        except Exception:  # nosec B110
-            pass
 
     # Check scenes
     scenes = await get_scenes()
@@ -257,9 +231,9 @@ async def check_entity_dependencies(entity_id: str) -> dict[str, Any]:
     if isinstance(scenes, dict) and "error" in scenes:
         return dependencies
 
+    scene_ids = index.lookup("entity_id", entity_id, "scene")
     for scene in scenes:
-        entity_ids = scene.get("entity_id_list", [])
-        if entity_id in entity_ids:
+        if scene.get("entity_id") in scene_ids:
             dependencies["scenes"].append(
                 {
                     "entity_id": scene.get("entity_id"),
@@ -317,24 +291,16 @@ async def analyze_automation_conflicts() -> dict[str, Any]:
         "warnings": [],
     }
 
+    # Fetch all automation configs concurrently (shared, cached snapshot)
+    all_configs = await get_automation_configs() if automations else {}
+    if "error" in all_configs:
+        all_configs = {}
+
     automation_configs = {}
     for automation in automations:
         automation_id = automation.get("entity_id")
-        if not automation_id:
-            continue
-        try:
-            automation_id_clean = (
-                automation_id.replace("automation.", "")
-                if "automation." in automation_id
-                else automation_id
-            )
-            config = await get_automation_config(automation_id_clean)
-            # Check for errors in config
-            if isinstance(config, dict) and "error" in config:
-                continue
-            automation_configs[automation_id] = config
-        except Exception:  # nosec B112
-            continue
+        if automation_id and automation_id in all_configs:
+            automation_configs[automation_id] = all_configs[automation_id]
 
     # Check for opposing actions on same entities
     entity_actions: dict[str, list[dict[str, Any]]] = {}
@@ -416,47 +382,35 @@ async def get_integration_errors(domain: str | None = None) -> dict[str, Any]:
             "note": "These are errors found in the error log"
         }
 
+    Note:
+        Errors come from the error log index (ERROR and CRITICAL records,
+        grouped by the integration their logger belongs to), which is brought
+        up to date by parsing only the new part of the log.
+
     Best Practices:
         - Use this to identify integration-specific issues
         - Filter by domain to focus on specific integration
         - Review errors to understand integration problems
     """
-    # Get error log
-    error_log = await get_hass_error_log()
-
-    # Check for errors in error log response
-    if isinstance(error_log, dict) and "error" in error_log:
+    # Bring the error log index up to date (only new log text is parsed)
+    try:
+        index = await refresh_error_log()
+    except Exception as e:
+        logger.error(f"Error retrieving Home Assistant error log: {str(e)}")
         return {
             "integration_errors": {},
             "total_integrations_with_errors": 0,
-            "error": error_log.get("error"),
+            "error": f"Error retrieving error log: {str(e)}",
             "note": "Could not retrieve error log",
         }
 
     integration_errors: dict[str, list[str]] = {}
-    log_text = error_log.get("log_text", "")
-
-    # Parse log for integration-specific errors
-    lines = log_text.split("\n")
-
-    for line in lines:
-        if "ERROR" in line.upper() or "Exception" in line:
-            # Extract integration name from [homeassistant.components.integration] pattern
-            # Try to match components.integration first, then fall back to any [name] pattern
-            integration_match = re.search(r"\[homeassistant\.components\.([a-zA-Z0-9_]+)\]", line)
-            if not integration_match:
-                # Fall back to matching any [integration] pattern
-                integration_match = re.search(r"\[([a-zA-Z0-9_]+)\]", line)
-            if integration_match:
-                integration = integration_match.group(1)
-
-                if domain and integration != domain:
-                    continue
-
-                if integration not in integration_errors:
-                    integration_errors[integration] = []
-
-                integration_errors[integration].append(line.strip())
+    records = [
+        record for level in ERROR_LEVELS for record in index.records(level, integration=domain)
+    ]
+    for record in sorted(records, key=lambda record: record.seq):
+        if record.integration:
+            integration_errors.setdefault(record.integration, []).append(record.lines[0].strip())
 
     return {
         "integration_errors": integration_errors,
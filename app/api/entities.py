@@ -3,15 +3,24 @@
 This module provides functions for interacting with Home Assistant entities.
 """
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
 from typing import Any, cast
 
 from app.config import HA_URL, get_ha_headers
 from app.core import DEFAULT_LEAN_FIELDS, DOMAIN_IMPORTANT_ATTRIBUTES, get_client
 from app.core.cache.decorator import cached
+from app.core.cache.segments import get_segment_cache
 from app.core.cache.ttl import TTL_LONG, TTL_SHORT
 from app.core.decorators import handle_api_errors
+from app.core.text_index import get_entity_text_index
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +70,31 @@ def filter_fields(data: dict[str, Any], fields: list[str]) -> dict[str, Any]:
     return result
 
 
+def lean_entity(entity: dict[str, Any]) -> dict[str, Any]:
+    """
+    Reduce an entity to its lean fields.
+
+    Args:
+        entity: Full entity state dictionary
+
+    Returns:
+        The entity with the default lean fields plus the important attributes
+        of its domain
+    """
+    # Get the entity's domain
+    entity_domain = entity["entity_id"].split(".")[0]
+
+    # Start with basic lean fields
+    lean_fields = DEFAULT_LEAN_FIELDS.copy()
+
+    # Add domain-specific important attributes
+    if entity_domain in DOMAIN_IMPORTANT_ATTRIBUTES:
+        for attr in DOMAIN_IMPORTANT_ATTRIBUTES[entity_domain]:
+            lean_fields.append(f"attr.{attr}")
+
+    return filter_fields(entity, lean_fields)
+
+
 async def get_all_entity_states() -> dict[str, dict[str, Any]]:
     """
     Fetch all entity states from Home Assistant.
@@ -117,6 +151,9 @@ async def get_entity_state(
     response.raise_for_status()
     entity_data = response.json()
 
+    # Refresh the entity in the text index if it is indexed
+    get_entity_text_index().update(entity_data)
+
     # Apply field filtering if requested
     if fields:
         # User-specified fields take precedence
@@ -126,7 +163,7 @@ async def get_entity_state(
         lean_fields = DEFAULT_LEAN_FIELDS.copy()
 
         # Add domain-specific important attributes
-        domain = entity_id.split(".")[0]
+        domain = entity_id.split(".", maxsplit=1)[0]
         if domain in DOMAIN_IMPORTANT_ATTRIBUTES:
             for attr in DOMAIN_IMPORTANT_ATTRIBUTES[domain]:
                 lean_fields.append(f"attr.{attr}")
@@ -163,6 +200,29 @@ def get_entities_ttl(args: tuple[Any, ...], kwargs: dict[str, Any], result: Any)
     return TTL_LONG
 
 
+@cached(ttl=TTL_SHORT, key_prefix="entities:state")
+async def get_all_states() -> list[dict[str, Any]]:
+    """
+    Get the full /api/states snapshot.
+
+    Returns:
+        Every entity state, unfiltered
+
+    Raises:
+        httpx.HTTPStatusError: If Home Assistant returns an error status
+
+    Note:
+        The snapshot is cached briefly and dropped when an entity action or
+        service call changes states. The in-memory cache returns the same
+        list object until then, which makes re-syncing the text index with
+        it a no-op.
+    """
+    client = await get_client()
+    response = await client.get(f"{HA_URL}/api/states", headers=get_ha_headers())
+    response.raise_for_status()
+    return cast(list[dict[str, Any]], response.json())
+
+
 @handle_api_errors
 @cached(ttl=get_entities_ttl, key_prefix="entities", condition=should_cache_entities)
 async def get_entities(
@@ -187,19 +247,28 @@ async def get_entities(
         List of entity dictionaries, optionally filtered by domain and search terms,
         and optionally limited to specific fields
     """
-    # Get all entities directly
-    client = await get_client()
-    response = await client.get(f"{HA_URL}/api/states", headers=get_ha_headers())
-    response.raise_for_status()
-    entities = response.json()
+    search_term = search_query.lower().strip() if search_query else ""
+    if search_term:
+        # Search the cached snapshot through the text index; syncing it again
+        # is a no-op until the snapshot changes
+        text_index = get_entity_text_index()
+        entities = await get_all_states()
+        text_index.sync(entities)
+
+        # Trigram postings narrow the scan down to the entities that can contain the term
+        candidates = text_index.substring_candidates(search_term)
+        if candidates is not None:
+            entities = text_index.entities(candidates)
+    else:
+        # Get all entities from the shared states snapshot
+        entities = await get_all_states()
 
     # Filter by domain if specified
     if domain:
         entities = [entity for entity in entities if entity["entity_id"].startswith(f"{domain}.")]
 
     # Search if query is provided
-    if search_query and search_query.strip():
-        search_term = search_query.lower().strip()
+    if search_term:
         filtered_entities = []
 
         for entity in entities:
@@ -239,29 +308,131 @@ async def get_entities(
         return [filter_fields(entity, fields) for entity in entities]
     if lean:
         # Apply domain-specific lean fields to each entity
-        result = []
-        for entity in entities:
-            # Get the entity's domain
-            entity_domain = entity["entity_id"].split(".")[0]
+        return [lean_entity(entity) for entity in entities]
+    # Return full entities
+    return cast(list[dict[str, Any]], entities)
 
-            # Start with basic lean fields
-            lean_fields = DEFAULT_LEAN_FIELDS.copy()
 
-            # Add domain-specific important attributes
-            if entity_domain in DOMAIN_IMPORTANT_ATTRIBUTES:
-                for attr in DOMAIN_IMPORTANT_ATTRIBUTES[entity_domain]:
-                    lean_fields.append(f"attr.{attr}")
+def _history_period_request(
+    entity_id: str | list[str], start_time: datetime, end_time: datetime
+) -> tuple[str, dict[str, str]]:
+    """Build the /api/history/period URL and query parameters for a time range."""
+    start_time_iso = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+    end_time_iso = end_time.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-            # Filter and add to result
-            result.append(filter_fields(entity, lean_fields))
+    # Construct the API URL
+    url = f"{HA_URL}/api/history/period/{start_time_iso}"
 
-        return result
-    # Return full entities
-    return cast(list[dict[str, Any]], entities)
+    # Set query parameters (HA accepts a comma-separated list of entities)
+    params = {
+        "filter_entity_id": entity_id if isinstance(entity_id, str) else ",".join(entity_id),
+        "minimal_response": "true",
+        "end_time": end_time_iso,
+    }
+    return url, params
+
+
+def _history_request(entity_id: str | list[str], hours: int) -> tuple[str, dict[str, str]]:
+    """Build the /api/history/period URL and query parameters for the last hours."""
+    end_time = datetime.now(UTC)
+    return _history_period_request(entity_id, end_time - timedelta(hours=hours), end_time)
+
+
+def _history_timestamp(state: dict[str, Any]) -> Any:
+    """Timestamp of a history state (minimal responses only carry last_changed)."""
+    return state.get("last_changed") or state.get("last_updated")
 
 
-# NOTE: This function is explicitly excluded from caching (US-006)
-# History data is highly dynamic and time-sensitive, so it should not be cached
+class _AsyncByteReader:
+    """Adapt an async byte iterator to the async ``read()`` interface ijson expects."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson accepts chunks larger than requested; b"" signals the end of the stream
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
+async def iter_entities_history(
+    entity_ids: list[str], hours: int
+) -> AsyncIterator[tuple[str | None, dict[str, Any]]]:
+    """
+    Stream the history of several entities with a single request.
+
+    Args:
+        entity_ids: The entity IDs to get history for
+        hours: Number of hours of history to retrieve
+
+    Yields:
+        Tuples of (entity_id, state object), grouped by entity
+
+    Raises:
+        httpx.HTTPStatusError: If Home Assistant returns an error status
+
+    Note:
+        With minimal_response, Home Assistant only includes the entity_id in
+        the first state of each entity's list, so it is carried over to the
+        states that follow. When the optional ``ijson`` package is installed,
+        the response body is parsed incrementally so memory stays bounded.
+        Without it, the body is decoded in a worker thread so concurrent
+        requests keep streaming while it is parsed. Attributes are not
+        requested since callers only need states.
+    """
+    client = await get_client()
+    url, params = _history_request(entity_ids, hours)
+    params["no_attributes"] = "true"
+
+    # A single-entity request never needs the entity_id from the response
+    current = entity_ids[0] if len(entity_ids) == 1 else None
+
+    async with client.stream("GET", url, headers=get_ha_headers(), params=params) as response:
+        response.raise_for_status()
+
+        if ijson is None:
+            await response.aread()
+            for state_list in await asyncio.to_thread(response.json):
+                if isinstance(state_list, list):
+                    for state in state_list:
+                        current = state.get("entity_id", current)
+                        yield current, state
+            return
+
+        # History is a list of per-entity lists of states
+        reader = _AsyncByteReader(response.aiter_bytes())
+        async for state in ijson.items_async(reader, "item.item", use_float=True):
+            current = state.get("entity_id", current)
+            yield current, state
+
+
+async def iter_entity_history(entity_id: str, hours: int) -> AsyncIterator[dict[str, Any]]:
+    """
+    Stream an entity's history, yielding one state object at a time.
+
+    Args:
+        entity_id: The entity ID to get history for
+        hours: Number of hours of history to retrieve
+
+    Yields:
+        State change objects (e.g., {"state": "21.5", "last_changed": "..."})
+
+    Raises:
+        httpx.HTTPStatusError: If Home Assistant returns an error status
+
+    Note:
+        See iter_entities_history; memory stays bounded for month-long sensor
+        histories when the optional ``ijson`` package is installed.
+    """
+    async for _, state in iter_entities_history([entity_id], hours):
+        yield state
+
+
+# NOTE: This function is explicitly excluded from response caching (US-006)
+# History data is highly dynamic and time-sensitive; closed hourly buckets are
+# kept in the segment cache instead, so only the open tail is fetched again
 @handle_api_errors
 async def get_entity_history(entity_id: str, hours: int) -> list[dict[str, Any]]:
     """
@@ -273,33 +444,38 @@ async def get_entity_history(entity_id: str, hours: int) -> list[dict[str, Any]]
 
     Returns:
         A list of state change objects, or an error dictionary.
+
+    Note:
+        Completed hours are served from the segment cache; only hours that
+        were never fetched (or were evicted) and the current hour are
+        requested from Home Assistant, along with the state at the start
+        of the range.
     """
     client = await get_client()
 
-    # Calculate the end time for the history lookup
-    end_time = datetime.now(UTC)
-    end_time_iso = end_time.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-    # Calculate the start time for the history lookup based on end_time
-    start_time = end_time - timedelta(hours=hours)
-    start_time_iso = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+    async def fetch(start_time: datetime, end_time: datetime) -> list[dict[str, Any]]:
+        url, params = _history_period_request(entity_id, start_time, end_time)
+        response = await client.get(url, headers=get_ha_headers(), params=params)
+        response.raise_for_status()
+        return [state for state_list in response.json() for state in state_list]
 
-    # Construct the API URL
-    url = f"{HA_URL}/api/history/period/{start_time_iso}"
-
-    # Set query parameters
-    params = {
-        "filter_entity_id": entity_id,
-        "minimal_response": "true",
-        "end_time": end_time_iso,
-    }
-
-    # Make the API call
-    response = await client.get(url, headers=get_ha_headers(), params=params)
-    response.raise_for_status()
-
-    # Return the JSON response
-    return response.json()
+    end_time = datetime.now(UTC)
+    states = await get_segment_cache().get_range(
+        f"history:{entity_id}",
+        end_time - timedelta(hours=hours),
+        end_time,
+        fetch,
+        timestamp=_history_timestamp,
+        carry_in=True,
+    )
+    if not states:
+        return []
+
+    if "entity_id" not in states[0]:
+        states[0] = {"entity_id": entity_id, **states[0]}
+
+    # History is a list of per-entity lists of states
+    return [states]
 
 
 @handle_api_errors
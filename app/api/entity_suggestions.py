@@ -4,12 +4,16 @@ This module provides context-aware entity suggestions based on relationships
 and usage patterns.
 """
 
+import asyncio
 import logging
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
 from typing import Any
 
-from app.api.devices import get_device_details
-from app.api.entities import get_entities, get_entity_state
+from app.api.devices import get_device_details, get_devices
+from app.api.entities import get_entities, get_entity_state, lean_entity
 from app.core.decorators import handle_api_errors
+from app.core.text_index import entity_name, get_entity_text_index, tokenize
 from app.core.vectordb.config import get_vectordb_config
 from app.core.vectordb.indexing import ENTITY_COLLECTION
 from app.core.vectordb.manager import get_vectordb_manager
@@ -28,9 +32,85 @@ RELATIONSHIP_TYPES = {
     # "same_manufacturer": "Entities from the same manufacturer",
 }
 
+# Seconds each suggestion strategy may take before its results are dropped
+STRATEGY_TIMEOUT = 5.0
+
+
+@dataclass
+class SuggestionContext:
+    """Data shared by the suggestion strategies of one get_entity_suggestions call."""
+
+    # Full entity states by entity_id, in /api/states order
+    states: dict[str, dict[str, Any]]
+    # Device registry entries by device id
+    devices: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Entity IDs by area (entity area_id attribute, else the area of its device)
+    area_entities: dict[str, list[str]] = field(default_factory=dict)
+    # Device id of each entity listed in the device registry
+    entity_devices: dict[str, str] = field(default_factory=dict)
+
+
+async def _build_suggestion_context() -> SuggestionContext | None:
+    """
+    Fetch the state snapshot and device registry shared by all strategies.
+
+    Returns:
+        The context, or None if the states could not be fetched (strategies
+        then fetch what they need themselves). If only the device registry
+        fails, the context is built without devices.
+    """
+    entities, devices = await asyncio.gather(
+        get_entities(lean=False, limit=0), get_devices(), return_exceptions=True
+    )
+    if isinstance(entities, BaseException):
+        logger.debug(f"Failed to build suggestion context: {entities}")
+        return None
+    if not isinstance(entities, list):
+        return None
+    if isinstance(devices, BaseException):
+        logger.debug(f"Failed to get devices for the suggestion context: {devices}")
+
+    states = {
+        entity["entity_id"]: entity
+        for entity in entities
+        if isinstance(entity, dict) and isinstance(entity.get("entity_id"), str)
+    }
+    # The shared text index backs the similar_name strategy
+    get_entity_text_index().sync(entities)
+
+    context = SuggestionContext(states=states)
+    if isinstance(devices, list):
+        for device in devices:
+            if not isinstance(device, dict) or not device.get("id"):
+                continue
+            context.devices[device["id"]] = device
+            for device_entity_id in device.get("entities") or []:
+                context.entity_devices[device_entity_id] = device["id"]
+
+    for entity_id, entity in states.items():
+        area_id = (entity.get("attributes") or {}).get("area_id")
+        if not area_id and entity_id in context.entity_devices:
+            area_id = context.devices[context.entity_devices[entity_id]].get("area_id")
+        if area_id:
+            context.area_entities.setdefault(area_id, []).append(entity_id)
+    return context
+
+
+async def _run_strategy(
+    name: str, strategy: Awaitable[list[dict[str, Any]]], timeout: float
+) -> list[dict[str, Any]]:
+    """Await a suggestion strategy, dropping its results if it fails or misses the deadline."""
+    try:
+        return await asyncio.wait_for(strategy, timeout)
+    except TimeoutError:
+        logger.warning(f"Suggestion strategy {name} timed out after {timeout}s, skipping it")
+    except Exception as e:
+        logger.error(f"Suggestion strategy {name} failed: {e}")
+    return []
+
 
 async def _find_entities_by_area(
-    area_id: str | None, exclude_entity_id: str
+    area_id: str | None, exclude_entity_id: str, context: SuggestionContext | None = None
 ) -> list[dict[str, Any]]:
     """
     Find entities in the same area.
@@ -38,6 +118,7 @@ async def _find_entities_by_area(
     Args:
         area_id: The area ID to search in
         exclude_entity_id: Entity ID to exclude from results
+        context: Optional shared snapshot (avoids fetching all entities)
 
     Returns:
         List of entities in the same area with relationship metadata
@@ -45,6 +126,19 @@ async def _find_entities_by_area(
     if not area_id:
         return []
 
+    if context is not None:
+        return [
+            {
+                "entity_id": entity_id,
+                "entity": lean_entity(context.states[entity_id]),
+                "relationship_type": "same_area",
+                "relationship_score": 1.0,
+                "metadata": {"area_id": area_id},
+            }
+            for entity_id in context.area_entities.get(area_id, [])
+            if entity_id != exclude_entity_id
+        ]
+
     try:
         # Get all entities
         entities = await get_entities(lean=True)
@@ -80,7 +174,7 @@ async def _find_entities_by_area(
 
 
 async def _find_entities_by_device(
-    device_id: str | None, exclude_entity_id: str
+    device_id: str | None, exclude_entity_id: str, context: SuggestionContext | None = None
 ) -> list[dict[str, Any]]:
     """
     Find entities from the same device.
@@ -88,6 +182,7 @@ async def _find_entities_by_device(
     Args:
         device_id: The device ID to search for
         exclude_entity_id: Entity ID to exclude from results
+        context: Optional shared snapshot (avoids per-entity state requests)
 
     Returns:
         List of entities from the same device with relationship metadata
@@ -95,6 +190,19 @@ async def _find_entities_by_device(
     if not device_id:
         return []
 
+    if context is not None and device_id in context.devices:
+        return [
+            {
+                "entity_id": entity_id,
+                "entity": lean_entity(context.states[entity_id]),
+                "relationship_type": "same_device",
+                "relationship_score": 1.0,
+                "metadata": {"device_id": device_id},
+            }
+            for entity_id in context.devices[device_id].get("entities") or []
+            if entity_id != exclude_entity_id and entity_id in context.states
+        ]
+
     try:
         # Get device details to find all entities
         device = await get_device_details(device_id)
@@ -133,7 +241,10 @@ async def _find_entities_by_device(
 
 
 async def _find_entities_by_domain(
-    domain: str | None, exclude_entity_id: str, limit: int = 20
+    domain: str | None,
+    exclude_entity_id: str,
+    limit: int = 20,
+    context: SuggestionContext | None = None,
 ) -> list[dict[str, Any]]:
     """
     Find entities of the same domain/type.
@@ -142,6 +253,7 @@ async def _find_entities_by_domain(
         domain: The domain to search for
         exclude_entity_id: Entity ID to exclude from results
         limit: Maximum number of results
+        context: Optional shared snapshot (avoids fetching the domain's entities)
 
     Returns:
         List of entities in the same domain with relationship metadata
@@ -151,7 +263,15 @@ async def _find_entities_by_domain(
 
     try:
         # Get entities of the same domain
-        entities = await get_entities(domain=domain, lean=True, limit=limit + 10)
+        if context is not None:
+            prefix = f"{domain}."
+            entities = [
+                lean_entity(entity)
+                for entity_id, entity in context.states.items()
+                if entity_id.startswith(prefix)
+            ]
+        else:
+            entities = await get_entities(domain=domain, lean=True, limit=limit + 10)
         if isinstance(entities, dict) and "error" in entities:
             return []
 
@@ -184,7 +304,10 @@ async def _find_entities_by_domain(
 
 
 async def _find_entities_by_similar_name(
-    entity_id: str, friendly_name: str | None, limit: int = 10
+    entity_id: str,
+    friendly_name: str | None,
+    limit: int = 10,
+    context: SuggestionContext | None = None,
 ) -> list[dict[str, Any]]:
     """
     Find entities with similar names.
@@ -193,69 +316,66 @@ async def _find_entities_by_similar_name(
         entity_id: The entity ID to find similar entities for
         friendly_name: The friendly name to search for
         limit: Maximum number of results
+        context: Optional shared snapshot (the text index is already synced with it)
 
     Returns:
         List of entities with similar names with relationship metadata
+
+    Note:
+        Names are compared by trigram similarity through the shared entity
+        text index, so typos and word order changes still match and only
+        entities sharing the name's rarest trigrams are scored.
     """
     if not friendly_name:
         return []
 
     try:
-        # Split friendly name into words and search
-        name_words = friendly_name.lower().split()
+        name_words = set(tokenize(friendly_name))
         if not name_words:
             return []
 
-        # Get all entities
-        entities = await get_entities(lean=True)
-        if isinstance(entities, dict) and "error" in entities:
-            return []
+        index = get_entity_text_index()
+        if context is None:
+            # Get all entities (full states, cached briefly) and sync the shared name index
+            entities = await get_entities(lean=False, limit=0)
+            if not isinstance(entities, list):
+                return []
+            index.sync(entities)
 
         results = []
-        for entity in entities:
-            if not isinstance(entity, dict):
-                continue
-
-            current_entity_id = entity.get("entity_id", "")
-            if current_entity_id == entity_id:
-                continue
-
-            entity_friendly_name = entity.get("attributes", {}).get("friendly_name", "")
-            if not entity_friendly_name:
-                continue
-
-            # Calculate name similarity
-            entity_name_words = set(entity_friendly_name.lower().split())
-            common_words = set(name_words).intersection(entity_name_words)
-
-            if common_words:
-                # Calculate similarity score
-                similarity_score = len(common_words) / max(len(name_words), len(entity_name_words))
-
-                results.append(
-                    {
-                        "entity_id": current_entity_id,
-                        "entity": entity,
-                        "relationship_type": "similar_name",
-                        "relationship_score": similarity_score,
-                        "metadata": {
-                            "common_words": list(common_words),
-                            "similarity": similarity_score,
-                        },
-                    }
-                )
-
-        # Sort by similarity score
-        results.sort(key=lambda x: x["relationship_score"], reverse=True)
+        for current_entity_id, similarity_score in index.similar_names(
+            friendly_name, limit, exclude=entity_id
+        ):
+            entity = index.entity(current_entity_id) or {"entity_id": current_entity_id}
+            common_words = name_words.intersection(tokenize(entity_name(entity)))
+            results.append(
+                {
+                    "entity_id": current_entity_id,
+                    "entity": lean_entity(entity),
+                    "relationship_type": "similar_name",
+                    "relationship_score": similarity_score,
+                    "metadata": {
+                        "common_words": sorted(common_words),
+                        "similarity": similarity_score,
+                    },
+                }
+            )
 
-        return results[:limit]
+        return results
     except Exception as e:
         logger.error(f"Failed to find entities by similar name: {e}")
         return []
 
 
+async def _lean_state(entity_id: str, context: SuggestionContext | None) -> dict[str, Any]:
+    """Get the lean state of an entity from the shared snapshot, else from Home Assistant."""
+    if context is not None and entity_id in context.states:
+        return lean_entity(context.states[entity_id])
+    return await get_entity_state(entity_id, lean=True)
+
+
 async def _find_entities_by_vector_similarity(
-    entity_id: str, limit: int = 10
+    entity_id: str, limit: int = 10, context: SuggestionContext | None = None
 ) -> list[dict[str, Any]]:
     """
     Find entities with similar capabilities using vector embeddings.
@@ -263,6 +383,7 @@ async def _find_entities_by_vector_similarity(
     Args:
         entity_id: The entity ID to find similar entities for
         limit: Maximum number of results
+        context: Optional shared snapshot (avoids per-entity state requests)
 
     Returns:
         List of similar entities with relationship metadata
@@ -281,7 +402,7 @@ async def _find_entities_by_vector_similarity(
         # We'll use the entity_id as the document ID in the collection
         try:
             # Search for similar entities
-            entity = await get_entity_state(entity_id, lean=True)
+            entity = await _lean_state(entity_id, context)
             if isinstance(entity, dict) and "error" in entity:
                 return []
 
@@ -309,7 +430,7 @@ async def _find_entities_by_vector_similarity(
                 similarity_score = max(0.0, min(1.0, 1.0 - (distance / 2.0)))
 
                 try:
-                    similar_entity = await get_entity_state(result_entity_id, lean=True)
+                    similar_entity = await _lean_state(result_entity_id, context)
                     if isinstance(similar_entity, dict) and "error" not in similar_entity:
                         results.append(
                             {
@@ -455,6 +576,12 @@ async def get_entity_suggestions(
         >>> suggestions = await get_entity_suggestions("light.living_room")
         >>> for suggestion in suggestions:
         ...     print(suggestion["explanation"])
+
+    Note:
+        The entity states and device registry are fetched once and shared by
+        all strategies, which run concurrently. A strategy that fails or takes
+        longer than STRATEGY_TIMEOUT seconds (e.g. a slow vector search) is
+        dropped; the other strategies' suggestions are still returned.
     """
     # Get entity metadata
     try:
@@ -475,40 +602,43 @@ async def get_entity_suggestions(
             "similar_capabilities",
         ]
 
+    # Shared snapshot: states, device registry and area map, fetched once
+    context = await _build_suggestion_context()
+
     # Extract entity metadata
     attributes = entity.get("attributes", {})
     area_id = attributes.get("area_id")
     device_id = attributes.get("device_id")
+    if context is not None:
+        device_id = device_id or context.entity_devices.get(entity_id)
+        if not area_id and device_id in context.devices:
+            area_id = context.devices[device_id].get("area_id")
     domain = entity_id.split(".")[0] if "." in entity_id else None
     friendly_name = attributes.get("friendly_name")
 
-    # Collect suggestions from different sources
-    all_suggestions = []
-
-    # Same area
+    # Run the requested strategies concurrently, each with its own deadline
+    strategies: dict[str, Awaitable[list[dict[str, Any]]]] = {}
     if "same_area" in relationship_types:
-        area_suggestions = await _find_entities_by_area(area_id, entity_id)
-        all_suggestions.extend(area_suggestions)
-
-    # Same device
+        strategies["same_area"] = _find_entities_by_area(area_id, entity_id, context=context)
     if "same_device" in relationship_types:
-        device_suggestions = await _find_entities_by_device(device_id, entity_id)
-        all_suggestions.extend(device_suggestions)
-
-    # Same domain
+        strategies["same_device"] = _find_entities_by_device(device_id, entity_id, context=context)
     if "same_domain" in relationship_types:
-        domain_suggestions = await _find_entities_by_domain(domain, entity_id, limit)
-        all_suggestions.extend(domain_suggestions)
-
-    # Similar name
+        strategies["same_domain"] = _find_entities_by_domain(
+            domain, entity_id, limit, context=context
+        )
     if "similar_name" in relationship_types:
-        name_suggestions = await _find_entities_by_similar_name(entity_id, friendly_name, limit)
-        all_suggestions.extend(name_suggestions)
-
-    # Similar capabilities (vector similarity)
+        strategies["similar_name"] = _find_entities_by_similar_name(
+            entity_id, friendly_name, limit, context=context
+        )
     if "similar_capabilities" in relationship_types:
-        vector_suggestions = await _find_entities_by_vector_similarity(entity_id, limit)
-        all_suggestions.extend(vector_suggestions)
+        strategies["similar_capabilities"] = _find_entities_by_vector_similarity(
+            entity_id, limit, context=context
+        )
+
+    strategy_results = await asyncio.gather(
+        *(_run_strategy(name, strategy, STRATEGY_TIMEOUT) for name, strategy in strategies.items())
+    )
+    all_suggestions = [suggestion for results in strategy_results for suggestion in results]
 
     # Rank and deduplicate
     ranked_suggestions = _rank_and_deduplicate(all_suggestions, limit)
@@ -8,6 +8,7 @@ from datetime import UTC, datetime, timedelta
 from typing import Any, cast
 
 from app.api.base import BaseAPI
+from app.core.cache.segments import get_segment_cache
 from app.core.decorators import handle_api_errors
 
 logger = logging.getLogger(__name__)
@@ -22,8 +23,22 @@ class LogbookAPI(BaseAPI):
 _logbook_api = LogbookAPI()
 
 
-# NOTE: This function is explicitly excluded from caching (US-006)
-# Logbook data is highly dynamic and time-sensitive, so it should not be cached
+async def _get_logbook_range(
+    start_time: datetime, end_time: datetime, entity_id: str | None = None
+) -> list[dict[str, Any]]:
+    """Fetch the logbook entries of a time range."""
+    endpoint = f"/api/logbook/{start_time.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+    params: dict[str, Any] = {"end_time": end_time.strftime("%Y-%m-%dT%H:%M:%SZ")}
+    if entity_id:
+        params["entity"] = entity_id
+
+    response = await _logbook_api.get(endpoint, params=params)
+    return cast(list[dict[str, Any]], response)
+
+
+# NOTE: This function is explicitly excluded from response caching (US-006)
+# Logbook data is highly dynamic and time-sensitive; closed hourly buckets are
+# kept in the segment cache instead, so only the open tail is fetched again
 @handle_api_errors
 async def get_logbook(
     timestamp: str | None = None,
@@ -66,19 +81,27 @@ async def get_logbook(
         The logbook records all state changes and events in Home Assistant.
         Useful for debugging and auditing system behavior.
         If timestamp is provided, hours parameter is ignored.
+        For hours-based queries, completed hours are served from the segment
+        cache and only the rest of the range is requested from Home Assistant.
 
     Best Practices:
         - Keep hours reasonable (24-72) for token efficiency
         - Use entity_id filter to focus on specific entities
         - Use timestamp for precise time ranges
     """
-    # Calculate timestamp if not provided
+    # Relative ranges go through the segment cache
     if not timestamp:
         end_time = datetime.now(UTC)
-        start_time = end_time - timedelta(hours=hours)
-        timestamp = start_time.strftime("%Y-%m-%dT%H:%M:%S")
+        return await get_segment_cache().get_range(
+            f"logbook:{entity_id or '*'}",
+            end_time - timedelta(hours=hours),
+            end_time,
+            lambda start, end: _get_logbook_range(start, end, entity_id),
+            timestamp=lambda entry: entry.get("when"),
+        )
+
     # Ensure timestamp doesn't have timezone info for API format
-    elif timestamp.endswith("Z"):
+    if timestamp.endswith("Z"):
         timestamp = timestamp[:-1]
 
     # Build URL and params
@@ -0,0 +1,132 @@
+"""References API module for hass-mcp.
+
+This module keeps the reference index in sync with Home Assistant and answers
+"what references this entity/device/area/tag/service?" questions from it.
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from app.api.automations import get_automation_configs
+from app.api.scenes import get_scenes
+from app.api.scripts import get_script_configs
+from app.core.decorators import handle_api_errors
+from app.core.references import (
+    ITEM_KINDS,
+    REFERENCE_TYPES,
+    ReferenceIndex,
+    get_reference_index,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _load_snapshot(kind: str) -> tuple[dict[str, Any] | None, Any]:
+    """
+    Load the current configs of one item kind.
+
+    Returns:
+        Tuple of (mapping of entity_id to config, or None on error; the raw
+        source object used for the index's identity check)
+    """
+    if kind == "automation":
+        automation_configs = await get_automation_configs()
+        if "error" in automation_configs:
+            return None, automation_configs
+        return automation_configs, automation_configs
+
+    if kind == "script":
+        script_configs = await get_script_configs()
+        if "error" in script_configs:
+            return None, script_configs
+        return script_configs, script_configs
+
+    scenes = await get_scenes()
+    if isinstance(scenes, dict) or any("error" in scene for scene in scenes):
+        return None, scenes
+    # Scenes only expose their member entities via state attributes
+    scene_configs = {
+        scene["entity_id"]: {"entity_id": scene.get("entity_id_list", [])}
+        for scene in scenes
+        if scene.get("entity_id")
+    }
+    return scene_configs, scenes
+
+
+async def refresh_reference_index(kinds: Iterable[str] = ITEM_KINDS) -> ReferenceIndex:
+    """
+    Sync the reference index with the current automation/script/scene configs.
+
+    Args:
+        kinds: Item kinds to refresh (default: automation, script and scene)
+
+    Returns:
+        The global ReferenceIndex, ready for lookups
+
+    Note:
+        Configs come from the cached bulk loaders, so an unchanged snapshot is a
+        no-op and a changed one only re-indexes the items that differ. Mutations
+        and reloads invalidate those caches, which is what keeps the index
+        current after automations or scripts are reloaded. Kinds whose configs
+        cannot be loaded are dropped from the index rather than served stale.
+    """
+    index = get_reference_index()
+    kinds = tuple(kinds)
+
+    snapshots = await asyncio.gather(*(_load_snapshot(kind) for kind in kinds))
+    for kind, (items, source) in zip(kinds, snapshots, strict=True):
+        if items is None:
+            logger.debug(f"Could not load {kind} configs, dropping them from the reference index")
+            index.clear_kind(kind)
+            continue
+        index.sync(kind, items, source=source)
+
+    return index
+
+
+@handle_api_errors
+async def find_references(value: str, ref_type: str = "entity_id") -> dict[str, Any]:
+    """
+    Find the automations, scripts and scenes that reference something.
+
+    Args:
+        value: The referenced value (e.g., 'light.living_room', a device ID,
+               an area ID, a tag ID or a service like 'light.turn_on')
+        ref_type: What kind of value it is. Options: entity_id, device_id,
+                  area_id, tag_id, service (default: entity_id)
+
+    Returns:
+        Dictionary containing:
+        - ref_type: The reference type searched
+        - value: The value searched
+        - automations: Sorted list of automation entity IDs referencing the value
+        - scripts: Sorted list of script entity IDs referencing the value
+        - scenes: Sorted list of scene entity IDs referencing the value
+
+    Example response:
+        {
+            "ref_type": "entity_id",
+            "value": "light.living_room",
+            "automations": ["automation.turn_on_lights"],
+            "scripts": ["script.lights_on"],
+            "scenes": ["scene.living_room_dim"]
+        }
+
+    Note:
+        References are collected by walking trigger, condition and action trees
+        (entity_id, device_id, area_id, tag_id and service/action keys).
+        Templated values cannot be resolved and are not indexed.
+    """
+    if ref_type not in REFERENCE_TYPES:
+        return {"error": f"Invalid ref_type: {ref_type}. Valid types: {', '.join(REFERENCE_TYPES)}"}
+
+    index = await refresh_reference_index()
+    return {
+        "ref_type": ref_type,
+        "value": value,
+        "automations": sorted(index.lookup(ref_type, value, "automation")),
+        "scripts": sorted(index.lookup(ref_type, value, "script")),
+        "scenes": sorted(index.lookup(ref_type, value, "scene")),
+    }
@@ -230,6 +230,7 @@ async def activate_scene(scene_id: str) -> dict[str, Any]:
 
 
 @handle_api_errors
+@invalidate_cache(pattern="scenes:*")
 async def reload_scenes() -> dict[str, Any]:
     """
     Reload scenes from configuration.
@@ -8,8 +8,8 @@ from typing import Any, cast
 
 from app.api.entities import get_entities, get_entity_state
 from app.config import HA_URL, get_ha_headers
-from app.core import get_client
-from app.core.cache.decorator import cached
+from app.core import gather_with_concurrency, get_client
+from app.core.cache.decorator import cached, invalidate_cache
 from app.core.cache.ttl import TTL_LONG
 from app.core.decorators import handle_api_errors
 
@@ -128,6 +128,49 @@ async def get_script_config(script_id: str) -> dict[str, Any]:
     return await get_entity_state(entity_id, lean=False)
 
 
+@handle_api_errors
+@cached(ttl=TTL_LONG, key_prefix="scripts", exclude_params=["max_concurrency"])
+async def get_script_configs(max_concurrency: int | None = None) -> dict[str, Any]:
+    """
+    Get the configuration of every script, fetched concurrently.
+
+    Args:
+        max_concurrency: Maximum number of config requests in flight
+                         (default: HASS_MCP_MAX_CONCURRENCY)
+
+    Returns:
+        Dictionary mapping script entity_id to its configuration.
+        Scripts whose config cannot be retrieved are omitted.
+
+    Note:
+        This is the script counterpart of get_automation_configs. The combined
+        result is cached so dependency checks share one snapshot.
+    """
+    scripts = await get_scripts()
+
+    # Check if we got an error response
+    if isinstance(scripts, dict) and "error" in scripts:
+        return scripts  # Just pass through the error
+
+    entity_ids = [s["entity_id"] for s in scripts if s.get("entity_id")]
+    results = await gather_with_concurrency(
+        (get_script_config(entity_id.removeprefix("script.")) for entity_id in entity_ids),
+        limit=max_concurrency,
+        return_exceptions=True,
+    )
+
+    configs: dict[str, Any] = {}
+    for entity_id, config in zip(entity_ids, results, strict=True):
+        if isinstance(config, BaseException) or not isinstance(config, dict):
+            logger.debug(f"Skipping config for {entity_id}: {config}")
+            continue
+        if "error" in config:
+            continue
+        configs[entity_id] = config
+
+    return configs
+
+
 @handle_api_errors
 async def run_script(script_id: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
     """
@@ -167,6 +210,7 @@ async def run_script(script_id: str, variables: dict[str, Any] | None = None) ->
 
 
 @handle_api_errors
+@invalidate_cache(pattern="scripts:*")
 async def reload_scripts() -> dict[str, Any]:
     """
     Reload all scripts from configuration.
@@ -8,7 +8,8 @@ from typing import Any, cast
 
 from app.config import HA_URL, get_ha_headers
 from app.core import get_client
-from app.core.cache.decorator import invalidate_cache
+from app.core.cache.decorator import cached, invalidate_cache
+from app.core.cache.ttl import TTL_MEDIUM
 from app.core.decorators import handle_api_errors
 
 logger = logging.getLogger(__name__)
@@ -102,6 +103,7 @@ async def call_service(
     return cast(dict[str, Any], response.json())
 
 
+@cached(ttl=TTL_MEDIUM, key_prefix="services")
 async def get_service_definitions() -> list[dict[str, Any]]:
     """Fetch all available Home Assistant service definitions with their field schemas.
 
@@ -4,33 +4,284 @@ This module provides functions for calculating statistics and analyzing usage pa
 """
 
 import logging
-from datetime import datetime
+import math
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from app.api.entities import get_entities, get_entity_history
+from app.api.entities import get_entities, iter_entities_history, iter_entity_history
 from app.api.logbook import get_entity_logbook
+from app.config import STATISTICS_USE_NUMPY
+from app.core import gather_with_concurrency
 from app.core.decorators import handle_api_errors
+from app.core.stats import (
+    EXACT_QUANTILE_LIMIT,
+    WEEKDAYS,
+    ArrayStatistics,
+    StreamingStatistics,
+    create_statistics,
+    wall_clock_seconds,
+    weekly_heatmap,
+)
+from app.core.websocket import websocket_available, ws_command
 
 logger = logging.getLogger(__name__)
 
+# Periods longer than this (in days) use long-term statistics when available
+LONG_TERM_STATISTICS_MIN_DAYS = 1
+
+# Maximum number of entities per batched history request (keeps URLs short)
+HISTORY_BATCH_SIZE = 25
+
+# States that do not tell whether an entity is numeric
+_UNKNOWN_STATES = frozenset({"unknown", "unavailable"})
+
+
+def select_statistics_period(period_days: int) -> str:
+    """
+    Pick the long-term statistics resolution for an analysis period.
+
+    Args:
+        period_days: Number of days to analyze
+
+    Returns:
+        Recorder statistics period: "5minute", "hour" or "day"
+
+    Note:
+        5-minute (short-term) statistics are only kept for about 10 days by
+        the recorder, so they are used for short periods only.
+    """
+    if period_days <= 3:
+        return "5minute"
+    if period_days <= 90:
+        return "hour"
+    return "day"
+
+
+@handle_api_errors
+async def get_long_term_statistics(
+    statistic_ids: list[str], period_days: int = 7, period: str | None = None
+) -> dict[str, Any]:
+    """
+    Get pre-aggregated long-term statistics from the recorder.
+
+    Args:
+        statistic_ids: Statistic IDs to fetch (entity IDs for entity statistics)
+        period_days: Number of days to fetch (default: 7)
+        period: Resolution ("5minute", "hour", "day", "week" or "month");
+                picked from period_days if omitted
+
+    Returns:
+        Dictionary containing:
+        - period: The resolution used
+        - statistics: Dictionary mapping statistic ID to a list of rows
+          (start, end, mean, min, max, and state/sum for counters)
+
+    Example response:
+        {
+            "period": "hour",
+            "statistics": {
+                "sensor.temperature": [
+                    {"start": 1735725600000, "end": 1735729200000,
+                     "mean": 21.3, "min": 20.9, "max": 21.8}
+                ]
+            }
+        }
+
+    Note:
+        Uses the WebSocket recorder/statistics_during_period command, which
+        requires the optional 'websockets' package. Only entities with a
+        state_class have long-term statistics.
+    """
+    resolution = period or select_statistics_period(period_days)
+    end_time = datetime.now(UTC)
+    start_time = end_time - timedelta(days=period_days)
+
+    result = await ws_command(
+        {
+            "type": "recorder/statistics_during_period",
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "statistic_ids": statistic_ids,
+            "period": resolution,
+            "types": ["mean", "min", "max", "state"],
+        }
+    )
+    return {"period": resolution, "statistics": result or {}}
+
+
+def _summarize_long_term_rows(rows: list[dict[str, Any]]) -> tuple[dict[str, Any], int] | None:
+    """Summarize long-term statistics rows; None if they hold no values."""
+    summary = StreamingStatistics()
+    minimum = math.inf
+    maximum = -math.inf
+    for row in rows:
+        # Measurements have a mean per period; counters only have a state
+        value = row.get("mean")
+        if value is None:
+            value = row.get("state")
+        if value is None:
+            continue
+        summary.push(float(value))
+        if row.get("min") is not None:
+            minimum = min(minimum, float(row["min"]))
+        if row.get("max") is not None:
+            maximum = max(maximum, float(row["max"]))
+
+    if not summary.count:
+        return None
+
+    statistics = summary.to_dict()
+    # Use the true extremes rather than the extremes of the period means
+    if math.isfinite(minimum):
+        statistics["min"] = minimum
+    if math.isfinite(maximum):
+        statistics["max"] = maximum
+    return statistics, summary.count
+
+
+async def _long_term_summaries(
+    entity_ids: list[str], period_days: int
+) -> tuple[str | None, dict[str, tuple[dict[str, Any], int]]]:
+    """
+    Summarize long-term statistics for several entities with one request.
+
+    Returns:
+        Tuple of (resolution used, mapping of entity_id to (statistics,
+        data_points)). Entities without long-term statistics are omitted; the
+        mapping is empty if long-term statistics are unavailable.
+    """
+    if not entity_ids or not websocket_available():
+        return None, {}
+
+    lts = await get_long_term_statistics(entity_ids, period_days)
+    if "error" in lts:
+        logger.debug(f"Long-term statistics unavailable, using history: {lts['error']}")
+        return None, {}
+
+    summaries = {}
+    for entity_id, rows in lts["statistics"].items():
+        summarized = _summarize_long_term_rows(rows) if isinstance(rows, list) else None
+        if summarized is not None:
+            summaries[entity_id] = summarized
+    return lts["period"], summaries
+
+
+def _may_be_numeric(entity: dict[str, Any]) -> bool:
+    """Whether an entity's current state does not rule out numeric history."""
+    state = entity.get("state")
+    if state is None or state in _UNKNOWN_STATES:
+        return True
+    try:
+        float(state)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+@handle_api_errors
+async def _summarize_history(entity_id: str, hours: int) -> dict[str, Any]:
+    """
+    Stream an entity's history into a StreamingStatistics summary.
+
+    Returns:
+        Dictionary with "summary" (numeric states) and "total_states"
+        (all states seen), or an error dictionary
+    """
+    summary = StreamingStatistics()
+    total_states = 0
+    async for state in iter_entity_history(entity_id, hours=hours):
+        total_states += 1
+        try:
+            numeric_value = float(state.get("state"))
+        except (ValueError, TypeError):
+            continue
+        if math.isfinite(numeric_value):
+            summary.push(numeric_value)
+
+    return {"summary": summary, "total_states": total_states}
+
+
+async def _summarize_history_batch(
+    entity_ids: list[str], hours: int, use_numpy: bool
+) -> dict[str, StreamingStatistics | ArrayStatistics]:
+    """Summarize the numeric history of several entities from one history request."""
+    summaries: dict[str, StreamingStatistics | ArrayStatistics] = {}
+    async for entity_id, state in iter_entities_history(entity_ids, hours=hours):
+        if entity_id is None:
+            continue
+        try:
+            numeric_value = float(state.get("state"))
+        except (ValueError, TypeError):
+            continue
+        if not math.isfinite(numeric_value):
+            continue
+        summary = summaries.get(entity_id)
+        if summary is None:
+            summary = summaries[entity_id] = create_statistics(use_numpy)
+        summary.push(numeric_value)
+    return summaries
+
+
+async def _summarize_histories(
+    entity_ids: list[str], hours: int, use_numpy: bool = False
+) -> tuple[dict[str, StreamingStatistics | ArrayStatistics], list[dict[str, Any]]]:
+    """
+    Summarize the numeric history of many entities with batched requests.
+
+    Entities are split into chunks of HISTORY_BATCH_SIZE, each fetched with a
+    single comma-separated filter_entity_id request; chunks are fetched and
+    parsed concurrently with bounded concurrency.
+
+    Returns:
+        Tuple of (mapping of entity_id to its summary, list of failed chunks).
+        Entities without numeric history, or whose chunk failed, are omitted
+        from the mapping; each failed chunk is reported with its entity_ids
+        and error.
+    """
+    chunks = [
+        entity_ids[i : i + HISTORY_BATCH_SIZE]
+        for i in range(0, len(entity_ids), HISTORY_BATCH_SIZE)
+    ]
+    results = await gather_with_concurrency(
+        (_summarize_history_batch(chunk, hours, use_numpy) for chunk in chunks),
+        return_exceptions=True,
+    )
+
+    summaries: dict[str, StreamingStatistics | ArrayStatistics] = {}
+    errors: list[dict[str, Any]] = []
+    for chunk, result in zip(chunks, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.warning(f"Error fetching history for {len(chunk)} entities: {result}")
+            errors.append({"entity_ids": chunk, "error": str(result) or type(result).__name__})
+            continue
+        summaries.update(result)
+    return summaries, errors
+
 
 # NOTE: This function is explicitly excluded from caching (US-006)
 # Statistics are derived from history data and are highly dynamic, so they should not be cached
 @handle_api_errors
-async def get_entity_statistics(entity_id: str, period_days: int = 7) -> dict[str, Any]:
+async def get_entity_statistics(
+    entity_id: str, period_days: int = 7, use_long_term: bool = True
+) -> dict[str, Any]:
     """
-    Get statistics for an entity (min, max, mean, median).
+    Get statistics for an entity (min, max, mean, median, stddev, percentiles).
 
     Args:
         entity_id: The entity ID to get statistics for
         period_days: Number of days to analyze (default: 7)
+        use_long_term: Use recorder long-term statistics for periods longer
+                       than a day when available (default: True)
 
     Returns:
         Dictionary containing:
         - entity_id: The entity ID analyzed
         - period_days: Number of days analyzed
         - data_points: Number of numeric data points found
-        - statistics: Dictionary with min, max, mean, median values
+        - statistics: Dictionary with min, max, mean, median, stddev, p5 and p95 values
+        - quantiles_exact: False if median/percentiles are streaming estimates
+        - source: "long_term_statistics" or "history"
+        - resolution: Long-term statistics period used (long_term_statistics only)
         - note: Note if no data or entity is not numeric
 
     Example response:
@@ -42,12 +293,23 @@ async def get_entity_statistics(entity_id: str, period_days: int = 7) -> dict[st
                 "min": 18.5,
                 "max": 24.3,
                 "mean": 21.4,
-                "median": 21.2
-            }
+                "median": 21.2,
+                "stddev": 1.3,
+                "p5": 19.1,
+                "p95": 23.6
+            },
+            "quantiles_exact": true,
+            "source": "history"
         }
 
     Note:
-        This calculates statistics from entity history data.
+        For periods longer than a day, HA's pre-aggregated long-term statistics
+        (5-minute, hourly or daily, depending on the period) are used when the
+        entity has them; median, stddev and percentiles are then computed over
+        the per-period means. Otherwise statistics are computed from raw
+        history in a single pass while it is streamed: mean and stddev use
+        Welford's algorithm, and median/percentiles are exact up to 10,000
+        points, then P² estimates.
         Only numeric entities can provide meaningful statistics.
         Returns empty statistics if entity is not numeric or has no data.
 
@@ -56,11 +318,26 @@ async def get_entity_statistics(entity_id: str, period_days: int = 7) -> dict[st
         - Keep period_days reasonable (7-30) for performance
         - Check for empty statistics if entity is not numeric
     """
-    # Get history for the period
-    history = await get_entity_history(entity_id, hours=period_days * 24)
+    # Prefer pre-aggregated long-term statistics for long periods
+    if use_long_term and period_days > LONG_TERM_STATISTICS_MIN_DAYS:
+        resolution, summaries = await _long_term_summaries([entity_id], period_days)
+        if entity_id in summaries:
+            statistics, data_points = summaries[entity_id]
+            return {
+                "entity_id": entity_id,
+                "period_days": period_days,
+                "data_points": data_points,
+                "statistics": statistics,
+                "quantiles_exact": data_points <= EXACT_QUANTILE_LIMIT,
+                "source": "long_term_statistics",
+                "resolution": resolution,
+            }
+
+    # Stream the history and summarize it in a single pass (bounded memory)
+    history = await _summarize_history(entity_id, hours=period_days * 24)
 
     # Check for errors
-    if isinstance(history, dict) and "error" in history:
+    if "error" in history:
         return {
             "entity_id": entity_id,
             "period_days": period_days,
@@ -68,14 +345,8 @@ async def get_entity_statistics(entity_id: str, period_days: int = 7) -> dict[st
             "statistics": {},
         }
 
-    # Flatten history list (history is a list of lists)
-    states = []
-    if isinstance(history, list):
-        for state_list in history:
-            if isinstance(state_list, list):
-                states.extend(state_list)
-
-    if not states:
+    summary: StreamingStatistics = history["summary"]
+    if not history["total_states"]:
         return {
             "entity_id": entity_id,
             "period_days": period_days,
@@ -83,17 +354,7 @@ async def get_entity_statistics(entity_id: str, period_days: int = 7) -> dict[st
             "statistics": {},
         }
 
-    # Extract numeric values
-    numeric_values = []
-    for state in states:
-        state_value = state.get("state")
-        try:
-            numeric_value = float(state_value)
-            numeric_values.append(numeric_value)
-        except (ValueError, TypeError):
-            continue
-
-    if not numeric_values:
+    if not summary.count:
         return {
             "entity_id": entity_id,
             "period_days": period_days,
@@ -101,25 +362,13 @@ async def get_entity_statistics(entity_id: str, period_days: int = 7) -> dict[st
             "statistics": {},
         }
 
-    # Calculate statistics
-    sorted_values = sorted(numeric_values)
-    n = len(numeric_values)
-    median = (
-        sorted_values[n // 2]
-        if n % 2 == 1
-        else (sorted_values[n // 2 - 1] + sorted_values[n // 2]) / 2
-    )
-
     stats = {
         "entity_id": entity_id,
         "period_days": period_days,
-        "data_points": len(numeric_values),
-        "statistics": {
-            "min": min(numeric_values),
-            "max": max(numeric_values),
-            "mean": sum(numeric_values) / len(numeric_values),
-            "median": median,
-        },
+        "data_points": summary.count,
+        "statistics": summary.to_dict(),
+        "quantiles_exact": summary.quantiles_exact,
+        "source": "history",
     }
 
     return stats
@@ -128,13 +377,17 @@ async def get_entity_statistics(entity_id: str, period_days: int = 7) -> dict[st
 # NOTE: This function is explicitly excluded from caching (US-006)
 # Statistics are derived from history data and are highly dynamic, so they should not be cached
 @handle_api_errors
-async def get_domain_statistics(domain: str, period_days: int = 7) -> dict[str, Any]:
+async def get_domain_statistics(
+    domain: str, period_days: int = 7, use_numpy: bool | None = None
+) -> dict[str, Any]:
     """
     Get aggregate statistics for all entities in a domain.
 
     Args:
         domain: The domain to get statistics for (e.g., 'sensor', 'light')
         period_days: Number of days to analyze (default: 7)
+        use_numpy: Reduce raw history with NumPy when it is installed
+                   (default: HASS_MCP_STATISTICS_NUMPY setting)
 
     Returns:
         Dictionary containing:
@@ -142,6 +395,10 @@ async def get_domain_statistics(domain: str, period_days: int = 7) -> dict[str,
         - period_days: Number of days analyzed
         - total_entities: Total number of entities in the domain
         - entity_statistics: Dictionary mapping entity_id to statistics
+        - incomplete: True if some history batches could not be fetched
+          (only present then)
+        - errors: The failed batches, with their entity_ids and error
+          (only present when incomplete)
 
     Example response:
         {
@@ -159,17 +416,21 @@ async def get_domain_statistics(domain: str, period_days: int = 7) -> dict[str,
         }
 
     Note:
-        This aggregates statistics for entities in a domain.
-        Limited to first 10 entities for performance.
-        Only numeric entities are included in entity_statistics.
+        This aggregates statistics for every entity in a domain. For periods
+        longer than a day, long-term statistics for all entities are fetched
+        in one request; entities without them fall back to raw history,
+        fetched in batches of 25 entities per request with the batches
+        streamed and summarized concurrently. Entities whose current state
+        is not numeric are skipped. Only numeric entities are included in
+        entity_statistics.
 
     Best Practices:
         - Use for domains with numeric entities (sensor, energy, etc.)
         - Keep period_days reasonable (7-30) for performance
         - Consider using get_entity_statistics for individual entities
     """
-    # Get all entities in domain
-    entities = await get_entities(domain=domain, lean=True)
+    # Get all entities in domain (no limit, large domains are batched below)
+    entities = await get_entities(domain=domain, limit=0, lean=True)
 
     # Check for errors
     if isinstance(entities, dict) and "error" in entities:
@@ -188,18 +449,35 @@ async def get_domain_statistics(domain: str, period_days: int = 7) -> dict[str,
         "entity_statistics": {},
     }
 
-    # Get statistics for each entity (limited to first 10 for performance)
-    for entity in entities[:10]:
-        entity_id = entity.get("entity_id")
-        if not entity_id:
-            continue
-        try:
-            entity_stats = await get_entity_statistics(entity_id, period_days)
-            # Only include entities with valid statistics
-            if entity_stats.get("statistics"):
-                stats["entity_statistics"][entity_id] = entity_stats.get("statistics", {})
-        except Exception:  # nosec B112
-            continue
+    # Skip entities whose current state shows they are not numeric
+    entity_ids = [
+        entity["entity_id"]
+        for entity in entities
+        if entity.get("entity_id") and _may_be_numeric(entity)
+    ]
+
+    # Long-term statistics for every entity in a single WebSocket request
+    if period_days > LONG_TERM_STATISTICS_MIN_DAYS:
+        _, summaries = await _long_term_summaries(entity_ids, period_days)
+        for entity_id, (entity_statistics, _) in summaries.items():
+            stats["entity_statistics"][entity_id] = entity_statistics
+
+    # Fall back to batched raw history for the rest
+    remaining = [e for e in entity_ids if e not in stats["entity_statistics"]]
+    if remaining:
+        summaries, errors = await _summarize_histories(
+            remaining,
+            hours=period_days * 24,
+            use_numpy=STATISTICS_USE_NUMPY if use_numpy is None else use_numpy,
+        )
+        for entity_id in remaining:
+            # Only include entities with numeric history
+            summary = summaries.get(entity_id)
+            if summary is not None and summary.count:
+                stats["entity_statistics"][entity_id] = summary.to_dict()
+        if errors:
+            stats["incomplete"] = True
+            stats["errors"] = errors
 
     return stats
 
@@ -224,6 +502,7 @@ async def analyze_usage_patterns(entity_id: str, days: int = 30) -> dict[str, An
         - daily_distribution: Dictionary mapping day name to event count
         - peak_hour: Hour with most events (0-23)
         - peak_day: Day of week with most events
+        - heatmap: Dictionary mapping day name to 24 hourly event counts
 
     Example response:
         {
@@ -233,11 +512,14 @@ async def analyze_usage_patterns(entity_id: str, days: int = 30) -> dict[str, An
             "hourly_distribution": {18: 30, 19: 25, 20: 20, ...},
             "daily_distribution": {"Monday": 25, "Tuesday": 22, ...},
             "peak_hour": 18,
-            "peak_day": "Monday"
+            "peak_day": "Monday",
+            "heatmap": {"Monday": [0, 0, ..., 6, 5, 4, 0], ...}
         }
 
     Note:
         This analyzes logbook entries to find usage patterns.
+        Each timestamp is parsed once, then bucketed by hour and weekday
+        with integer arithmetic (NumPy bincount when installed).
         Useful for understanding when devices are used most.
         Helps optimize automations based on actual usage.
 
@@ -265,30 +547,17 @@ async def analyze_usage_patterns(entity_id: str, days: int = 30) -> dict[str, An
             "daily_distribution": {},
             "peak_hour": None,
             "peak_day": None,
+            "heatmap": {},
         }
 
-    # Analyze by hour of day
-    hourly_usage: dict[int, int] = {}
-    daily_usage: dict[str, int] = {}
-
-    for entry in logbook:
-        when = entry.get("when")
-        if when:
-            try:
-                # Parse timestamp (handle both with and without timezone)
-                if when.endswith("Z"):
-                    dt = datetime.fromisoformat(when.replace("Z", "+00:00"))
-                else:
-                    dt = datetime.fromisoformat(when)
-
-                hour = dt.hour
-                hourly_usage[hour] = hourly_usage.get(hour, 0) + 1
-
-                # Analyze by day of week
-                day = dt.strftime("%A")
-                daily_usage[day] = daily_usage.get(day, 0) + 1
-            except (ValueError, AttributeError):  # nosec B110
-                continue
+    # Parse every timestamp in one pass, then bucket with integer arithmetic
+    wall_seconds = wall_clock_seconds(entry.get("when") for entry in logbook)
+    heatmap = weekly_heatmap(wall_seconds)
+
+    hourly_usage = {
+        hour: count for hour in range(24) if (count := sum(heatmap[day][hour] for day in range(7)))
+    }
+    daily_usage = {WEEKDAYS[day]: count for day in range(7) if (count := sum(heatmap[day]))}
 
     # Find peak hour and day
     peak_hour = max(hourly_usage.items(), key=lambda x: x[1])[0] if hourly_usage else None
@@ -302,4 +571,5 @@ async def analyze_usage_patterns(entity_id: str, days: int = 30) -> dict[str, An
         "daily_distribution": daily_usage,
         "peak_hour": peak_hour,
         "peak_day": peak_day,
+        "heatmap": dict(zip(WEEKDAYS, heatmap, strict=True)) if wall_seconds else {},
     }
@@ -3,12 +3,13 @@
 This module provides functions for interacting with Home Assistant system information.
 """
 
+import asyncio
 import logging
-import re
+from collections import Counter
 from typing import Any, cast
 
 from app.api.entities import filter_fields
-from app.config import HA_URL, get_ha_headers
+from app.config import HA_URL, TRACING_ENABLED, get_ha_headers
 from app.core import DOMAIN_IMPORTANT_ATTRIBUTES, get_client
 from app.core.cache.config import get_cache_config
 from app.core.cache.decorator import cached
@@ -16,6 +17,15 @@ from app.core.cache.manager import get_cache_manager
 from app.core.cache.metrics import get_cache_metrics
 from app.core.cache.ttl import TTL_VERY_LONG
 from app.core.decorators import handle_api_errors
+from app.core.error_log import (
+    ERROR_LEVELS,
+    ErrorLogIndex,
+    ErrorLogUnavailable,
+    get_error_log_index,
+)
+from app.core.profiling import get_tool_profiler
+from app.core.telemetry import get_performance_metrics
+from app.core.tracing import get_trace_recorder, otel_available
 
 logger = logging.getLogger(__name__)
 
@@ -42,8 +52,77 @@ async def get_hass_version() -> str:
     return data.get("version", "unknown")
 
 
+# Serializes error log refreshes so new text is fed to the index once
+_error_log_lock = asyncio.Lock()
+
+
+async def refresh_error_log() -> ErrorLogIndex:
+    """
+    Bring the error log index up to date with Home Assistant's error log.
+
+    Returns:
+        The global ErrorLogIndex, ready for queries
+
+    Raises:
+        ErrorLogUnavailable: If Home Assistant returns an error status
+
+    Note:
+        Only the part of the log after the last byte offset read is requested
+        (HTTP Range), starting one line earlier so the overlap can be checked.
+        If the overlap does not match, or the log is now shorter, Home
+        Assistant has started a new log and it is re-read from the start.
+        Servers that ignore Range requests return the whole log, in which case
+        only the new part is parsed.
+    """
+    async with _error_log_lock:
+        index = get_error_log_index()
+        for _ in range(2):
+            url = f"{HA_URL}/api/error_log"
+            headers = get_ha_headers()
+            tail_bytes = index.tail.encode("utf-8")
+            overlap_start = index.offset - len(tail_bytes)
+            if index.offset:
+                headers = {**headers, "Range": f"bytes={overlap_start}-"}
+
+            client = await get_client()
+            response = await client.get(url, headers=headers, timeout=30.0)
+
+            if response.status_code == 206:
+                new_text = response.text
+                if not new_text.startswith(index.tail):
+                    index.clear()
+                    continue
+                new_text = new_text[len(index.tail) :]
+            elif response.status_code == 416:
+                # The log is shorter than what was already read
+                index.clear()
+                continue
+            elif response.status_code == 200:
+                new_text = response.text
+                log_bytes = new_text.encode("utf-8")
+                if index.offset and log_bytes[overlap_start : index.offset] == tail_bytes:
+                    new_text = log_bytes[index.offset :].decode("utf-8", errors="replace")
+                else:
+                    index.clear()
+            else:
+                raise ErrorLogUnavailable(
+                    f"{response.status_code} {response.reason_phrase}", response.text
+                )
+            break
+
+        index.feed(new_text)
+
+        # Advance through the last complete line; a partial line is re-read next time
+        complete, newline, _ = new_text.rpartition("\n")
+        if newline:
+            index.offset += len(complete.encode("utf-8")) + 1
+            index.tail = complete.rsplit("\n", 1)[-1] + "\n"
+        return index
+
+
 # NOTE: This function is explicitly excluded from caching (US-006)
-# Error logs are highly dynamic and time-sensitive, so they should not be cached
+# Error logs are highly dynamic and time-sensitive, so they should not be cached;
+# the log is followed incrementally through the error log index instead
 @handle_api_errors
 async def get_hass_error_log(
     level: str | None = None,
@@ -56,17 +135,18 @@ async def get_hass_error_log(
 
     Args:
         level: Optional filter for log level (e.g., "ERROR", "WARNING").
-        integration: Optional filter for integration name (e.g., "mqtt", "hue").
+        integration: Optional filter for integration name (e.g., "mqtt", "hue");
+                     keeps records mentioning it anywhere, logger name included.
         search_term: Optional text search filter.
         lines: Optional number of most recent lines to include (if less than total).
 
     Returns:
         A dictionary containing:
-        - log_text: The full error log text (filtered if filters applied)
-        - error_count: Number of ERROR entries found
-        - warning_count: Number of WARNING entries found
+        - log_text: The error log text (filtered if filters applied)
+        - error_count: Number of ERROR/CRITICAL records matching the filters
+        - warning_count: Number of WARNING records matching the filters
         - total_lines: Total number of lines in the returned log
-        - integration_mentions: Map of integration names to mention counts
+        - integration_mentions: Map of integration names to record counts
         - filters_applied: Which filters were active (if any)
 
     Example response:
@@ -84,6 +164,14 @@ async def get_hass_error_log(
             }
         }
 
+    Note:
+        The log is parsed into records (a header line plus any traceback
+        lines), so filters keep whole records. Only new log text is fetched
+        and parsed on each call; the level filter and unfiltered counts come
+        from the error log index. Only the most recent records are kept
+        (HASS_MCP_ERROR_LOG_MAX_RECORDS), so log_text covers those records
+        rather than the whole log file.
+
     Best Practices:
         - Use this tool when troubleshooting specific Home Assistant errors
         - Look for patterns in repeated errors
@@ -91,76 +179,11 @@ async def get_hass_error_log(
         - Focus on integrations with many mentions in the log
     """
     try:
-        # Call the Home Assistant API error_log endpoint
-        url = f"{HA_URL}/api/error_log"
-        headers = get_ha_headers()
-
-        client = await get_client()
-        response = await client.get(url, headers=headers, timeout=30.0)
-
-        if response.status_code == 200:
-            log_text = response.text
-
-            # Apply filters (AND semantics)
-            filters_applied: dict[str, str | int] = {}
-            filtered = True
-
-            if level:
-                filters_applied["level"] = level
-                log_text = "\n".join(line for line in log_text.split("\n") if level in line.upper())
-
-            if integration:
-                filters_applied["integration"] = integration
-                log_text = "\n".join(
-                    line for line in log_text.split("\n") if integration.lower() in line.lower()
-                )
-
-            if search_term:
-                filters_applied["search_term"] = search_term
-                log_text = "\n".join(
-                    line for line in log_text.split("\n") if search_term.lower() in line.lower()
-                )
-
-            if lines and lines > 0:
-                filters_applied["lines"] = lines
-                log_lines = log_text.split("\n")
-                log_text = "\n".join(log_lines[-lines:])
-
-            if not filters_applied:
-                filtered = False
-
-            total_lines = len(log_text.split("\n")) if log_text.strip() else 0
-
-            # Count errors and warnings
-            error_count = log_text.count("ERROR")
-            warning_count = log_text.count("WARNING")
-
-            # Extract integration mentions
-            integration_mentions = {}
-
-            # Look for patterns like [mqtt], [zwave], etc.
-            for match in re.finditer(r"\[([a-zA-Z0-9_]+)\]", log_text):
-                integration_name = match.group(1).lower()
-                integration_mentions[integration_name] = (
-                    integration_mentions.get(integration_name, 0) + 1
-                )
-
-            result: dict[str, Any] = {
-                "log_text": log_text,
-                "error_count": error_count,
-                "warning_count": warning_count,
-                "total_lines": total_lines,
-                "integration_mentions": integration_mentions,
-            }
-
-            if filtered:
-                result["filters_applied"] = filters_applied
-
-            return result
-
+        index = await refresh_error_log()
+    except ErrorLogUnavailable as e:
         return {
-            "error": f"Error retrieving error log: {response.status_code} {response.reason_phrase}",
-            "details": response.text,
+            "error": f"Error retrieving error log: {e}",
+            "details": e.details,
             "log_text": "",
             "error_count": 0,
             "warning_count": 0,
@@ -178,6 +201,51 @@ async def get_hass_error_log(
             "integration_mentions": {},
         }
 
+    # Apply filters (AND semantics); the level filter comes from the index
+    filters_applied: dict[str, str | int] = {}
+    if level:
+        filters_applied["level"] = level
+    records = index.records(level=level)
+
+    if integration:
+        # Records that mention the integration anywhere, not only its own
+        # logger's records (e.g. a core error about an MQTT entity)
+        filters_applied["integration"] = integration
+        name = integration.lower()
+        records = [record for record in records if name in record.text.lower()]
+
+    if search_term:
+        filters_applied["search_term"] = search_term
+        term = search_term.lower()
+        records = [record for record in records if term in record.text.lower()]
+
+    if filters_applied:
+        level_counts = Counter(record.level for record in records if record.level)
+        integration_mentions = dict(
+            Counter(record.integration for record in records if record.integration)
+        )
+    else:
+        level_counts = index.level_counts
+        integration_mentions = dict(index.integration_counts)
+
+    log_text = "\n".join(record.text for record in records)
+    if lines and lines > 0:
+        filters_applied["lines"] = lines
+        log_text = "\n".join(log_text.split("\n")[-lines:])
+
+    result: dict[str, Any] = {
+        "log_text": log_text,
+        "error_count": sum(level_counts.get(name, 0) for name in ERROR_LEVELS),
+        "warning_count": level_counts.get("WARNING", 0),
+        "total_lines": len(log_text.split("\n")) if log_text.strip() else 0,
+        "integration_mentions": integration_mentions,
+    }
+
+    if filters_applied:
+        result["filters_applied"] = filters_applied
+
+    return result
+
 
 # NOTE: This function is explicitly excluded from caching (US-006)
 # System overview includes current entity states which are highly dynamic, so it should not be cached
@@ -519,7 +587,7 @@ async def get_cache_configuration() -> dict[str, Any]:
     Returns:
         A dictionary containing:
         - enabled: Whether caching is enabled
-        - backend: The cache backend type (memory, redis, file)
+        - backend: The cache backend type (memory, redis, tiered, file, sqlite)
         - default_ttl: Default TTL in seconds
         - max_size: Maximum cache size
         - redis_url: Redis URL if configured (None otherwise)
@@ -633,16 +701,23 @@ async def get_cache_statistics() -> dict[str, Any]:
         - cache_enabled: Whether caching is enabled
         - backend: The cache backend type
         - size: Current cache size (if available)
+        - evictions: Entries evicted to stay within the size limit (if available)
         - statistics: Overall cache statistics (hits, misses, hit rate, etc.)
         - per_endpoint: Per-endpoint statistics
         - top_endpoints: Top endpoints by various metrics
         - health: Cache health information
+        - tools: End-to-end latency percentiles per MCP tool
+        - tiers: L1 (in-process) and L2 (Redis) hit statistics, tiered backend only
+
+    Latencies are reported as p50/p95/p99 estimates from fixed-bucket
+    histograms; rates cover the last 60 seconds.
 
     Example response:
         {
             "cache_enabled": true,
             "backend": "memory",
             "size": 1234,
+            "evictions": 0,
             "statistics": {
                 "total_hits": 1523,
                 "total_misses": 234,
@@ -659,6 +734,21 @@ async def get_cache_statistics() -> dict[str, Any]:
                     "total_api_calls": 234,
                     "total_cache_calls": 1523
                 },
+                "latency": {
+                    "cache_hit": {"count": 1523, "p50_ms": 0.4, "p95_ms": 1.2, "p99_ms": 2.1, "max_ms": 4.8},
+                    "cache_miss": {"count": 234, ...},
+                    "api": {"count": 234, "p50_ms": 38.0, "p95_ms": 120.5, "p99_ms": 410.0, "max_ms": 950.2},
+                    "total": {"count": 1757, ...}
+                },
+                "rates": {
+                    "window_seconds": 60,
+                    "requests_per_second": 2.5,
+                    "hits_per_second": 2.1,
+                    "misses_per_second": 0.4,
+                    "api_calls_per_second": 0.4,
+                    "tool_calls_per_second": 1.2,
+                    "hit_rate": 0.84
+                },
                 "endpoint_count": 15
             },
             "per_endpoint": {
@@ -672,9 +762,13 @@ async def get_cache_statistics() -> dict[str, Any]:
                     "avg_cache_time_ms": 1.0,
                     "time_saved_ms": 49.0,
                     "api_call_count": 12,
-                    "cache_call_count": 462
+                    "cache_call_count": 462,
+                    "latency": {"cache_hit": {...}, "cache_miss": {...}, "api": {...}, "total": {...}}
                 }
             },
+            "tools": {
+                "get_entity": {"count": 120, "p50_ms": 1.1, "p95_ms": 45.0, "p99_ms": 180.3, "max_ms": 512.0}
+            },
             "top_endpoints": {
                 "by_hits": [
                     ["entities:get_entities", {"hits": 450, ...}]
@@ -745,10 +839,11 @@ async def get_cache_statistics() -> dict[str, Any]:
         else:
             health["warning"] += "; Low cache hit rate"
 
-    return {
+    result = {
         "cache_enabled": stats["enabled"],
         "backend": stats["backend"],
         "size": stats.get("size"),
+        "evictions": stats.get("evictions"),
         "statistics": stats["statistics"],
         "per_endpoint": stats["per_endpoint"],
         "top_endpoints": {
@@ -757,4 +852,58 @@ async def get_cache_statistics() -> dict[str, Any]:
             "by_hit_rate": top_by_hit_rate,
         },
         "health": health,
+        "tools": metrics.get_tool_stats(),
+    }
+    if "tiers" in stats:
+        result["tiers"] = stats["tiers"]
+    return result
+
+
+@handle_api_errors
+async def get_performance_traces() -> dict[str, Any]:
+    """
+    Get the slowest tool call traces, request timings and saved profiles.
+
+    Returns:
+        Dictionary containing:
+        - tracing_enabled: Whether tool calls are traced (HASS_MCP_TRACING_ENABLED)
+        - otel_export: Whether spans are also exported to OpenTelemetry
+        - slowest_traces: Span trees of the slowest tool calls, slowest first
+        - requests: Home Assistant request and vector DB latency percentiles
+        - profiling: Whether profiling is enabled, and the saved profiles
+
+    Example response:
+        {
+            "tracing_enabled": true,
+            "otel_export": false,
+            "slowest_traces": [
+                {
+                    "name": "tool.list_items",
+                    "start_ms": 0.0,
+                    "duration_ms": 812.4,
+                    "attributes": {"tool": "list_items"},
+                    "children": [
+                        {"name": "cache.get", "start_ms": 0.1, "duration_ms": 0.2,
+                         "attributes": {"endpoint": "automations:get_automations", "hit": false},
+                         "children": []},
+                        {"name": "ha.request", "start_ms": 0.4, "duration_ms": 795.0,
+                         "attributes": {"method": "GET", "endpoint": "/api/states", "status": 200},
+                         "children": []}
+                    ]
+                }
+            ],
+            "requests": {"in_flight": 0, "ha_requests": {...}, "vectordb": {...}},
+            "profiling": {"enabled": false, "profiles": []}
+        }
+    """
+    profiler = get_tool_profiler()
+    return {
+        "tracing_enabled": TRACING_ENABLED,
+        "otel_export": otel_available(),
+        "slowest_traces": get_trace_recorder().get_slowest(),
+        "requests": get_performance_metrics().get_statistics(),
+        "profiling": {
+            "enabled": profiler.enabled,
+            "profiles": profiler.get_profiles(),
+        },
     }
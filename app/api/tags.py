@@ -7,8 +7,9 @@ Tags are used with NFC/RFID readers to trigger automations.
 import logging
 from typing import Any, cast
 
-from app.api.automations import get_automation_config, get_automations
+from app.api.automations import get_automations
 from app.api.base import BaseAPI
+from app.api.references import refresh_reference_index
 from app.core.cache.decorator import cached, invalidate_cache
 from app.core.cache.ttl import TTL_LONG
 from app.core.decorators import handle_api_errors
@@ -123,6 +124,19 @@ async def delete_tag(tag_id: str) -> dict[str, Any]:
     return await _tags_api.delete(f"/api/tag/{tag_id}")
 
 
+def _has_tag_trigger(config: dict[str, Any], tag_id: str) -> bool:
+    """Check whether an automation config is triggered by a tag."""
+    triggers = config.get("trigger", [])
+    if not isinstance(triggers, list):
+        return False
+    return any(
+        isinstance(trigger, dict)
+        and trigger.get("platform") == "tag"
+        and trigger.get("tag_id") == tag_id
+        for trigger in triggers
+    )
+
+
 @handle_api_errors
 async def get_tag_automations(tag_id: str) -> list[dict[str, Any]]:
     """
@@ -147,8 +161,10 @@ async def get_tag_automations(tag_id: str) -> list[dict[str, Any]]:
         ]
 
     Note:
-        This searches through all automations to find those with tag triggers.
-        Tag triggers use platform "tag" with matching tag_id.
+        Only automations with a tag trigger (platform "tag" with matching
+        tag_id) are returned. Candidates are looked up in the reference
+        index, which also holds tag_id references from conditions and
+        actions, then checked against their triggers.
         Useful for understanding tag dependencies before deletion.
 
     Best Practices:
@@ -160,36 +176,25 @@ async def get_tag_automations(tag_id: str) -> list[dict[str, Any]]:
     # Get all automations
     automations = await get_automations()
 
+    # Look up tagged automations in the reference index (synced from cached configs)
+    index = await refresh_reference_index(kinds=("automation",))
+    tagged_ids = index.lookup("tag_id", tag_id, "automation")
+
     tag_automations = []
     for automation in automations:
         automation_id = automation.get("entity_id")
-        if not automation_id:
+        if automation_id not in tagged_ids:
             continue
-        try:
-            automation_entity_id = automation_id.replace("automation.", "")
-            config = await get_automation_config(automation_entity_id)
-
-            # Check if automation has tag trigger
-            triggers = config.get("trigger", [])
-            if not isinstance(triggers, list):
-                triggers = []
-
-            for trigger in triggers:
-                if (
-                    isinstance(trigger, dict)
-                    and trigger.get("platform") == "tag"
-                    and trigger.get("tag_id") == tag_id
-                ):
-                    tag_automations.append(
-                        {
-                            "automation_id": automation_id,
-                            "alias": automation.get("attributes", {}).get("friendly_name")
-                            or config.get("alias"),
-                            "enabled": automation.get("state") == "on",
-                        }
-                    )
-                    break
-        except Exception:  # nosec B112
+        config = index.get_config("automation", automation_id) or {}
+        if not _has_tag_trigger(config, tag_id):
             continue
+        tag_automations.append(
+            {
+                "automation_id": automation_id,
+                "alias": automation.get("attributes", {}).get("friendly_name")
+                or config.get("alias"),
+                "enabled": automation.get("state") == "on",
+            }
+        )
 
     return tag_automations
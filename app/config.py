@@ -9,6 +9,19 @@ HA_TOKEN: str = os.environ.get("HA_TOKEN", "")
 # SSL/TLS Configuration
 HA_SSL_VERIFY: str | bool = os.environ.get("HA_SSL_VERIFY", "true")
 
+# Maximum number of concurrent Home Assistant requests for bulk fan-out operations
+HA_MAX_CONCURRENCY: int = int(os.environ.get("HASS_MCP_MAX_CONCURRENCY", "8"))
+
+# Maximum number of parsed error log records kept in memory
+ERROR_LOG_MAX_RECORDS: int = int(os.environ.get("HASS_MCP_ERROR_LOG_MAX_RECORDS", "5000"))
+
+# Reduce batched history statistics with NumPy (requires the optional numpy package)
+STATISTICS_USE_NUMPY: bool = os.environ.get("HASS_MCP_STATISTICS_NUMPY", "false").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
 # Cache configuration
 CACHE_ENABLED: bool = os.environ.get("HASS_MCP_CACHE_ENABLED", "true").lower() in (
     "true",
@@ -18,8 +31,55 @@ CACHE_ENABLED: bool = os.environ.get("HASS_MCP_CACHE_ENABLED", "true").lower() i
 CACHE_BACKEND: str = os.environ.get("HASS_MCP_CACHE_BACKEND", "memory").lower()
 CACHE_DEFAULT_TTL: int = int(os.environ.get("HASS_MCP_CACHE_DEFAULT_TTL", "300"))
 CACHE_MAX_SIZE: int = int(os.environ.get("HASS_MCP_CACHE_MAX_SIZE", "1000"))
+# TTL of cached not-found (404) outcomes; 0 disables negative caching
+CACHE_NEGATIVE_TTL: int = int(os.environ.get("HASS_MCP_CACHE_NEGATIVE_TTL", "30"))
 REDIS_URL: str | None = os.environ.get("HASS_MCP_CACHE_REDIS_URL")
 CACHE_DIR: str = os.environ.get("HASS_MCP_CACHE_DIR", ".cache")
+# In-process L1 of the tiered backend (in front of Redis)
+CACHE_L1_MAX_SIZE: int = int(os.environ.get("HASS_MCP_CACHE_L1_MAX_SIZE", "256"))
+CACHE_L1_TTL: float = float(os.environ.get("HASS_MCP_CACHE_L1_TTL", "30"))
+# Endpoints prefetched concurrently at startup (comma-separated; empty disables)
+CACHE_WARMUP: list[str] = [
+    name.strip().lower()
+    for name in os.environ.get("HASS_MCP_CACHE_WARMUP", "").split(",")
+    if name.strip()
+]
+CACHE_WARMUP_TIMEOUT: float = float(os.environ.get("HASS_MCP_CACHE_WARMUP_TIMEOUT", "30"))
+# Memory cache snapshot written on shutdown and restored on startup (empty disables)
+CACHE_SNAPSHOT_FILE: str = os.environ.get("HASS_MCP_CACHE_SNAPSHOT_FILE", "")
+# Value codec of the Redis, file and SQLite backends
+CACHE_SERIALIZER: str = os.environ.get("HASS_MCP_CACHE_SERIALIZER", "auto").lower()
+CACHE_COMPRESSION: str = os.environ.get("HASS_MCP_CACHE_COMPRESSION", "auto").lower()
+CACHE_COMPRESS_THRESHOLD: int = int(os.environ.get("HASS_MCP_CACHE_COMPRESS_THRESHOLD", "4096"))
+# Byte budget of the time-bucketed history/logbook segment cache
+SEGMENT_CACHE_MAX_BYTES: int = int(
+    os.environ.get("HASS_MCP_SEGMENT_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+)
+
+# Metrics export
+# Serve Prometheus metrics on /metrics (sse and streamable-http transports)
+METRICS_ENABLED: bool = os.environ.get("HASS_MCP_METRICS_ENABLED", "false").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+# Prometheus textfile written periodically and on shutdown (empty disables)
+METRICS_TEXTFILE: str = os.environ.get("HASS_MCP_METRICS_TEXTFILE", "")
+METRICS_TEXTFILE_INTERVAL: float = float(os.environ.get("HASS_MCP_METRICS_TEXTFILE_INTERVAL", "15"))
+
+# Tracing and profiling of tool calls
+TRACING_ENABLED: bool = os.environ.get("HASS_MCP_TRACING_ENABLED", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+# Number of slowest tool call traces kept in memory
+TRACE_KEEP: int = int(os.environ.get("HASS_MCP_TRACE_KEEP", "20"))
+# Directory receiving cProfile dumps of the slowest tool calls (empty disables)
+PROFILE_DIR: str = os.environ.get("HASS_MCP_PROFILE_DIR", "")
+PROFILE_TOP_N: int = int(os.environ.get("HASS_MCP_PROFILE_TOP_N", "10"))
+# Fraction of tool calls profiled while profiling is enabled
+PROFILE_SAMPLE_RATE: float = float(os.environ.get("HASS_MCP_PROFILE_SAMPLE_RATE", "1.0"))
 
 
 def get_ha_headers() -> dict:
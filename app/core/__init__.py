@@ -2,12 +2,14 @@
 
 This module provides shared utilities including:
 - HTTP client management
+- Bounded concurrency helpers
 - Decorators for async handlers and error handling
 - Type definitions
 - Error handling utilities
 """
 
 from app.core.client import cleanup_client, get_client
+from app.core.concurrency import gather_with_concurrency
 from app.core.decorators import async_handler, handle_api_errors
 from app.core.types import (
     DEFAULT_LEAN_FIELDS,
@@ -20,6 +22,7 @@ from app.core.types import (
 __all__ = [
     "cleanup_client",
     "get_client",
+    "gather_with_concurrency",
     "async_handler",
     "handle_api_errors",
     "DEFAULT_LEAN_FIELDS",
@@ -8,6 +8,7 @@ from app.core.cache.decorator import cached, invalidate_cache
 from app.core.cache.invalidation import InvalidationStrategy
 from app.core.cache.manager import CacheManager, get_cache_manager
 from app.core.cache.metrics import CacheMetrics, get_cache_metrics
+from app.core.cache.segments import SegmentCache, get_segment_cache
 from app.core.cache.ttl import (
     TTL_DISABLED,
     TTL_LONG,
@@ -21,10 +22,12 @@ __all__ = [
     "CacheManager",
     "CacheMetrics",
     "InvalidationStrategy",
+    "SegmentCache",
     "cached",
     "get_cache_config",
     "get_cache_manager",
     "get_cache_metrics",
+    "get_segment_cache",
     "invalidate_cache",
     "TTL_DISABLED",
     "TTL_SHORT",
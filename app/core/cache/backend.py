@@ -4,12 +4,26 @@ This module defines the abstract interface that all cache backends must implemen
 """
 
 import logging
+import re
 from abc import ABC, abstractmethod
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
 
+def compile_key_pattern(pattern: str) -> re.Pattern[str]:
+    """
+    Compile a key pattern where '*' matches any run of characters.
+
+    Args:
+        pattern: Key pattern (e.g. "entities:*")
+
+    Returns:
+        Compiled regular expression matching whole keys
+    """
+    return re.compile(".*".join(re.escape(part) for part in pattern.split("*")))
+
+
 class CacheBackend(ABC):
     """
     Abstract base class for cache backends.
@@ -83,3 +97,59 @@ class CacheBackend(ABC):
             List of matching cache keys
         """
         pass
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """
+        Retrieve several values from the cache.
+
+        Backends that can fetch keys in one round trip should override this;
+        the default calls get() for each key.
+
+        Args:
+            keys: The cache keys to retrieve
+
+        Returns:
+            Dictionary of the keys that were found to their values
+        """
+        values: dict[str, Any] = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    async def set_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """
+        Store several values in the cache with the same TTL.
+
+        Args:
+            items: Dictionary of cache keys to values
+            ttl: Optional Time-To-Live in seconds. If None, entries don't expire
+        """
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        """
+        Delete several values from the cache.
+
+        Args:
+            keys: The cache keys to delete
+        """
+        for key in keys:
+            await self.delete(key)
+
+    async def delete_pattern(self, pattern: str) -> list[str]:
+        """
+        Delete all entries whose keys match a pattern.
+
+        Args:
+            pattern: Pattern to match keys (supports wildcards like '*')
+
+        Returns:
+            List of the deleted cache keys
+        """
+        keys = await self.keys(pattern)
+        if keys:
+            await self.delete_many(keys)
+        return keys
@@ -0,0 +1,294 @@
+"""Value codec for persistent cache backends.
+
+This module serializes cache values for backends that store bytes (Redis,
+file, SQLite). Every encoded value starts with a one-byte format tag, so
+decoding dispatches directly to the right decoder instead of trying JSON and
+falling back to pickle:
+
+- bits 0-2: serialization format (JSON, msgpack or pickle)
+- bits 3-4: compression (none, zlib, zstd or lz4)
+
+JSON is encoded with orjson when it is installed, and msgpack is used for
+JSON-compatible values when orjson is not. Values larger than a threshold are
+compressed with zstd or lz4 when available. Tags are below 0x20, which no
+JSON document or pickle stream starts with, so values written before the tag
+existed are still decoded.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import pickle  # nosec B403 - Used for serializing complex types in trusted cache
+import zlib
+from typing import Any
+
+from app.config import CACHE_COMPRESS_THRESHOLD, CACHE_COMPRESSION, CACHE_SERIALIZER
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # type: ignore[assignment]
+
+try:
+    from compression import zstd  # type: ignore[import-not-found]  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd  # type: ignore[no-redef]
+    except ImportError:
+        zstd = None  # type: ignore[assignment]
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Serialization formats (bits 0-2 of the tag)
+FORMAT_JSON = 0x01
+FORMAT_MSGPACK = 0x02
+FORMAT_PICKLE = 0x03
+_FORMAT_MASK = 0x07
+
+# Compression algorithms (bits 3-4 of the tag)
+COMPRESSION_NONE = 0x00
+COMPRESSION_ZLIB = 0x08
+COMPRESSION_ZSTD = 0x10
+COMPRESSION_LZ4 = 0x18
+_COMPRESSION_MASK = 0x18
+
+# Tags are control characters; legacy (untagged) values start at 0x20 or above
+_LEGACY_TAG_MIN = 0x20
+
+_JSON_TYPES = (dict, list, str, int, float, bool, type(None))
+
+_COMPRESSION_NAMES = {
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+    "lz4": COMPRESSION_LZ4,
+}
+
+
+def _compressor_available(compression: int) -> bool:
+    """Check whether the library for a compression algorithm is installed."""
+    if compression == COMPRESSION_ZSTD:
+        return zstd is not None
+    if compression == COMPRESSION_LZ4:
+        return lz4_frame is not None
+    return True
+
+
+def _compress(compression: int, data: bytes) -> bytes:
+    """Compress data with the given algorithm."""
+    if compression == COMPRESSION_ZSTD:
+        return zstd.compress(data)
+    if compression == COMPRESSION_LZ4:
+        return lz4_frame.compress(data)
+    return zlib.compress(data, 1)
+
+
+def _decompress(compression: int, data: bytes) -> bytes:
+    """Decompress data compressed with the given algorithm."""
+    if not _compressor_available(compression):
+        raise ValueError(f"Compression library for tag 0x{compression:02x} is not installed")
+    if compression == COMPRESSION_ZSTD:
+        return zstd.decompress(data)
+    if compression == COMPRESSION_LZ4:
+        return lz4_frame.decompress(data)
+    return zlib.decompress(data)
+
+
+class Codec:
+    """
+    Encodes cache values to tagged bytes and decodes them back.
+
+    Example:
+        codec = Codec(compression="zlib", compress_threshold=1024)
+        data = codec.encode({"state": "on"})
+        assert codec.decode(data) == {"state": "on"}
+    """
+
+    def __init__(
+        self,
+        serializer: str = "auto",
+        compression: str = "auto",
+        compress_threshold: int = 4096,
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            serializer: Format for JSON-compatible values: "json" (orjson when
+                        installed), "msgpack", or "auto" (orjson, then msgpack,
+                        then the standard library json module)
+            compression: "zstd", "lz4", "zlib", "none", or "auto" (zstd, then
+                         lz4, then none)
+            compress_threshold: Minimum encoded size in bytes before compressing
+
+        Raises:
+            ValueError: If the serializer or compression is unknown or its
+                        library is not installed
+        """
+        serializer = serializer.lower()
+        if serializer == "auto":
+            self.format = FORMAT_MSGPACK if orjson is None and msgpack is not None else FORMAT_JSON
+        elif serializer == "json":
+            self.format = FORMAT_JSON
+        elif serializer == "msgpack":
+            if msgpack is None:
+                raise ValueError("msgpack serializer selected but msgpack is not installed")
+            self.format = FORMAT_MSGPACK
+        else:
+            raise ValueError(f"Unknown cache serializer '{serializer}'")
+
+        compression = compression.lower()
+        if compression == "auto":
+            self.compression = next(
+                (c for c in (COMPRESSION_ZSTD, COMPRESSION_LZ4) if _compressor_available(c)),
+                COMPRESSION_NONE,
+            )
+        elif compression in ("none", "off", ""):
+            self.compression = COMPRESSION_NONE
+        elif compression in _COMPRESSION_NAMES:
+            self.compression = _COMPRESSION_NAMES[compression]
+            if not _compressor_available(self.compression):
+                raise ValueError(f"{compression} compression selected but it is not installed")
+        else:
+            raise ValueError(f"Unknown cache compression '{compression}'")
+
+        self.compress_threshold = compress_threshold
+
+    def _serialize(self, value: Any) -> tuple[int, bytes]:
+        """
+        Serialize a value without compression.
+
+        Args:
+            value: The value to serialize
+
+        Returns:
+            Tuple of (format tag, serialized bytes)
+        """
+        if isinstance(value, _JSON_TYPES):
+            try:
+                if self.format == FORMAT_MSGPACK:
+                    return FORMAT_MSGPACK, msgpack.packb(value, default=str, use_bin_type=True)
+                if orjson is not None:
+                    return FORMAT_JSON, orjson.dumps(
+                        value, default=str, option=orjson.OPT_NON_STR_KEYS
+                    )
+                return FORMAT_JSON, json.dumps(value, default=str).encode("utf-8")
+            except (TypeError, ValueError, OverflowError):
+                # Not representable in the fast format (e.g. huge ints); use pickle
+                pass
+        return FORMAT_PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def encode(self, value: Any) -> bytes:
+        """
+        Encode a value to tagged bytes.
+
+        Args:
+            value: The value to encode
+
+        Returns:
+            Format tag byte followed by the (possibly compressed) value
+
+        Raises:
+            ValueError: If the value cannot be serialized
+        """
+        try:
+            tag, data = self._serialize(value)
+        except Exception as e:
+            raise ValueError(f"Failed to serialize value: {e}") from e
+
+        if self.compression != COMPRESSION_NONE and len(data) >= self.compress_threshold:
+            compressed = _compress(self.compression, data)
+            if len(compressed) < len(data):
+                tag |= self.compression
+                data = compressed
+        return bytes((tag,)) + data
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Decode tagged bytes back to a value.
+
+        Args:
+            data: Bytes produced by encode() (or an untagged legacy value)
+
+        Returns:
+            The decoded value
+
+        Raises:
+            ValueError: If the data cannot be decoded
+        """
+        if not data:
+            raise ValueError("Failed to deserialize value: empty data")
+        tag = data[0]
+        try:
+            if tag >= _LEGACY_TAG_MIN:
+                return self._decode_legacy(data)
+
+            payload = memoryview(data)[1:]
+            compression = tag & _COMPRESSION_MASK
+            if compression != COMPRESSION_NONE:
+                payload = _decompress(compression, payload)
+
+            value_format = tag & _FORMAT_MASK
+            if value_format == FORMAT_JSON:
+                if orjson is not None:
+                    return orjson.loads(payload)
+                return json.loads(bytes(payload))
+            if value_format == FORMAT_MSGPACK:
+                if msgpack is None:
+                    raise ValueError("Value was encoded with msgpack, which is not installed")
+                return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+            if value_format == FORMAT_PICKLE:
+                # nosec B301 - Cache data is trusted (written by our own backends)
+                return pickle.loads(payload)  # nosec B301
+            raise ValueError(f"Unknown format tag 0x{tag:02x}")
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to deserialize value: {e}") from e
+
+    def _decode_legacy(self, data: bytes) -> Any:
+        """
+        Decode a value written before values were tagged (JSON or pickle).
+
+        Args:
+            data: Untagged serialized bytes
+
+        Returns:
+            The decoded value
+        """
+        try:
+            return json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            # nosec B301 - Cache data is trusted (written by our own backends)
+            return pickle.loads(data)  # nosec B301
+
+
+# Global codec instance
+_codec: Codec | None = None
+
+
+def get_codec() -> Codec:
+    """
+    Get the global codec instance configured from the environment.
+
+    Returns:
+        The global Codec instance
+    """
+    global _codec
+    if _codec is None:
+        try:
+            _codec = Codec(CACHE_SERIALIZER, CACHE_COMPRESSION, CACHE_COMPRESS_THRESHOLD)
+        except ValueError as e:
+            logger.warning(f"Invalid cache codec configuration: {e}. Using defaults.")
+            _codec = Codec()
+    return _codec
@@ -20,7 +20,10 @@ from app.config import (
     CACHE_DEFAULT_TTL,
     CACHE_DIR,
     CACHE_ENABLED,
+    CACHE_L1_MAX_SIZE,
+    CACHE_L1_TTL,
     CACHE_MAX_SIZE,
+    CACHE_NEGATIVE_TTL,
     REDIS_URL,
 )
 
@@ -54,8 +57,11 @@ class CacheConfig:
             "backend": CACHE_BACKEND,
             "default_ttl": CACHE_DEFAULT_TTL,
             "max_size": CACHE_MAX_SIZE,
+            "negative_ttl": CACHE_NEGATIVE_TTL,
             "redis_url": REDIS_URL,
             "cache_dir": CACHE_DIR,
+            "l1_max_size": CACHE_L1_MAX_SIZE,
+            "l1_ttl": CACHE_L1_TTL,
             "endpoints": {},
         }
 
@@ -113,10 +119,16 @@ class CacheConfig:
                     self._config_data["default_ttl"] = int(file_data["default_ttl"])
                 if "max_size" in file_data:
                     self._config_data["max_size"] = int(file_data["max_size"])
+                if "negative_ttl" in file_data:
+                    self._config_data["negative_ttl"] = int(file_data["negative_ttl"])
                 if "redis_url" in file_data:
                     self._config_data["redis_url"] = file_data["redis_url"]
                 if "cache_dir" in file_data:
                     self._config_data["cache_dir"] = file_data["cache_dir"]
+                if "l1_max_size" in file_data:
+                    self._config_data["l1_max_size"] = int(file_data["l1_max_size"])
+                if "l1_ttl" in file_data:
+                    self._config_data["l1_ttl"] = float(file_data["l1_ttl"])
                 if "endpoints" in file_data:
                     self._config_data["endpoints"] = file_data["endpoints"]
 
@@ -153,12 +165,34 @@ class CacheConfig:
             except ValueError:
                 logger.warning("Invalid HASS_MCP_CACHE_MAX_SIZE value, using default")
 
+        if os.environ.get("HASS_MCP_CACHE_NEGATIVE_TTL"):
+            try:
+                self._config_data["negative_ttl"] = int(
+                    os.environ.get("HASS_MCP_CACHE_NEGATIVE_TTL", "30")
+                )
+            except ValueError:
+                logger.warning("Invalid HASS_MCP_CACHE_NEGATIVE_TTL value, using default")
+
         if os.environ.get("HASS_MCP_CACHE_REDIS_URL"):
             self._config_data["redis_url"] = os.environ.get("HASS_MCP_CACHE_REDIS_URL")
 
         if os.environ.get("HASS_MCP_CACHE_DIR"):
             self._config_data["cache_dir"] = os.environ.get("HASS_MCP_CACHE_DIR", ".cache")
 
+        if os.environ.get("HASS_MCP_CACHE_L1_MAX_SIZE"):
+            try:
+                self._config_data["l1_max_size"] = int(
+                    os.environ.get("HASS_MCP_CACHE_L1_MAX_SIZE", "256")
+                )
+            except ValueError:
+                logger.warning("Invalid HASS_MCP_CACHE_L1_MAX_SIZE value, using default")
+
+        if os.environ.get("HASS_MCP_CACHE_L1_TTL"):
+            try:
+                self._config_data["l1_ttl"] = float(os.environ.get("HASS_MCP_CACHE_L1_TTL", "30"))
+            except ValueError:
+                logger.warning("Invalid HASS_MCP_CACHE_L1_TTL value, using default")
+
     def _build_endpoint_ttls(self) -> None:
         """Build endpoint TTL mapping from configuration."""
         endpoints = self._config_data.get("endpoints", {})
@@ -192,6 +226,35 @@ class CacheConfig:
 
         return None
 
+    def get_negative_ttl(self, domain: str, operation: str | None = None) -> int:
+        """
+        Get the TTL of cached not-found outcomes for an endpoint.
+
+        Looks for a "negative_ttl" in the endpoint configuration of
+        domain.operation, then of the domain, then falls back to the global
+        negative TTL.
+
+        Args:
+            domain: The API domain (e.g., 'entities', 'automations')
+            operation: Optional operation name (e.g., 'get_entity_state')
+
+        Returns:
+            TTL in seconds (0 disables negative caching)
+        """
+        endpoints = self._config_data.get("endpoints", {})
+        domain_config = endpoints.get(domain)
+        candidates = []
+        if operation:
+            candidates.append(endpoints.get(f"{domain}.{operation}"))
+            if isinstance(domain_config, dict):
+                candidates.append(domain_config.get(operation))
+        candidates.append(domain_config)
+
+        for config in candidates:
+            if isinstance(config, dict) and "negative_ttl" in config:
+                return int(config["negative_ttl"])
+        return int(self._config_data.get("negative_ttl", CACHE_NEGATIVE_TTL))
+
     def get_default_ttl(self) -> int:
         """Get the default TTL."""
         return int(self._config_data.get("default_ttl", CACHE_DEFAULT_TTL))
@@ -220,7 +283,7 @@ class CacheConfig:
             return str(redis_url)
 
         # Default Redis URL if backend is redis but URL not specified
-        if self.get_backend().lower() == "redis":
+        if self.get_backend().lower() in ("redis", "tiered"):
             return "redis://localhost:6379/0"
 
         return None
@@ -229,6 +292,14 @@ class CacheConfig:
         """Get the cache directory path."""
         return str(self._config_data.get("cache_dir", CACHE_DIR))
 
+    def get_l1_max_size(self) -> int:
+        """Get the maximum number of L1 entries of the tiered backend."""
+        return int(self._config_data.get("l1_max_size", CACHE_L1_MAX_SIZE))
+
+    def get_l1_ttl(self) -> float:
+        """Get the maximum lifetime in seconds of an L1 entry of the tiered backend."""
+        return float(self._config_data.get("l1_ttl", CACHE_L1_TTL))
+
     def update_endpoint_ttl(self, domain: str, ttl: int, operation: str | None = None) -> None:
         """
         Update TTL for an endpoint at runtime.
@@ -272,8 +343,11 @@ class CacheConfig:
             "backend": CACHE_BACKEND,
             "default_ttl": CACHE_DEFAULT_TTL,
             "max_size": CACHE_MAX_SIZE,
+            "negative_ttl": CACHE_NEGATIVE_TTL,
             "redis_url": REDIS_URL,
             "cache_dir": CACHE_DIR,
+            "l1_max_size": CACHE_L1_MAX_SIZE,
+            "l1_ttl": CACHE_L1_TTL,
             "endpoints": {},
         }
         self._endpoint_ttls = {}
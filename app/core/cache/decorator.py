@@ -10,21 +10,34 @@ import hashlib
 import inspect
 import json
 import logging
+import re
 import time
 from collections.abc import Awaitable, Callable
 from typing import Any, TypeVar
 
+import httpx
+
 from app.core.cache.config import get_cache_config
 from app.core.cache.invalidation import InvalidationStrategy
 from app.core.cache.key_builder import CacheKeyBuilder
 from app.core.cache.manager import get_cache_manager
 from app.core.cache.metrics import get_cache_metrics
+from app.core.tracing import span
 
 logger = logging.getLogger(__name__)
 
 # Generic type variable for async functions
 F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
 
+# Key of a cached not-found HTTP error, which is raised again on a cache hit
+NOT_FOUND_ENTRY_KEY = "__hass_mcp_not_found__"
+
+# HTTP statuses cached as not-found outcomes; timeouts and 5xx are never cached
+NOT_FOUND_STATUS_CODES = frozenset({404, 410})
+
+_HTTP_STATUS_RE = re.compile(r"^HTTP error: (\d{3})\b")
+_NOT_FOUND_RE = re.compile(r"\bnot found\b", re.IGNORECASE)
+
 
 def cached(
     ttl: int | Callable[[tuple[Any, ...], dict[str, Any], Any], int] | None = None,
@@ -32,6 +45,8 @@ def cached(
     include_params: list[str] | None = None,
     exclude_params: list[str] | None = None,
     condition: Callable[[tuple[Any, ...], dict[str, Any], Any], bool] | None = None,
+    *,
+    negative_ttl: int | None = None,
 ) -> Callable[[F], F]:
     """
     Decorator to automatically cache function results.
@@ -40,6 +55,12 @@ def cached(
     parameters. It automatically generates cache keys from the function
     name, module path, and normalized parameters.
 
+    Not-found outcomes (HTTP 404/410 errors, or error responses saying
+    "not found") are cached for the shorter negative TTL, so repeated lookups
+    of a missing entity don't reach Home Assistant; a cached HTTP error is
+    raised again on a hit. Other errors (timeouts, connection errors, 5xx)
+    are never cached.
+
     Args:
         ttl: Time-To-Live in seconds (uses default if None)
         key_prefix: Custom key prefix (defaults to function module path)
@@ -47,6 +68,8 @@ def cached(
         exclude_params: List of parameter names to exclude from cache key
         condition: Function to determine if result should be cached.
                    Receives (args, kwargs, result) and returns bool.
+        negative_ttl: TTL in seconds of not-found outcomes (uses the endpoint's
+                      or global negative TTL if None; 0 disables)
 
     Returns:
         Decorator function
@@ -67,8 +90,7 @@ def cached(
     """
 
     def decorator(func: F) -> F:
-        @functools.wraps(func)
-        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        async def cached_call(*args: Any, **kwargs: Any) -> Any:
             # Get cache manager and metrics
             cache = await get_cache_manager()
             metrics = get_cache_metrics()
@@ -91,16 +113,22 @@ def cached(
             endpoint = f"{domain}:{operation}"
 
             # Try to get from cache
+            cached_value = None
             try:
-                cached_value = await cache.get(cache_key, endpoint=endpoint)
-                if cached_value is not None:
-                    logger.debug(
-                        f"Cache hit for {func.__name__}: {cache_key}",
-                        extra={"cache_key": cache_key, "endpoint": endpoint},
-                    )
-                    return cached_value
+                with span("cache.get", endpoint=endpoint) as lookup:
+                    cached_value = await cache.get(cache_key, endpoint=endpoint)
+                    if lookup is not None:
+                        lookup.set_attribute("hit", cached_value is not None)
             except Exception as e:
                 logger.warning(f"Cache get error for {func.__name__}: {e}", exc_info=True)
+            if cached_value is not None:
+                logger.debug(
+                    f"Cache hit for {func.__name__}: {cache_key}",
+                    extra={"cache_key": cache_key, "endpoint": endpoint},
+                )
+                if isinstance(cached_value, dict) and NOT_FOUND_ENTRY_KEY in cached_value:
+                    _raise_not_found(cached_value[NOT_FOUND_ENTRY_KEY])
+                return cached_value
 
             # Cache miss - call the function
             logger.debug(
@@ -123,6 +151,19 @@ def cached(
                     if isinstance(result[0], dict) and "error" in result[0]:
                         is_error_response = True
 
+                # Not-found responses are cached for the negative TTL, before any condition
+                if is_error_response and _is_not_found_response(result):
+                    await _cache_not_found(
+                        cache,
+                        cache_key,
+                        result,
+                        negative_ttl=negative_ttl,
+                        domain=domain,
+                        operation=operation,
+                        endpoint=endpoint,
+                    )
+                    return result
+
                 # Check condition if provided
                 if condition is not None:
                     try:
@@ -173,7 +214,8 @@ def cached(
 
                 # Store in cache
                 try:
-                    await cache.set(cache_key, result, ttl=cache_ttl, endpoint=endpoint)
+                    with span("cache.set", endpoint=endpoint):
+                        await cache.set(cache_key, result, ttl=cache_ttl, endpoint=endpoint)
                     logger.debug(
                         f"Cached result for {func.__name__}: {cache_key} (ttl={cache_ttl})",
                         extra={"cache_key": cache_key, "endpoint": endpoint, "ttl": cache_ttl},
@@ -184,10 +226,36 @@ def cached(
 
                 return result
             except Exception as e:
-                # If function fails, don't try to cache
-                logger.error(f"Function {func.__name__} failed: {e}", exc_info=True)
+                # Only not-found errors are cached; anything else may be transient
+                entry = _not_found_entry(e)
+                if entry is not None:
+                    logger.debug(f"Function {func.__name__} returned not found: {e}")
+                    await _cache_not_found(
+                        cache,
+                        cache_key,
+                        entry,
+                        negative_ttl=negative_ttl,
+                        domain=domain,
+                        operation=operation,
+                        endpoint=endpoint,
+                    )
+                else:
+                    logger.error(f"Function {func.__name__} failed: {e}", exc_info=True)
                 raise
 
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # End-to-end latency, whether served from the cache or the API
+            start_time = time.time()
+            try:
+                return await cached_call(*args, **kwargs)
+            finally:
+                module_path = func.__module__ or "unknown"
+                domain = module_path.split(".")[-1] if "." in module_path else module_path
+                get_cache_metrics().record_request(
+                    f"{domain}:{func.__name__}", (time.time() - start_time) * 1000
+                )
+
         return wrapper  # type: ignore[return-value]
 
     return decorator
@@ -377,6 +445,112 @@ def invalidate_cache(
     return decorator
 
 
+def _not_found_entry(exc: BaseException) -> dict[str, Any] | None:
+    """
+    Describe a not-found HTTP error so it can be cached and raised again.
+
+    Args:
+        exc: Exception raised by the cached function
+
+    Returns:
+        Cache entry for the error, or None if it is not a not-found error
+    """
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    if exc.response.status_code not in NOT_FOUND_STATUS_CODES:
+        return None
+    try:
+        body = exc.response.text
+        request = exc.request
+    except Exception:
+        # Unread streamed body or missing request; not worth caching
+        return None
+    if not isinstance(body, str):
+        return None
+    return {
+        NOT_FOUND_ENTRY_KEY: {
+            "status_code": exc.response.status_code,
+            "method": request.method,
+            "url": str(request.url),
+            "body": body[:500],
+            "message": str(exc),
+        }
+    }
+
+
+def _raise_not_found(entry: dict[str, Any]) -> None:
+    """
+    Raise a cached not-found HTTP error again.
+
+    Args:
+        entry: Error description from _not_found_entry()
+
+    Raises:
+        httpx.HTTPStatusError: Equivalent to the original error
+    """
+    request = httpx.Request(entry["method"], entry["url"])
+    response = httpx.Response(
+        entry["status_code"], request=request, content=entry["body"].encode("utf-8")
+    )
+    raise httpx.HTTPStatusError(entry["message"], request=request, response=response)
+
+
+def _is_not_found_response(result: Any) -> bool:
+    """
+    Check whether an error response reports a missing resource.
+
+    Args:
+        result: Error response ({"error": ...} or [{"error": ...}])
+
+    Returns:
+        True for 404/410 HTTP errors and "not found" messages
+    """
+    error = result[0] if isinstance(result, list) else result
+    message = str(error.get("error", ""))
+    status = _HTTP_STATUS_RE.match(message)
+    if status:
+        return int(status.group(1)) in NOT_FOUND_STATUS_CODES
+    if message.startswith(("Timeout error", "Connection error", "Error connecting")):
+        return False
+    return bool(_NOT_FOUND_RE.search(message))
+
+
+async def _cache_not_found(
+    cache: Any,
+    cache_key: str,
+    value: Any,
+    *,
+    negative_ttl: int | None,
+    domain: str,
+    operation: str,
+    endpoint: str,
+) -> None:
+    """
+    Cache a not-found outcome for the negative TTL.
+
+    Args:
+        cache: Cache manager
+        cache_key: Cache key of the call
+        value: Error response or not-found entry to cache
+        negative_ttl: Explicit negative TTL of the decorator, if any
+        domain: API domain of the cached function
+        operation: Name of the cached function
+        endpoint: Endpoint identifier for metrics tracking
+    """
+    if negative_ttl is None:
+        negative_ttl = get_cache_config().get_negative_ttl(domain, operation)
+    if negative_ttl <= 0:
+        return
+    try:
+        await cache.set(cache_key, value, ttl=negative_ttl, endpoint=endpoint)
+        logger.debug(
+            f"Cached not-found outcome for {operation}: {cache_key} (ttl={negative_ttl})",
+            extra={"cache_key": cache_key, "endpoint": endpoint, "ttl": negative_ttl},
+        )
+    except Exception as e:
+        logger.warning(f"Cache set error for {operation}: {e}", exc_info=True)
+
+
 def _build_cache_key(
     func: Callable[..., Any],
     args: tuple[Any, ...],
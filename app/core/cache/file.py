@@ -7,10 +7,12 @@ dependencies like Redis.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
-import pickle  # nosec B403 - Used for serializing complex types in trusted cache
+import os
+import tempfile
 import time
 from contextlib import suppress
 from pathlib import Path
@@ -24,9 +26,19 @@ except ImportError:
     aiofiles_os = None  # type: ignore[assignment]
 
 from app.core.cache.backend import CacheBackend
+from app.core.cache.codec import Codec, get_codec
 
 logger = logging.getLogger(__name__)
 
+# Suffix of cache entry files (metadata header line followed by the value)
+ENTRY_SUFFIX = ".cache"
+
+# Suffix of temporary files written before being renamed into place
+TMP_SUFFIX = ".tmp"
+
+# Seconds after which a leftover temporary file is considered abandoned
+STALE_TMP_AGE = 60
+
 
 class FileCacheBackend(CacheBackend):
     """
@@ -34,14 +46,19 @@ class FileCacheBackend(CacheBackend):
 
     This backend stores cache entries as files on disk with TTL support.
     It uses a directory structure for organization and async file I/O for performance.
+    Each entry is a single file holding a JSON metadata header line followed by the
+    serialized value. Writes go to a temporary file that is renamed into place, so
+    concurrent readers never see a partial entry and a crash cannot separate a value
+    from its expiry.
     """
 
-    def __init__(self, cache_dir: str = ".cache"):
+    def __init__(self, cache_dir: str = ".cache", codec: Codec | None = None):
         """
         Initialize the file cache backend.
 
         Args:
             cache_dir: Directory path for cache files (default: ".cache")
+            codec: Value codec (default: the global codec from get_codec())
 
         Raises:
             ImportError: If aiofiles package is not installed
@@ -54,6 +71,7 @@ class FileCacheBackend(CacheBackend):
             )
 
         self.cache_dir = Path(cache_dir)
+        self._codec = codec or get_codec()
         self._lock = None  # Will be initialized in async context
 
         # Create cache directory if it doesn't exist
@@ -95,68 +113,107 @@ class FileCacheBackend(CacheBackend):
         # Create directory structure: cache_dir/prefix/
         key_hash = self._get_key_hash(key)
         dir_path = self.cache_dir / prefix
-        return dir_path / f"{key_hash}.json"
+        return dir_path / f"{key_hash}{ENTRY_SUFFIX}"
 
-    def _get_metadata_path(self, key: str) -> Path:
+    def _parse_entry(self, data: bytes) -> tuple[dict[str, Any], bytes]:
         """
-        Get the metadata file path for a cache key.
+        Split a cache file into its metadata header and payload.
 
         Args:
-            key: The cache key
+            data: Cache file contents
 
         Returns:
-            Path to the metadata file
+            Tuple of (metadata, serialized value)
+
+        Raises:
+            ValueError: If the header is missing or the payload is truncated
         """
-        file_path = self._get_file_path(key)
-        # Replace .json with .meta.json
-        return file_path.parent / f"{file_path.stem}.meta.json"
+        header, separator, payload = data.partition(b"\n")
+        if not separator:
+            raise ValueError("Missing cache entry header")
+        metadata = json.loads(header)
+        if metadata.get("size") != len(payload):
+            raise ValueError("Truncated cache entry")
+        return metadata, payload
+
+    def _read_header(self, file_path: Path) -> dict[str, Any] | None:
+        """
+        Read the metadata header of a cache file.
 
-    async def _ensure_directory(self, file_path: Path) -> None:
+        Args:
+            file_path: Path to the cache file
+
+        Returns:
+            Metadata dictionary, or None if the file is missing or unreadable
         """
-        Ensure the directory for a file path exists.
+        try:
+            with open(file_path, "rb") as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+    def _write_file(self, file_path: Path, data: bytes) -> None:
+        """
+        Atomically write a cache file.
+
+        The data is written to a temporary file in the same directory and
+        renamed over the target, so readers see either the old or the new
+        entry, never a partial one.
 
         Args:
-            file_path: The file path
+            file_path: Path to the cache file
+            data: Cache file contents (header and payload)
         """
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=".", suffix=TMP_SUFFIX)
         try:
-            await aiofiles.os.makedirs(file_path.parent, exist_ok=True)
-        except Exception as e:
-            logger.warning(f"Failed to create directory {file_path.parent}: {e}", exc_info=True)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, file_path)
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+    def _remove_file(self, file_path: Path) -> None:
+        """
+        Remove a cache file if it exists.
+
+        Args:
+            file_path: Path to the cache file
+        """
+        with suppress(FileNotFoundError):
+            os.unlink(file_path)
+
+    def _entry_files(self) -> list[Path]:
+        """
+        List all cache files.
+
+        Returns:
+            Paths of all cache entry files
+        """
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob(f"*/*{ENTRY_SUFFIX}"))
 
     def _serialize(self, value: Any) -> bytes:
         """
-        Serialize a value for storage.
+        Serialize a value for storage on disk.
 
         Args:
             value: The value to serialize
 
         Returns:
-            Serialized bytes
+            Tagged bytes (see app.core.cache.codec)
 
         Raises:
             ValueError: If serialization fails
         """
-        try:
-            # Try JSON for simple types (dict, list, str, int, float, bool, None)
-            if isinstance(value, (dict, list, str, int, float, bool, type(None))):
-                json_str = json.dumps(value, default=str)
-                return json_str.encode("utf-8")
-            # Use pickle for complex types
-            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
-        except (TypeError, ValueError) as e:
-            # If JSON fails, try pickle
-            try:
-                return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
-            except Exception as pickle_error:
-                logger.error(
-                    f"Failed to serialize value: {e} (pickle also failed: {pickle_error})",
-                    exc_info=True,
-                )
-                raise ValueError(f"Failed to serialize value: {e}") from pickle_error
+        return self._codec.encode(value)
 
     def _deserialize(self, data: bytes) -> Any:
         """
-        Deserialize a value from storage.
+        Deserialize a value read from disk.
 
         Args:
             data: Serialized bytes
@@ -167,18 +224,62 @@ class FileCacheBackend(CacheBackend):
         Raises:
             ValueError: If deserialization fails
         """
+        return self._codec.decode(data)
+
+    def _matches(self, key: str, pattern: str | None) -> bool:
+        """
+        Check whether a cache key matches a pattern.
+
+        Args:
+            key: The cache key
+            pattern: Optional pattern (supports wildcards like '*')
+
+        Returns:
+            True if the key matches (or no pattern is given)
+        """
+        if not pattern:
+            return True
+        if "*" not in pattern:
+            return key == pattern
+        pattern_parts = pattern.split("*")
+        if len(pattern_parts) != 2:
+            # More complex pattern, use simple substring match
+            return pattern.replace("*", "") in key
+        if pattern.startswith("*"):
+            return key.endswith(pattern_parts[1])
+        if pattern.endswith("*"):
+            return key.startswith(pattern_parts[0])
+        return False
+
+    def _read_entry(self, key: str) -> Any | None:
+        """
+        Read a cache entry with a single open/read and no stat calls.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or None if missing, expired or unreadable
+        """
+        file_path = self._get_file_path(key)
         try:
-            # Try JSON first (faster for simple types)
-            try:
-                json_str = data.decode("utf-8")
-                return json.loads(json_str)
-            except (UnicodeDecodeError, json.JSONDecodeError):
-                # If JSON fails, try pickle
-                # nosec B301 - Cache data is trusted (from our own cache directory)
-                return pickle.loads(data)  # nosec B301
-        except Exception as e:
-            logger.error(f"Failed to deserialize value: {e}", exc_info=True)
-            raise ValueError(f"Failed to deserialize value: {e}") from e
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            metadata, payload = self._parse_entry(data)
+        except ValueError:
+            # Left by an interrupted write; treat as a miss
+            self._remove_file(file_path)
+            return None
+
+        expires_at = metadata.get("expires_at")
+        if expires_at is not None and time.time() > expires_at:
+            self._remove_file(file_path)
+            return None
+        return self._deserialize(payload)
 
     async def get(self, key: str) -> Any | None:
         """
@@ -191,36 +292,7 @@ class FileCacheBackend(CacheBackend):
             The cached value if found and not expired, None otherwise
         """
         try:
-            file_path = self._get_file_path(key)
-
-            # Check if file exists
-            if not await aiofiles.os.path.exists(file_path):
-                return None
-
-            # Read cache file
-            async with aiofiles.open(file_path, "rb") as f:
-                data = await f.read()
-
-            if not data:
-                return None
-
-            # Check metadata for expiration
-            metadata_path = self._get_metadata_path(key)
-            if await aiofiles.os.path.exists(metadata_path):
-                async with aiofiles.open(metadata_path, "r") as f:
-                    metadata_str = await f.read()
-                    metadata = json.loads(metadata_str)
-
-                    # Check expiration
-                    expires_at = metadata.get("expires_at")
-                    if expires_at is not None:
-                        if time.time() > expires_at:
-                            # Expired, delete files
-                            await self.delete(key)
-                            return None
-
-            # Deserialize and return value
-            return self._deserialize(data)
+            return await asyncio.to_thread(self._read_entry, key)
         except Exception as e:
             logger.warning(f"File cache get error for key '{key}': {e}", exc_info=True)
             return None
@@ -229,35 +301,26 @@ class FileCacheBackend(CacheBackend):
         """
         Store a value in the cache.
 
+        The value and its metadata (original key for pattern matching, expiry)
+        are written to one file, atomically replacing any previous entry.
+
         Args:
             key: The cache key
             value: The value to cache
             ttl: Optional Time-To-Live in seconds. If None, entry doesn't expire
         """
         try:
-            file_path = self._get_file_path(key)
-            metadata_path = self._get_metadata_path(key)
-
-            # Ensure directory exists
-            await self._ensure_directory(file_path)
-
-            # Serialize value
-            data = self._serialize(value)
-
-            # Write cache file
-            async with aiofiles.open(file_path, "wb") as f:
-                await f.write(data)
-
-            # Write metadata (store original key for pattern matching)
+            payload = self._serialize(value)
+            now = time.time()
             metadata = {
-                "key": key,  # Store original key for pattern matching
-                "created_at": time.time(),
-                "expires_at": time.time() + ttl if ttl and ttl > 0 else None,
+                "key": key,
+                "created_at": now,
+                "expires_at": now + ttl if ttl and ttl > 0 else None,
                 "ttl": ttl,
+                "size": len(payload),
             }
-            async with aiofiles.open(metadata_path, "w") as f:
-                await f.write(json.dumps(metadata))
-
+            data = json.dumps(metadata).encode("utf-8") + b"\n" + payload
+            await asyncio.to_thread(self._write_file, self._get_file_path(key), data)
         except Exception as e:
             logger.warning(f"File cache set error for key '{key}': {e}", exc_info=True)
 
@@ -269,21 +332,9 @@ class FileCacheBackend(CacheBackend):
             key: The cache key to delete
         """
         try:
-            file_path = self._get_file_path(key)
-            metadata_path = self._get_metadata_path(key)
-
-            # Delete cache file
-            if await aiofiles.os.path.exists(file_path):
-                await aiofiles.os.remove(file_path)
-
-            # Delete metadata file
-            if await aiofiles.os.path.exists(metadata_path):
-                await aiofiles.os.remove(metadata_path)
-
-            # Try to remove empty directory
-            with suppress(Exception):
-                if file_path.parent.exists() and not any(file_path.parent.iterdir()):
-                    await aiofiles.os.rmdir(file_path.parent)
+            await aiofiles.os.remove(self._get_file_path(key))
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"File cache delete error for key '{key}': {e}", exc_info=True)
 
@@ -323,30 +374,42 @@ class FileCacheBackend(CacheBackend):
             True if the key exists and is not expired, False otherwise
         """
         try:
-            file_path = self._get_file_path(key)
-
-            if not await aiofiles.os.path.exists(file_path):
+            metadata = await asyncio.to_thread(self._read_header, self._get_file_path(key))
+            if metadata is None:
+                return False
+            expires_at = metadata.get("expires_at")
+            if expires_at is not None and time.time() > expires_at:
+                await self.delete(key)
                 return False
-
-            # Check expiration
-            metadata_path = self._get_metadata_path(key)
-            if await aiofiles.os.path.exists(metadata_path):
-                async with aiofiles.open(metadata_path, "r") as f:
-                    metadata_str = await f.read()
-                    metadata = json.loads(metadata_str)
-
-                    expires_at = metadata.get("expires_at")
-                    if expires_at is not None:
-                        if time.time() > expires_at:
-                            # Expired, delete files
-                            await self.delete(key)
-                            return False
-
             return True
         except Exception as e:
             logger.warning(f"File cache exists error for key '{key}': {e}", exc_info=True)
             return False
 
+    def _scan_keys(self, pattern: str | None) -> list[str]:
+        """
+        Read the header of every cache file and collect matching live keys.
+
+        Args:
+            pattern: Optional pattern to match keys
+
+        Returns:
+            List of matching, non-expired cache keys
+        """
+        keys: list[str] = []
+        now = time.time()
+        for file_path in self._entry_files():
+            metadata = self._read_header(file_path)
+            if metadata is None:
+                continue
+            expires_at = metadata.get("expires_at")
+            if expires_at is not None and now > expires_at:
+                continue
+            original_key = metadata.get("key")
+            if original_key is not None and self._matches(original_key, pattern):
+                keys.append(original_key)
+        return keys
+
     async def keys(self, pattern: str | None = None) -> list[str]:
         """
         Get all cache keys, optionally filtered by pattern.
@@ -358,80 +421,7 @@ class FileCacheBackend(CacheBackend):
             List of matching cache keys
         """
         try:
-            keys: list[str] = []
-
-            if not self.cache_dir.exists():
-                return []
-
-            # Walk through cache directory
-            for prefix_dir in self.cache_dir.iterdir():
-                if not prefix_dir.is_dir():
-                    continue
-
-                # Scan files in prefix directory
-                for file_path in prefix_dir.glob("*.json"):
-                    # Skip metadata files
-                    if file_path.name.endswith(".meta.json"):
-                        continue
-
-                    # Read metadata to get original key
-                    metadata_path = file_path.with_suffix(".meta.json")
-                    original_key = None
-                    if metadata_path.exists():
-                        try:
-                            async with aiofiles.open(metadata_path, "r") as f:
-                                metadata_str = await f.read()
-                                metadata = json.loads(metadata_str)
-
-                                # Get original key from metadata
-                                original_key = metadata.get("key")
-
-                                # Check expiration
-                                expires_at = metadata.get("expires_at")
-                                if expires_at is not None and time.time() > expires_at:
-                                    # Expired, skip
-                                    continue
-                        except Exception as e:  # noqa: B112 - Intentional continue on error
-                            # If metadata read fails, skip this file
-                            logger.debug(f"Error reading metadata for {file_path}: {e}")
-                            continue
-
-                    # If no original key found, skip this file
-                    if original_key is None:
-                        continue
-
-                    # Match pattern if provided
-                    if pattern:
-                        if "*" in pattern:
-                            # Simple wildcard matching
-                            pattern_parts = pattern.split("*")
-                            if len(pattern_parts) == 2:
-                                # Pattern like "prefix*" or "*suffix" or "*middle*"
-                                if pattern.startswith("*") and pattern.endswith("*"):
-                                    # *middle*
-                                    middle = pattern_parts[1]
-                                    if middle in original_key:
-                                        keys.append(original_key)
-                                elif pattern.startswith("*"):
-                                    # *suffix
-                                    suffix = pattern_parts[1]
-                                    if original_key.endswith(suffix):
-                                        keys.append(original_key)
-                                elif pattern.endswith("*"):
-                                    # prefix*
-                                    prefix = pattern_parts[0]
-                                    if original_key.startswith(prefix):
-                                        keys.append(original_key)
-                            # More complex pattern, use simple substring match
-                            elif pattern.replace("*", "") in original_key:
-                                keys.append(original_key)
-                        # Exact match
-                        elif original_key == pattern:
-                            keys.append(original_key)
-                    else:
-                        keys.append(original_key)
-
-            return keys
+            return await asyncio.to_thread(self._scan_keys, pattern)
         except Exception as e:
             logger.warning(f"File cache keys error for pattern '{pattern}': {e}", exc_info=True)
             return []
@@ -462,6 +452,32 @@ class FileCacheBackend(CacheBackend):
             logger.warning(f"File cache size error: {e}", exc_info=True)
             return -1
 
+    def _remove_expired(self) -> int:
+        """
+        Remove expired entries, abandoned temporary files and legacy-layout files.
+
+        Returns:
+            Number of expired entries removed
+        """
+        removed = 0
+        now = time.time()
+        for file_path in self._entry_files():
+            metadata = self._read_header(file_path)
+            expires_at = metadata.get("expires_at") if metadata else None
+            if expires_at is not None and now > expires_at:
+                self._remove_file(file_path)
+                removed += 1
+
+        # Temporary files left by interrupted writes, and .json/.meta.json
+        # pairs written before metadata moved into the entry file
+        for file_path in self.cache_dir.glob(f"*/.*{TMP_SUFFIX}"):
+            with suppress(OSError):
+                if now - file_path.stat().st_mtime > STALE_TMP_AGE:
+                    self._remove_file(file_path)
+        for file_path in self.cache_dir.glob("*/*.json"):
+            self._remove_file(file_path)
+        return removed
+
     async def cleanup_expired(self) -> int:
         """
         Remove all expired entries from the cache.
@@ -470,40 +486,9 @@ class FileCacheBackend(CacheBackend):
             Number of expired entries removed
         """
         try:
-            removed = 0
-
             if not self.cache_dir.exists():
                 return 0
-
-            # Walk through cache directory
-            for prefix_dir in self.cache_dir.iterdir():
-                if not prefix_dir.is_dir():
-                    continue
-
-                # Scan files in prefix directory
-                for file_path in prefix_dir.glob("*.json"):
-                    # Skip metadata files
-                    if file_path.name.endswith(".meta.json"):
-                        continue
-
-                    # Check expiration from metadata
-                    metadata_path = file_path.with_suffix(".meta.json")
-                    if metadata_path.exists():
-                        try:
-                            async with aiofiles.open(metadata_path, "r") as f:
-                                metadata_str = await f.read()
-                                metadata = json.loads(metadata_str)
-                                expires_at = metadata.get("expires_at")
-
-                                if expires_at is not None and time.time() > expires_at:
-                                    # Expired, delete files
-                                    original_key = metadata.get("key")
-                                    if original_key:
-                                        await self.delete(original_key)
-                                        removed += 1
-                        except Exception as e:
-                            logger.debug(f"Error checking expiration for {file_path}: {e}")
-
+            removed = await asyncio.to_thread(self._remove_expired)
             if removed > 0:
                 logger.info(f"Cleaned up {removed} expired cache entries")
             return removed
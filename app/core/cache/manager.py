@@ -87,6 +87,8 @@ class CacheManager:
                         exc_info=True,
                     )
                     self._backend = MemoryCacheBackend(max_size=max_size)
+            elif backend_type == "tiered":
+                self._backend = self._create_tiered_backend(max_size)
             elif backend_type == "file":
                 try:
                     # Import is done here to avoid circular imports and allow optional dependency
@@ -108,6 +110,8 @@ class CacheManager:
                         exc_info=True,
                     )
                     self._backend = MemoryCacheBackend(max_size=max_size)
+            elif backend_type == "sqlite":
+                self._backend = self._create_sqlite_backend(max_size)
             else:
                 logger.warning(
                     f"Unknown cache backend '{backend_type}', falling back to memory backend"
@@ -116,6 +120,69 @@ class CacheManager:
 
         return self._backend
 
+    def _create_sqlite_backend(self, max_size: int) -> CacheBackend:
+        """
+        Create a SQLite backend in the configured cache directory.
+
+        Args:
+            max_size: Maximum size of the memory backend used as fallback
+
+        Returns:
+            The SQLite backend, or a memory backend if the database can't be opened
+        """
+        try:
+            from app.core.cache.sqlite import SQLiteCacheBackend  # noqa: PLC0415
+
+            cache_dir = self._config.get_cache_dir()
+            backend = SQLiteCacheBackend(cache_dir=cache_dir)
+            logger.info(f"Initialized SQLite cache backend (cache_dir={cache_dir})")
+            return backend
+        except Exception as e:
+            logger.warning(
+                f"Failed to initialize SQLite backend: {e}. Falling back to memory backend.",
+                exc_info=True,
+            )
+        return MemoryCacheBackend(max_size=max_size)
+
+    def _create_tiered_backend(self, max_size: int) -> CacheBackend:
+        """
+        Create an in-process L1 cache in front of Redis.
+
+        Args:
+            max_size: Maximum size of the memory backend used as fallback
+
+        Returns:
+            The tiered backend, or a memory backend if Redis is unavailable
+        """
+        try:
+            # Import is done here to avoid circular imports and allow optional dependency
+            from app.core.cache.redis import RedisCacheBackend  # noqa: PLC0415
+            from app.core.cache.tiered import TieredCacheBackend  # noqa: PLC0415
+
+            redis_url = self._config.get_redis_url() or "redis://localhost:6379/0"
+            l1_max_size = self._config.get_l1_max_size()
+            l1_ttl = self._config.get_l1_ttl()
+            backend = TieredCacheBackend(
+                RedisCacheBackend(url=redis_url), l1_max_size=l1_max_size, l1_ttl=l1_ttl
+            )
+            logger.info(
+                f"Initialized tiered cache backend (url={redis_url}, "
+                f"l1_max_size={l1_max_size}, l1_ttl={l1_ttl}s)"
+            )
+            return backend
+        except ImportError as e:
+            logger.warning(
+                f"Redis package not installed: {e}. "
+                "Install it with: pip install redis or uv pip install redis. "
+                "Falling back to memory backend."
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to initialize tiered backend: {e}. Falling back to memory backend.",
+                exc_info=True,
+            )
+        return MemoryCacheBackend(max_size=max_size)
+
     async def get(self, key: str, default: Any = None, endpoint: str | None = None) -> Any:
         """
         Retrieve a value from the cache.
@@ -148,7 +215,7 @@ class CacheManager:
                 return value
             self._misses += 1
             if endpoint:
-                self._metrics.record_miss(endpoint)
+                self._metrics.record_miss(endpoint, cache_time_ms)
             logger.debug(f"Cache miss: {key}", extra={"cache_key": key, "endpoint": endpoint})
             return default
         except Exception as e:
@@ -156,7 +223,7 @@ class CacheManager:
             logger.warning(f"Cache get error for key '{key}': {e}", exc_info=True)
             self._misses += 1
             if endpoint:
-                self._metrics.record_miss(endpoint)
+                self._metrics.record_miss(endpoint, (time.time() - start_time) * 1000)
             return default
 
     async def set(
@@ -261,14 +328,11 @@ class CacheManager:
             total_invalidated = 0
 
             for invalidation_pattern in patterns_to_invalidate:
-                matching_keys = await backend.keys(invalidation_pattern)
-                if matching_keys:
-                    # Delete all matching keys
-                    for key in matching_keys:
-                        if key not in all_invalidated_keys:
-                            await backend.delete(key)
-                            all_invalidated_keys.append(key)
-                            total_invalidated += 1
+                # Backends delete matching keys in batches (Redis: tag sets, no SCAN)
+                for key in await backend.delete_pattern(invalidation_pattern):
+                    if key not in all_invalidated_keys:
+                        all_invalidated_keys.append(key)
+                        total_invalidated += 1
 
             if total_invalidated > 0:
                 self._metrics.record_invalidation(pattern)
@@ -401,6 +465,12 @@ class CacheManager:
         # Add backend-specific stats if available
         if self._backend and hasattr(self._backend, "size"):
             stats["size"] = self._backend.size()
+        if self._backend and hasattr(self._backend, "evictions"):
+            stats["evictions"] = self._backend.evictions
+
+        # Tiered backends report L1 and L2 hit rates separately
+        if self._backend and hasattr(self._backend, "get_tier_statistics"):
+            stats["tiers"] = self._backend.get_tier_statistics()
 
         # Add detailed metrics
         metrics_stats = self._metrics.get_statistics()
@@ -57,6 +57,8 @@ class MemoryCacheBackend(CacheBackend):
         self._cache: dict[str, CacheEntry] = {}
         self._lock = asyncio.Lock()
         self.max_size = max_size
+        # Entries dropped to stay within max_size
+        self.evictions = 0
 
     async def get(self, key: str) -> Any | None:
         """
@@ -106,6 +108,7 @@ class MemoryCacheBackend(CacheBackend):
                 if self._cache:
                     oldest_key = next(iter(self._cache))
                     del self._cache[oldest_key]
+                    self.evictions += 1
                     logger.debug(f"Evicted cache entry: {oldest_key}")
 
             # Store the entry
@@ -218,3 +221,45 @@ class MemoryCacheBackend(CacheBackend):
             for key in expired_keys:
                 del self._cache[key]
             return len(expired_keys)
+
+    def export_entries(self) -> list[tuple[str, Any, float | None]]:
+        """
+        Get all live entries, oldest first, for a snapshot.
+
+        Runs without awaiting, so the entries are consistent without taking
+        the lock (and it can be called while the event loop shuts down).
+
+        Returns:
+            List of (key, value, expires_at) tuples, expires_at in Unix time
+        """
+        return [
+            (key, entry.value, entry.expires_at)
+            for key, entry in list(self._cache.items())
+            if not entry.is_expired()
+        ]
+
+    async def import_entries(self, entries: list[tuple[str, Any, float | None]]) -> int:
+        """
+        Load snapshot entries, keeping their original expiry times.
+
+        Expired entries and keys already in the cache are skipped. If the
+        entries don't fit, the newest ones (last in the list) are kept.
+
+        Args:
+            entries: List of (key, value, expires_at) tuples from export_entries()
+
+        Returns:
+            Number of entries loaded
+        """
+        async with self._lock:
+            now = time.time()
+            fresh = [
+                (key, value, expires_at)
+                for key, value, expires_at in entries
+                if (expires_at is None or expires_at > now) and key not in self._cache
+            ]
+            free = max(0, self.max_size - len(self._cache))
+            loaded = fresh[-free:] if free else []
+            for key, value, expires_at in loaded:
+                self._cache[key] = CacheEntry(value, expires_at)
+            return len(loaded)
@@ -1,18 +1,191 @@
 """Cache metrics for hass-mcp.
 
 This module provides cache metrics collection and per-endpoint statistics tracking.
+Latencies are recorded in fixed-bucket histograms, so p50/p95/p99 can be reported
+with constant memory per endpoint, and recent throughput is tracked over a
+sliding window of per-second counters.
 """
 
 from __future__ import annotations
 
+import bisect
+import copy
+import math
 import time
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from threading import Lock
 from typing import Any
 
 logger = None  # Will be set when logging is imported
 
+# Upper bounds (ms) of the latency histogram buckets; a final bucket catches the rest
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+)
+
+# Percentiles reported for each histogram
+REPORTED_PERCENTILES = (50, 95, 99)
+
+# Length of the sliding window used for request rates, in seconds
+RATE_WINDOW_SECONDS = 60
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Memory is constant regardless of how many values are recorded. Percentiles
+    are interpolated within the bucket they fall in, so they are estimates
+    whose error is bounded by the bucket width.
+    """
+
+    __slots__ = ("count", "counts", "max", "min", "sum")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value_ms: float) -> None:
+        """
+        Add a latency.
+
+        Args:
+            value_ms: The latency in milliseconds
+        """
+        value_ms = max(value_ms, 0.0)
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, p: float) -> float:
+        """
+        Estimate a percentile.
+
+        Args:
+            p: Percentile between 0 and 100
+
+        Returns:
+            The estimated latency in milliseconds (0.0 if nothing was recorded)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = p / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count == 0:
+                continue
+            if cumulative + bucket_count >= rank:
+                lower = LATENCY_BUCKETS_MS[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max
+                # Observed extremes are tighter bounds than the bucket edges
+                lower = max(lower, self.min)
+                upper = min(upper, self.max)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * fraction
+            cumulative += bucket_count
+        return self.max
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """
+        Add another histogram's values to this one.
+
+        Args:
+            other: The histogram to merge in
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts, strict=True)]
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        result: dict[str, Any] = {"count": self.count}
+        for p in REPORTED_PERCENTILES:
+            result[f"p{p}_ms"] = round(self.percentile(p), 2)
+        result["max_ms"] = round(self.max, 2)
+        return result
+
+
+class SlidingWindowCounter:
+    """
+    Event counter over a sliding window of one-second slots.
+
+    Memory is one slot per second of the window.
+    """
+
+    __slots__ = ("_counts", "_seconds", "window_seconds")
+
+    def __init__(self, window_seconds: int = RATE_WINDOW_SECONDS) -> None:
+        """
+        Initialize an empty counter.
+
+        Args:
+            window_seconds: Length of the window in seconds
+        """
+        self.window_seconds = window_seconds
+        self._counts = [0] * window_seconds
+        self._seconds = [-1] * window_seconds
+
+    def add(self, now: float | None = None) -> None:
+        """
+        Count an event.
+
+        Args:
+            now: Monotonic time of the event (default: now)
+        """
+        second = int(time.monotonic() if now is None else now)
+        slot = second % self.window_seconds
+        if self._seconds[slot] != second:
+            self._seconds[slot] = second
+            self._counts[slot] = 0
+        self._counts[slot] += 1
+
+    def total(self, now: float | None = None) -> int:
+        """
+        Count the events in the window.
+
+        Args:
+            now: Monotonic time the window ends at (default: now)
+
+        Returns:
+            Number of events in the last window_seconds seconds
+        """
+        second = int(time.monotonic() if now is None else now)
+        return sum(
+            count
+            for count, slot_second in zip(self._counts, self._seconds, strict=True)
+            if 0 <= second - slot_second < self.window_seconds
+        )
+
+    def rate(self, now: float | None = None) -> float:
+        """Events per second over the window."""
+        return self.total(now) / self.window_seconds
+
 
 @dataclass
 class EndpointStats:
@@ -26,6 +199,10 @@ class EndpointStats:
     total_cache_time_ms: float = 0.0
     api_call_count: int = 0
     cache_call_count: int = 0
+    cache_hit_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    cache_miss_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    api_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    total_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
 
     def hit_rate(self) -> float:
         """Calculate hit rate for this endpoint."""
@@ -63,6 +240,12 @@ class EndpointStats:
             "time_saved_ms": round(self.time_saved_ms(), 2),
             "api_call_count": self.api_call_count,
             "cache_call_count": self.cache_call_count,
+            "latency": {
+                "cache_hit": self.cache_hit_latency.to_dict(),
+                "cache_miss": self.cache_miss_latency.to_dict(),
+                "api": self.api_latency.to_dict(),
+                "total": self.total_latency.to_dict(),
+            },
         }
 
 
@@ -71,8 +254,9 @@ class CacheMetrics:
     Cache metrics collector.
 
     This class tracks cache statistics including hits, misses, sets, deletes,
-    and per-endpoint statistics. It is thread-safe and provides methods
-    for querying statistics.
+    per-endpoint statistics and latency histograms, per-tool latency
+    histograms, and request rates over a sliding window. It is thread-safe
+    and provides methods for querying statistics.
     """
 
     def __init__(self):
@@ -84,6 +268,11 @@ class CacheMetrics:
         self._total_deletes = 0
         self._total_invalidations = 0
         self._per_endpoint: dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self._per_tool: dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._hit_window = SlidingWindowCounter()
+        self._miss_window = SlidingWindowCounter()
+        self._api_call_window = SlidingWindowCounter()
+        self._tool_call_window = SlidingWindowCounter()
         self._start_time = time.time()
 
     def record_hit(self, endpoint: str, cache_time_ms: float = 0.0) -> None:
@@ -95,12 +284,17 @@ class CacheMetrics:
             stats.cache_call_count += 1
             if cache_time_ms > 0:
                 stats.total_cache_time_ms += cache_time_ms
+            stats.cache_hit_latency.record(cache_time_ms)
+            self._hit_window.add()
 
-    def record_miss(self, endpoint: str) -> None:
-        """Record a cache miss."""
+    def record_miss(self, endpoint: str, cache_time_ms: float = 0.0) -> None:
+        """Record a cache miss and the time spent finding out."""
         with self._lock:
             self._total_misses += 1
-            self._per_endpoint[endpoint].misses += 1
+            stats = self._per_endpoint[endpoint]
+            stats.misses += 1
+            stats.cache_miss_latency.record(cache_time_ms)
+            self._miss_window.add()
 
     def record_set(self, endpoint: str) -> None:
         """Record a cache set operation."""
@@ -125,6 +319,34 @@ class CacheMetrics:
             stats = self._per_endpoint[endpoint]
             stats.api_call_count += 1
             stats.total_api_time_ms += api_time_ms
+            stats.api_latency.record(api_time_ms)
+            self._api_call_window.add()
+
+    def record_request(self, endpoint: str, total_time_ms: float) -> None:
+        """Record the end-to-end duration of a cached call, hit or miss."""
+        with self._lock:
+            self._per_endpoint[endpoint].total_latency.record(total_time_ms)
+
+    def record_tool_call(self, tool: str, duration_ms: float) -> None:
+        """Record the end-to-end duration of an MCP tool call."""
+        with self._lock:
+            self._per_tool[tool].record(duration_ms)
+            self._tool_call_window.add()
+
+    def export_endpoint_stats(self) -> dict[str, EndpointStats]:
+        """Get a consistent copy of every endpoint's statistics, histograms included."""
+        with self._lock:
+            return copy.deepcopy(dict(self._per_endpoint))
+
+    def export_tool_histograms(self) -> dict[str, LatencyHistogram]:
+        """Get a consistent copy of every tool's latency histogram."""
+        with self._lock:
+            return copy.deepcopy(dict(self._per_tool))
+
+    def get_tool_stats(self) -> dict[str, dict[str, Any]]:
+        """Get latency statistics for all tools."""
+        with self._lock:
+            return {tool: histogram.to_dict() for tool, histogram in self._per_tool.items()}
 
     def get_total_hits(self) -> int:
         """Get total cache hits."""
@@ -235,9 +457,39 @@ class CacheMetrics:
                     "total_api_calls": total_api_calls,
                     "total_cache_calls": total_cache_calls,
                 },
+                "latency": {
+                    "cache_hit": self._merged_latency("cache_hit_latency").to_dict(),
+                    "cache_miss": self._merged_latency("cache_miss_latency").to_dict(),
+                    "api": self._merged_latency("api_latency").to_dict(),
+                    "total": self._merged_latency("total_latency").to_dict(),
+                },
+                "rates": self._rates(),
                 "endpoint_count": len(self._per_endpoint),
             }
 
+    def _merged_latency(self, attribute: str) -> LatencyHistogram:
+        """Merge one latency histogram across endpoints (caller holds the lock)."""
+        merged = LatencyHistogram()
+        for stats in self._per_endpoint.values():
+            merged.merge(getattr(stats, attribute))
+        return merged
+
+    def _rates(self) -> dict[str, Any]:
+        """Request rates over the sliding window (caller holds the lock)."""
+        now = time.monotonic()
+        hits = self._hit_window.total(now)
+        misses = self._miss_window.total(now)
+        window = self._hit_window.window_seconds
+        return {
+            "window_seconds": window,
+            "requests_per_second": round((hits + misses) / window, 3),
+            "hits_per_second": round(hits / window, 3),
+            "misses_per_second": round(misses / window, 3),
+            "api_calls_per_second": round(self._api_call_window.rate(now), 3),
+            "tool_calls_per_second": round(self._tool_call_window.rate(now), 3),
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses > 0 else 0.0,
+        }
+
     def reset(self) -> None:
         """Reset all statistics."""
         with self._lock:
@@ -247,6 +499,11 @@ class CacheMetrics:
             self._total_deletes = 0
             self._total_invalidations = 0
             self._per_endpoint.clear()
+            self._per_tool.clear()
+            self._hit_window = SlidingWindowCounter()
+            self._miss_window = SlidingWindowCounter()
+            self._api_call_window = SlidingWindowCounter()
+            self._tool_call_window = SlidingWindowCounter()
             self._start_time = time.time()
 
 
@@ -7,9 +7,8 @@ survive server restarts.
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-import pickle  # nosec B403 - Used for serializing complex types in trusted cache
 from typing import Any
 
 try:
@@ -34,10 +33,71 @@ except ImportError:
     RedisError = Exception  # type: ignore[assignment, misc]
     RedisTimeoutError = Exception  # type: ignore[assignment, misc]
 
-from app.core.cache.backend import CacheBackend
+from app.core.cache.backend import CacheBackend, compile_key_pattern
+from app.core.cache.codec import Codec, get_codec
 
 logger = logging.getLogger(__name__)
 
+# Prefix of keys the backend keeps for itself (never returned by keys())
+INTERNAL_KEY_PREFIX = "hass-mcp:"
+
+# Prefix of the Redis SETs holding the cache keys of each key prefix
+TAG_KEY_PREFIX = f"{INTERNAL_KEY_PREFIX}tags:"
+
+# Marker set once the tag sets cover every cache key in the database
+TAG_INDEX_KEY = f"{INTERNAL_KEY_PREFIX}tag-index"
+
+# Keys unlinked per pipeline round trip
+DELETE_BATCH_SIZE = 500
+
+# Writes to a tag set between two prunes of its expired members
+TAG_PRUNE_INTERVAL = 1000
+
+# Pub/sub channel carrying invalidations to the near caches of other replicas
+INVALIDATION_CHANNEL = f"{INTERNAL_KEY_PREFIX}invalidations"
+
+
+def _decode_key(key: bytes | str) -> str:
+    """Decode a key returned by Redis."""
+    return key.decode("utf-8") if isinstance(key, bytes) else key
+
+
+def _tag_key(key: str) -> str:
+    """
+    Get the tag set of a cache key.
+
+    Args:
+        key: The cache key (e.g. "entities:state:id=light.kitchen")
+
+    Returns:
+        Key of the Redis SET tracking keys with the same prefix
+    """
+    return TAG_KEY_PREFIX + key.split(":", 1)[0]
+
+
+def _pattern_tag_key(pattern: str) -> str | None:
+    """
+    Get the tag set holding every key a pattern can match.
+
+    Args:
+        pattern: Key pattern (e.g. "entities:state:*")
+
+    Returns:
+        Tag set key, or None if the pattern's prefix contains a wildcard
+    """
+    prefix = pattern.split(":", 1)[0]
+    if any(char in prefix for char in "*?["):
+        return None
+    return TAG_KEY_PREFIX + prefix
+
+
+def _group_by_tag(keys: list[str]) -> dict[str, list[str]]:
+    """Group cache keys by their tag set."""
+    groups: dict[str, list[str]] = {}
+    for key in keys:
+        groups.setdefault(_tag_key(key), []).append(key)
+    return groups
+
 
 class RedisCacheBackend(CacheBackend):
     """
@@ -45,15 +105,21 @@ class RedisCacheBackend(CacheBackend):
 
     This backend stores cache entries in Redis with TTL support.
     It uses connection pooling and handles reconnection automatically.
+    Every key is also added to a Redis SET for its prefix ("entities",
+    "automations", ...), so pattern invalidation reads one SET instead of
+    scanning the keyspace, and batch operations are pipelined. Keys that
+    expired are dropped from their tag set when the prefix is invalidated
+    and every TAG_PRUNE_INTERVAL writes to it, so tag sets stay bounded.
     """
 
-    def __init__(self, url: str, decode_responses: bool = False):
+    def __init__(self, url: str, decode_responses: bool = False, codec: Codec | None = None):
         """
         Initialize the Redis cache backend.
 
         Args:
             url: Redis connection URL (e.g., 'redis://localhost:6379/0')
             decode_responses: If True, decode responses as strings (default: False for binary data)
+            codec: Value codec (default: the global codec from get_codec())
 
         Raises:
             ImportError: If redis package is not installed
@@ -76,6 +142,9 @@ class RedisCacheBackend(CacheBackend):
 
         self.url = url
         self.decode_responses = decode_responses
+        self._codec = codec or get_codec()
+        self._tag_index_ready = False
+        self._tag_writes: dict[str, int] = {}
         self._client: Any | None = None  # Type: redis.Redis[bytes] | None
         self._connection_pool: Any | None = None  # Type: redis.ConnectionPool | None
 
@@ -121,35 +190,19 @@ class RedisCacheBackend(CacheBackend):
             value: The value to serialize
 
         Returns:
-            Serialized bytes
+            Tagged bytes (see app.core.cache.codec)
 
         Raises:
             ValueError: If serialization fails
         """
-        try:
-            # Try JSON for simple types (dict, list, str, int, float, bool, None)
-            if isinstance(value, (dict, list, str, int, float, bool, type(None))):
-                json_str = json.dumps(value, default=str)
-                return json_str.encode("utf-8")
-            # Use pickle for complex types
-            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
-        except (TypeError, ValueError) as e:
-            # If JSON fails, try pickle
-            try:
-                return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
-            except Exception as pickle_error:
-                logger.error(
-                    f"Failed to serialize value: {e} (pickle also failed: {pickle_error})",
-                    exc_info=True,
-                )
-                raise ValueError(f"Failed to serialize value: {e}") from pickle_error
+        return self._codec.encode(value)
 
     def _deserialize(self, data: bytes) -> Any:
         """
         Deserialize a value from Redis.
 
         Args:
-            data: Serialized bytes from Redis
+            data: Serialized bytes
 
         Returns:
             Deserialized value
@@ -157,18 +210,7 @@ class RedisCacheBackend(CacheBackend):
         Raises:
             ValueError: If deserialization fails
         """
-        try:
-            # Try JSON first (faster for simple types)
-            try:
-                json_str = data.decode("utf-8")
-                return json.loads(json_str)
-            except (UnicodeDecodeError, json.JSONDecodeError):
-                # If JSON fails, try pickle
-                # nosec B301 - Cache data is trusted (from our own Redis instance)
-                return pickle.loads(data)  # nosec B301
-        except Exception as e:
-            logger.error(f"Failed to deserialize value: {e}", exc_info=True)
-            raise ValueError(f"Failed to deserialize value: {e}") from e
+        return self._codec.decode(data)
 
     async def get(self, key: str) -> Any | None:
         """
@@ -208,12 +250,10 @@ class RedisCacheBackend(CacheBackend):
             client = await self._get_client()
             data = self._serialize(value)
 
-            if ttl and ttl > 0:
-                # Use SETEX for set with expiration
-                await client.setex(key, ttl, data)
-            else:
-                # Set without expiration
-                await client.set(key, data)
+            # Use SETEX for set with expiration, SET without; tag the key concurrently
+            write = client.setex(key, ttl, data) if ttl and ttl > 0 else client.set(key, data)
+            await asyncio.gather(write, client.sadd(_tag_key(key), key))
+            await self._count_tag_writes(client, [key])
         except (RedisConnectionError, RedisTimeoutError, RedisError, ValueError) as e:
             logger.warning(f"Redis set error for key '{key}': {e}", exc_info=True)
         except Exception as e:
@@ -228,7 +268,7 @@ class RedisCacheBackend(CacheBackend):
         """
         try:
             client = await self._get_client()
-            await client.delete(key)
+            await asyncio.gather(client.delete(key), client.srem(_tag_key(key), key))
         except (RedisConnectionError, RedisTimeoutError, RedisError) as e:
             logger.warning(f"Redis delete error for key '{key}': {e}", exc_info=True)
         except Exception as e:
@@ -240,6 +280,8 @@ class RedisCacheBackend(CacheBackend):
             client = await self._get_client()
             # Use FLUSHDB to clear current database (not FLUSHALL which clears all databases)
             await client.flushdb()
+            self._tag_index_ready = False
+            self._tag_writes.clear()
             logger.info("Redis cache cleared")
         except (RedisConnectionError, RedisTimeoutError, RedisError) as e:
             logger.warning(f"Redis clear error: {e}", exc_info=True)
@@ -288,19 +330,14 @@ class RedisCacheBackend(CacheBackend):
             if pattern:
                 # Use SCAN for pattern matching (non-blocking, production-safe)
                 async for key in client.scan_iter(match=pattern):
-                    if isinstance(key, bytes):
-                        keys.append(key.decode("utf-8"))
-                    else:
-                        keys.append(key)
+                    keys.append(_decode_key(key))
             else:
                 # Get all keys (use SCAN with no pattern)
                 async for key in client.scan_iter():
-                    if isinstance(key, bytes):
-                        keys.append(key.decode("utf-8"))
-                    else:
-                        keys.append(key)
+                    keys.append(_decode_key(key))
 
-            return keys
+            # Skip the backend's own tag sets
+            return [key for key in keys if not key.startswith(INTERNAL_KEY_PREFIX)]
         except (RedisConnectionError, RedisTimeoutError, RedisError) as e:
             logger.warning(f"Redis keys error for pattern '{pattern}': {e}", exc_info=True)
             return []
@@ -352,15 +389,257 @@ class RedisCacheBackend(CacheBackend):
             Number of expired entries removed (always 0 for Redis as it's automatic)
         """
         # Redis automatically handles TTL expiration, so no cleanup needed
-        # But we can verify connection is healthy
+        # But we can verify connection is healthy and drop expired keys from tag sets
         try:
             client = await self._get_client()
             await client.ping()
+            await self._prune_tags(client)
             return 0
         except Exception as e:
             logger.warning(f"Redis cleanup check error: {e}", exc_info=True)
             return 0
 
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """
+        Retrieve several values from the cache with one MGET.
+
+        Args:
+            keys: The cache keys to retrieve
+
+        Returns:
+            Dictionary of the keys that were found to their values
+        """
+        if not keys:
+            return {}
+        try:
+            client = await self._get_client()
+            values: dict[str, Any] = {}
+            for key, data in zip(keys, await client.mget(keys), strict=True):
+                if data is None:
+                    continue
+                try:
+                    values[key] = self._deserialize(data)
+                except ValueError as e:
+                    logger.warning(f"Redis get error for key '{key}': {e}", exc_info=True)
+            return values
+        except Exception as e:
+            logger.warning(f"Redis get_many error for {len(keys)} keys: {e}", exc_info=True)
+            return {}
+
+    async def set_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """
+        Store several values in the cache in one pipelined round trip.
+
+        Args:
+            items: Dictionary of cache keys to values
+            ttl: Optional Time-To-Live in seconds. If None, entries don't expire
+        """
+        if not items:
+            return
+        try:
+            client = await self._get_client()
+            pipe = client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(key, self._serialize(value), ex=ttl if ttl and ttl > 0 else None)
+            for tag_key, members in _group_by_tag(list(items)).items():
+                pipe.sadd(tag_key, *members)
+            await pipe.execute()
+            await self._count_tag_writes(client, list(items))
+        except Exception as e:
+            logger.warning(f"Redis set_many error for {len(items)} keys: {e}", exc_info=True)
+
+    async def _unlink(self, client: Any, keys: list[str]) -> list[str]:
+        """
+        Unlink keys and remove them from their tag sets in pipelined batches.
+
+        UNLINK frees values in a background thread, so large entries do not
+        block the server.
+
+        Args:
+            client: Redis client
+            keys: The cache keys to delete
+
+        Returns:
+            List of the keys that existed
+        """
+        deleted: list[str] = []
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start : start + DELETE_BATCH_SIZE]
+            pipe = client.pipeline(transaction=False)
+            for key in batch:
+                pipe.unlink(key)
+            for tag_key, members in _group_by_tag(batch).items():
+                pipe.srem(tag_key, *members)
+            results = await pipe.execute()
+            deleted.extend(key for key, removed in zip(batch, results, strict=False) if removed)
+        return deleted
+
+    async def delete_many(self, keys: list[str]) -> None:
+        """
+        Delete several values from the cache in pipelined UNLINK batches.
+
+        Args:
+            keys: The cache keys to delete
+        """
+        if not keys:
+            return
+        try:
+            client = await self._get_client()
+            await self._unlink(client, keys)
+        except Exception as e:
+            logger.warning(f"Redis delete_many error for {len(keys)} keys: {e}", exc_info=True)
+
+    async def _ensure_tag_index(self, client: Any) -> None:
+        """
+        Add keys written before tag sets existed to their tag sets, once per database.
+
+        Args:
+            client: Redis client
+        """
+        if self._tag_index_ready:
+            return
+        if not await client.exists(TAG_INDEX_KEY):
+            keys = [
+                key
+                for key in [_decode_key(key) async for key in client.scan_iter()]
+                if not key.startswith(INTERNAL_KEY_PREFIX)
+            ]
+            pipe = client.pipeline(transaction=False)
+            for tag_key, members in _group_by_tag(keys).items():
+                pipe.sadd(tag_key, *members)
+            pipe.set(TAG_INDEX_KEY, 1)
+            await pipe.execute()
+            logger.info(f"Indexed {len(keys)} existing Redis cache keys into tag sets")
+        self._tag_index_ready = True
+
+    async def _prune_tag(self, client: Any, tag_key: str, members: list[str] | None = None) -> None:
+        """
+        Remove keys that expired from a tag set.
+
+        Args:
+            client: Redis client
+            tag_key: Key of the tag set
+            members: Members to check (default: every member of the tag set)
+        """
+        try:
+            if members is None:
+                members = [_decode_key(key) for key in await client.smembers(tag_key)]
+            for start in range(0, len(members), DELETE_BATCH_SIZE):
+                batch = members[start : start + DELETE_BATCH_SIZE]
+                pipe = client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.exists(key)
+                expired = [
+                    key
+                    for key, exists in zip(batch, await pipe.execute(), strict=True)
+                    if not exists
+                ]
+                if expired:
+                    await client.srem(tag_key, *expired)
+        except Exception as e:
+            logger.warning(f"Redis tag set pruning error for '{tag_key}': {e}", exc_info=True)
+
+    async def _prune_tags(self, client: Any) -> None:
+        """
+        Remove keys that expired from their tag sets.
+
+        Args:
+            client: Redis client
+        """
+        try:
+            async for raw_tag_key in client.scan_iter(match=f"{TAG_KEY_PREFIX}*"):
+                await self._prune_tag(client, _decode_key(raw_tag_key))
+        except Exception as e:
+            logger.warning(f"Redis tag set pruning error: {e}", exc_info=True)
+
+    async def _count_tag_writes(self, client: Any, keys: list[str]) -> None:
+        """
+        Count writes to tag sets, pruning a tag set every TAG_PRUNE_INTERVAL writes.
+
+        Args:
+            client: Redis client
+            keys: The cache keys just written
+        """
+        for tag_key, members in _group_by_tag(keys).items():
+            writes = self._tag_writes.get(tag_key, 0) + len(members)
+            if writes >= TAG_PRUNE_INTERVAL:
+                writes = 0
+                await self._prune_tag(client, tag_key)
+            self._tag_writes[tag_key] = writes
+
+    async def delete_pattern(self, pattern: str) -> list[str]:
+        """
+        Delete all entries whose keys match a pattern.
+
+        Matching keys are read from the tag set of the pattern's prefix (one
+        SMEMBERS instead of a SCAN over the keyspace) and unlinked in
+        pipelined batches. Members of the tag set whose keys expired are
+        removed from it. Patterns whose prefix contains a wildcard fall back
+        to SCAN.
+
+        Args:
+            pattern: Pattern to match keys (supports wildcards like '*')
+
+        Returns:
+            List of the deleted cache keys
+        """
+        try:
+            tag_key = _pattern_tag_key(pattern)
+            if tag_key is None:
+                keys = await self.keys(pattern)
+                client = await self._get_client()
+                return await self._unlink(client, keys)
+
+            client = await self._get_client()
+            await self._ensure_tag_index(client)
+            regex = compile_key_pattern(pattern)
+            members = [_decode_key(key) for key in await client.smembers(tag_key)]
+            matched = [key for key in members if regex.fullmatch(key)]
+            deleted = await self._unlink(client, matched)
+            # Drop the other members of the tag set that expired meanwhile
+            await self._prune_tag(
+                client, tag_key, [key for key in members if not regex.fullmatch(key)]
+            )
+            return deleted
+        except Exception as e:
+            logger.warning(f"Redis delete_pattern error for '{pattern}': {e}", exc_info=True)
+            return []
+
+    async def publish(self, channel: str, message: str) -> int:
+        """
+        Publish a message on a pub/sub channel.
+
+        Args:
+            channel: Channel name
+            message: Message payload
+
+        Returns:
+            Number of subscribers that received the message
+
+        Raises:
+            redis.RedisError: If the message cannot be published
+        """
+        client = await self._get_client()
+        return await client.publish(channel, message)
+
+    async def subscribe(self, channel: str) -> Any:
+        """
+        Subscribe to a pub/sub channel on a dedicated connection.
+
+        Args:
+            channel: Channel name
+
+        Returns:
+            Subscribed redis PubSub object; close it with aclose()
+
+        Raises:
+            redis.RedisError: If the subscription fails
+        """
+        client = await self._get_client()
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        return pubsub
+
     async def close(self) -> None:
         """
         Close Redis connection pool.
@@ -0,0 +1,362 @@
+"""Time-bucketed segment cache for hass-mcp.
+
+History and logbook data for a time range that has already ended never
+changes. This module caches such data in fixed, closed time buckets (one hour
+by default) so that repeated range queries only fetch the still-open tail of
+the range, plus any buckets that were never fetched or have been evicted,
+from Home Assistant. Segments are merged in time order on read and evicted in
+LRU order once a byte budget is exceeded.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from app.config import SEGMENT_CACHE_MAX_BYTES
+from app.core.cache.config import get_cache_config
+
+logger = logging.getLogger(__name__)
+
+# Default bucket size in seconds (one hour)
+DEFAULT_BUCKET_SECONDS = 3600
+
+# Seconds after a bucket ends before it is considered closed (recorder commit lag)
+DEFAULT_SETTLE_SECONDS = 60
+
+# Ranges spanning more buckets than this bypass the segment cache
+MAX_BUCKETS_PER_QUERY = 24 * 90
+
+FetchRange = Callable[[datetime, datetime], Awaitable[list[Any]]]
+
+
+def parse_timestamp(value: Any) -> float | None:
+    """
+    Convert a Home Assistant timestamp to Unix time.
+
+    Args:
+        value: ISO 8601 string (e.g., '2025-01-01T10:00:00Z') or Unix time
+
+    Returns:
+        Unix timestamp, or None if the value cannot be parsed
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
+
+
+class Segment:
+    """Records of one closed time bucket."""
+
+    __slots__ = ("records", "size", "timestamps")
+
+    def __init__(self, records: list[Any], timestamps: list[float], size: int):
+        """
+        Initialize a segment.
+
+        Args:
+            records: Records in the bucket, in time order
+            timestamps: Unix timestamp of each record
+            size: Approximate size of the records in bytes
+        """
+        self.records = records
+        self.timestamps = timestamps
+        self.size = size
+
+
+class SegmentCache:
+    """
+    Cache of time-ordered records split into fixed, closed time buckets.
+
+    Buckets are keyed by ``(namespace, bucket_start)``. Only buckets that
+    ended at least ``settle_seconds`` ago are stored, so cached data never
+    goes stale; the open tail of every range is always fetched fresh.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+        max_bytes: int = SEGMENT_CACHE_MAX_BYTES,
+        settle_seconds: int = DEFAULT_SETTLE_SECONDS,
+    ):
+        """
+        Initialize the segment cache.
+
+        Args:
+            bucket_seconds: Size of each time bucket in seconds
+            max_bytes: Byte budget; least recently used segments are evicted
+                       once it is exceeded
+            settle_seconds: Seconds after a bucket ends before it is cached
+        """
+        self.bucket_seconds = bucket_seconds
+        self.max_bytes = max_bytes
+        self.settle_seconds = settle_seconds
+        self._segments: OrderedDict[tuple[str, int], Segment] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _bucket_start(self, ts: float) -> int:
+        return math.floor(ts / self.bucket_seconds) * self.bucket_seconds
+
+    def _get(self, namespace: str, bucket: int) -> Segment | None:
+        segment = self._segments.get((namespace, bucket))
+        if segment is not None:
+            self._segments.move_to_end((namespace, bucket))
+        return segment
+
+    def _put(self, namespace: str, bucket: int, records: list[Any], timestamps: list[float]):
+        size = len(json.dumps(records, default=str))
+        if size > self.max_bytes:
+            return
+        key = (namespace, bucket)
+        old = self._segments.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._segments[key] = Segment(records, timestamps, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._segments:
+            _, evicted = self._segments.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    @staticmethod
+    def _drop_start_state(
+        records: list[Any], run_start: float, timestamp: Callable[[Any], Any]
+    ) -> list[Any]:
+        """Drop the state a history response starts with (dated at or before its start)."""
+        if records:
+            ts = parse_timestamp(timestamp(records[0]))
+            if ts is not None and ts <= run_start:
+                return records[1:]
+        return records
+
+    def _store_run(
+        self,
+        namespace: str,
+        run_start: float,
+        run_end: float,
+        closed_end: int,
+        *,
+        records: list[Any],
+        timestamp: Callable[[Any], Any],
+        carry_in: bool,
+    ) -> None:
+        """Split a fetched range into buckets and cache the full, closed ones."""
+        first_bucket = self._bucket_start(run_start)
+        if first_bucket < run_start:
+            first_bucket += self.bucket_seconds
+        last_end = min(run_end, closed_end)
+        if first_bucket + self.bucket_seconds > last_end:
+            return
+
+        # The start state is not a change within the range; Home Assistant
+        # dates it at the start of the request, so it would read as one
+        if carry_in:
+            records = self._drop_start_state(records, run_start, timestamp)
+
+        buckets: dict[int, tuple[list[Any], list[float]]] = {}
+        for record in records:
+            ts = parse_timestamp(timestamp(record))
+            # Unparseable or out-of-range data means the range cannot be trusted
+            if ts is None or ts >= run_end or (carry_in and ts < run_start):
+                logger.debug(f"Not caching {namespace} segments: unexpected record timestamp")
+                return
+            bucket = self._bucket_start(max(ts, run_start))
+            bucket_records, bucket_timestamps = buckets.setdefault(bucket, ([], []))
+            bucket_records.append(record)
+            bucket_timestamps.append(ts)
+
+        bucket = first_bucket
+        while bucket + self.bucket_seconds <= last_end:
+            bucket_records, bucket_timestamps = buckets.get(bucket, ([], []))
+            self._put(namespace, bucket, bucket_records, bucket_timestamps)
+            bucket += self.bucket_seconds
+
+    async def get_range(
+        self,
+        namespace: str,
+        start: datetime,
+        end: datetime,
+        fetch: FetchRange,
+        *,
+        timestamp: Callable[[Any], Any],
+        carry_in: bool = False,
+    ) -> list[Any]:
+        """
+        Get the records of a time range, fetching only what is not cached.
+
+        Args:
+            namespace: Identifies the data source and filters
+                       (e.g., 'history:sensor.temperature')
+            start: Start of the range (timezone-aware)
+            end: End of the range (timezone-aware)
+            fetch: Coroutine function fetching the records of a sub-range
+                   ``[start, end)`` in time order
+            timestamp: Function returning a record's timestamp (ISO string or Unix time)
+            carry_in: Whether each fetch starts with the state in effect at its
+                      start, dated at or before it (history). Segments then only
+                      hold real changes, and when the range starts in a cached
+                      bucket its start state is fetched with a one-second request
+
+        Returns:
+            The merged records of the range, in time order, as a single fetch
+            of the whole range would return them
+
+        Note:
+            Missing adjacent buckets are coalesced into a single fetch, so a
+            cold query costs exactly one request. Caching is bypassed when the
+            cache is disabled or the range spans more than
+            MAX_BUCKETS_PER_QUERY buckets.
+        """
+        start_ts = start.timestamp()
+        end_ts = end.timestamp()
+        if (
+            not get_cache_config().is_enabled()
+            or end_ts <= start_ts
+            or (end_ts - start_ts) / self.bucket_seconds > MAX_BUCKETS_PER_QUERY
+        ):
+            return await fetch(start, end)
+
+        closed_end = self._bucket_start(time.time() - self.settle_seconds)
+
+        # Plan the range as cached segments and missing runs
+        pieces: list[tuple[float, float, Segment | None]] = []
+        t = start_ts
+        while t < end_ts:
+            bucket = self._bucket_start(t)
+            bucket_end = bucket + self.bucket_seconds
+            if bucket_end > closed_end:
+                pieces.append((t, end_ts, None))
+                break
+            piece_end = min(bucket_end, end_ts)
+            segment = self._get(namespace, bucket)
+            if segment is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            pieces.append((t, piece_end, segment))
+            t = piece_end
+
+        # Coalesce adjacent missing pieces into runs
+        plan: list[tuple[float, float, Segment | None]] = []
+        for piece_start, piece_end, segment in pieces:
+            if segment is None and plan and plan[-1][2] is None:
+                plan[-1] = (plan[-1][0], piece_end, None)
+            else:
+                plan.append((piece_start, piece_end, segment))
+
+        runs = [(a, b) for a, b, segment in plan if segment is None]
+        # Segments don't know the state in effect at an arbitrary start time
+        probe = carry_in and plan[0][2] is not None
+        requests = [(start_ts, start_ts + 1), *runs] if probe else runs
+        fetched = await asyncio.gather(
+            *(
+                fetch(datetime.fromtimestamp(a, UTC), datetime.fromtimestamp(b, UTC))
+                for a, b in requests
+            )
+        )
+        start_records = fetched[0] if probe else []
+        fetched = fetched[1:] if probe else fetched
+        for (a, b), records in zip(runs, fetched, strict=True):
+            self._store_run(
+                namespace, a, b, closed_end, records=records, timestamp=timestamp, carry_in=carry_in
+            )
+
+        # A cold query is served straight from its single fetch
+        if len(plan) == 1 and plan[0][2] is None:
+            return fetched[0]
+
+        results: list[Any] = []
+        if start_records:
+            ts = parse_timestamp(timestamp(start_records[0]))
+            if ts is not None and ts <= start_ts:
+                results.append(start_records[0])
+
+        fetched_runs = iter(fetched)
+        for index, (piece_start, piece_end, segment) in enumerate(plan):
+            if segment is None:
+                records = next(fetched_runs)
+                if index:
+                    # The previous pieces already cover the state at this run's start
+                    if carry_in:
+                        records = self._drop_start_state(records, piece_start, timestamp)
+                    records = [
+                        r
+                        for r in records
+                        if (ts := parse_timestamp(timestamp(r))) is None or ts >= piece_start
+                    ]
+                results.extend(records)
+                continue
+
+            results.extend(
+                record
+                for record, ts in zip(segment.records, segment.timestamps, strict=True)
+                if piece_start <= ts < piece_end
+            )
+        return results
+
+    def clear(self, namespace: str | None = None) -> None:
+        """
+        Remove cached segments.
+
+        Args:
+            namespace: Only remove segments of this namespace (default: all)
+        """
+        if namespace is None:
+            self._segments.clear()
+            self._bytes = 0
+            return
+        for key in [k for k in self._segments if k[0] == namespace]:
+            self._bytes -= self._segments.pop(key).size
+
+    def get_statistics(self) -> dict[str, Any]:
+        """
+        Get segment cache statistics.
+
+        Returns:
+            Dictionary with segment count, bytes used, byte budget, bucket
+            size and bucket hit/miss/eviction counts
+        """
+        return {
+            "segments": len(self._segments),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "bucket_seconds": self.bucket_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Global segment cache instance
+_segment_cache: SegmentCache | None = None
+
+
+def get_segment_cache() -> SegmentCache:
+    """
+    Get the global segment cache instance (singleton pattern).
+
+    Returns:
+        The SegmentCache instance
+    """
+    global _segment_cache
+    if _segment_cache is None:
+        _segment_cache = SegmentCache()
+    return _segment_cache
@@ -0,0 +1,145 @@
+"""Memory cache snapshots for hass-mcp.
+
+This module writes the memory cache to a file on shutdown and loads it back
+on startup, so a restart or redeploy doesn't start with a cold cache. Entries
+keep their absolute expiry times: time spent offline counts against their
+TTL, and entries that expired meanwhile are not restored. Values are encoded
+with the cache codec, and the file is replaced atomically.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import app.core.cache.manager as manager_module
+from app.config import CACHE_SNAPSHOT_FILE
+from app.core.cache.codec import get_codec
+from app.core.cache.memory import MemoryCacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Format version of the snapshot file
+SNAPSHOT_VERSION = 1
+
+
+def save_snapshot(backend: MemoryCacheBackend, path: str | Path) -> int:
+    """
+    Write the live entries of a memory cache to a snapshot file.
+
+    This is synchronous so it can run while the event loop shuts down.
+
+    Args:
+        backend: Memory cache backend to save
+        path: Snapshot file path
+
+    Returns:
+        Number of entries written
+
+    Raises:
+        OSError: If the file cannot be written
+        ValueError: If the entries cannot be encoded
+    """
+    path = Path(path)
+    entries = backend.export_entries()
+    data = get_codec().encode(
+        {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "entries": [[key, value, expires_at] for key, value, expires_at in entries],
+        }
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return len(entries)
+
+
+async def load_snapshot(backend: MemoryCacheBackend, path: str | Path) -> int:
+    """
+    Load a snapshot file into a memory cache.
+
+    Args:
+        backend: Memory cache backend to fill
+        path: Snapshot file path
+
+    Returns:
+        Number of entries restored (expired entries are skipped)
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a valid snapshot
+    """
+    snapshot: Any = get_codec().decode(Path(path).read_bytes())
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError("Unsupported cache snapshot format")
+    entries = [(key, value, expires_at) for key, value, expires_at in snapshot["entries"]]
+    return await backend.import_entries(entries)
+
+
+async def restore_cache_snapshot(path: str | None = None) -> int:
+    """
+    Restore the configured snapshot into the cache manager's memory backend.
+
+    Args:
+        path: Snapshot file path (default: HASS_MCP_CACHE_SNAPSHOT_FILE)
+
+    Returns:
+        Number of entries restored (0 if disabled, missing or not a memory cache)
+    """
+    path = path if path is not None else CACHE_SNAPSHOT_FILE
+    if not path or not Path(path).exists():
+        return 0
+
+    cache = await manager_module.get_cache_manager()
+    backend = await cache._get_backend()
+    if not isinstance(backend, MemoryCacheBackend):
+        logger.info("Cache snapshot ignored: the configured backend is already persistent")
+        return 0
+
+    try:
+        restored = await load_snapshot(backend, path)
+        logger.info(f"Restored {restored} cache entries from {path}")
+        return restored
+    except Exception as e:
+        # A corrupt snapshot only costs a cold cache
+        logger.warning(f"Failed to restore cache snapshot {path}: {e}")
+        return 0
+
+
+def save_cache_snapshot(path: str | None = None) -> int:
+    """
+    Save the cache manager's memory backend to the configured snapshot file.
+
+    Args:
+        path: Snapshot file path (default: HASS_MCP_CACHE_SNAPSHOT_FILE)
+
+    Returns:
+        Number of entries saved (0 if disabled or not a memory cache)
+    """
+    path = path if path is not None else CACHE_SNAPSHOT_FILE
+    if not path:
+        return 0
+
+    # Synchronous: use the existing manager instead of creating one
+    cache = manager_module._cache_manager
+    backend = cache._backend if cache is not None else None
+    if not isinstance(backend, MemoryCacheBackend):
+        return 0
+
+    try:
+        saved = save_snapshot(backend, path)
+        logger.info(f"Saved {saved} cache entries to {path}")
+        return saved
+    except Exception as e:
+        logger.warning(f"Failed to save cache snapshot {path}: {e}")
+        return 0
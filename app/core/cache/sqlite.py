@@ -0,0 +1,373 @@
+"""SQLite cache backend for hass-mcp.
+
+This module provides a persistent cache backend that stores every entry in a
+single SQLite database in WAL mode. Compared to the file backend (two files
+per key), a lookup is one indexed read, a write is one atomic transaction, and
+listing or expiring keys never touches the disk: an in-memory index of keys and
+expiry times is rebuilt from the database at startup.
+
+Note:
+    The in-memory index assumes a single process writes to the database.
+    Entries written by another process are only seen after a restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from app.core.cache.backend import CacheBackend, compile_key_pattern
+from app.core.cache.codec import Codec, get_codec
+
+logger = logging.getLogger(__name__)
+
+# Database file name inside the cache directory
+DATABASE_FILE = "cache.db"
+
+# Keys fetched per query by get_many()
+BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL
+)
+"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Persistent cache backend using a single SQLite database.
+
+    The database runs in WAL mode, so readers never block the writer and each
+    set/delete is an atomic transaction. Keys and expiry times are mirrored in
+    memory, so misses, exists() and keys() are answered without I/O.
+    Database calls run in a worker thread to keep the event loop responsive.
+    """
+
+    def __init__(
+        self, cache_dir: str = ".cache", filename: str = DATABASE_FILE, codec: Codec | None = None
+    ):
+        """
+        Initialize the SQLite cache backend.
+
+        Args:
+            cache_dir: Directory path for the database (default: ".cache")
+            filename: Database file name inside cache_dir
+            codec: Value codec (default: the global codec from get_codec())
+
+        Raises:
+            ValueError: If the cache directory or database cannot be created
+        """
+        self.cache_dir = Path(cache_dir)
+        self.path = self.cache_dir / filename
+        self._codec = codec or get_codec()
+        self._lock = threading.Lock()
+        self._index: dict[str, float | None] = {}
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.path), check_same_thread=False, isolation_level=None
+            )
+            self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+            self._load_index()
+            logger.info(f"Initialized SQLite cache backend at {self.path}")
+        except Exception as e:
+            logger.error(f"Failed to open SQLite cache {self.path}: {e}", exc_info=True)
+            raise ValueError(f"Failed to open SQLite cache: {e}") from e
+
+    def _load_index(self) -> None:
+        """Rebuild the in-memory key index from the database, dropping expired entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            )
+            self._index = dict(self._conn.execute("SELECT key, expires_at FROM entries"))
+
+    def _is_live(self, key: str) -> bool:
+        """
+        Check the in-memory index for a key.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            True if the key is indexed and not expired
+        """
+        if key not in self._index:
+            return False
+        expires_at = self._index[key]
+        return expires_at is None or time.time() < expires_at
+
+    def _execute(self, sql: str, params: Any = (), many: bool = False) -> list[Any]:
+        """
+        Run a statement on the database connection.
+
+        Args:
+            sql: SQL statement
+            params: Statement parameters (a sequence of them if many is True)
+            many: Whether to run the statement once per parameter set, in one
+                  transaction
+
+        Returns:
+            Fetched rows
+        """
+        with self._lock:
+            if many:
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    self._conn.executemany(sql, params)
+                return []
+            return self._conn.execute(sql, params).fetchall()
+
+    async def get(self, key: str) -> Any | None:
+        """
+        Retrieve a value from the cache.
+
+        Args:
+            key: The cache key to retrieve
+
+        Returns:
+            The cached value if found and not expired, None otherwise
+        """
+        if not self._is_live(key):
+            if key in self._index:
+                await self.delete(key)
+            return None
+        try:
+            rows = await asyncio.to_thread(
+                self._execute, "SELECT value FROM entries WHERE key = ?", (key,)
+            )
+            if not rows:
+                self._index.pop(key, None)
+                return None
+            return self._codec.decode(rows[0][0])
+        except Exception as e:
+            logger.warning(f"SQLite cache get error for key '{key}': {e}", exc_info=True)
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """
+        Store a value in the cache.
+
+        Args:
+            key: The cache key
+            value: The value to cache
+            ttl: Optional Time-To-Live in seconds. If None, entry doesn't expire
+        """
+        try:
+            data = self._codec.encode(value)
+            expires_at = time.time() + ttl if ttl and ttl > 0 else None
+            await asyncio.to_thread(
+                self._execute,
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, data, expires_at),
+            )
+            self._index[key] = expires_at
+        except Exception as e:
+            logger.warning(f"SQLite cache set error for key '{key}': {e}", exc_info=True)
+
+    async def delete(self, key: str) -> None:
+        """
+        Delete a value from the cache.
+
+        Args:
+            key: The cache key to delete
+        """
+        if key not in self._index:
+            return
+        del self._index[key]
+        try:
+            await asyncio.to_thread(self._execute, "DELETE FROM entries WHERE key = ?", (key,))
+        except Exception as e:
+            logger.warning(f"SQLite cache delete error for key '{key}': {e}", exc_info=True)
+
+    async def clear(self) -> None:
+        """Clear all entries from the cache."""
+        self._index.clear()
+        try:
+            await asyncio.to_thread(self._execute, "DELETE FROM entries")
+            await self.compact()
+            logger.info("SQLite cache cleared")
+        except Exception as e:
+            logger.warning(f"SQLite cache clear error: {e}", exc_info=True)
+
+    async def exists(self, key: str) -> bool:
+        """
+        Check if a key exists in the cache.
+
+        Args:
+            key: The cache key to check
+
+        Returns:
+            True if the key exists and is not expired, False otherwise
+        """
+        return self._is_live(key)
+
+    async def keys(self, pattern: str | None = None) -> list[str]:
+        """
+        Get all cache keys, optionally filtered by pattern.
+
+        Args:
+            pattern: Optional pattern to match keys (supports wildcards like '*')
+
+        Returns:
+            List of matching, non-expired cache keys
+        """
+        keys = [key for key in list(self._index) if self._is_live(key)]
+        if pattern:
+            regex = compile_key_pattern(pattern)
+            keys = [key for key in keys if regex.fullmatch(key)]
+        return keys
+
+    def size(self) -> int:
+        """
+        Get the current number of cache entries.
+
+        Returns:
+            Number of entries in the cache (including expired entries not yet removed)
+        """
+        return len(self._index)
+
+    async def async_size(self) -> int:
+        """
+        Get the current number of cache entries asynchronously.
+
+        Returns:
+            Number of entries in the cache
+        """
+        return self.size()
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """
+        Retrieve several values from the cache with one query.
+
+        Args:
+            keys: The cache keys to retrieve
+
+        Returns:
+            Dictionary of the keys that were found to their values
+        """
+        live = [key for key in keys if self._is_live(key)]
+        if not live:
+            return {}
+        try:
+            values: dict[str, Any] = {}
+            # Stay below SQLite's bound parameter limit
+            for start in range(0, len(live), BATCH_SIZE):
+                batch = live[start : start + BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                rows = await asyncio.to_thread(
+                    self._execute,
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders})",  # nosec B608
+                    batch,
+                )
+                for key, data in rows:
+                    values[key] = self._codec.decode(data)
+            return values
+        except Exception as e:
+            logger.warning(f"SQLite cache get_many error: {e}", exc_info=True)
+            return {}
+
+    async def set_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """
+        Store several values in the cache in one transaction.
+
+        Args:
+            items: Dictionary of cache keys to values
+            ttl: Optional Time-To-Live in seconds. If None, entries don't expire
+        """
+        if not items:
+            return
+        try:
+            expires_at = time.time() + ttl if ttl and ttl > 0 else None
+            rows = [(key, self._codec.encode(value), expires_at) for key, value in items.items()]
+            await asyncio.to_thread(
+                self._execute,
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                rows,
+                True,
+            )
+            for key in items:
+                self._index[key] = expires_at
+        except Exception as e:
+            logger.warning(f"SQLite cache set_many error: {e}", exc_info=True)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        """
+        Delete several values from the cache in one transaction.
+
+        Args:
+            keys: The cache keys to delete
+        """
+        indexed = [key for key in keys if key in self._index]
+        if not indexed:
+            return
+        for key in indexed:
+            del self._index[key]
+        try:
+            await asyncio.to_thread(
+                self._execute,
+                "DELETE FROM entries WHERE key = ?",
+                [(key,) for key in indexed],
+                True,
+            )
+        except Exception as e:
+            logger.warning(f"SQLite cache delete_many error: {e}", exc_info=True)
+
+    async def cleanup_expired(self) -> int:
+        """
+        Remove all expired entries from the cache.
+
+        Returns:
+            Number of expired entries removed
+        """
+        expired = [key for key in list(self._index) if not self._is_live(key)]
+        if not expired:
+            return 0
+        for key in expired:
+            self._index.pop(key, None)
+        try:
+            await asyncio.to_thread(
+                self._execute,
+                "DELETE FROM entries WHERE key = ?",
+                [(key,) for key in expired],
+                True,
+            )
+            await self.compact()
+            logger.info(f"Cleaned up {len(expired)} expired cache entries")
+        except Exception as e:
+            logger.warning(f"SQLite cache cleanup error: {e}", exc_info=True)
+        return len(expired)
+
+    async def compact(self) -> None:
+        """
+        Compact the database online.
+
+        Checkpoints the write-ahead log into the database, truncating it, and
+        returns free pages to the filesystem. Readers and writers of other
+        connections are not blocked for longer than the checkpoint.
+        """
+        try:
+            await asyncio.to_thread(self._execute, "PRAGMA wal_checkpoint(TRUNCATE)")
+            await asyncio.to_thread(self._execute, "PRAGMA incremental_vacuum")
+        except Exception as e:
+            logger.warning(f"SQLite cache compaction error: {e}", exc_info=True)
+
+    async def close(self) -> None:
+        """Checkpoint the write-ahead log and close the database."""
+        await self.compact()
+        with self._lock:
+            self._conn.close()
+        logger.info("Closed SQLite cache backend")
@@ -0,0 +1,458 @@
+"""Tiered (near) cache backend for hass-mcp.
+
+This module puts a small in-process LRU cache (L1) in front of the Redis
+backend (L2). An L1 hit costs neither a network round trip nor a
+deserialization. Deletes, pattern invalidations and clears are published on a
+Redis pub/sub channel; every replica drops the matching L1 entries when the
+message arrives, so replicas sharing a Redis database stay coherent.
+
+Note:
+    Overwrites (set) are not broadcast. Another replica may serve its previous
+    L1 copy of an overwritten key for at most the L1 TTL; data changes in Home
+    Assistant are invalidated, not overwritten, so they are always broadcast.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from app.core.cache.backend import CacheBackend, compile_key_pattern
+from app.core.cache.redis import INVALIDATION_CHANNEL, RedisCacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before subscribing again after the subscription failed
+RESUBSCRIBE_DELAY = 5.0
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Near cache: an in-process LRU (L1) in front of Redis (L2).
+
+    Reads try L1 first and fill it from L2. Writes go to L2 and then L1.
+    L1 is only filled while the invalidation channel is subscribed, and it is
+    emptied whenever the subscription is lost, since invalidations published
+    meanwhile are missed. L1 entries live at most l1_ttl seconds, which bounds
+    staleness even if an invalidation message is lost.
+    """
+
+    def __init__(
+        self,
+        l2: RedisCacheBackend,
+        l1_max_size: int = 256,
+        l1_ttl: float = 30.0,
+        channel: str = INVALIDATION_CHANNEL,
+    ):
+        """
+        Initialize the tiered cache backend.
+
+        Args:
+            l2: Shared Redis backend
+            l1_max_size: Maximum number of L1 entries (0 disables L1)
+            l1_ttl: Maximum lifetime of an L1 entry in seconds
+            channel: Pub/sub channel carrying invalidations between replicas
+        """
+        self.l2 = l2
+        self.l1_max_size = l1_max_size
+        self.l1_ttl = l1_ttl
+        self.channel = channel
+        self._l1: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        # Identifies this replica's own messages, which are already applied
+        self._instance_id = uuid.uuid4().hex
+        # Bumped on every L1 invalidation so in-flight L2 reads don't refill stale values
+        self._generation = 0
+        self._pubsub: Any | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._subscribe_lock = asyncio.Lock()
+        self._retry_at = 0.0
+
+        self.l1_hits = 0
+        self.l1_misses = 0
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.invalidations_received = 0
+        # L1 entries dropped to stay within l1_max_size
+        self.evictions = 0
+
+    # L1 helpers
+
+    def _l1_get(self, key: str) -> Any | None:
+        """Get a live L1 value, refreshing its LRU position."""
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return value
+
+    def _l1_put(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Store a value in L1 for at most l1_ttl (or ttl, if shorter) seconds."""
+        lifetime = min(self.l1_ttl, ttl) if ttl and ttl > 0 else self.l1_ttl
+        if lifetime <= 0 or self.l1_max_size <= 0:
+            return
+        self._l1[key] = (value, time.monotonic() + lifetime)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_max_size:
+            self._l1.popitem(last=False)
+            self.evictions += 1
+
+    def _l1_drop(self, keys: list[str]) -> None:
+        """Drop keys from L1."""
+        self._generation += 1
+        for key in keys:
+            self._l1.pop(key, None)
+
+    def _l1_drop_pattern(self, pattern: str) -> None:
+        """Drop the L1 keys matching a wildcard pattern."""
+        regex = compile_key_pattern(pattern)
+        self._l1_drop([key for key in self._l1 if regex.fullmatch(key)])
+
+    def _l1_clear(self) -> None:
+        """Empty L1."""
+        self._generation += 1
+        self._l1.clear()
+
+    # Invalidation channel
+
+    async def _ensure_subscribed(self) -> bool:
+        """
+        Subscribe to the invalidation channel if not subscribed yet.
+
+        Returns:
+            True if invalidations are being received (L1 may be filled)
+        """
+        if self._listener is not None and not self._listener.done():
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+
+        async with self._subscribe_lock:
+            if self._listener is not None and not self._listener.done():
+                return True
+            await self._close_pubsub()
+            try:
+                self._pubsub = await self.l2.subscribe(self.channel)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to subscribe to cache invalidations: {e}. "
+                    f"Serving from Redis only for {RESUBSCRIBE_DELAY:.0f}s."
+                )
+                self._retry_at = time.monotonic() + RESUBSCRIBE_DELAY
+                return False
+
+            # Invalidations published while unsubscribed were missed
+            self._l1_clear()
+            self._listener = asyncio.create_task(self._listen(self._pubsub))
+            logger.info(f"Subscribed to cache invalidations on '{self.channel}'")
+            return True
+
+    async def _listen(self, pubsub: Any) -> None:
+        """
+        Apply invalidation messages until the subscription fails.
+
+        Args:
+            pubsub: Subscribed redis PubSub object
+        """
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    self._apply_invalidation(message["data"])
+        except Exception as e:
+            logger.warning(f"Cache invalidation subscription lost: {e}")
+            self._retry_at = time.monotonic() + RESUBSCRIBE_DELAY
+        finally:
+            self._l1_clear()
+
+    def _apply_invalidation(self, data: bytes | str) -> None:
+        """
+        Apply an invalidation message published by another replica.
+
+        Args:
+            data: JSON message with "keys", "pattern" or "clear"
+        """
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed cache invalidation message: {e}")
+            return
+        if message.get("origin") == self._instance_id:
+            return
+
+        self.invalidations_received += 1
+        if "keys" in message:
+            self._l1_drop(message["keys"])
+        elif "pattern" in message:
+            self._l1_drop_pattern(message["pattern"])
+        else:
+            self._l1_clear()
+
+    async def _publish(self, message: dict[str, Any]) -> None:
+        """
+        Publish an invalidation to the other replicas.
+
+        Args:
+            message: Invalidation with "keys", "pattern" or "clear"
+        """
+        message["origin"] = self._instance_id
+        try:
+            await self.l2.publish(self.channel, json.dumps(message))
+        except Exception as e:
+            # Other replicas catch up when their L1 entries expire
+            logger.warning(f"Failed to publish cache invalidation: {e}", exc_info=True)
+
+    async def _close_pubsub(self) -> None:
+        """Close the current pub/sub connection, if any."""
+        if self._pubsub is not None:
+            with contextlib.suppress(Exception):
+                await self._pubsub.aclose()
+            self._pubsub = None
+
+    # CacheBackend interface
+
+    async def get(self, key: str) -> Any | None:
+        """
+        Retrieve a value from L1, or from L2 on an L1 miss.
+
+        Args:
+            key: The cache key to retrieve
+
+        Returns:
+            The cached value if found and not expired, None otherwise
+        """
+        value = self._l1_get(key)
+        if value is not None:
+            self.l1_hits += 1
+            return value
+        self.l1_misses += 1
+
+        subscribed = await self._ensure_subscribed()
+        generation = self._generation
+        value = await self.l2.get(key)
+        if value is None:
+            self.l2_misses += 1
+            return None
+        self.l2_hits += 1
+        if subscribed and generation == self._generation:
+            self._l1_put(key, value)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """
+        Store a value in L2 and L1.
+
+        Args:
+            key: The cache key
+            value: The value to cache
+            ttl: Optional Time-To-Live in seconds. If None, entry doesn't expire
+        """
+        self._l1_drop([key])
+        subscribed = await self._ensure_subscribed()
+        generation = self._generation
+        await self.l2.set(key, value, ttl)
+        if subscribed and generation == self._generation:
+            self._l1_put(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        """
+        Delete a value from both tiers and from the other replicas' L1.
+
+        Args:
+            key: The cache key to delete
+        """
+        self._l1_drop([key])
+        await self.l2.delete(key)
+        await self._publish({"keys": [key]})
+
+    async def clear(self) -> None:
+        """Clear both tiers and the other replicas' L1."""
+        self._l1_clear()
+        await self.l2.clear()
+        await self._publish({"clear": True})
+
+    async def exists(self, key: str) -> bool:
+        """
+        Check if a key exists in L1 or L2.
+
+        Args:
+            key: The cache key to check
+
+        Returns:
+            True if the key exists and is not expired, False otherwise
+        """
+        return self._l1_get(key) is not None or await self.l2.exists(key)
+
+    async def keys(self, pattern: str | None = None) -> list[str]:
+        """
+        Get all cache keys from L2, optionally filtered by pattern.
+
+        Args:
+            pattern: Optional pattern to match keys (supports wildcards like '*')
+
+        Returns:
+            List of matching cache keys
+        """
+        return await self.l2.keys(pattern)
+
+    def size(self) -> int:
+        """
+        Get the current number of L2 entries.
+
+        Returns:
+            Result of the L2 backend's size()
+        """
+        return self.l2.size()
+
+    async def async_size(self) -> int:
+        """
+        Get the current number of L2 entries asynchronously.
+
+        Returns:
+            Number of entries in the Redis database
+        """
+        return await self.l2.async_size()
+
+    async def cleanup_expired(self) -> int:
+        """
+        Drop expired L1 entries and clean up L2.
+
+        Returns:
+            Number of expired entries removed
+        """
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._l1.items() if now >= expires_at]
+        for key in expired:
+            del self._l1[key]
+        return await self.l2.cleanup_expired()
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """
+        Retrieve several values, fetching L1 misses with one L2 round trip.
+
+        Args:
+            keys: The cache keys to retrieve
+
+        Returns:
+            Dictionary of the keys that were found to their values
+        """
+        values: dict[str, Any] = {}
+        missing: list[str] = []
+        for key in keys:
+            value = self._l1_get(key)
+            if value is not None:
+                values[key] = value
+            else:
+                missing.append(key)
+        self.l1_hits += len(values)
+        self.l1_misses += len(missing)
+        if not missing:
+            return values
+
+        subscribed = await self._ensure_subscribed()
+        generation = self._generation
+        fetched = await self.l2.get_many(missing)
+        self.l2_hits += len(fetched)
+        self.l2_misses += len(missing) - len(fetched)
+        if subscribed and generation == self._generation:
+            for key, value in fetched.items():
+                self._l1_put(key, value)
+        values.update(fetched)
+        return values
+
+    async def set_many(self, items: dict[str, Any], ttl: int | None = None) -> None:
+        """
+        Store several values in L2 and L1.
+
+        Args:
+            items: Dictionary of cache keys to values
+            ttl: Optional Time-To-Live in seconds. If None, entries don't expire
+        """
+        self._l1_drop(list(items))
+        subscribed = await self._ensure_subscribed()
+        generation = self._generation
+        await self.l2.set_many(items, ttl)
+        if subscribed and generation == self._generation:
+            for key, value in items.items():
+                self._l1_put(key, value, ttl)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        """
+        Delete several values from both tiers and from the other replicas' L1.
+
+        Args:
+            keys: The cache keys to delete
+        """
+        if not keys:
+            return
+        self._l1_drop(keys)
+        await self.l2.delete_many(keys)
+        await self._publish({"keys": keys})
+
+    async def delete_pattern(self, pattern: str) -> list[str]:
+        """
+        Delete the keys matching a pattern from both tiers and from the other
+        replicas' L1.
+
+        Args:
+            pattern: Pattern to match keys (supports wildcards like '*')
+
+        Returns:
+            List of the L2 keys that were deleted
+        """
+        self._l1_drop_pattern(pattern)
+        deleted = await self.l2.delete_pattern(pattern)
+        # Published even if L2 had no match: L1 copies may outlive their L2 entry
+        await self._publish({"pattern": pattern})
+        return deleted
+
+    def get_tier_statistics(self) -> dict[str, Any]:
+        """
+        Get per-tier hit statistics.
+
+        Returns:
+            Dictionary with:
+            - l1: hits, misses and hit rate of all lookups, size, limits and evictions
+            - l2: hits, misses and hit rate of the lookups that missed L1
+            - subscribed: Whether invalidations are being received
+            - invalidations_received: Invalidations applied from other replicas
+        """
+        l1_lookups = self.l1_hits + self.l1_misses
+        l2_lookups = self.l2_hits + self.l2_misses
+        return {
+            "l1": {
+                "hits": self.l1_hits,
+                "misses": self.l1_misses,
+                "hit_rate": round(self.l1_hits / l1_lookups, 3) if l1_lookups else 0.0,
+                "size": len(self._l1),
+                "max_size": self.l1_max_size,
+                "evictions": self.evictions,
+                "ttl": self.l1_ttl,
+            },
+            "l2": {
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "hit_rate": round(self.l2_hits / l2_lookups, 3) if l2_lookups else 0.0,
+            },
+            "subscribed": self._listener is not None and not self._listener.done(),
+            "invalidations_received": self.invalidations_received,
+        }
+
+    async def close(self) -> None:
+        """Stop listening for invalidations and close the Redis connections."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        await self._close_pubsub()
+        self._l1.clear()
+        await self.l2.close()
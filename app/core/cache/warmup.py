@@ -0,0 +1,144 @@
+"""Cache warmup for hass-mcp.
+
+This module prefetches frequently used endpoints when the server starts, so
+the first requests after a restart are served from the cache instead of all
+paying full Home Assistant latency at once. Endpoints are fetched through
+their cached API functions, concurrently and bounded by
+HASS_MCP_MAX_CONCURRENCY.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any
+
+from app.config import CACHE_WARMUP, CACHE_WARMUP_TIMEOUT
+from app.core.concurrency import gather_with_concurrency
+
+logger = logging.getLogger(__name__)
+
+# Warmup endpoint names and the cached API functions (module:function) they call
+WARMUP_ENDPOINTS: dict[str, str] = {
+    "states": "app.api.entities:get_all_states",
+    "areas": "app.api.areas:get_areas",
+    "floors": "app.api.floors:get_floors",
+    "labels": "app.api.labels:get_labels",
+    "devices": "app.api.devices:get_devices",
+    "automations": "app.api.automations:get_automations",
+    "scripts": "app.api.scripts:get_scripts",
+    "scenes": "app.api.scenes:get_scenes",
+    "services": "app.api.services:get_service_definitions",
+    "helpers": "app.api.helpers:list_helpers",
+    "integrations": "app.api.integrations:get_integrations",
+    "zones": "app.api.zones:list_zones",
+    "config": "app.api.system:get_core_config",
+}
+
+# Endpoints warmed by HASS_MCP_CACHE_WARMUP=default
+DEFAULT_WARMUP = ["states", "areas", "devices", "automations", "services"]
+
+
+def _is_error(result: Any) -> bool:
+    """Check whether a result is an error response from handle_api_errors."""
+    if isinstance(result, dict):
+        return "error" in result
+    if isinstance(result, list) and len(result) == 1 and isinstance(result[0], dict):
+        return "error" in result[0]
+    return False
+
+
+async def _fetch(name: str) -> Any:
+    """
+    Call the cached API function of a warmup endpoint.
+
+    Args:
+        name: Warmup endpoint name (a key of WARMUP_ENDPOINTS)
+
+    Returns:
+        The function's result
+    """
+    module_name, function_name = WARMUP_ENDPOINTS[name].split(":")
+    # Imported lazily: the API modules import the cache package
+    function = getattr(importlib.import_module(module_name), function_name)
+    return await function()
+
+
+async def warm_cache(
+    endpoints: list[str] | None = None, timeout: float | None = None
+) -> dict[str, Any]:
+    """
+    Prefetch endpoints concurrently to fill the cache.
+
+    Args:
+        endpoints: Warmup endpoint names ("default" expands to DEFAULT_WARMUP,
+                   "all" to every endpoint); defaults to HASS_MCP_CACHE_WARMUP
+        timeout: Seconds after which unfinished fetches are abandoned
+                 (default: HASS_MCP_CACHE_WARMUP_TIMEOUT)
+
+    Returns:
+        Dictionary with:
+        - warmed: Endpoints that were fetched and cached
+        - failed: Endpoints that failed, mapped to their error
+        - unknown: Requested names that are not warmup endpoints
+        - duration_ms: Total warmup time
+
+    Example:
+        result = await warm_cache(["states", "areas"])
+        # {"warmed": ["states", "areas"], "failed": {}, "unknown": [], "duration_ms": 84.2}
+    """
+    requested = CACHE_WARMUP if endpoints is None else endpoints
+    names: list[str] = []
+    unknown: list[str] = []
+    for name in requested:
+        expanded = {"default": DEFAULT_WARMUP, "all": list(WARMUP_ENDPOINTS)}.get(name, [name])
+        for endpoint in expanded:
+            if endpoint not in WARMUP_ENDPOINTS:
+                unknown.append(endpoint)
+            elif endpoint not in names:
+                names.append(endpoint)
+    if unknown:
+        logger.warning(f"Unknown cache warmup endpoints: {', '.join(unknown)}")
+
+    start_time = time.time()
+    results: dict[str, Any] = {}
+
+    async def _warm(name: str) -> None:
+        try:
+            results[name] = await _fetch(name)
+        except Exception as e:
+            results[name] = e
+
+    if names:
+        try:
+            await asyncio.wait_for(
+                gather_with_concurrency(_warm(name) for name in names),
+                timeout=timeout if timeout is not None else CACHE_WARMUP_TIMEOUT,
+            )
+        except TimeoutError:
+            logger.warning("Cache warmup timed out; unfinished endpoints were skipped")
+
+    warmed: list[str] = []
+    failed: dict[str, str] = {}
+    for name in names:
+        result = results.get(name, TimeoutError("timed out"))
+        if isinstance(result, Exception):
+            failed[name] = str(result) or type(result).__name__
+        elif _is_error(result):
+            failed[name] = str((result[0] if isinstance(result, list) else result)["error"])
+        else:
+            warmed.append(name)
+
+    duration_ms = (time.time() - start_time) * 1000
+    if names:
+        logger.info(
+            f"Cache warmup finished in {duration_ms:.0f}ms: "
+            f"{len(warmed)} warmed, {len(failed)} failed",
+            extra={"warmed": warmed, "failed": failed},
+        )
+    return {
+        "warmed": warmed,
+        "failed": failed,
+        "unknown": unknown,
+        "duration_ms": round(duration_ms, 1),
+    }
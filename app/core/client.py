@@ -8,6 +8,7 @@ import logging
 import httpx
 
 from app.config import get_ssl_verify_value
+from app.core.telemetry import InstrumentedTransport
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,9 @@ async def get_client() -> httpx.AsyncClient:
     - "false": Disable SSL verification (useful for self-signed certificates)
     - "/path/to/ca.pem": Use custom CA certificate bundle
 
+    Every request is recorded in the performance metrics (latency by endpoint
+    and status, requests in flight).
+
     Returns:
         An httpx.AsyncClient instance
 
@@ -38,7 +42,9 @@ async def get_client() -> httpx.AsyncClient:
     if _client is None:
         ssl_verify = get_ssl_verify_value()
         logger.debug(f"Creating new HTTP client with SSL verify: {ssl_verify}")
-        _client = httpx.AsyncClient(timeout=10.0, verify=ssl_verify)
+        # Requests are timed by endpoint and status for the performance metrics
+        transport = InstrumentedTransport(httpx.AsyncHTTPTransport(verify=ssl_verify))
+        _client = httpx.AsyncClient(timeout=10.0, verify=ssl_verify, transport=transport)
     return _client
 
 
@@ -0,0 +1,51 @@
+"""Concurrency helpers for hass-mcp.
+
+This module provides bounded fan-out utilities so that bulk operations
+(e.g., fetching every automation config) run concurrently without
+flooding Home Assistant with an unbounded number of requests.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Iterable
+from typing import Any, TypeVar
+
+from app.config import HA_MAX_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def gather_with_concurrency(
+    aws: Iterable[Awaitable[T]],
+    limit: int | None = None,
+    return_exceptions: bool = False,
+) -> list[Any]:
+    """
+    Await a collection of awaitables with at most ``limit`` running at once.
+
+    Results are returned in the same order as the input, like asyncio.gather.
+
+    Args:
+        aws: Awaitables (typically coroutines) to run
+        limit: Maximum number of awaitables in flight (default: HASS_MCP_MAX_CONCURRENCY)
+        return_exceptions: If True, exceptions are returned in the result list
+                           instead of being raised
+
+    Returns:
+        List of results in input order
+
+    Examples:
+        configs = await gather_with_concurrency(
+            (get_automation_config(a["id"]) for a in automations), limit=8
+        )
+    """
+    max_in_flight = limit if limit and limit > 0 else HA_MAX_CONCURRENCY
+    semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def _run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in aws), return_exceptions=return_exceptions)
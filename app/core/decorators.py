@@ -6,12 +6,16 @@ This module provides decorators for async handlers and error handling.
 import functools
 import inspect
 import logging
+import time
 from collections.abc import Awaitable, Callable
 from typing import Any, TypeVar, cast
 
 import httpx
 
 from app.config import HA_TOKEN, HA_URL
+from app.core.cache.metrics import get_cache_metrics
+from app.core.profiling import get_tool_profiler
+from app.core.tracing import trace_tool
 
 logger = logging.getLogger(__name__)
 
@@ -92,10 +96,14 @@ def handle_api_errors(func: F) -> F:
 
 def async_handler(command_type: str):
     """
-    Simple decorator that logs command execution.
+    Decorator that logs, times, traces and profiles command execution.
 
     This decorator adds logging to async functions, typically MCP tools,
-    to track when commands are executed.
+    to track when commands are executed. It is also their instrumentation
+    point: each call's duration goes to the per-tool latency histograms of
+    the cache metrics, its span tree (cache lookups, Home Assistant requests,
+    vector DB operations) to the trace recorder and OpenTelemetry, and
+    sampled calls are profiled when HASS_MCP_PROFILE_DIR is set.
 
     Args:
         command_type: The type of command (for logging)
@@ -114,7 +122,15 @@ def async_handler(command_type: str):
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
             logger.info(f"Executing command: {command_type}")
-            return await func(*args, **kwargs)
+            start_time = time.time()
+            try:
+                with trace_tool(command_type):
+                    async with get_tool_profiler().profile(command_type):
+                        return await func(*args, **kwargs)
+            finally:
+                get_cache_metrics().record_tool_call(
+                    command_type, (time.time() - start_time) * 1000
+                )
 
         return cast(Callable[..., Awaitable[T]], wrapper)
 
@@ -0,0 +1,308 @@
+"""Error log index for hass-mcp.
+
+This module parses Home Assistant's error log into records (timestamp, level,
+logger, integration and message) and keeps the most recent ones in a ring
+buffer indexed by level and integration. Text is fed incrementally as the log
+grows, so every line is parsed once and filters and counts become index
+lookups instead of rescanning the whole log.
+"""
+
+import re
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.config import ERROR_LOG_MAX_RECORDS
+
+# Log levels treated as errors
+ERROR_LEVELS = frozenset({"ERROR", "CRITICAL", "FATAL"})
+
+# Header line of a log record, e.g.
+# 2025-01-01 12:00:00.123 ERROR (MainThread) [homeassistant.components.hue] Connection failed
+_RECORD_RE = re.compile(
+    r"^(?P<timestamp>\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?)?)\s+"
+    r"(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL|FATAL)\s+"
+    r"(?:\((?P<thread>[^)]*)\)\s+)?"
+    r"\[(?P<logger>[^\]]+)\]\s?(?P<message>.*)$"
+)
+
+# Logger names that identify an integration
+_INTEGRATION_RE = re.compile(r"^(?:homeassistant\.components|custom_components)\.([a-zA-Z0-9_]+)")
+
+
+class ErrorLogUnavailable(Exception):
+    """Raised when the error log cannot be retrieved from Home Assistant."""
+
+    def __init__(self, message: str, details: str = ""):
+        """
+        Initialize the exception.
+
+        Args:
+            message: Short description (e.g., '500 Internal Server Error')
+            details: Response body, if any
+        """
+        super().__init__(message)
+        self.details = details
+
+
+def integration_from_logger(logger_name: str | None) -> str | None:
+    """
+    Get the integration a logger belongs to.
+
+    Args:
+        logger_name: Logger name (e.g., 'homeassistant.components.hue.light' or 'mqtt')
+
+    Returns:
+        Integration domain (e.g., 'hue'), the logger name itself for short
+        undotted names, or None
+    """
+    if not logger_name:
+        return None
+    match = _INTEGRATION_RE.match(logger_name)
+    if match:
+        return match.group(1).lower()
+    if re.fullmatch(r"[a-zA-Z0-9_]+", logger_name):
+        return logger_name.lower()
+    return None
+
+
+@dataclass
+class ErrorLogRecord:
+    """A parsed error log record (header line plus any continuation lines)."""
+
+    seq: int
+    timestamp: str | None
+    level: str | None
+    logger: str | None
+    integration: str | None
+    message: str
+    lines: list[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """The record's raw text, including tracebacks."""
+        return "\n".join(self.lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the record as a dictionary.
+
+        Returns:
+            Dictionary with timestamp, level, logger, integration and message
+        """
+        return {
+            "timestamp": self.timestamp,
+            "level": self.level,
+            "logger": self.logger,
+            "integration": self.integration,
+            "message": self.message,
+        }
+
+
+class ErrorLogIndex:
+    """
+    Ring buffer of parsed error log records with level and integration indexes.
+
+    Records get increasing sequence numbers; the level and integration indexes
+    hold sequence numbers in order, so evicting the oldest record only pops
+    from the left of the relevant index entries. Counts are kept up to date as
+    records are added and evicted.
+    """
+
+    def __init__(self, max_records: int = ERROR_LOG_MAX_RECORDS):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_records: Maximum number of records kept (oldest are evicted first)
+        """
+        self.max_records = max_records
+        self._records: dict[int, ErrorLogRecord] = {}
+        self._by_level: dict[str, deque[int]] = {}
+        self._by_integration: dict[str, deque[int]] = {}
+        self.level_counts: Counter[str] = Counter()
+        self.integration_counts: Counter[str] = Counter()
+        self._next_seq = 0
+        self._first_seq = 0
+        # Rollback information for a trailing line that had no newline yet
+        self._provisional: tuple[str, int, int] | None = None
+        # Byte offset of the text fed so far, maintained by the caller
+        self.offset = 0
+        self.tail = ""
+
+    def __len__(self) -> int:
+        """Number of records in the buffer."""
+        return len(self._records)
+
+    def clear(self) -> None:
+        """Remove every record and reset the offset."""
+        self._records.clear()
+        self._by_level.clear()
+        self._by_integration.clear()
+        self.level_counts.clear()
+        self.integration_counts.clear()
+        self._first_seq = self._next_seq
+        self._provisional = None
+        self.offset = 0
+        self.tail = ""
+
+    def _add(self, record: ErrorLogRecord) -> None:
+        self._records[record.seq] = record
+        if record.level:
+            self._by_level.setdefault(record.level, deque()).append(record.seq)
+            self.level_counts[record.level] += 1
+        if record.integration:
+            self._by_integration.setdefault(record.integration, deque()).append(record.seq)
+            self.integration_counts[record.integration] += 1
+
+        while len(self._records) > self.max_records:
+            self._remove(self._first_seq, from_left=True)
+
+    def _remove(self, seq: int, from_left: bool) -> None:
+        record = self._records.pop(seq, None)
+        if from_left:
+            self._first_seq = seq + 1
+        if record is None:
+            return
+        for key, postings, counts in (
+            (record.level, self._by_level, self.level_counts),
+            (record.integration, self._by_integration, self.integration_counts),
+        ):
+            if not key:
+                continue
+            if from_left:
+                postings[key].popleft()
+            else:
+                postings[key].pop()
+            counts[key] -= 1
+            if not postings[key]:
+                del postings[key]
+                del counts[key]
+
+    def _rollback(self) -> None:
+        """Undo the effect of the last unterminated line."""
+        if self._provisional is None:
+            return
+        kind, seq, length = self._provisional
+        self._provisional = None
+        if kind == "record":
+            self._remove(seq, from_left=False)
+            self._next_seq = seq
+        elif seq in self._records:
+            del self._records[seq].lines[length:]
+
+    def feed(self, text: str) -> int:
+        """
+        Parse new log text and add its records.
+
+        Lines that do not start a record (tracebacks, wrapped messages) are
+        appended to the previous record. A final line without a trailing
+        newline is indexed provisionally and undone by the next ``feed``,
+        which is expected to start with that line again.
+
+        Args:
+            text: New log text, starting at a line boundary
+
+        Returns:
+            Number of new records
+        """
+        self._rollback()
+        if not text:
+            return 0
+
+        lines = text.split("\n")
+        unterminated = lines.pop() if lines else ""
+        added = 0
+        for line in lines:
+            added += self._feed_line(line)
+        if unterminated:
+            last = self._records.get(self._next_seq - 1)
+            length = len(last.lines) if last is not None else 0
+            if self._feed_line(unterminated):
+                added += 1
+                self._provisional = ("record", self._next_seq - 1, 0)
+            else:
+                self._provisional = ("continuation", self._next_seq - 1, length)
+        return added
+
+    def _feed_line(self, line: str) -> int:
+        line = line.rstrip("\r")
+        match = _RECORD_RE.match(line)
+        last = self._records.get(self._next_seq - 1)
+        if match is None and last is not None:
+            last.lines.append(line)
+            return 0
+
+        if match is None:
+            record = ErrorLogRecord(self._next_seq, None, None, None, None, line.strip(), [line])
+        else:
+            logger_name = match.group("logger")
+            record = ErrorLogRecord(
+                seq=self._next_seq,
+                timestamp=match.group("timestamp"),
+                level="CRITICAL" if match.group("level") == "FATAL" else match.group("level"),
+                logger=logger_name,
+                integration=integration_from_logger(logger_name),
+                message=match.group("message"),
+                lines=[line],
+            )
+        self._next_seq += 1
+        self._add(record)
+        return 1
+
+    def records(
+        self, level: str | None = None, integration: str | None = None
+    ) -> list[ErrorLogRecord]:
+        """
+        Get records, oldest first, optionally filtered by level and integration.
+
+        Args:
+            level: Only records of this level (e.g., 'ERROR')
+            integration: Only records of this integration (e.g., 'hue')
+
+        Returns:
+            Matching records in log order
+        """
+        candidates: list[set[int] | None] = []
+        if level:
+            candidates.append(set(self._by_level.get(level.upper(), ())))
+        if integration:
+            candidates.append(set(self._by_integration.get(integration.lower(), ())))
+
+        if not candidates:
+            return list(self._records.values())
+        seqs = set.intersection(*candidates)  # type: ignore[arg-type]
+        return [self._records[seq] for seq in sorted(seqs)]
+
+    def get_statistics(self) -> dict[str, Any]:
+        """
+        Get buffer statistics.
+
+        Returns:
+            Dictionary with record count, capacity, byte offset and counts per
+            level and integration
+        """
+        return {
+            "records": len(self._records),
+            "max_records": self.max_records,
+            "offset": self.offset,
+            "levels": dict(self.level_counts),
+            "integrations": dict(self.integration_counts),
+        }
+
+
+# Global error log index instance
+_error_log_index: ErrorLogIndex | None = None
+
+
+def get_error_log_index() -> ErrorLogIndex:
+    """
+    Get the global error log index instance (singleton pattern).
+
+    Returns:
+        The ErrorLogIndex instance
+    """
+    global _error_log_index
+    if _error_log_index is None:
+        _error_log_index = ErrorLogIndex()
+    return _error_log_index
@@ -0,0 +1,167 @@
+"""Sampling profiler for slow tool calls.
+
+When HASS_MCP_PROFILE_DIR is set, sampled MCP tool calls run under cProfile
+and the profiles of the slowest HASS_MCP_PROFILE_TOP_N calls are kept in that
+directory as ``<tool>-<timestamp>-<duration>ms.prof`` files (open them with
+``python -m pstats`` or snakeviz). A profile that drops out of the top N is
+deleted.
+
+cProfile profiles the whole thread, so other tasks running on the event loop
+during a profiled call show up in its profile. Only one call is profiled at a
+time. Profiles are written and deleted in a worker thread, so disk I/O never
+blocks the event loop.
+"""
+
+import asyncio
+import cProfile
+import heapq
+import logging
+import random
+import re
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from app.config import PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_TOP_N
+
+logger = logging.getLogger(__name__)
+
+
+class ToolProfiler:
+    """Profiles sampled tool calls and keeps the slowest profiles on disk."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        top_n: int = PROFILE_TOP_N,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+    ) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            directory: Directory receiving the profiles (None or "" disables)
+            top_n: Number of slowest profiles kept
+            sample_rate: Fraction of calls profiled, between 0 and 1
+        """
+        self.directory = Path(directory) if directory else None
+        self.top_n = top_n
+        self.sample_rate = sample_rate
+        self._lock = Lock()
+        self._active = False
+        self._kept: list[tuple[float, str, str]] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Whether calls are being profiled."""
+        return self.directory is not None and self.top_n > 0 and self.sample_rate > 0
+
+    def _acquire(self) -> bool:
+        """Claim the profiler for one call, if this call is sampled and it is free."""
+        if not self.enabled or random.random() >= self.sample_rate:  # noqa: S311
+            return False
+        with self._lock:
+            if self._active:
+                return False
+            self._active = True
+            return True
+
+    @asynccontextmanager
+    async def profile(self, tool: str) -> AsyncIterator[None]:
+        """
+        Profile a tool call if it is sampled and no other call is being profiled.
+
+        Args:
+            tool: Tool name, used in the profile file name
+        """
+        if not self._acquire():
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger or coverage tool) is active
+            with self._lock:
+                self._active = False
+            yield
+            return
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            with self._lock:
+                self._active = False
+            await self._keep(tool, duration_ms, profiler)
+
+    def _write(self, profiler: cProfile.Profile, path: Path) -> None:
+        """Write a profile to disk (runs in a worker thread)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+
+    async def _keep(self, tool: str, duration_ms: float, profiler: cProfile.Profile) -> None:
+        """Write the profile if it is among the slowest, deleting the one it displaces."""
+        assert self.directory is not None
+        with self._lock:
+            if len(self._kept) >= self.top_n and duration_ms <= self._kept[0][0]:
+                return
+        safe_tool = re.sub(r"[^A-Za-z0-9_.-]", "_", tool)
+        path = self.directory / f"{safe_tool}-{int(time.time() * 1000)}-{duration_ms:.0f}ms.prof"
+        try:
+            await asyncio.to_thread(self._write, profiler, path)
+        except OSError as e:
+            logger.warning(f"Failed to write profile {path}: {e}")
+            return
+
+        # Another profile may have been kept during the write; the fastest one drops out
+        entry = (duration_ms, str(path), tool)
+        displaced = None
+        with self._lock:
+            if len(self._kept) >= self.top_n:
+                displaced = heapq.heappushpop(self._kept, entry)
+            else:
+                heapq.heappush(self._kept, entry)
+        if displaced is not None:
+            await asyncio.to_thread(Path(displaced[1]).unlink, missing_ok=True)
+        if displaced is not entry:
+            logger.info(f"Profiled slow {tool} call ({duration_ms:.0f}ms): {path}")
+
+    def get_profiles(self) -> list[dict[str, Any]]:
+        """
+        Get the kept profiles, slowest first.
+
+        Returns:
+            List of dictionaries with tool, duration_ms and path
+        """
+        with self._lock:
+            kept = sorted(self._kept, reverse=True)
+        return [
+            {"tool": tool, "duration_ms": round(duration_ms, 2), "path": path}
+            for duration_ms, path, tool in kept
+        ]
+
+
+# Global profiler instance
+_tool_profiler: ToolProfiler | None = None
+
+
+def get_tool_profiler() -> ToolProfiler:
+    """
+    Get the global tool profiler instance (singleton pattern).
+
+    Returns:
+        The ToolProfiler instance, configured from HASS_MCP_PROFILE_*
+    """
+    global _tool_profiler
+
+    if _tool_profiler is None:
+        _tool_profiler = ToolProfiler(PROFILE_DIR)
+
+    return _tool_profiler
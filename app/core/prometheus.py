@@ -0,0 +1,192 @@
+"""Prometheus metrics export for hass-mcp.
+
+This module renders the cache, Home Assistant request, vector DB and tool
+metrics in the Prometheus text exposition format. The sse and
+streamable-http transports serve it on ``/metrics``; with the stdio transport
+it can be written to a file for node_exporter's textfile collector.
+Latencies are exported as histograms in seconds, using the fixed buckets of
+the in-process latency histograms.
+"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import app.core.cache.manager as manager_module
+from app.core.cache.metrics import LATENCY_BUCKETS_MS, LatencyHistogram, get_cache_metrics
+from app.core.telemetry import get_performance_metrics
+
+logger = logging.getLogger(__name__)
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prefix of every exported metric name
+METRIC_PREFIX = "hass_mcp_"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    """Format a label set, e.g. {endpoint="entities:get_entities"}."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    """Format a sample value."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Exposition:
+    """Builder for a text exposition, one metric family at a time."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def family(self, name: str, metric_type: str, help_text: str) -> str:
+        """Start a metric family and return its full name."""
+        full_name = METRIC_PREFIX + name
+        self.lines.append(f"# HELP {full_name} {help_text}")
+        self.lines.append(f"# TYPE {full_name} {metric_type}")
+        return full_name
+
+    def sample(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
+        """Add a sample."""
+        self.lines.append(f"{name}{_labels(labels or {})} {_number(value)}")
+
+    def histogram(self, name: str, histogram: LatencyHistogram, labels: dict[str, str]) -> None:
+        """Add the samples of a millisecond histogram, converted to seconds."""
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, histogram.counts, strict=False):
+            cumulative += count
+            self.sample(f"{name}_bucket", cumulative, {**labels, "le": f"{bound / 1000:g}"})
+        self.sample(f"{name}_bucket", histogram.count, {**labels, "le": "+Inf"})
+        self.sample(f"{name}_sum", histogram.sum / 1000, labels)
+        self.sample(f"{name}_count", histogram.count, labels)
+
+    def render(self) -> str:
+        """Get the exposition text."""
+        return "\n".join(self.lines) + "\n"
+
+
+def _render_cache(out: _Exposition) -> None:
+    """Add the cache counters and latency histograms."""
+    cache_metrics = get_cache_metrics()
+    endpoints = cache_metrics.export_endpoint_stats()
+
+    for field, help_text in (
+        ("hits", "Cache hits"),
+        ("misses", "Cache misses"),
+        ("sets", "Cache writes"),
+        ("deletes", "Cache deletes"),
+    ):
+        name = out.family(f"cache_{field}_total", "counter", f"{help_text} by endpoint")
+        for endpoint, stats in sorted(endpoints.items()):
+            out.sample(name, getattr(stats, field), {"endpoint": endpoint})
+
+    name = out.family("cache_invalidations_total", "counter", "Cache invalidation operations")
+    out.sample(name, cache_metrics.get_total_invalidations())
+
+    # Synchronous: read the existing manager instead of creating one
+    manager = manager_module._cache_manager
+    backend = manager._backend if manager is not None else None
+    if backend is not None and hasattr(backend, "evictions"):
+        name = out.family("cache_evictions_total", "counter", "Cache entries evicted for size")
+        out.sample(name, backend.evictions)
+    if backend is not None and hasattr(backend, "size"):
+        name = out.family("cache_entries", "gauge", "Entries in the cache")
+        out.sample(name, backend.size())
+
+    name = out.family(
+        "cache_lookup_duration_seconds", "histogram", "Cache lookup latency by endpoint and result"
+    )
+    for endpoint, stats in sorted(endpoints.items()):
+        out.histogram(name, stats.cache_hit_latency, {"endpoint": endpoint, "result": "hit"})
+        out.histogram(name, stats.cache_miss_latency, {"endpoint": endpoint, "result": "miss"})
+
+    name = out.family(
+        "cache_upstream_duration_seconds",
+        "histogram",
+        "Latency of the API calls made on cache misses, by endpoint",
+    )
+    for endpoint, stats in sorted(endpoints.items()):
+        out.histogram(name, stats.api_latency, {"endpoint": endpoint})
+
+    name = out.family(
+        "cached_call_duration_seconds",
+        "histogram",
+        "End-to-end latency of cached API functions, hit or miss, by endpoint",
+    )
+    for endpoint, stats in sorted(endpoints.items()):
+        out.histogram(name, stats.total_latency, {"endpoint": endpoint})
+
+
+def render_metrics() -> str:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    Returns:
+        The exposition text
+
+    Example:
+        # HELP hass_mcp_cache_hits_total Cache hits by endpoint
+        # TYPE hass_mcp_cache_hits_total counter
+        hass_mcp_cache_hits_total{endpoint="entities:get_entities"} 42
+    """
+    out = _Exposition()
+    _render_cache(out)
+
+    performance = get_performance_metrics()
+    name = out.family(
+        "ha_request_duration_seconds",
+        "histogram",
+        "Home Assistant API latency until response headers, by method, endpoint and status",
+    )
+    for (method, endpoint, status), histogram in sorted(performance.export_ha_requests().items()):
+        out.histogram(name, histogram, {"method": method, "endpoint": endpoint, "status": status})
+
+    name = out.family("ha_requests_in_flight", "gauge", "Home Assistant API requests in flight")
+    out.sample(name, performance.get_in_flight())
+
+    name = out.family(
+        "vectordb_operation_duration_seconds", "histogram", "Vector DB latency by operation"
+    )
+    for operation, histogram in sorted(performance.export_vectordb().items()):
+        out.histogram(name, histogram, {"operation": operation})
+
+    name = out.family("tool_call_duration_seconds", "histogram", "MCP tool call latency by tool")
+    for tool, histogram in sorted(get_cache_metrics().export_tool_histograms().items()):
+        out.histogram(name, histogram, {"tool": tool})
+
+    return out.render()
+
+
+def write_metrics_textfile(path: str | Path) -> None:
+    """
+    Write the metrics to a file, for node_exporter's textfile collector.
+
+    The file is replaced atomically so the collector never reads a partial file.
+
+    Args:
+        path: Output file path (the collector expects a ``.prom`` extension)
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    data = render_metrics().encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
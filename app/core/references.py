@@ -0,0 +1,356 @@
+"""Reference index for hass-mcp.
+
+This module provides an inverted index from the things automations, scripts
+and scenes refer to (entities, devices, areas, tags and services) back to the
+items that reference them. Configs are walked once when they are indexed, so
+dependency questions become dictionary lookups instead of rescanning every
+config with string searches.
+"""
+
+import logging
+import re
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Reference types tracked by the index
+REFERENCE_TYPES = ("entity_id", "device_id", "area_id", "tag_id", "service")
+
+# Item kinds that can reference other things
+ITEM_KINDS = ("automation", "script", "scene")
+
+# Keys that are not part of an item's own configuration
+# (get_script_config merges the live entity state under "entity")
+_SKIPPED_KEYS = frozenset({"entity"})
+
+# Keys that hold entity/device/area/tag IDs (string, comma-separated string or list)
+_ID_KEYS = frozenset({"entity_id", "device_id", "area_id", "tag_id"})
+
+# Keys that hold a service call ("action" is the newer spelling of "service")
+_SERVICE_KEYS = frozenset({"service", "action"})
+
+# Script services that are not calls to a specific script
+_SCRIPT_SERVICES = frozenset({"turn_on", "turn_off", "toggle", "reload"})
+
+# Entity IDs mentioned in templates, e.g. states('light.x') or states.light.x.state
+_TEMPLATE_ENTITY_RE = re.compile(r"(?<![\w.])(?:states\.)?([a-z_][a-z0-9_]*\.[a-z0-9_]+)")
+
+# Template variables whose attribute access looks like an entity ID
+_TEMPLATE_NAMES = frozenset(
+    {"states", "state_attr", "trigger", "this", "repeat", "wait", "context", "value_json"}
+)
+
+
+def _template_entities(template: str) -> set[str]:
+    """Find the entity IDs a template string mentions."""
+    return {
+        entity_id
+        for entity_id in _TEMPLATE_ENTITY_RE.findall(template)
+        if entity_id.partition(".")[0] not in _TEMPLATE_NAMES
+    }
+
+
+def _as_values(value: Any) -> list[str]:
+    """Normalize an ID field (string, comma-separated string or list) to a list."""
+    if isinstance(value, str):
+        candidates = value.split(",")
+    elif isinstance(value, list):
+        candidates = [v for v in value if isinstance(v, str)]
+    else:
+        return []
+    # Templates are scanned for entity IDs separately
+    return [v.strip() for v in candidates if v.strip() and "{{" not in v]
+
+
+def extract_references(config: Any) -> dict[str, set[str]]:
+    """
+    Walk a trigger/condition/action tree and collect everything it references.
+
+    Templates cannot be resolved statically, but the entity IDs they mention
+    (``{{ states('sensor.x') }}``, ``states.light.y.state``) are collected as
+    entity references, so templated conditions and service data still count
+    as dependencies.
+
+    Args:
+        config: Automation, script or scene configuration (nested dicts/lists)
+
+    Returns:
+        Dictionary mapping each reference type to the set of referenced values
+
+    Example response:
+        {
+            "entity_id": {"light.living_room", "script.bedtime"},
+            "device_id": set(),
+            "area_id": {"kitchen"},
+            "tag_id": {"ABC123"},
+            "service": {"light.turn_on", "script.bedtime"}
+        }
+    """
+    refs: dict[str, set[str]] = {ref_type: set() for ref_type in REFERENCE_TYPES}
+
+    stack = [config]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if "{{" in node:
+                refs["entity_id"].update(_template_entities(node))
+            continue
+        if isinstance(node, list):
+            stack.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        for key, value in node.items():
+            if key in _SKIPPED_KEYS:
+                continue
+            if key in _ID_KEYS:
+                refs[key].update(_as_values(value))
+            elif key in _SERVICE_KEYS and isinstance(value, str):
+                if "." in value and "{{" not in value:
+                    refs["service"].add(value)
+                    # Calling script.<name> directly references that script entity
+                    domain, _, name = value.partition(".")
+                    if domain == "script" and name not in _SCRIPT_SERVICES:
+                        refs["entity_id"].add(value)
+            elif key == "scene" and isinstance(value, str) and value.startswith("scene."):
+                refs["entity_id"].add(value)
+
+            if isinstance(value, (dict, list)) or (isinstance(value, str) and "{{" in value):
+                stack.append(value)
+
+    return refs
+
+
+class ReferenceIndex:
+    """
+    Inverted index from referenced values to the items referencing them.
+
+    Postings are stored as ``{ref_type: {value: {kind: {item_id, ...}}}}`` so
+    lookups are O(1) dictionary accesses. Each indexed item also keeps its
+    config and forward references, which lets ``sync`` re-index only the
+    items whose config actually changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty reference index."""
+        self._postings: dict[str, dict[str, dict[str, set[str]]]] = {
+            ref_type: {} for ref_type in REFERENCE_TYPES
+        }
+        self._configs: dict[str, dict[str, Any]] = {kind: {} for kind in ITEM_KINDS}
+        self._forward: dict[str, dict[str, dict[str, set[str]]]] = {kind: {} for kind in ITEM_KINDS}
+        self._sources: dict[str, Any] = {}
+        self.version = 0
+
+    @staticmethod
+    def _check_kind(kind: str) -> None:
+        if kind not in ITEM_KINDS:
+            raise ValueError(f"Invalid kind: {kind}. Valid kinds: {', '.join(ITEM_KINDS)}")
+
+    @staticmethod
+    def _check_ref_type(ref_type: str) -> None:
+        if ref_type not in REFERENCE_TYPES:
+            raise ValueError(
+                f"Invalid reference type: {ref_type}. Valid types: {', '.join(REFERENCE_TYPES)}"
+            )
+
+    def add_item(self, kind: str, item_id: str, config: Any) -> None:
+        """
+        Index (or re-index) a single item.
+
+        Args:
+            kind: Item kind ("automation", "script" or "scene")
+            item_id: Entity ID of the item (e.g., 'automation.morning')
+            config: The item's configuration
+        """
+        self._check_kind(kind)
+        self._unindex(kind, item_id)
+
+        refs = extract_references(config)
+        # An item never depends on itself
+        refs["entity_id"].discard(item_id)
+
+        for ref_type, values in refs.items():
+            postings = self._postings[ref_type]
+            for value in values:
+                postings.setdefault(value, {}).setdefault(kind, set()).add(item_id)
+
+        self._configs[kind][item_id] = config
+        self._forward[kind][item_id] = refs
+        self.version += 1
+
+    def remove_item(self, kind: str, item_id: str) -> None:
+        """
+        Remove an item from the index.
+
+        Args:
+            kind: Item kind ("automation", "script" or "scene")
+            item_id: Entity ID of the item
+        """
+        self._check_kind(kind)
+        if self._unindex(kind, item_id):
+            self.version += 1
+
+    def _unindex(self, kind: str, item_id: str) -> bool:
+        refs = self._forward[kind].pop(item_id, None)
+        self._configs[kind].pop(item_id, None)
+        if refs is None:
+            return False
+
+        for ref_type, values in refs.items():
+            postings = self._postings[ref_type]
+            for value in values:
+                by_kind = postings.get(value)
+                if not by_kind or kind not in by_kind:
+                    continue
+                by_kind[kind].discard(item_id)
+                if not by_kind[kind]:
+                    del by_kind[kind]
+                if not by_kind:
+                    del postings[value]
+        return True
+
+    def sync(self, kind: str, items: dict[str, Any], source: Any = None) -> int:
+        """
+        Bring one kind of items in line with a fresh snapshot.
+
+        Only items that were added, removed or whose config changed are
+        re-indexed. When ``source`` is the same object as the last synced
+        snapshot (e.g. an unchanged in-memory cache entry), nothing is done.
+
+        Args:
+            kind: Item kind ("automation", "script" or "scene")
+            items: Mapping of item entity_id to configuration
+            source: Optional object the snapshot was derived from, used as a
+                    cheap identity check for unchanged snapshots
+
+        Returns:
+            Number of items that were (re-)indexed or removed
+        """
+        self._check_kind(kind)
+        compare_source = source if source is not None else items
+        if kind in self._sources and self._sources[kind] is compare_source:
+            return 0
+
+        changed = 0
+        current = self._configs[kind]
+        for item_id in [i for i in current if i not in items]:
+            self._unindex(kind, item_id)
+            changed += 1
+        for item_id, config in items.items():
+            if item_id in current and current[item_id] == config:
+                continue
+            self.add_item(kind, item_id, config)
+            changed += 1
+
+        if changed:
+            self.version += 1
+            logger.debug(f"Reference index: re-indexed {changed} {kind}(s)")
+        self._sources[kind] = compare_source
+        return changed
+
+    def clear_kind(self, kind: str) -> None:
+        """
+        Drop every item of one kind and forget its last synced snapshot.
+
+        Args:
+            kind: Item kind ("automation", "script" or "scene")
+        """
+        self._check_kind(kind)
+        for item_id in list(self._configs[kind]):
+            self._unindex(kind, item_id)
+        self._sources.pop(kind, None)
+        self.version += 1
+
+    def mark_stale(self, kind: str) -> None:
+        """
+        Force the next ``sync`` of a kind to diff against its snapshot.
+
+        Args:
+            kind: Item kind ("automation", "script" or "scene")
+        """
+        self._check_kind(kind)
+        self._sources.pop(kind, None)
+
+    def clear(self) -> None:
+        """Remove everything from the index."""
+        for kind in ITEM_KINDS:
+            self.clear_kind(kind)
+
+    def lookup(self, ref_type: str, value: str, kind: str) -> set[str]:
+        """
+        Get the items of one kind that reference a value.
+
+        Args:
+            ref_type: Reference type (entity_id, device_id, area_id, tag_id or service)
+            value: The referenced value (e.g., 'light.living_room')
+            kind: Item kind ("automation", "script" or "scene")
+
+        Returns:
+            Set of item entity IDs (empty if nothing references the value)
+        """
+        self._check_ref_type(ref_type)
+        self._check_kind(kind)
+        by_kind = self._postings[ref_type].get(value)
+        if not by_kind:
+            return set()
+        return set(by_kind.get(kind, ()))
+
+    def get_references(self, kind: str, item_id: str) -> dict[str, set[str]] | None:
+        """
+        Get everything a single item references.
+
+        Args:
+            kind: Item kind ("automation", "script" or "scene")
+            item_id: Entity ID of the item
+
+        Returns:
+            Dictionary of reference type to values, or None if the item is not indexed
+        """
+        self._check_kind(kind)
+        return self._forward[kind].get(item_id)
+
+    def get_config(self, kind: str, item_id: str) -> Any | None:
+        """
+        Get the indexed configuration of an item.
+
+        Args:
+            kind: Item kind ("automation", "script" or "scene")
+            item_id: Entity ID of the item
+
+        Returns:
+            The configuration the item was indexed with, or None if not indexed
+        """
+        self._check_kind(kind)
+        return self._configs[kind].get(item_id)
+
+    def get_statistics(self) -> dict[str, Any]:
+        """
+        Get index size statistics.
+
+        Returns:
+            Dictionary with the index version, item counts per kind and
+            distinct referenced values per reference type
+        """
+        return {
+            "version": self.version,
+            "items": {kind: len(self._configs[kind]) for kind in ITEM_KINDS},
+            "references": {ref_type: len(self._postings[ref_type]) for ref_type in REFERENCE_TYPES},
+        }
+
+
+# Global reference index instance
+_reference_index: ReferenceIndex | None = None
+
+
+def get_reference_index() -> ReferenceIndex:
+    """
+    Get the global reference index instance (singleton pattern).
+
+    Returns:
+        The ReferenceIndex instance
+    """
+    global _reference_index
+    if _reference_index is None:
+        _reference_index = ReferenceIndex()
+    return _reference_index
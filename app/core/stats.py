@@ -0,0 +1,493 @@
+"""Streaming statistics for hass-mcp.
+
+This module provides single-pass, bounded-memory summaries of numeric
+streams: Welford's algorithm for mean/variance and the P² algorithm
+(Jain & Chlamtac, 1985) for quantiles. They let history statistics be
+computed while the history response is being parsed, without collecting
+and sorting every data point. When the optional ``numpy`` package is
+installed, ArrayStatistics offers a vectorized alternative that buffers up
+to EXACT_QUANTILE_LIMIT values in a compact array and reduces them in one go.
+"""
+
+import math
+from array import array
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+# Number of values kept for exact quantiles before switching to P² estimates
+EXACT_QUANTILE_LIMIT = 10_000
+
+# Quantiles reported by StreamingStatistics.to_dict()
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+# Day names indexed by weekday (Monday is 0, like datetime.weekday())
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# 1970-01-01 was a Thursday
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_WEEKDAY = 3
+
+
+def numpy_available() -> bool:
+    """
+    Check whether the NumPy reduction can be used.
+
+    Returns:
+        True if the optional ``numpy`` package is installed
+    """
+    return np is not None
+
+
+def _interpolated_quantile(sorted_values: list[float], p: float) -> float:
+    """Linearly interpolated quantile of an already sorted list."""
+    position = (len(sorted_values) - 1) * p
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+class RunningStats:
+    """
+    Running count, min, max, mean and variance (Welford's algorithm).
+
+    Numerically stable and O(1) memory regardless of how many values are pushed.
+    """
+
+    __slots__ = ("_m2", "count", "max", "mean", "min")
+
+    def __init__(self) -> None:
+        """Initialize empty running statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value: The value to add
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0.0 with fewer than two values)."""
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation (0.0 with fewer than two values)."""
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of a single quantile using the P² algorithm.
+
+    Keeps five markers whose heights are adjusted with piecewise-parabolic
+    interpolation as values arrive, so memory is constant. With five or fewer
+    values the result is exact.
+    """
+
+    __slots__ = ("_dn", "_heights", "_initial", "_desired", "_positions", "p")
+
+    def __init__(self, p: float):
+        """
+        Initialize the estimator.
+
+        Args:
+            p: Quantile to estimate, between 0 and 1 (e.g., 0.5 for the median)
+        """
+        if not 0.0 <= p <= 1.0:
+            raise ValueError(f"Quantile must be between 0 and 1, got {p}")
+        self.p = p
+        self._initial: list[float] = []
+        self._heights: list[float] = []
+        self._positions: list[int] = []
+        self._desired: list[float] = []
+        self._dn = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def push(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value: The value to add
+        """
+        if not self._heights:
+            self._initial.append(value)
+            if len(self._initial) == 5:
+                self._initial.sort()
+                self._heights = self._initial
+                self._initial = []
+                self._positions = [0, 1, 2, 3, 4]
+                p = self.p
+                self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+            return
+
+        q = self._heights
+        n = self._positions
+
+        # Find the cell containing the value, extending the extremes if needed
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = 0
+            while k < 3 and value >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._dn[i]
+
+        # Adjust the three middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if q[i - 1] < candidate < q[i + 1]:
+                    q[i] = candidate
+                else:
+                    q[i] = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q = self._heights
+        n = self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float | None:
+        """
+        Get the current estimate.
+
+        Returns:
+            The quantile estimate, or None if no values were pushed
+        """
+        if self._heights:
+            return self._heights[2]
+        if not self._initial:
+            return None
+        return _interpolated_quantile(sorted(self._initial), self.p)
+
+
+class StreamingStatistics:
+    """
+    Single-pass numeric summary with bounded memory.
+
+    Moments come from RunningStats. Quantiles are exact (interpolated over the
+    retained values) until more than ``exact_limit`` values have been seen,
+    after which P² estimates are used and the retained values are dropped.
+    """
+
+    def __init__(
+        self,
+        quantiles: Iterable[float] = DEFAULT_QUANTILES,
+        exact_limit: int = EXACT_QUANTILE_LIMIT,
+    ):
+        """
+        Initialize the summary.
+
+        Args:
+            quantiles: Quantiles to track (between 0 and 1)
+            exact_limit: Maximum number of values retained for exact quantiles
+        """
+        self.running = RunningStats()
+        self._estimators = {p: P2Quantile(p) for p in quantiles}
+        self._exact_limit = exact_limit
+        self._values: list[float] | None = []
+
+    @property
+    def count(self) -> int:
+        """Number of values pushed."""
+        return self.running.count
+
+    @property
+    def quantiles_exact(self) -> bool:
+        """Whether quantiles are still computed from every value."""
+        return self._values is not None
+
+    def push(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value: The value to add
+        """
+        self.running.push(value)
+        for estimator in self._estimators.values():
+            estimator.push(value)
+        if self._values is not None:
+            if len(self._values) < self._exact_limit:
+                self._values.append(value)
+            else:
+                self._values = None
+
+    def quantile(self, p: float) -> float | None:
+        """
+        Get a tracked quantile.
+
+        Args:
+            p: One of the quantiles passed to the constructor
+
+        Returns:
+            The quantile value, or None if no values were pushed
+        """
+        if self.running.count == 0:
+            return None
+        if self._values is not None:
+            return _interpolated_quantile(sorted(self._values), p)
+        return self._estimators[p].value()
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the summary as a dictionary.
+
+        Returns:
+            Dictionary with min, max, mean, median, stddev and one ``pNN``
+            entry per tracked quantile other than the median (empty if no
+            values were pushed)
+
+        Example response:
+            {
+                "min": 18.5,
+                "max": 24.3,
+                "mean": 21.4,
+                "median": 21.2,
+                "stddev": 1.3,
+                "p5": 19.1,
+                "p95": 23.6
+            }
+        """
+        if self.running.count == 0:
+            return {}
+
+        sorted_values = sorted(self._values) if self._values is not None else None
+
+        def _quantile(p: float) -> float | None:
+            if sorted_values is not None:
+                return _interpolated_quantile(sorted_values, p)
+            return self._estimators[p].value()
+
+        result: dict[str, Any] = {
+            "min": self.running.min,
+            "max": self.running.max,
+            "mean": self.running.mean,
+            "median": _quantile(0.5) if 0.5 in self._estimators else None,
+            "stddev": self.running.stddev,
+        }
+        for p in self._estimators:
+            if p != 0.5:
+                result[f"p{round(p * 100):g}"] = _quantile(p)
+        return result
+
+
+class ArrayStatistics:
+    """
+    Numeric summary reduced with NumPy.
+
+    Values are appended to a compact ``array('d')`` (8 bytes per value) and
+    reduced with vectorized NumPy operations when the summary is read, so
+    quantiles are exact. Like StreamingStatistics, memory is bounded: past
+    ``exact_limit`` values the buffer is replayed into a StreamingStatistics
+    summary and dropped, and quantiles become P² estimates. Exposes the same
+    interface as StreamingStatistics.
+    """
+
+    def __init__(
+        self,
+        quantiles: Iterable[float] = DEFAULT_QUANTILES,
+        exact_limit: int = EXACT_QUANTILE_LIMIT,
+    ):
+        """
+        Initialize the summary.
+
+        Args:
+            quantiles: Quantiles to track (between 0 and 1)
+            exact_limit: Maximum number of values buffered for the NumPy reduction
+
+        Raises:
+            RuntimeError: If the optional numpy package is not installed
+        """
+        if np is None:
+            raise RuntimeError("The 'numpy' package is required for ArrayStatistics")
+        self._quantiles = tuple(quantiles)
+        self._exact_limit = exact_limit
+        self._values: array | None = array("d")
+        self._streaming: StreamingStatistics | None = None
+
+    @property
+    def count(self) -> int:
+        """Number of values pushed."""
+        if self._streaming is not None:
+            return self._streaming.count
+        return len(self._values)
+
+    @property
+    def quantiles_exact(self) -> bool:
+        """Whether quantiles are still computed from every value."""
+        return self._streaming is None
+
+    def push(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value: The value to add
+        """
+        if self._streaming is not None:
+            self._streaming.push(value)
+            return
+        self._values.append(value)
+        if len(self._values) > self._exact_limit:
+            # Switch to the bounded streaming summary
+            self._streaming = StreamingStatistics(self._quantiles, exact_limit=0)
+            for buffered in self._values:
+                self._streaming.push(buffered)
+            self._values = None
+
+    def quantile(self, p: float) -> float | None:
+        """
+        Get a quantile.
+
+        Args:
+            p: Quantile between 0 and 1 (one of the tracked quantiles once
+               the buffer limit was exceeded)
+
+        Returns:
+            The quantile value, or None if no values were pushed
+        """
+        if self._streaming is not None:
+            return self._streaming.quantile(p)
+        if not self._values:
+            return None
+        return float(np.quantile(np.frombuffer(self._values, dtype=np.float64), p))
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Get the summary as a dictionary.
+
+        Returns:
+            Same layout as StreamingStatistics.to_dict()
+        """
+        if self._streaming is not None:
+            return self._streaming.to_dict()
+        if not self._values:
+            return {}
+
+        values = np.frombuffer(self._values, dtype=np.float64)
+        quantiles = np.quantile(values, self._quantiles) if self._quantiles else []
+        by_p = dict(zip(self._quantiles, (float(q) for q in quantiles), strict=True))
+
+        result: dict[str, Any] = {
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "mean": float(values.mean()),
+            "median": by_p.get(0.5),
+            "stddev": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        }
+        for p, value in by_p.items():
+            if p != 0.5:
+                result[f"p{round(p * 100):g}"] = value
+        return result
+
+
+def create_statistics(
+    use_numpy: bool = False, quantiles: Iterable[float] = DEFAULT_QUANTILES
+) -> StreamingStatistics | ArrayStatistics:
+    """
+    Create a numeric summary.
+
+    Args:
+        use_numpy: Use the NumPy reduction when numpy is installed (default: False)
+        quantiles: Quantiles to track (between 0 and 1)
+
+    Returns:
+        ArrayStatistics if requested and numpy is installed, otherwise
+        StreamingStatistics
+    """
+    if use_numpy and np is not None:
+        return ArrayStatistics(quantiles)
+    return StreamingStatistics(quantiles)
+
+
+def wall_clock_seconds(timestamps: Iterable[Any]) -> list[int]:
+    """
+    Parse timestamps into wall-clock seconds since the epoch.
+
+    Wall-clock seconds keep each timestamp's own UTC offset (e.g. 18:00+02:00
+    counts as 18:00), so hours and weekdays can be derived with integer
+    arithmetic without building datetime objects again.
+
+    Args:
+        timestamps: ISO 8601 strings (e.g., '2025-01-01T18:00:00Z') or Unix
+                    times (taken as UTC)
+
+    Returns:
+        Wall-clock seconds for every timestamp that could be parsed
+    """
+    seconds = []
+    for value in timestamps:
+        if isinstance(value, int | float) and not isinstance(value, bool):
+            seconds.append(int(value))
+            continue
+        if not isinstance(value, str):
+            continue
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        seconds.append(int((parsed.replace(tzinfo=None) - _EPOCH).total_seconds()))
+    return seconds
+
+
+def weekly_heatmap(wall_seconds: list[int]) -> list[list[int]]:
+    """
+    Count timestamps per weekday and hour of day.
+
+    Args:
+        wall_seconds: Wall-clock seconds since the epoch (see wall_clock_seconds)
+
+    Returns:
+        7 x 24 matrix of counts, indexed by weekday (Monday first) then hour
+
+    Note:
+        Uses NumPy ``bincount`` over ``weekday * 24 + hour`` when numpy is
+        installed, otherwise the same integer arithmetic in a Python loop.
+    """
+    if np is not None and wall_seconds:
+        values = np.asarray(wall_seconds, dtype=np.int64)
+        cells = ((values // 86400 + _EPOCH_WEEKDAY) % 7) * 24 + (values // 3600) % 24
+        return np.bincount(cells, minlength=7 * 24).reshape(7, 24).tolist()
+
+    counts = [0] * (7 * 24)
+    for value in wall_seconds:
+        counts[((value // 86400 + _EPOCH_WEEKDAY) % 7) * 24 + (value // 3600) % 24] += 1
+    return [counts[day * 24 : (day + 1) * 24] for day in range(7)]
@@ -0,0 +1,226 @@
+"""Performance telemetry for hass-mcp.
+
+This module records Home Assistant request latencies by endpoint and status,
+the number of requests in flight, and vector DB operation timings. Latencies
+use the same fixed-bucket histograms as the cache metrics, so memory stays
+bounded: request paths are collapsed to a few segments before being used as
+labels.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.cache.metrics import LatencyHistogram
+from app.core.tracing import span
+
+# Home Assistant API sections whose second path segment is a bounded name
+# (a service domain, a config resource or a Supervisor section) worth keeping
+DETAILED_API_SECTIONS = {"config", "hassio", "services"}
+
+
+def normalize_endpoint(url: str) -> str:
+    """
+    Collapse a Home Assistant URL into a low-cardinality endpoint label.
+
+    IDs, timestamps and other free-form segments are replaced with ``*``.
+
+    Args:
+        url: Request URL or path
+
+    Returns:
+        The endpoint label
+
+    Examples:
+        normalize_endpoint("http://ha:8123/api/states/light.kitchen")  # "/api/states/*"
+        normalize_endpoint("/api/services/light/turn_on")              # "/api/services/light/*"
+        normalize_endpoint("/api/config")                              # "/api/config"
+    """
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    if not parts or parts[0] != "api":
+        return "/*" if parts else "/"
+    kept = parts[1:2]
+    if kept and kept[0] in DETAILED_API_SECTIONS:
+        kept = parts[1:3]
+    endpoint = "/api/" + "/".join(kept) if kept else "/api"
+    return endpoint + "/*" if len(parts) > len(kept) + 1 else endpoint
+
+
+class PerformanceMetrics:
+    """
+    Home Assistant request and vector DB timing collector.
+
+    Thread-safe, like CacheMetrics.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self._lock = Lock()
+        self._ha_requests: dict[tuple[str, str, str], LatencyHistogram] = defaultdict(
+            LatencyHistogram
+        )
+        self._in_flight = 0
+        self._vectordb: dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+    def request_started(self) -> None:
+        """Count a Home Assistant request as in flight."""
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self, method: str, endpoint: str, status: str, duration_ms: float) -> None:
+        """
+        Record a finished Home Assistant request.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint label (see normalize_endpoint())
+            status: HTTP status code, or "error" if no response was received
+            duration_ms: Time until the response headers arrived
+        """
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+            self._ha_requests[(method, endpoint, status)].record(duration_ms)
+
+    def record_vectordb(self, operation: str, duration_ms: float) -> None:
+        """
+        Record the duration of a vector DB operation.
+
+        Args:
+            operation: Operation name ("embed", "search", "add", "update", "delete")
+            duration_ms: Duration in milliseconds
+        """
+        with self._lock:
+            self._vectordb[operation].record(duration_ms)
+
+    @contextmanager
+    def time_vectordb(self, operation: str) -> Iterator[None]:
+        """
+        Time a vector DB operation, including failed ones, and trace it as a span.
+
+        Args:
+            operation: Operation name
+
+        Example:
+            with get_performance_metrics().time_vectordb("search"):
+                results = await backend.search_vectors(...)
+        """
+        start_time = time.time()
+        try:
+            with span(f"vectordb.{operation}"):
+                yield
+        finally:
+            self.record_vectordb(operation, (time.time() - start_time) * 1000)
+
+    def get_in_flight(self) -> int:
+        """Get the number of Home Assistant requests in flight."""
+        with self._lock:
+            return self._in_flight
+
+    def export_ha_requests(self) -> dict[tuple[str, str, str], LatencyHistogram]:
+        """Get a copy of the request histograms, keyed by (method, endpoint, status)."""
+        with self._lock:
+            return copy.deepcopy(dict(self._ha_requests))
+
+    def export_vectordb(self) -> dict[str, LatencyHistogram]:
+        """Get a copy of the vector DB histograms, keyed by operation."""
+        with self._lock:
+            return copy.deepcopy(dict(self._vectordb))
+
+    def get_statistics(self) -> dict[str, Any]:
+        """
+        Get request and vector DB latency statistics.
+
+        Returns:
+            Dictionary with:
+            - in_flight: Home Assistant requests in flight
+            - ha_requests: Latency percentiles per "METHOD endpoint status"
+            - vectordb: Latency percentiles per operation
+        """
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "ha_requests": {
+                    f"{method} {endpoint} {status}": histogram.to_dict()
+                    for (method, endpoint, status), histogram in self._ha_requests.items()
+                },
+                "vectordb": {
+                    operation: histogram.to_dict()
+                    for operation, histogram in self._vectordb.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """Reset all statistics (requests in flight are kept)."""
+        with self._lock:
+            self._ha_requests.clear()
+            self._vectordb.clear()
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that records Home Assistant request metrics.
+
+    Wraps another transport and times each request until its response
+    headers arrive, counting it as in flight meanwhile and tracing it as a
+    span of the current tool call.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            transport: The transport that sends the requests
+        """
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request through the wrapped transport and record its timing."""
+        metrics = get_performance_metrics()
+        endpoint = normalize_endpoint(str(request.url))
+        status = "error"
+        metrics.request_started()
+        start_time = time.time()
+        try:
+            with span("ha.request", method=request.method, endpoint=endpoint) as current:
+                response = await self._transport.handle_async_request(request)
+                status = str(response.status_code)
+                if current is not None:
+                    current.set_attribute("status", response.status_code)
+            return response
+        finally:
+            metrics.request_finished(
+                request.method, endpoint, status, (time.time() - start_time) * 1000
+            )
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self._transport.aclose()
+
+
+# Global metrics instance
+_performance_metrics: PerformanceMetrics | None = None
+
+
+def get_performance_metrics() -> PerformanceMetrics:
+    """
+    Get the global performance metrics instance (singleton pattern).
+
+    Returns:
+        The PerformanceMetrics instance
+    """
+    global _performance_metrics
+
+    if _performance_metrics is None:
+        _performance_metrics = PerformanceMetrics()
+
+    return _performance_metrics
@@ -0,0 +1,635 @@
+"""Inverted text index for hass-mcp entity search.
+
+This module keeps an in-memory inverted index over Home Assistant entities so
+keyword search does not have to scan every entity on each call:
+
+- Token postings over entity_id, friendly_name, area and device, ranked with
+  BM25 (partial words are matched through the vocabulary's n-grams).
+- Character trigram postings over everything substring search looks at
+  (entity_id, friendly_name, state and scalar attributes), used to narrow a
+  substring search down to the few entities that can match.
+- Word trigram postings over normalized friendly names, used for fuzzy name
+  matching (trigram similarity, as in PostgreSQL's pg_trgm).
+
+The index is synced from /api/states snapshots; only entities whose state or
+attributes changed since the last sync are re-indexed.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from collections.abc import Collection, Iterator
+from typing import Any
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Length of the character n-grams used for substring and partial-word lookups
+GRAM_SIZE = 3
+
+# Fields covered by the token index (BM25)
+TOKEN_FIELDS = ("entity_id", "friendly_name", "area", "device")
+
+# Score weight of a partial-word match relative to an exact token match
+PARTIAL_MATCH_WEIGHT = 0.5
+
+# Minimum trigram similarity of two names to count as similar
+NAME_SIMILARITY_THRESHOLD = 0.3
+
+# Minimum share of a name's trigrams a text must contain to mention the name
+NAME_MENTION_THRESHOLD = 0.9
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into normalized search tokens.
+
+    Args:
+        text: Text to tokenize (e.g., 'light.living_room' or 'Kitchen Lights')
+
+    Returns:
+        Lowercased alphanumeric tokens, with simple plurals folded
+        (e.g., ['kitchen', 'light'])
+    """
+    return [
+        token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+        for token in _TOKEN_RE.findall(text.lower())
+    ]
+
+
+def ngrams(text: str, size: int = GRAM_SIZE) -> set[str]:
+    """
+    Get the character n-grams of a text.
+
+    Args:
+        text: Text to split
+        size: n-gram length
+
+    Returns:
+        Set of n-grams (empty if the text is shorter than size)
+    """
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def name_trigrams(text: str) -> set[str]:
+    """
+    Get the word trigrams of a name.
+
+    Each token is padded with two leading spaces and one trailing space before
+    it is split, so short words and word starts carry weight
+    (e.g., 'Lamp' -> {'  l', ' la', 'lam', 'amp', 'mp '}).
+
+    Args:
+        text: Name or free text
+
+    Returns:
+        Set of trigrams of the normalized tokens
+    """
+    grams: set[str] = set()
+    for token in tokenize(text):
+        grams |= ngrams(f"  {token} ")
+    return grams
+
+
+def entity_name(entity: dict[str, Any]) -> str:
+    """
+    Get the friendly name of an entity.
+
+    Args:
+        entity: Entity state dictionary
+
+    Returns:
+        The friendly_name attribute (or top-level friendly_name), or ''
+    """
+    attributes = entity.get("attributes") or {}
+    name = attributes.get("friendly_name") or entity.get("friendly_name") or ""
+    return name if isinstance(name, str) else str(name)
+
+
+def substring_fields(entity: dict[str, Any]) -> list[str]:
+    """
+    Get the lowercased texts a substring search matches against.
+
+    Args:
+        entity: Entity state dictionary
+
+    Returns:
+        entity_id, friendly_name, state and every scalar attribute value
+    """
+    attributes = entity.get("attributes") or {}
+    fields = [str(entity.get("entity_id", "")).lower()]
+    friendly_name = attributes.get("friendly_name")
+    if isinstance(friendly_name, str) and friendly_name:
+        fields.append(friendly_name.lower())
+    fields.append(str(entity.get("state", "")).lower())
+    for value in attributes.values():
+        if isinstance(value, str | int | float | bool):
+            fields.append(str(value).lower())
+    return fields
+
+
+def _token_fields(entity: dict[str, Any]) -> dict[str, list[str]]:
+    """Tokens of each token-indexed field of an entity."""
+    attributes = entity.get("attributes") or {}
+    device = attributes.get("device_name") or attributes.get("device_id") or ""
+    return {
+        "entity_id": tokenize(str(entity.get("entity_id", ""))),
+        "friendly_name": tokenize(entity_name(entity)),
+        "area": tokenize(str(attributes.get("area_id") or "")),
+        "device": tokenize(str(device)),
+    }
+
+
+class _Document:
+    """An indexed entity."""
+
+    __slots__ = (
+        "area_id",
+        "entity",
+        "field_terms",
+        "grams",
+        "length",
+        "name_grams",
+        "signature",
+        "terms",
+    )
+
+    def __init__(self, entity: dict[str, Any], signature: Any):
+        attributes = entity.get("attributes") or {}
+        self.entity = entity
+        self.signature = signature
+        self.area_id = str(attributes.get("area_id") or "").lower()
+        fields = _token_fields(entity)
+        self.field_terms = {field: set(tokens) for field, tokens in fields.items()}
+        self.terms: dict[str, int] = {}
+        for tokens in fields.values():
+            for token in tokens:
+                self.terms[token] = self.terms.get(token, 0) + 1
+        self.length = sum(self.terms.values())
+        self.grams: set[str] = set()
+        for text in substring_fields(entity):
+            self.grams |= ngrams(text)
+        self.name_grams = name_trigrams(entity_name(entity))
+
+
+class EntityTextIndex:
+    """
+    Inverted index over entities with BM25 ranking and substring candidates.
+
+    Token postings map each term to ``{entity_id: term frequency}``, so a
+    ranked search only touches the postings of the query's terms. Trigram
+    postings map each character trigram to the entities containing it, so a
+    substring search intersects a few posting sets instead of scanning every
+    entity. Name trigram postings serve fuzzy name lookups the same way: only
+    entities sharing the query's rarest trigrams are scored.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._docs: dict[str, _Document] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._grams: dict[str, set[str]] = {}
+        self._term_grams: dict[str, set[str]] = {}
+        self._name_grams: dict[str, set[str]] = {}
+        self._total_length = 0
+        self._source: Any = None
+        # Position of each entity in the last synced snapshot
+        self._positions: dict[str, int] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        """Number of indexed entities."""
+        return len(self._docs)
+
+    def __contains__(self, entity_id: object) -> bool:
+        """Whether an entity is indexed."""
+        return entity_id in self._docs
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the indexed entity IDs."""
+        return iter(self._docs)
+
+    @staticmethod
+    def _signature(entity: dict[str, Any]) -> Any:
+        """Change marker of an entity; None means it must always be re-indexed."""
+        last_updated = entity.get("last_updated")
+        if not last_updated:
+            return None
+        return (entity.get("state"), last_updated)
+
+    def _add(self, entity_id: str, doc: _Document) -> None:
+        self._docs[entity_id] = doc
+        self._total_length += doc.length
+        for term, frequency in doc.terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                for gram in ngrams(term):
+                    self._term_grams.setdefault(gram, set()).add(term)
+            postings[entity_id] = frequency
+        for gram in doc.grams:
+            self._grams.setdefault(gram, set()).add(entity_id)
+        for gram in doc.name_grams:
+            self._name_grams.setdefault(gram, set()).add(entity_id)
+
+    def remove(self, entity_id: str) -> bool:
+        """
+        Remove an entity from the index.
+
+        Args:
+            entity_id: Entity to remove
+
+        Returns:
+            True if the entity was indexed
+        """
+        doc = self._docs.pop(entity_id, None)
+        if doc is None:
+            return False
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings[term]
+            del postings[entity_id]
+            if not postings:
+                del self._postings[term]
+                for gram in ngrams(term):
+                    grams = self._term_grams[gram]
+                    grams.discard(term)
+                    if not grams:
+                        del self._term_grams[gram]
+        for gram in doc.grams:
+            entity_ids = self._grams[gram]
+            entity_ids.discard(entity_id)
+            if not entity_ids:
+                del self._grams[gram]
+        for gram in doc.name_grams:
+            entity_ids = self._name_grams[gram]
+            entity_ids.discard(entity_id)
+            if not entity_ids:
+                del self._name_grams[gram]
+        return True
+
+    def add(self, entity: dict[str, Any]) -> bool:
+        """
+        Add or re-index an entity.
+
+        Args:
+            entity: Full entity state dictionary (with attributes)
+
+        Returns:
+            True if the entity was (re-)indexed, False if it was unchanged
+        """
+        entity_id = entity.get("entity_id")
+        if not isinstance(entity_id, str) or not entity_id:
+            return False
+        signature = self._signature(entity)
+        doc = self._docs.get(entity_id)
+        if doc is not None and signature is not None and doc.signature == signature:
+            doc.entity = entity
+            return False
+        if doc is not None:
+            self.remove(entity_id)
+        self._add(entity_id, _Document(entity, signature))
+        return True
+
+    def update(self, entity: dict[str, Any]) -> bool:
+        """
+        Re-index an entity if it is already indexed (e.g. after a state fetch).
+
+        Args:
+            entity: Full entity state dictionary (with attributes)
+
+        Returns:
+            True if the entity was re-indexed
+        """
+        if not isinstance(entity, dict) or entity.get("entity_id") not in self._docs:
+            return False
+        changed = self.add(entity)
+        if changed:
+            self.version += 1
+        return changed
+
+    def sync(self, entities: list[dict[str, Any]]) -> int:
+        """
+        Sync the index with a full /api/states snapshot.
+
+        Args:
+            entities: Every entity state (not filtered by domain or search)
+
+        Returns:
+            Number of entities added, re-indexed or removed
+
+        Note:
+            Syncing the same snapshot object again is a no-op, and entities
+            whose state and last_updated are unchanged are not re-indexed.
+        """
+        if entities is self._source:
+            return 0
+
+        changed = 0
+        positions: dict[str, int] = {}
+        for entity in entities:
+            if not isinstance(entity, dict):
+                continue
+            entity_id = entity.get("entity_id")
+            if not isinstance(entity_id, str) or not entity_id:
+                continue
+            positions[entity_id] = len(positions)
+            if self.add(entity):
+                changed += 1
+        for entity_id in [entity_id for entity_id in self._docs if entity_id not in positions]:
+            self.remove(entity_id)
+            changed += 1
+
+        self._source = entities
+        self._positions = positions
+        if changed:
+            self.version += 1
+        return changed
+
+    def clear(self) -> None:
+        """Remove every entity."""
+        self._docs.clear()
+        self._postings.clear()
+        self._grams.clear()
+        self._term_grams.clear()
+        self._name_grams.clear()
+        self._total_length = 0
+        self._source = None
+        self._positions = {}
+        self.version += 1
+
+    def entity(self, entity_id: str) -> dict[str, Any] | None:
+        """
+        Get the indexed state of an entity.
+
+        Args:
+            entity_id: Entity to get
+
+        Returns:
+            The entity state dictionary, or None if not indexed
+        """
+        doc = self._docs.get(entity_id)
+        return doc.entity if doc is not None else None
+
+    def entities(self, entity_ids: Collection[str]) -> list[dict[str, Any]]:
+        """
+        Get the indexed states of some entities, in snapshot order.
+
+        Args:
+            entity_ids: Entities to get (unindexed ones are skipped)
+
+        Returns:
+            The entity state dictionaries, in the order of the last synced
+            /api/states snapshot
+        """
+        indexed = [entity_id for entity_id in entity_ids if entity_id in self._docs]
+        indexed.sort(key=lambda entity_id: self._positions.get(entity_id, len(self._positions)))
+        return [self._docs[entity_id].entity for entity_id in indexed]
+
+    def substring_candidates(self, term: str) -> set[str] | None:
+        """
+        Get the entities that may contain a substring.
+
+        Args:
+            term: Lowercased search term
+
+        Returns:
+            IDs of the entities containing every trigram of the term (a
+            superset of the actual matches), or None if the term is too short
+            to use the trigram postings
+        """
+        grams = ngrams(term)
+        if not grams:
+            return None
+        posting_sets = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        if not posting_sets[0]:
+            return set()
+        return set.intersection(*posting_sets)
+
+    def _expand(self, term: str) -> list[str]:
+        """Indexed terms containing a partial word (e.g. 'temp' -> 'temperature')."""
+        grams = ngrams(term)
+        if not grams:
+            return []
+        term_sets = sorted((self._term_grams.get(gram, set()) for gram in grams), key=len)
+        return [t for t in set.intersection(*term_sets) if term in t]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        *,
+        domain: str | None = None,
+        area_id: str | None = None,
+        allowed: Collection[str] | None = None,
+    ) -> list[tuple[str, float, list[str]]]:
+        """
+        Rank entities for a keyword query with BM25.
+
+        Args:
+            query: Keyword query (e.g., 'living room lights')
+            limit: Maximum number of results
+            domain: Only entities of this domain
+            area_id: Only entities whose area_id attribute matches
+            allowed: Only these entities (a metadata pre-filter), if given
+
+        Returns:
+            List of (entity_id, score, matched fields) tuples, best first
+
+        Note:
+            Query words that are not indexed terms are matched against the
+            indexed terms containing them, at PARTIAL_MATCH_WEIGHT.
+        """
+        if not self._docs:
+            return []
+
+        count = len(self._docs)
+        average_length = self._total_length / count or 1.0
+        area = area_id.lower() if area_id else ""
+
+        scores: dict[str, float] = {}
+        matched_terms: dict[str, set[str]] = {}
+        for query_term in dict.fromkeys(tokenize(query)):
+            if query_term in self._postings:
+                variants = [(query_term, 1.0)]
+            else:
+                variants = [(term, PARTIAL_MATCH_WEIGHT) for term in self._expand(query_term)]
+            for term, weight in variants:
+                postings = self._postings[term]
+                frequency = len(postings)
+                idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+                for entity_id, term_frequency in postings.items():
+                    if not self._accepts(entity_id, None, domain, area, allowed):
+                        continue
+                    doc = self._docs[entity_id]
+                    norm = self.k1 * (1 - self.b + self.b * doc.length / average_length)
+                    scores[entity_id] = scores.get(entity_id, 0.0) + weight * idf * (
+                        term_frequency * (self.k1 + 1) / (term_frequency + norm)
+                    )
+                    matched_terms.setdefault(entity_id, set()).add(term)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        results = []
+        for entity_id, score in top:
+            field_terms = self._docs[entity_id].field_terms
+            fields = [
+                field for field in TOKEN_FIELDS if field_terms[field] & matched_terms[entity_id]
+            ]
+            results.append((entity_id, score, fields))
+        return results
+
+    def _accepts(
+        self,
+        entity_id: str,
+        exclude: str | None,
+        domain: str | None,
+        area: str,
+        allowed: Collection[str] | None = None,
+    ) -> bool:
+        """Whether an entity passes the exclusion, pre-filter, domain and area filters."""
+        if entity_id == exclude:
+            return False
+        if allowed is not None and entity_id not in allowed:
+            return False
+        if domain and not entity_id.startswith(f"{domain}."):
+            return False
+        return not area or self._docs[entity_id].area_id == area
+
+    def similar_names(
+        self,
+        name: str,
+        limit: int = 10,
+        *,
+        threshold: float = NAME_SIMILARITY_THRESHOLD,
+        exclude: str | None = None,
+        domain: str | None = None,
+        area_id: str | None = None,
+        allowed: Collection[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Find the entities whose friendly name is similar to a name.
+
+        Args:
+            name: Name to match (e.g., 'Livng Room Light')
+            limit: Maximum number of results
+            threshold: Minimum trigram similarity (0-1)
+            exclude: Entity ID to leave out (e.g., the entity itself)
+            domain: Only entities of this domain
+            area_id: Only entities whose area_id attribute matches
+            allowed: Only these entities (a metadata pre-filter), if given
+
+        Returns:
+            List of (entity_id, similarity) tuples, most similar first
+
+        Note:
+            Similarity is the Jaccard index of the two names' trigram sets. A
+            name reaching the threshold must share at least
+            ceil(threshold * query trigrams) trigrams with the query, so it
+            contains one of the query's rarest trigrams: only the entities in
+            those postings are scored (prefix filtering).
+        """
+        query = name_trigrams(name)
+        if not query or threshold <= 0:
+            return []
+
+        needed = max(1, math.ceil(threshold * len(query) - 1e-9))
+        rarest = sorted(query, key=lambda gram: len(self._name_grams.get(gram, ())))
+        candidates: set[str] = set()
+        for gram in rarest[: len(query) - needed + 1]:
+            candidates |= self._name_grams.get(gram, set())
+
+        area = area_id.lower() if area_id else ""
+        matches = []
+        for entity_id in candidates:
+            if not self._accepts(entity_id, exclude, domain, area, allowed):
+                continue
+            grams = self._docs[entity_id].name_grams
+            overlap = len(query & grams)
+            similarity = overlap / (len(query) + len(grams) - overlap)
+            if similarity >= threshold:
+                matches.append((entity_id, similarity))
+        return heapq.nsmallest(limit, matches, key=lambda match: (-match[1], match[0]))
+
+    def mentioned_names(
+        self,
+        text: str,
+        limit: int = 10,
+        *,
+        threshold: float = NAME_MENTION_THRESHOLD,
+        domain: str | None = None,
+        area_id: str | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        Find the entities whose friendly name occurs (fuzzily) in a text.
+
+        Args:
+            text: Free text (e.g., 'turn on the living room lights')
+            limit: Maximum number of results
+            threshold: Minimum share of a name's trigrams found in the text (0-1)
+            domain: Only entities of this domain
+            area_id: Only entities whose area_id attribute matches
+
+        Returns:
+            List of (entity_id, coverage) tuples, best covered (then longest)
+            names first
+        """
+        query = name_trigrams(text)
+        if not query:
+            return []
+
+        shared: Counter[str] = Counter()
+        for gram in query:
+            shared.update(self._name_grams.get(gram, ()))
+
+        area = area_id.lower() if area_id else ""
+        matches = []
+        for entity_id, overlap in shared.items():
+            if not self._accepts(entity_id, None, domain, area):
+                continue
+            size = len(self._docs[entity_id].name_grams)
+            coverage = overlap / size
+            if coverage >= threshold:
+                matches.append((entity_id, coverage, size))
+        top = heapq.nsmallest(limit, matches, key=lambda match: (-match[1], -match[2], match[0]))
+        return [(entity_id, coverage) for entity_id, coverage, _ in top]
+
+    def get_statistics(self) -> dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with entity, term, trigram and name trigram counts and
+            the index version
+        """
+        return {
+            "entities": len(self._docs),
+            "terms": len(self._postings),
+            "grams": len(self._grams),
+            "name_grams": len(self._name_grams),
+            "version": self.version,
+        }
+
+
+# Global entity text index instance
+_entity_text_index: EntityTextIndex | None = None
+
+
+def get_entity_text_index() -> EntityTextIndex:
+    """
+    Get the global entity text index instance (singleton pattern).
+
+    Returns:
+        The EntityTextIndex instance
+    """
+    global _entity_text_index
+    if _entity_text_index is None:
+        _entity_text_index = EntityTextIndex()
+    return _entity_text_index
@@ -0,0 +1,299 @@
+"""Tool call tracing for hass-mcp.
+
+This module records a span tree per MCP tool call: async_handler opens a root
+span, and cache lookups, Home Assistant requests and vector DB operations
+open child spans while it is active. The current span is tracked in a context
+variable, so spans opened by concurrent subtasks attach to the span that
+spawned them. The slowest traces are kept in memory. When the optional
+``opentelemetry-api`` package is installed, every span is also exported
+through the globally configured OpenTelemetry tracer provider.
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any
+
+from app.config import TRACE_KEEP, TRACING_ENABLED
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Children kept per span; tools that fan out to hundreds of requests only
+# record a count of the rest
+MAX_CHILDREN = 100
+
+_tracer = otel_trace.get_tracer(__name__) if otel_trace is not None else None
+
+# Span of the innermost active operation in the current context
+_current_span: ContextVar["Span | None"] = ContextVar("hass_mcp_current_span", default=None)
+
+
+def otel_available() -> bool:
+    """
+    Check whether spans are exported to OpenTelemetry.
+
+    Returns:
+        True if the optional ``opentelemetry-api`` package is installed
+    """
+    return _tracer is not None
+
+
+class Span:
+    """A timed operation within a tool call, with its child operations."""
+
+    __slots__ = (
+        "_otel_span",
+        "attributes",
+        "children",
+        "dropped_children",
+        "duration_ms",
+        "error",
+        "name",
+        "start",
+    )
+
+    def __init__(self, name: str, attributes: dict[str, Any] | None = None) -> None:
+        """
+        Start a span.
+
+        Args:
+            name: Operation name, e.g. "ha.request"
+            attributes: Details of the operation
+        """
+        self.name = name
+        self.attributes = {k: v for k, v in (attributes or {}).items() if v is not None}
+        self.start = time.perf_counter()
+        self.duration_ms: float | None = None
+        self.error: str | None = None
+        self.children: list[Span] = []
+        self.dropped_children = 0
+        self._otel_span: Any = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Set an attribute, on the exported OpenTelemetry span as well.
+
+        Args:
+            key: Attribute name
+            value: Attribute value
+        """
+        self.attributes[key] = value
+        if self._otel_span is not None:
+            self._otel_span.set_attribute(key, value)
+
+    def add_child(self, child: "Span") -> None:
+        """Attach a child span, counting it as dropped past MAX_CHILDREN."""
+        if len(self.children) < MAX_CHILDREN:
+            self.children.append(child)
+        else:
+            self.dropped_children += 1
+
+    def finish(self) -> None:
+        """Stop the span's clock."""
+        self.duration_ms = (time.perf_counter() - self.start) * 1000
+
+    def to_dict(self, origin: float | None = None) -> dict[str, Any]:
+        """
+        Convert the span tree to a dictionary.
+
+        Args:
+            origin: perf_counter() value start offsets are relative to
+                    (default: this span's start)
+
+        Returns:
+            Dictionary with name, start_ms, duration_ms, attributes, children
+            and, when set, error and dropped_children
+        """
+        origin = self.start if origin is None else origin
+        result: dict[str, Any] = {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": round(self.duration_ms, 2) if self.duration_ms is not None else None,
+            "attributes": self.attributes,
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+        if self.error is not None:
+            result["error"] = self.error
+        if self.dropped_children:
+            result["dropped_children"] = self.dropped_children
+        return result
+
+
+def _otel_attributes(attributes: dict[str, Any]) -> dict[str, Any]:
+    """Keep the attribute values OpenTelemetry accepts."""
+    return {
+        key: value
+        for key, value in attributes.items()
+        if isinstance(value, (str, bool, int, float))
+    }
+
+
+@contextmanager
+def _activate(current: Span) -> Iterator[Span]:
+    """Make a span current (and exported) until the block exits."""
+    otel_context = (
+        _tracer.start_as_current_span(current.name, attributes=_otel_attributes(current.attributes))
+        if _tracer is not None
+        else nullcontext()
+    )
+    with otel_context as otel_span:
+        current._otel_span = otel_span
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.error = type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            current.finish()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """
+    Trace an operation as a child of the current span.
+
+    Outside a traced tool call, and without OpenTelemetry, this does nothing
+    and yields None.
+
+    Args:
+        name: Operation name, e.g. "cache.get"
+        **attributes: Details of the operation (None values are dropped)
+
+    Yields:
+        The span, or None when nothing is traced
+
+    Example:
+        with span("ha.request", method="GET", endpoint="/api/states/*") as current:
+            response = await send()
+            if current is not None:
+                current.set_attribute("status", response.status_code)
+    """
+    parent = _current_span.get()
+    if parent is None and _tracer is None:
+        yield None
+        return
+
+    current = Span(name, attributes)
+    if parent is not None:
+        parent.add_child(current)
+    with _activate(current):
+        yield current
+
+
+class TraceRecorder:
+    """
+    Keeps the slowest tool call traces.
+
+    Memory is bounded by the number of traces kept and MAX_CHILDREN per span.
+    """
+
+    def __init__(self, keep: int = TRACE_KEEP) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            keep: Number of slowest traces kept
+        """
+        self.keep = keep
+        self._lock = Lock()
+        self._slowest: list[tuple[float, int, Span]] = []
+        self._sequence = itertools.count()
+
+    def record(self, root: Span) -> None:
+        """
+        Record a finished tool call trace.
+
+        Args:
+            root: Root span of the tool call
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Trace of {root.name}", extra={"trace": root.to_dict()})
+        if self.keep <= 0 or root.duration_ms is None:
+            return
+        with self._lock:
+            entry = (root.duration_ms, next(self._sequence), root)
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, entry)
+            elif entry[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def get_slowest(self) -> list[dict[str, Any]]:
+        """
+        Get the slowest traces, slowest first.
+
+        Returns:
+            List of span trees (see Span.to_dict())
+        """
+        with self._lock:
+            roots = [root for _, _, root in sorted(self._slowest, reverse=True)]
+        return [root.to_dict() for root in roots]
+
+    def reset(self) -> None:
+        """Drop all traces."""
+        with self._lock:
+            self._slowest.clear()
+
+
+# Global recorder instance
+_trace_recorder: TraceRecorder | None = None
+
+
+def get_trace_recorder() -> TraceRecorder:
+    """
+    Get the global trace recorder instance (singleton pattern).
+
+    Returns:
+        The TraceRecorder instance
+    """
+    global _trace_recorder
+
+    if _trace_recorder is None:
+        _trace_recorder = TraceRecorder()
+
+    return _trace_recorder
+
+
+@contextmanager
+def trace_tool(tool: str) -> Iterator[Span | None]:
+    """
+    Trace a tool call as a root span and record it when it finishes.
+
+    A tool called from within another traced tool call becomes a child span
+    of that call instead.
+
+    Args:
+        tool: Tool name
+
+    Yields:
+        The root span, or None when tracing is disabled
+        (HASS_MCP_TRACING_ENABLED=false)
+    """
+    if not TRACING_ENABLED:
+        yield None
+        return
+
+    parent = _current_span.get()
+    root = Span(f"tool.{tool}", {"tool": tool})
+    if parent is not None:
+        parent.add_child(root)
+        with _activate(root):
+            yield root
+        return
+
+    try:
+        with _activate(root):
+            yield root
+    finally:
+        get_trace_recorder().record(root)
@@ -0,0 +1,142 @@
+"""Area vocabulary index for hass-mcp query processing.
+
+This module keeps the names and aliases of all Home Assistant areas in an
+Aho-Corasick automaton, so finding the areas mentioned in a query is a single
+linear scan of the query. The automaton is only rebuilt when the area
+vocabulary actually changes.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any
+
+from app.core.vectordb.matchers import KeywordMatcher
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_area_text(text: str) -> str:
+    """
+    Normalize an area name, alias or query for matching.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        Lowercased text with runs of whitespace collapsed to single spaces
+    """
+    return _WHITESPACE_RE.sub(" ", text.lower()).strip()
+
+
+class AreaIndex:
+    """
+    Keyword index over normalized area names and aliases.
+
+    ``sync`` compares the vocabulary with the one the automaton was built
+    from, so re-syncing an unchanged area registry costs no rebuild.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty, not yet loaded area index."""
+        self._vocabulary: tuple[tuple[str, str], ...] = ()
+        self._matcher = KeywordMatcher(())
+        self._synced_at: float | None = None
+        self.refresh_task: asyncio.Task[Any] | None = None
+        self.version = 0
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index has been synced with the area registry."""
+        return self._synced_at is not None
+
+    def is_fresh(self, max_age: float) -> bool:
+        """
+        Check whether the index was synced recently.
+
+        Args:
+            max_age: Maximum age in seconds
+
+        Returns:
+            True if the index was synced less than max_age seconds ago
+        """
+        return self._synced_at is not None and time.monotonic() - self._synced_at < max_age
+
+    def sync(self, areas: list[dict[str, Any]]) -> bool:
+        """
+        Sync the index with the current areas.
+
+        Args:
+            areas: Areas as returned by get_areas()
+
+        Returns:
+            True if the vocabulary changed and the automaton was rebuilt
+        """
+        vocabulary = tuple(
+            (normalized, area["area_id"])
+            for area in areas
+            if isinstance(area, dict) and area.get("area_id")
+            for name in [area.get("name"), *(area.get("aliases") or [])]
+            if isinstance(name, str) and (normalized := normalize_area_text(name))
+        )
+        self._synced_at = time.monotonic()
+        if vocabulary == self._vocabulary and self.version:
+            return False
+
+        self._vocabulary = vocabulary
+        self._matcher = KeywordMatcher(vocabulary)
+        self.version += 1
+        return True
+
+    def match(self, text: str) -> list[str]:
+        """
+        Find the areas whose name or an alias occurs in a text.
+
+        Args:
+            text: Text to scan (e.g., a user query)
+
+        Returns:
+            Matching area IDs, in area registry order, each at most once
+        """
+        return list(dict.fromkeys(self._matcher.find(normalize_area_text(text))))
+
+    def clear(self) -> None:
+        """Remove all areas and mark the index as not loaded."""
+        if self.refresh_task is not None and not self.refresh_task.done():
+            self.refresh_task.cancel()
+        self.refresh_task = None
+        self._vocabulary = ()
+        self._matcher = KeywordMatcher(())
+        self._synced_at = None
+
+    def get_statistics(self) -> dict[str, Any]:
+        """
+        Get area index statistics.
+
+        Returns:
+            Dictionary with the number of areas and keywords, the index
+            version and whether it has been loaded
+        """
+        return {
+            "areas": len({area_id for _, area_id in self._vocabulary}),
+            "keywords": len(self._vocabulary),
+            "version": self.version,
+            "loaded": self.loaded,
+        }
+
+
+# Global area index instance
+_area_index: AreaIndex | None = None
+
+
+def get_area_index() -> AreaIndex:
+    """
+    Get the global area index instance (singleton pattern).
+
+    Returns:
+        The AreaIndex instance
+    """
+    global _area_index
+    if _area_index is None:
+        _area_index = AreaIndex()
+    return _area_index
@@ -4,14 +4,20 @@ This module provides query intent classification, domain prediction, action extr
 entity extraction, parameter extraction, and query refinement for natural language queries.
 """
 
+import asyncio
 import contextlib
 import logging
 import re
 from typing import Any
 
 from app.api.areas import get_areas
+from app.api.entities import get_all_states
+from app.core.cache.ttl import TTL_VERY_LONG
+from app.core.text_index import get_entity_text_index
+from app.core.vectordb.areas import AreaIndex, get_area_index
 from app.core.vectordb.config import VectorDBConfig, get_vectordb_config
 from app.core.vectordb.manager import VectorDBManager, get_vectordb_manager
+from app.core.vectordb.matchers import KeywordMatcher, PatternTable
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +93,75 @@ ATTRIBUTE_PATTERNS = {
     "position": [r"\b(position|level|open|closed)\b"],
 }
 
+# Entity type hints (substring keywords)
+TYPE_HINTS = {
+    "temperature": ["temperature", "temp", "heat", "cool"],
+    "motion": ["motion", "movement", "presence"],
+    "humidity": ["humidity", "moisture"],
+    "brightness": ["brightness", "light level"],
+}
+
+# Pattern tables compiled once; each is matched with a single scan per query
+_INTENT_TABLE = PatternTable(INTENT_PATTERNS)
+_DOMAIN_TABLE = PatternTable(DOMAIN_PATTERNS)
+_ACTION_TABLE = PatternTable(ACTION_PATTERNS)
+_ATTRIBUTE_TABLE = PatternTable(ATTRIBUTE_PATTERNS)
+_TYPE_HINT_MATCHER = KeywordMatcher(
+    (keyword, type_name) for type_name, keywords in TYPE_HINTS.items() for keyword in keywords
+)
+
+_ENTITY_ID_RE = re.compile(r"\b([a-z_]+)\.([a-z0-9_]+)\b", re.IGNORECASE)
+_INT_RE = re.compile(r"\b(\d+)\b")
+_FLOAT_RE = re.compile(r"\b(\d+\.\d+)\b")
+_PERCENT_RE = re.compile(r"(\d+)%")
+_TIME_RES = [
+    re.compile(r"\b(\d+)\s*(minute|minutes|hour|hours|day|days|week|weeks)\b", re.IGNORECASE),
+    re.compile(r"\b(today|yesterday|now|recent|last)\b", re.IGNORECASE),
+]
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+async def _load_area_index(index: AreaIndex) -> None:
+    """Sync the area index with get_areas(), keeping the old vocabulary on errors."""
+    try:
+        areas = await get_areas()
+    except Exception as e:
+        logger.debug(f"Failed to get areas for the area index: {e}")
+        return
+    # handle_api_errors reports errors of list endpoints as [{"error": ...}]
+    if not isinstance(areas, list) or (
+        areas and isinstance(areas[0], dict) and "error" in areas[0]
+    ):
+        logger.debug(f"Failed to get areas for the area index: {areas}")
+        return
+    index.sync(areas)
+
+
+async def refresh_area_index(max_age: float = TTL_VERY_LONG) -> AreaIndex:
+    """
+    Get the area index, loading it on first use.
+
+    Args:
+        max_age: Seconds after which the index is re-synced with the area registry
+
+    Returns:
+        The global AreaIndex
+
+    Note:
+        Only the first call waits for the areas to be loaded. Once the index
+        is older than max_age, it keeps serving the current vocabulary while a
+        background task re-syncs it; the automaton is only rebuilt if an area
+        name or alias changed.
+    """
+    index = get_area_index()
+    if index.is_fresh(max_age):
+        return index
+    if not index.loaded:
+        await _load_area_index(index)
+    elif index.refresh_task is None or index.refresh_task.done():
+        index.refresh_task = asyncio.create_task(_load_area_index(index))
+    return index
+
 
 async def classify_intent(query: str) -> tuple[str, float]:
     """
@@ -99,19 +174,10 @@ async def classify_intent(query: str) -> tuple[str, float]:
         Tuple of (intent, confidence) where intent is one of:
         SEARCH, CONTROL, STATUS, CONFIGURE, DISCOVER, ANALYZE
     """
-    query_lower = query.lower()
-    intent_scores: dict[str, float] = {}
-
-    # Score each intent based on pattern matches
-    for intent, patterns in INTENT_PATTERNS.items():
-        score = 0.0
-        for pattern in patterns:
-            matches = len(re.findall(pattern, query_lower, re.IGNORECASE))
-            score += matches * 0.3  # Weight each match
-
-        # Boost score for multiple matches
-        if score > 0:
-            intent_scores[intent] = score
+    # Score each intent based on pattern matches (weight 0.3 per match)
+    intent_scores = {
+        intent: matches * 0.3 for intent, matches in _INTENT_TABLE.counts(query.lower()).items()
+    }
 
     # If no intent found, default to SEARCH
     if not intent_scores:
@@ -139,7 +205,7 @@ async def predict_domain(query: str) -> tuple[str | None, float]:
         Tuple of (domain, confidence) where domain is one of:
         light, sensor, switch, climate, cover, fan, lock, media_player, camera, etc.
     """
-    query_lower = query.lower()
+    domain_counts = _DOMAIN_TABLE.counts(query.lower())
     domain_scores: dict[str, float] = {}
 
     # Score each domain based on pattern matches
@@ -157,16 +223,9 @@ async def predict_domain(query: str) -> tuple[str | None, float]:
         "alarm_control_panel",
     ]
     for domain in domain_order:
-        if domain not in DOMAIN_PATTERNS:
-            continue
-        patterns = DOMAIN_PATTERNS[domain]
-        score = 0.0
-        for pattern in patterns:
-            matches = len(re.findall(pattern, query_lower, re.IGNORECASE))
-            score += matches * 0.4  # Weight each match
-
-        if score > 0:
-            domain_scores[domain] = score
+        matches = domain_counts.get(domain, 0)
+        if matches:
+            domain_scores[domain] = matches * 0.4  # Weight each match
 
     # If no domain found, return None
     if not domain_scores:
@@ -197,33 +256,54 @@ async def extract_action(query: str) -> tuple[str | None, dict[str, Any]]:
     query_lower = query.lower()
     action_params: dict[str, Any] = {}
 
-    # Check each action pattern
-    for action, patterns in ACTION_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, query_lower, re.IGNORECASE):
-                # Extract numeric value if present
-                value_match = re.search(r"\b(\d+)\b", query)
-                if value_match:
-                    with contextlib.suppress(ValueError):
-                        action_params["value"] = int(value_match.group(1))
+    # First action (in ACTION_PATTERNS order) with a matching pattern
+    action = _ACTION_TABLE.first(query_lower)
+    if action is None:
+        return (None, {})
+
+    # Extract numeric value if present
+    value_match = _INT_RE.search(query)
+    if value_match:
+        with contextlib.suppress(ValueError):
+            action_params["value"] = int(value_match.group(1))
 
-                # Extract percentage if present
-                percent_match = re.search(r"(\d+)%", query)
-                if percent_match:
-                    with contextlib.suppress(ValueError):
-                        action_params["value"] = int(percent_match.group(1))
-                        action_params["unit"] = "percent"
+    # Extract percentage if present
+    percent_match = _PERCENT_RE.search(query)
+    if percent_match:
+        with contextlib.suppress(ValueError):
+            action_params["value"] = int(percent_match.group(1))
+            action_params["unit"] = "percent"
+
+    # Extract attribute if present (the last matching attribute wins)
+    attribute = _ATTRIBUTE_TABLE.last(query_lower)
+    if attribute:
+        action_params["attribute"] = attribute
+
+    return (action, action_params)
 
-                # Extract attribute if present
-                for attr_name, attr_patterns in ATTRIBUTE_PATTERNS.items():
-                    for attr_pattern in attr_patterns:
-                        if re.search(attr_pattern, query_lower, re.IGNORECASE):
-                            action_params["attribute"] = attr_name
-                            break
 
-                return (action, action_params)
+async def _mentioned_entities(query: str) -> list[str]:
+    """
+    Find the entities whose friendly name is mentioned in a query.
+
+    Args:
+        query: Natural language query
 
-    return (None, {})
+    Returns:
+        Entity IDs, or an empty list if the states could not be fetched
+    """
+    # Sync with the cached states snapshot first, so the result never depends
+    # on whether an earlier call happened to populate the index
+    try:
+        states = await get_all_states()
+    except Exception as e:
+        logger.debug(f"Failed to get states for entity name matching: {e}")
+        return []
+    if not isinstance(states, list):
+        return []
+    text_index = get_entity_text_index()
+    text_index.sync(states)
+    return [entity_id for entity_id, _ in text_index.mentioned_names(query)]
 
 
 async def extract_entities(
@@ -239,59 +319,40 @@ async def extract_entities(
 
     Returns:
         Tuple of (entity_ids, filters) where:
-        - entity_ids: List of explicit entity IDs found in query
+        - entity_ids: List of explicit entity IDs found in query, followed by
+          entities whose friendly name is mentioned in it
         - filters: Dictionary with entity filters (area, domain, type, etc.)
     """
     entity_ids: list[str] = []
     filters: dict[str, Any] = {}
+    query_lower = query.lower()
 
     # Extract explicit entity IDs (format: domain.entity_id)
     # Match domain.entity_id pattern (e.g., "light.living_room")
-    entity_id_pattern = r"\b([a-z_]+)\.([a-z0-9_]+)\b"
-    entity_matches = re.findall(entity_id_pattern, query, re.IGNORECASE)
-    for domain, entity_name in entity_matches:
+    for domain, entity_name in _ENTITY_ID_RE.findall(query):
         entity_id = f"{domain}.{entity_name}"
         entity_ids.append(entity_id)
 
-    # Extract area/room names
-    try:
-        areas = await get_areas()
-        area_names: list[str] = []
-        for area in areas:
-            if isinstance(area, dict):
-                area_name = area.get("name", "").lower()
-                area_id = area.get("area_id", "")
-                if area_name and area_name in query.lower():
-                    area_names.append(area_id)
-                    filters["area_id"] = area_id
-                # Check aliases
-                aliases = area.get("aliases", [])
-                for alias in aliases:
-                    if isinstance(alias, str) and alias.lower() in query.lower():
-                        area_names.append(area_id)
-                        filters["area_id"] = area_id
-                        break
-    except Exception as e:
-        logger.debug(f"Failed to get areas for entity extraction: {e}")
+    # Resolve entities mentioned by friendly name through the entity text index
+    for entity_id in await _mentioned_entities(query):
+        if entity_id not in entity_ids:
+            entity_ids.append(entity_id)
+
+    # Extract area/room names from the area index (the last matching area wins)
+    area_index = await refresh_area_index()
+    matched_areas = area_index.match(query)
+    if matched_areas:
+        filters["area_id"] = matched_areas[-1]
 
     # Extract domain from query (already predicted, but also check here)
     domain, _ = await predict_domain(query)
     if domain:
         filters["domain"] = domain
 
-    # Extract entity type hints (temperature, motion, etc.)
-    type_hints = {
-        "temperature": ["temperature", "temp", "heat", "cool"],
-        "motion": ["motion", "movement", "presence"],
-        "humidity": ["humidity", "moisture"],
-        "brightness": ["brightness", "light level"],
-    }
-
-    for type_name, keywords in type_hints.items():
-        for keyword in keywords:
-            if keyword in query.lower():
-                filters["type"] = type_name
-                break
+    # Extract entity type hints (temperature, motion, etc.; the last matching type wins)
+    type_hints = _TYPE_HINT_MATCHER.find(query_lower)
+    if type_hints:
+        filters["type"] = type_hints[-1]
 
     return (entity_ids, filters)
 
@@ -315,40 +376,33 @@ async def extract_parameters(query: str) -> dict[str, Any]:
 
     # Extract numeric values (check float first, then integer, then percentage)
     # Check for percentage first (most specific)
-    percent_match = re.search(r"(\d+)%", query)
+    percent_match = _PERCENT_RE.search(query)
     if percent_match:
         with contextlib.suppress(ValueError, IndexError):
             parameters["value"] = int(percent_match.group(1))
             parameters["unit"] = "percent"
     else:
         # Check for float (more specific than integer)
-        float_match = re.search(r"\b(\d+\.\d+)\b", query)
+        float_match = _FLOAT_RE.search(query)
         if float_match:
             with contextlib.suppress(ValueError, IndexError):
                 parameters["value"] = float(float_match.group(1))
         else:
             # Check for integer
-            int_match = re.search(r"\b(\d+)\b", query)
+            int_match = _INT_RE.search(query)
             if int_match:
                 with contextlib.suppress(ValueError, IndexError):
                     parameters["value"] = int(int_match.group(1))
 
-    # Extract attribute names
+    # Extract attribute names (the last matching attribute wins)
     query_lower = query.lower()
-    for attr_name, attr_patterns in ATTRIBUTE_PATTERNS.items():
-        for attr_pattern in attr_patterns:
-            if re.search(attr_pattern, query_lower, re.IGNORECASE):
-                parameters["attribute"] = attr_name
-                break
+    attribute = _ATTRIBUTE_TABLE.last(query_lower)
+    if attribute:
+        parameters["attribute"] = attribute
 
     # Extract time references
-    time_patterns = [
-        r"\b(\d+)\s*(minute|minutes|hour|hours|day|days|week|weeks)\b",
-        r"\b(today|yesterday|now|recent|last)\b",
-    ]
-
-    for pattern in time_patterns:
-        match = re.search(pattern, query_lower, re.IGNORECASE)
+    for time_re in _TIME_RES:
+        match = time_re.search(query_lower)
         if match:
             parameters["time"] = match.group(0)
             break
@@ -384,7 +438,7 @@ async def refine_query(query: str) -> str:
             refined = refined.replace(old_phrase.capitalize(), new_phrase.capitalize())
 
     # Normalize whitespace
-    refined = re.sub(r"\s+", " ", refined)
+    refined = _WHITESPACE_RE.sub(" ", refined)
 
     return refined
 
@@ -0,0 +1,167 @@
+"""Vector search hit cache for hass-mcp.
+
+This module caches the raw hit lists of vector searches (entity IDs,
+distances and vector metadata), keyed by collection, normalized query,
+metadata filters and the collection's index version. Entity states are not
+cached here: callers hydrate fresh states on top of the cached hits, so a
+repeated query skips embedding and the nearest-neighbour search while still
+reporting current states.
+"""
+
+import copy
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.cache.ttl import TTL_VERY_LONG
+
+# Maximum number of cached hit lists
+HIT_CACHE_SIZE = 256
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query for use in a cache key.
+
+    Args:
+        query: Search query
+
+    Returns:
+        Lowercased query with runs of whitespace collapsed to single spaces
+    """
+    return _WHITESPACE_RE.sub(" ", query.lower()).strip()
+
+
+class VectorHitCache:
+    """
+    LRU cache of vector search hit lists.
+
+    A hit list fetched with a given limit also serves smaller limits, and a
+    list shorter than its limit (every match was returned) serves any limit.
+    Entries carry the index version they were searched at, so a search that
+    completes after the index changed can never be served.
+    """
+
+    def __init__(self, max_entries: int = HIT_CACHE_SIZE, max_age: float = TTL_VERY_LONG):
+        """
+        Initialize an empty hit cache.
+
+        Args:
+            max_entries: Maximum number of cached hit lists
+            max_age: Seconds after which a hit list is searched again, even if
+                     the index did not change (e.g. it was changed by another
+                     process)
+        """
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries: OrderedDict[tuple[Any, ...], tuple[float, int, list[dict[str, Any]]]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        collection_name: str,
+        query: str,
+        filter_metadata: dict[str, Any] | None,
+        version: int,
+    ) -> tuple[Any, ...]:
+        """
+        Build the cache key of a search.
+
+        Args:
+            collection_name: Searched collection
+            query: Search query (normalized here)
+            filter_metadata: Metadata filters of the search
+            version: Index version of the collection
+
+        Returns:
+            Hashable cache key
+        """
+        filters = json.dumps(filter_metadata or {}, sort_keys=True, default=str)
+        return (collection_name, normalize_query(query), filters, version)
+
+    def __len__(self) -> int:
+        """Number of cached hit lists."""
+        return len(self._entries)
+
+    def get(self, key: tuple[Any, ...], limit: int) -> list[dict[str, Any]] | None:
+        """
+        Get a cached hit list.
+
+        Args:
+            key: Cache key from key()
+            limit: Number of hits needed
+
+        Returns:
+            Copy of the first limit hits, or None if not cached (or cached
+            with fewer hits than needed)
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, stored_limit, hits = entry
+            if time.monotonic() - stored_at >= self.max_age:
+                del self._entries[key]
+            elif stored_limit >= limit or len(hits) < stored_limit:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(hits[:limit])
+        self.misses += 1
+        return None
+
+    def put(self, key: tuple[Any, ...], limit: int, hits: list[dict[str, Any]]) -> None:
+        """
+        Cache a hit list.
+
+        Args:
+            key: Cache key from key()
+            limit: Limit the hits were searched with
+            hits: Raw vector search hits
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > limit:
+            return
+        self._entries[key] = (time.monotonic(), limit, copy.deepcopy(hits))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, collection_name: str | None = None) -> int:
+        """
+        Drop cached hit lists.
+
+        Args:
+            collection_name: Only drop the hits of this collection (all if None)
+
+        Returns:
+            Number of hit lists dropped
+        """
+        if collection_name is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+        keys = [key for key in self._entries if key[0] == collection_name]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def get_statistics(self) -> dict[str, Any]:
+        """
+        Get hit cache statistics.
+
+        Returns:
+            Dictionary with the number of cached hit lists, hits, misses and
+            hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
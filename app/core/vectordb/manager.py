@@ -7,10 +7,12 @@ vector database operations and embedding generation.
 import logging
 from typing import Any
 
+from app.core.telemetry import get_performance_metrics
 from app.core.vectordb.backend import VectorDBBackend
 from app.core.vectordb.chroma_backend import ChromaBackend
 from app.core.vectordb.config import VectorDBConfig, get_vectordb_config
 from app.core.vectordb.embeddings import EmbeddingModel
+from app.core.vectordb.hits import VectorHitCache
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +36,25 @@ class VectorDBManager:
         self.backend: VectorDBBackend | None = None
         self.embedding_model: EmbeddingModel | None = None
         self._initialized = False
+        self.hit_cache = VectorHitCache()
+        self._index_versions: dict[str, int] = {}
+
+    def get_index_version(self, collection_name: str) -> int:
+        """
+        Get the index version of a collection.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            Number of changes made to the collection through this manager
+        """
+        return self._index_versions.get(collection_name, 0)
+
+    def _index_changed(self, collection_name: str) -> None:
+        """Bump a collection's index version and drop its cached search hits."""
+        self._index_versions[collection_name] = self.get_index_version(collection_name) + 1
+        self.hit_cache.invalidate(collection_name)
 
     async def initialize(self) -> None:
         """Initialize the vector DB manager."""
@@ -127,7 +148,8 @@ class VectorDBManager:
         if not self.embedding_model:
             raise RuntimeError("Embedding model not initialized")
 
-        return await self.embedding_model.embed(texts)
+        with get_performance_metrics().time_vectordb("embed"):
+            return await self.embedding_model.embed(texts)
 
     async def add_vectors(
         self,
@@ -159,7 +181,9 @@ class VectorDBManager:
             await self.backend.create_collection(collection_name)
 
         # Add vectors
-        await self.backend.add_vectors(collection_name, vectors, ids, metadata)
+        with get_performance_metrics().time_vectordb("add"):
+            await self.backend.add_vectors(collection_name, vectors, ids, metadata)
+        self._index_changed(collection_name)
 
     async def search_vectors(
         self,
@@ -167,6 +191,7 @@ class VectorDBManager:
         query_text: str,
         limit: int = 10,
         filter_metadata: dict[str, Any] | None = None,
+        use_cache: bool = True,
     ) -> list[dict[str, Any]]:
         """
         Search for similar vectors in a collection.
@@ -176,10 +201,29 @@ class VectorDBManager:
             query_text: Query text to search for
             limit: Maximum number of results to return
             filter_metadata: Optional metadata filters to apply
+            use_cache: Whether to serve and store hits in the hit cache
 
         Returns:
             List of search results with metadata
+
+        Note:
+            Hits are cached by normalized query, filters and the collection's
+            index version, and are dropped when vectors are added, updated or
+            deleted through this manager. Entity state changes do not
+            invalidate them: callers hydrate current states on top of the hits.
         """
+        cache_key = None
+        if use_cache:
+            cache_key = self.hit_cache.key(
+                collection_name,
+                query_text,
+                filter_metadata,
+                self.get_index_version(collection_name),
+            )
+            cached_hits = self.hit_cache.get(cache_key, limit)
+            if cached_hits is not None:
+                return cached_hits
+
         if not self._initialized:
             await self.initialize()
 
@@ -194,10 +238,13 @@ class VectorDBManager:
         query_vector = query_embeddings[0]
 
         # Search
-        results = await self.backend.search_vectors(
-            collection_name, query_vector, limit, filter_metadata
-        )
+        with get_performance_metrics().time_vectordb("search"):
+            results = await self.backend.search_vectors(
+                collection_name, query_vector, limit, filter_metadata
+            )
 
+        if cache_key is not None:
+            self.hit_cache.put(cache_key, limit, results)
         return results
 
     async def update_vectors(
@@ -226,7 +273,9 @@ class VectorDBManager:
         vectors = await self.embed_texts(texts)
 
         # Update vectors
-        await self.backend.update_vectors(collection_name, vectors, ids, metadata)
+        with get_performance_metrics().time_vectordb("update"):
+            await self.backend.update_vectors(collection_name, vectors, ids, metadata)
+        self._index_changed(collection_name)
 
     async def delete_vectors(self, collection_name: str, ids: list[str]) -> None:
         """
@@ -242,7 +291,9 @@ class VectorDBManager:
         if not self.backend:
             raise RuntimeError("Vector DB backend not initialized")
 
-        await self.backend.delete_vectors(collection_name, ids)
+        with get_performance_metrics().time_vectordb("delete"):
+            await self.backend.delete_vectors(collection_name, ids)
+        self._index_changed(collection_name)
 
     async def create_collection(
         self, collection_name: str, metadata: dict[str, Any] | None = None
@@ -261,6 +312,7 @@ class VectorDBManager:
             raise RuntimeError("Vector DB backend not initialized")
 
         await self.backend.create_collection(collection_name, metadata)
+        self._index_changed(collection_name)
 
     async def delete_collection(self, collection_name: str) -> None:
         """
@@ -276,6 +328,7 @@ class VectorDBManager:
             raise RuntimeError("Vector DB backend not initialized")
 
         await self.backend.delete_collection(collection_name)
+        self._index_changed(collection_name)
 
     async def collection_exists(self, collection_name: str) -> bool:
         """
@@ -320,6 +373,7 @@ class VectorDBManager:
         if self.embedding_model:
             await self.embedding_model.close()
         self._initialized = False
+        self.hit_cache.invalidate()
         logger.info("Closed Vector DB manager")
 
 
@@ -0,0 +1,185 @@
+"""Precompiled text matchers for hass-mcp query processing.
+
+This module provides the matchers used by query classification:
+
+- PatternTable compiles a table of regex patterns (e.g. intent -> patterns)
+  into a single regex, so one scan of a query finds the matches of every
+  pattern in the table.
+- KeywordMatcher is an Aho-Corasick automaton that finds every occurrence of
+  a set of keywords (type hints, area names) in one pass over a query.
+"""
+
+import re
+from collections import deque
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any
+
+# Number of distinct queries whose pattern counts are kept per table
+PATTERN_CACHE_SIZE = 1024
+
+
+class PatternTable:
+    """
+    A table of regex patterns grouped by key, compiled into one combined regex.
+
+    Each pattern becomes a named group inside a lookahead tried at every word
+    start, so a single ``finditer`` scan reports where every pattern matches,
+    even when patterns overlap (the same word counting for several keys).
+    Counts follow ``re.findall`` semantics: non-overlapping matches per
+    pattern, summed per key.
+
+    Patterns must only match at word starts (e.g. ``r"\\b(on|off)\\b"``).
+    """
+
+    def __init__(self, patterns: Mapping[str, list[str]], cache_size: int = PATTERN_CACHE_SIZE):
+        """
+        Compile a pattern table.
+
+        Args:
+            patterns: Dictionary mapping each key to its regex patterns
+            cache_size: Number of distinct texts whose counts are cached
+        """
+        self.keys = list(patterns)
+        self._slot_keys: list[str] = []
+        parts = []
+        for key, key_patterns in patterns.items():
+            for pattern in key_patterns:
+                parts.append(f"(?=(?P<p{len(self._slot_keys)}>{pattern})?)")
+                self._slot_keys.append(key)
+        self._regex = re.compile(r"\b(?=\w)" + "".join(parts), re.IGNORECASE)
+        self._slot_groups = [self._regex.groupindex[f"p{i}"] for i in range(len(self._slot_keys))]
+        self.counts = lru_cache(maxsize=cache_size)(self._counts)
+
+    def _counts(self, text: str) -> Mapping[str, int]:
+        """
+        Count the matches of each key's patterns in a text.
+
+        Args:
+            text: Text to scan (usually a lowercased query)
+
+        Returns:
+            Read-only mapping of key to match count, for keys with at least
+            one match, in table order
+        """
+        slot_counts = [0] * len(self._slot_keys)
+        next_start = [0] * len(self._slot_keys)
+        for match in self._regex.finditer(text):
+            for slot, group in enumerate(self._slot_groups):
+                start, end = match.span(group)
+                if start >= next_start[slot]:
+                    slot_counts[slot] += 1
+                    next_start[slot] = end
+
+        counts: dict[str, int] = {}
+        for key, count in zip(self._slot_keys, slot_counts, strict=True):
+            if count:
+                counts[key] = counts.get(key, 0) + count
+        return MappingProxyType(counts)
+
+    def first(self, text: str) -> str | None:
+        """
+        Get the first key in table order with a matching pattern.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            The key, or None if no pattern matches
+        """
+        return next(iter(self.counts(text)), None)
+
+    def last(self, text: str) -> str | None:
+        """
+        Get the last key in table order with a matching pattern.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            The key, or None if no pattern matches
+        """
+        return next(reversed(self.counts(text)), None)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a set of keywords.
+
+    The automaton is compiled into a deterministic transition table, so
+    matching is one dictionary lookup per character of the text regardless
+    of the number of keywords. Matching is case-insensitive substring
+    matching, like ``keyword in text.lower()``.
+    """
+
+    def __init__(self, keywords: Iterable[tuple[str, Any]]):
+        """
+        Build the automaton.
+
+        Args:
+            keywords: (keyword, value) pairs; several keywords may share a value
+        """
+        self.values: list[Any] = []
+        transitions: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+
+        for keyword, value in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword.lower():
+                next_state = transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(transitions)
+                    transitions[state][char] = next_state
+                    transitions.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(len(self.values))
+            self.values.append(value)
+
+        # Breadth-first pass: failure links, merged outputs and the full
+        # transition table (missing characters lead back to the root)
+        fail = [0] * len(transitions)
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in list(transitions[state].items()):
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in transitions[fallback]:
+                    fallback = fail[fallback]
+                target = transitions[fallback].get(char, 0)
+                fail[next_state] = target if target != next_state else 0
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+            for char, target in transitions[fail[state]].items():
+                transitions[state].setdefault(char, target)
+
+        self._transitions = transitions
+        self._outputs = outputs
+
+    def __len__(self) -> int:
+        """Number of keywords in the automaton."""
+        return len(self.values)
+
+    def find(self, text: str) -> list[Any]:
+        """
+        Find the keywords occurring in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Values of the keywords found, in the order the keywords were
+            given, each keyword at most once
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        found: set[int] = set()
+        state = 0
+        for char in text.lower():
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return [self.values[i] for i in sorted(found)]
@@ -4,16 +4,24 @@ This module provides semantic search functionality for entities using
 natural language queries and vector similarity.
 """
 
+import asyncio
 import logging
 from typing import Any
 
-from app.api.entities import get_entities, get_entity_state
+from app.api.devices import get_devices
+from app.api.entities import get_entities, get_entity_state, lean_entity
+from app.core.text_index import EntityTextIndex, get_entity_text_index
 from app.core.vectordb.config import VectorDBConfig, get_vectordb_config
 from app.core.vectordb.indexing import ENTITY_COLLECTION
 from app.core.vectordb.manager import VectorDBManager, get_vectordb_manager
 
 logger = logging.getLogger(__name__)
 
+# Reciprocal rank fusion: rank offset and per-retriever weights for hybrid search
+RRF_K = 60
+SEMANTIC_WEIGHT = 1.0
+KEYWORD_WEIGHT = 1.0
+
 
 async def semantic_search(
     query: str,
@@ -49,13 +57,27 @@ async def semantic_search(
         - entity: Entity state dictionary
         - explanation: Explanation for why entity matched
         - metadata: Entity metadata from vector DB
+
+    Note:
+        With hybrid search, the vector search and the entity state snapshot
+        are fetched concurrently; both retrievers then rank the same
+        in-memory candidate pool, pre-filtered by domain, area, manufacturer
+        and state, and their rankings are fused with reciprocal rank fusion
+        (similarity_score is then the fused score scaled to 0-1).
     """
     manager = manager or get_vectordb_manager()
     config = config or get_vectordb_config()
 
     if not config.is_enabled():
         logger.debug("Vector DB is disabled, falling back to keyword search")
-        return await _keyword_search(query, domain, area_id, limit)
+        return await _keyword_search(
+            query,
+            domain,
+            area_id,
+            limit,
+            entity_state=entity_state,
+            device_manufacturer=device_manufacturer,
+        )
 
     # Get configuration values
     if similarity_threshold is None:
@@ -80,28 +102,89 @@ async def semantic_search(
             filter_metadata["manufacturer"] = device_manufacturer
 
         # Perform semantic search
-        vector_results = await manager.search_vectors(
+        vector_search = manager.search_vectors(
             collection_name=ENTITY_COLLECTION,
             query_text=query,
             limit=limit * 2,  # Get more results for ranking
             filter_metadata=filter_metadata if filter_metadata else None,
         )
 
+        # Hybrid search: fetch the candidate pool while the vector search runs
+        if hybrid_search:
+            vector_results, index, manufacturer_ids = await asyncio.gather(
+                vector_search,
+                _load_candidate_pool(),
+                _manufacturer_entity_ids(device_manufacturer),
+            )
+            if index is not None:
+                allowed = _prefilter(
+                    index,
+                    domain=domain,
+                    area_id=area_id,
+                    manufacturer_ids=manufacturer_ids,
+                    entity_state=entity_state,
+                )
+                return _fuse_results(
+                    vector_results,
+                    index,
+                    allowed,
+                    query=query,
+                    similarity_threshold=similarity_threshold,
+                    limit=limit,
+                )
+        else:
+            vector_results = await vector_search
+
         # Process and rank results
         results = await _process_search_results(
             vector_results, query, similarity_threshold, entity_state, limit
         )
 
-        # Hybrid search: combine with keyword search if enabled
-        if hybrid_search:
-            keyword_results = await _keyword_search(query, domain, area_id, limit)
-            results = _merge_and_rank_results(results, keyword_results, limit)
-
         return results[:limit]
 
     except Exception as e:
         logger.error(f"Semantic search failed: {e}, falling back to keyword search")
-        return await _keyword_search(query, domain, area_id, limit)
+        return await _keyword_search(
+            query,
+            domain,
+            area_id,
+            limit,
+            entity_state=entity_state,
+            device_manufacturer=device_manufacturer,
+        )
+
+
+def _vector_similarity(result: dict[str, Any]) -> float | None:
+    """
+    Get the similarity of a raw vector search result.
+
+    Args:
+        result: Raw vector search result
+
+    Returns:
+        Similarity score (0.0-1.0), or None if the result has no score
+    """
+    similarity_score = result.get("distance") or result.get("similarity")
+    if similarity_score is None:
+        return None
+
+    # Convert distance to similarity
+    # Chroma uses cosine distance (0 = identical, 2 = opposite)
+    # Convert to similarity (1.0 = identical, 0.0 = opposite)
+    if "distance" in result:
+        # Chroma returns cosine distance (0-2 range)
+        # Convert to similarity: similarity = 1 - (distance / 2)
+        distance = float(similarity_score)
+        return max(0.0, min(1.0, 1.0 - (distance / 2.0)))
+    if isinstance(similarity_score, (int, float)):
+        if similarity_score <= 0:
+            return 0.0
+        if similarity_score > 1.0:
+            # Likely a distance metric, convert to similarity
+            return 1.0 / (1.0 + similarity_score)
+        # Already in 0-1 range, just ensure it's a float
+        return float(similarity_score)
+    return None
 
 
 async def _process_search_results(
@@ -131,28 +214,10 @@ async def _process_search_results(
         if not entity_id:
             continue
 
-        similarity_score = result.get("distance") or result.get("similarity")
+        similarity_score = _vector_similarity(result)
         if similarity_score is None:
             continue
 
-        # Convert distance to similarity
-        # Chroma uses cosine distance (0 = identical, 2 = opposite)
-        # Convert to similarity (1.0 = identical, 0.0 = opposite)
-        if "distance" in result:
-            # Chroma returns cosine distance (0-2 range)
-            # Convert to similarity: similarity = 1 - (distance / 2)
-            distance = float(similarity_score)
-            similarity_score = max(0.0, min(1.0, 1.0 - (distance / 2.0)))
-        elif isinstance(similarity_score, (int, float)):
-            if similarity_score <= 0:
-                similarity_score = 0.0
-            elif similarity_score > 1.0:
-                # Likely a distance metric, convert to similarity
-                similarity_score = 1.0 / (1.0 + similarity_score)
-            else:
-                # Already in 0-1 range, just ensure it's a float
-                similarity_score = float(similarity_score)
-
         # Apply similarity threshold
         if similarity_score < similarity_threshold:
             continue
@@ -271,11 +336,148 @@ def _boost_score(
     return boosted_score
 
 
+async def _load_candidate_pool() -> EntityTextIndex | None:
+    """
+    Sync the entity text index with the current states.
+
+    Returns:
+        The synced index (the in-memory candidate pool), or None if the
+        states could not be fetched
+    """
+    # Full states (cached briefly); syncing an unchanged snapshot is a no-op
+    entities = await get_entities(limit=0, lean=False)
+    if not isinstance(entities, list):
+        return None
+    index = get_entity_text_index()
+    index.sync(entities)
+    return index
+
+
+async def _manufacturer_entity_ids(manufacturer: str | None) -> set[str] | None:
+    """
+    Get the entities of the devices made by a manufacturer.
+
+    Args:
+        manufacturer: Manufacturer name (case-insensitive)
+
+    Returns:
+        Entity IDs, or None if no manufacturer was given or the device
+        registry is unavailable (no manufacturer filtering)
+    """
+    if not manufacturer:
+        return None
+    try:
+        devices = await get_devices()
+    except Exception as e:
+        logger.debug(f"Failed to get devices for the manufacturer filter: {e}")
+        return None
+    if not isinstance(devices, list):
+        return None
+
+    manufacturer = manufacturer.lower()
+    return {
+        entity_id
+        for device in devices
+        if isinstance(device, dict)
+        and str(device.get("manufacturer") or "").lower() == manufacturer
+        for entity_id in device.get("entities") or []
+    }
+
+
+def _prefilter(
+    index: EntityTextIndex,
+    *,
+    domain: str | None,
+    area_id: str | None,
+    manufacturer_ids: set[str] | None,
+    entity_state: str | None,
+) -> set[str] | None:
+    """
+    Get the candidates matching the metadata filters, before any scoring.
+
+    Args:
+        index: Candidate pool
+        domain: Optional domain filter
+        area_id: Optional area filter
+        manufacturer_ids: Optional entities of the requested manufacturer
+        entity_state: Optional entity state filter
+
+    Returns:
+        Entity IDs passing every filter, or None if no filter is set
+    """
+    if not (domain or area_id or entity_state) and manufacturer_ids is None:
+        return None
+
+    prefix = f"{domain}." if domain else ""
+    area = area_id.lower() if area_id else ""
+    state = entity_state.lower() if entity_state else ""
+    allowed = set()
+    for entity_id in manufacturer_ids if manufacturer_ids is not None else index:
+        if prefix and not entity_id.startswith(prefix):
+            continue
+        entity = index.entity(entity_id)
+        if entity is None:
+            continue
+        if area and str((entity.get("attributes") or {}).get("area_id") or "").lower() != area:
+            continue
+        if state and str(entity.get("state", "")).lower() != state:
+            continue
+        allowed.add(entity_id)
+    return allowed
+
+
+def _keyword_results(
+    index: EntityTextIndex, query: str, limit: int, allowed: set[str] | None
+) -> list[dict[str, Any]]:
+    """
+    Rank the candidate pool for a keyword query.
+
+    Args:
+        index: Candidate pool
+        query: Search query string
+        limit: Maximum results
+        allowed: Pre-filtered candidates (None for all)
+
+    Returns:
+        Keyword search results, best first
+    """
+    results = []
+    for entity_id, score, fields in index.search(query, limit, allowed=allowed):
+        results.append(
+            {
+                "entity_id": entity_id,
+                # Map the unbounded BM25 score into the 0-1 similarity range
+                "similarity_score": score / (score + 1.0),
+                "entity": lean_entity(index.entity(entity_id) or {"entity_id": entity_id}),
+                "explanation": f"Keyword match in {', '.join(fields)}",
+                "metadata": {},
+            }
+        )
+
+    # No keyword matched (e.g. a misspelled name): fall back to fuzzy name matching
+    if not results:
+        for entity_id, similarity in index.similar_names(query, limit, allowed=allowed):
+            results.append(
+                {
+                    "entity_id": entity_id,
+                    "similarity_score": similarity,
+                    "entity": lean_entity(index.entity(entity_id) or {"entity_id": entity_id}),
+                    "explanation": "Fuzzy match in friendly_name",
+                    "metadata": {},
+                }
+            )
+
+    return results
+
+
 async def _keyword_search(
     query: str,
     domain: str | None = None,
     area_id: str | None = None,
     limit: int = 10,
+    *,
+    entity_state: str | None = None,
+    device_manufacturer: str | None = None,
 ) -> list[dict[str, Any]]:
     """
     Perform keyword-based search for entities.
@@ -285,120 +487,99 @@ async def _keyword_search(
         domain: Optional domain filter
         area_id: Optional area filter
         limit: Maximum results
+        entity_state: Optional entity state filter
+        device_manufacturer: Optional device manufacturer filter
 
     Returns:
         List of entities with keyword match scores
     """
     try:
-        entities = await get_entities(domain=domain, search_query=query, limit=limit * 2, lean=True)
-        if isinstance(entities, dict) and "error" in entities:
+        index, manufacturer_ids = await asyncio.gather(
+            _load_candidate_pool(), _manufacturer_entity_ids(device_manufacturer)
+        )
+        if index is None:
             return []
 
-        results = []
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-
-        for entity in entities:
-            if not isinstance(entity, dict):
-                continue
-
-            entity_id = entity.get("entity_id", "").lower()
-            friendly_name = entity.get("attributes", {}).get("friendly_name", "").lower()
-            entity_area_id = entity.get("attributes", {}).get("area_id", "").lower()
-
-            # Filter by area if specified
-            if area_id and entity_area_id != area_id.lower():
-                continue
-
-            # Calculate keyword match score
-            score = 0.0
-            matches = []
-
-            # Check entity_id
-            if query_lower in entity_id:
-                score += 0.5
-                matches.append("entity_id")
-
-            # Check friendly_name
-            if friendly_name:
-                if query_lower in friendly_name:
-                    score += 0.4
-                    matches.append("friendly_name")
-                # Check word matches
-                name_words = set(friendly_name.split())
-                common_words = query_words.intersection(name_words)
-                if common_words:
-                    score += 0.1 * len(common_words)
-                    matches.append("name_words")
-
-            if score > 0:
-                results.append(
-                    {
-                        "entity_id": entity.get("entity_id"),
-                        "similarity_score": score,
-                        "entity": entity,
-                        "explanation": f"Keyword match in {', '.join(matches)}",
-                        "metadata": {},
-                    }
-                )
-
-        # Sort by score (descending)
-        results.sort(key=lambda x: x["similarity_score"], reverse=True)
-
-        return results[:limit]
+        allowed = _prefilter(
+            index,
+            domain=domain,
+            area_id=area_id,
+            manufacturer_ids=manufacturer_ids,
+            entity_state=entity_state,
+        )
+        return _keyword_results(index, query, limit, allowed)
 
     except Exception as e:
         logger.error(f"Keyword search failed: {e}")
         return []
 
 
-def _merge_and_rank_results(
-    semantic_results: list[dict[str, Any]],
-    keyword_results: list[dict[str, Any]],
+def _fuse_results(
+    vector_results: list[dict[str, Any]],
+    index: EntityTextIndex,
+    allowed: set[str] | None,
+    *,
+    query: str,
+    similarity_threshold: float,
     limit: int,
 ) -> list[dict[str, Any]]:
     """
-    Merge and rank semantic and keyword search results.
+    Fuse semantic and keyword rankings of the candidate pool with reciprocal rank fusion.
 
     Args:
-        semantic_results: Semantic search results
-        keyword_results: Keyword search results
+        vector_results: Raw vector search results
+        index: Candidate pool (current entity states)
+        allowed: Pre-filtered candidates (None for all)
+        query: Original query string
+        similarity_threshold: Minimum semantic similarity score
         limit: Maximum results
 
     Returns:
-        Merged and ranked results
+        Fused results, best first; similarity_score is the fused score scaled
+        so that ranking first for both retrievers scores 1.0
     """
-    # Create a map of entity_id to best result
-    result_map: dict[str, dict[str, Any]] = {}
-
-    # Add semantic results (weighted higher)
-    for result in semantic_results:
-        entity_id = result.get("entity_id")
-        if entity_id:
-            # Boost semantic results
-            result["similarity_score"] = result.get("similarity_score", 0.0) * 1.2
-            result["source"] = "semantic"
-            result_map[entity_id] = result
-
-    # Add keyword results (merge or add)
-    for result in keyword_results:
-        entity_id = result.get("entity_id")
-        if entity_id:
-            if entity_id in result_map:
-                # Merge: use higher score
-                existing_score = result_map[entity_id].get("similarity_score", 0.0)
-                keyword_score = result.get("similarity_score", 0.0)
-                if keyword_score > existing_score:
-                    result["similarity_score"] = keyword_score
-                    result["source"] = "hybrid"
-                    result_map[entity_id] = result
-            else:
-                # Add new result
-                result["source"] = "keyword"
-                result_map[entity_id] = result
-
-    # Convert to list and sort
-    merged_results = list(result_map.values())
-    merged_results.sort(key=lambda x: x.get("similarity_score", 0.0), reverse=True)
-
-    return merged_results[:limit]
+    # Semantic ranking: pre-filtered vector hits, hydrated from the pool
+    semantic = []
+    for result in vector_results:
+        entity_id = result.get("id") or result.get("entity_id")
+        similarity = _vector_similarity(result)
+        if not entity_id or similarity is None or similarity < similarity_threshold:
+            continue
+        if allowed is not None and entity_id not in allowed:
+            continue
+        entity = index.entity(entity_id)
+        if entity is None:
+            continue
+        metadata = result.get("metadata", {})
+        score = _boost_score(entity, query, similarity, metadata)
+        semantic.append((score, entity_id, entity, similarity, metadata))
+    semantic.sort(key=lambda hit: hit[0], reverse=True)
+
+    fused: dict[str, dict[str, Any]] = {}
+    for rank, (_, entity_id, entity, similarity, metadata) in enumerate(semantic, start=1):
+        fused[entity_id] = {
+            "entity_id": entity_id,
+            "similarity_score": SEMANTIC_WEIGHT / (RRF_K + rank),
+            "entity": lean_entity(entity),
+            "explanation": _build_explanation(entity, query, similarity),
+            "metadata": metadata,
+            "source": "semantic",
+        }
+
+    for rank, result in enumerate(_keyword_results(index, query, limit * 2, allowed), start=1):
+        contribution = KEYWORD_WEIGHT / (RRF_K + rank)
+        existing = fused.get(result["entity_id"])
+        if existing is None:
+            result["similarity_score"] = contribution
+            result["source"] = "keyword"
+            fused[result["entity_id"]] = result
+        else:
+            existing["similarity_score"] += contribution
+            existing["explanation"] += f"; {result['explanation']}"
+            existing["source"] = "hybrid"
+
+    best_possible = (SEMANTIC_WEIGHT + KEYWORD_WEIGHT) / (RRF_K + 1)
+    results = sorted(fused.values(), key=lambda r: r["similarity_score"], reverse=True)[:limit]
+    for result in results:
+        result["similarity_score"] /= best_possible
+    return results
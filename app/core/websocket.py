@@ -0,0 +1,126 @@
+"""WebSocket API access for hass-mcp.
+
+Some Home Assistant data is only exposed over the WebSocket API (e.g. the
+recorder's long-term statistics). This module provides a small one-shot
+command helper on top of the optional ``websockets`` package.
+"""
+
+import asyncio
+import json
+import logging
+import ssl
+from typing import Any
+
+from app.config import HA_TOKEN, HA_URL, get_ssl_verify_value
+
+try:
+    import websockets
+except ImportError:
+    websockets = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Default timeout (seconds) for connecting and for each reply
+WS_TIMEOUT = 30.0
+
+
+class HomeAssistantWebSocketError(Exception):
+    """Raised when a WebSocket command cannot be completed."""
+
+
+def websocket_available() -> bool:
+    """
+    Check whether WebSocket commands can be sent.
+
+    Returns:
+        True if the optional ``websockets`` package is installed
+    """
+    return websockets is not None
+
+
+def get_websocket_url() -> str:
+    """
+    Build the WebSocket API URL from HA_URL.
+
+    Returns:
+        URL like 'ws://localhost:8123/api/websocket' (wss:// for https)
+    """
+    base = HA_URL.rstrip("/")
+    if base.startswith("https://"):
+        base = "wss://" + base.removeprefix("https://")
+    elif base.startswith("http://"):
+        base = "ws://" + base.removeprefix("http://")
+    return f"{base}/api/websocket"
+
+
+def _ssl_context(url: str) -> ssl.SSLContext | None:
+    """Build an SSL context matching HA_SSL_VERIFY for wss:// URLs."""
+    if not url.startswith("wss://"):
+        return None
+    verify = get_ssl_verify_value()
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+    if isinstance(verify, str):
+        return ssl.create_default_context(cafile=verify)
+    return ssl.create_default_context()
+
+
+async def ws_command(message: dict[str, Any], timeout: float = WS_TIMEOUT) -> Any:
+    """
+    Send a single WebSocket API command and return its result.
+
+    Opens a connection, authenticates with HA_TOKEN, sends the command and
+    waits for the matching result message.
+
+    Args:
+        message: Command payload without "id" (e.g., {"type": "get_config"})
+        timeout: Timeout in seconds for connecting and for each reply
+
+    Returns:
+        The "result" field of the command's reply
+
+    Raises:
+        HomeAssistantWebSocketError: If the websockets package is missing,
+            authentication fails or Home Assistant reports an error
+
+    Examples:
+        config = await ws_command({"type": "get_config"})
+    """
+    if websockets is None:
+        raise HomeAssistantWebSocketError(
+            "The 'websockets' package is required for WebSocket API access"
+        )
+
+    url = get_websocket_url()
+
+    async def _receive(ws: Any) -> dict[str, Any]:
+        return json.loads(await asyncio.wait_for(ws.recv(), timeout))
+
+    async with websockets.connect(
+        url, ssl=_ssl_context(url), max_size=None, open_timeout=timeout
+    ) as ws:
+        hello = await _receive(ws)
+        if hello.get("type") == "auth_required":
+            await ws.send(json.dumps({"type": "auth", "access_token": HA_TOKEN}))
+            auth = await _receive(ws)
+            if auth.get("type") != "auth_ok":
+                raise HomeAssistantWebSocketError(
+                    f"WebSocket authentication failed: {auth.get('message', auth.get('type'))}"
+                )
+
+        await ws.send(json.dumps({"id": 1, **message}))
+        while True:
+            reply = await _receive(ws)
+            if reply.get("id") == 1 and reply.get("type") == "result":
+                break
+
+    if not reply.get("success"):
+        error = reply.get("error") or {}
+        raise HomeAssistantWebSocketError(
+            f"WebSocket command {message.get('type')} failed: "
+            f"{error.get('code', 'unknown_error')} - {error.get('message', '')}"
+        )
+    return reply.get("result")
@@ -1,7 +1,10 @@
+import asyncio
 import json
 import logging
 import os
 
+import anyio
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -12,12 +15,23 @@ logger = logging.getLogger(__name__)
 
 # Create an MCP server
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import Response
 
 from app.api.entities import (
     get_entities,
     get_entity_state,
 )
+from app.config import (
+    CACHE_WARMUP,
+    METRICS_ENABLED,
+    METRICS_TEXTFILE,
+    METRICS_TEXTFILE_INTERVAL,
+)
 from app.core import async_handler
+from app.core.cache.snapshot import restore_cache_snapshot, save_cache_snapshot
+from app.core.cache.warmup import warm_cache
+from app.core.prometheus import CONTENT_TYPE, render_metrics, write_metrics_textfile
 
 # Get package version for server info
 try:
@@ -817,6 +831,62 @@ mcp.prompt()(dashboard_layout_generator)
 # They are registered above after creating the mcp instance
 
 
+async def metrics_endpoint(request: Request) -> Response:
+    """Serve Prometheus metrics (sse and streamable-http transports)."""
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+
+if METRICS_ENABLED:
+    mcp.custom_route("/metrics", methods=["GET"])(metrics_endpoint)
+
+
+def _write_metrics_textfile() -> None:
+    """Write the metrics textfile, logging instead of raising on failure."""
+    try:
+        write_metrics_textfile(METRICS_TEXTFILE)
+    except OSError as e:
+        logger.warning(f"Failed to write metrics textfile {METRICS_TEXTFILE}: {e}")
+
+
+async def _export_metrics_textfile() -> None:
+    """Rewrite the metrics textfile every HASS_MCP_METRICS_TEXTFILE_INTERVAL seconds."""
+    while True:
+        _write_metrics_textfile()
+        await asyncio.sleep(METRICS_TEXTFILE_INTERVAL)
+
+
+async def serve(transport: str = "stdio") -> None:
+    """Serve MCP requests with a warm cache.
+
+    Restores the memory cache snapshot (HASS_MCP_CACHE_SNAPSHOT_FILE) before
+    serving, prefetches the HASS_MCP_CACHE_WARMUP endpoints in the background
+    while the first requests are handled, and saves the snapshot again when
+    the server stops. When HASS_MCP_METRICS_TEXTFILE is set, metrics are
+    written to it periodically and once more on shutdown.
+
+    Args:
+        transport: Transport mode ("stdio", "sse", or "streamable-http")
+    """
+    await restore_cache_snapshot()
+    warmup = asyncio.create_task(warm_cache()) if CACHE_WARMUP else None
+    exporter = asyncio.create_task(_export_metrics_textfile()) if METRICS_TEXTFILE else None
+    try:
+        if transport == "sse":
+            await mcp.run_sse_async()
+        elif transport == "streamable-http":
+            await mcp.run_streamable_http_async()
+        else:
+            await mcp.run_stdio_async()
+    finally:
+        for task in (warmup, exporter):
+            if task is not None and not task.done():
+                task.cancel()
+        # Synchronous, so it completes even while the event loop is being cancelled
+        save_cache_snapshot()
+        if METRICS_TEXTFILE:
+            _write_metrics_textfile()
+
+
 def run_server() -> None:
     """Run the MCP server with transport selected via environment variables.
 
@@ -827,6 +897,8 @@ def run_server() -> None:
                     Used only for "sse" and "streamable-http" transports.
         - MCP_PORT: Port to bind (default: "8000"). Used only for server transports.
         - PORT: Alternative port variable (Smithery compatibility). Overridden by MCP_PORT.
+
+    The cache is restored and warmed up around the server (see serve()).
     """
     transport = os.environ.get("MCP_TRANSPORT", "stdio")
 
@@ -840,8 +912,8 @@ def run_server() -> None:
             host,
             port,
         )
-        mcp.run(transport=transport)  # type: ignore[arg-type]
+        anyio.run(serve, transport)
 
     else:
         logger.info("Starting server with transport=stdio")
-        mcp.run()
+        anyio.run(serve, "stdio")
@@ -102,6 +102,7 @@ async def analyze_usage_patterns_tool(entity_id: str, days: int = 30) -> dict[st
         - daily_distribution: Dictionary mapping day name to event count
         - peak_hour: Hour with most events (0-23)
         - peak_day: Day of week with most events
+        - heatmap: Dictionary mapping day name to 24 hourly event counts
 
     Examples:
         entity_id="light.living_room", days=30 - analyze light usage patterns over last month
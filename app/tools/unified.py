@@ -26,6 +26,7 @@ from app.api import (
     labels,
     logbook,
     notifications,
+    references,
     scenes,
     scripts,
     statistics,
@@ -731,6 +732,8 @@ async def diagnose(
     type: str,  # noqa: A002
     entity_id: str | None = None,
     domain: str | None = None,
+    ref_type: str = "entity_id",
+    value: str | None = None,
 ) -> dict[str, Any]:
     """
     Unified diagnostics tool that replaces diagnose_entity, check_entity_dependencies, analyze_automation_conflicts, and get_integration_errors.
@@ -741,8 +744,13 @@ async def diagnose(
             - "dependencies": Check entity dependencies (requires entity_id)
             - "automation_conflicts": Analyze automation conflicts
             - "integration_errors": Get integration errors (optional domain filter)
+            - "references": Find automations/scripts/scenes referencing a value
+              (requires value or entity_id)
         entity_id: Entity ID (required for "entity" and "dependencies" types)
         domain: Optional domain filter for "integration_errors" type
+        ref_type: Reference type for "references" type. Options: entity_id,
+                  device_id, area_id, tag_id, service (default: entity_id)
+        value: Referenced value for "references" type (defaults to entity_id)
 
     Returns:
         Diagnostics dictionary
@@ -752,6 +760,7 @@ async def diagnose(
         type="dependencies", entity_id="sensor.temperature" - Check dependencies
         type="automation_conflicts" - Analyze conflicts
         type="integration_errors", domain="hue" - Get integration errors
+        type="references", ref_type="device_id", value="abc123" - Find device references
     """
     logger.info(f"Running diagnostics: type={type}, entity_id={entity_id}, domain={domain}")
 
@@ -768,8 +777,13 @@ async def diagnose(
             return await diagnostics.analyze_automation_conflicts()
         if type == "integration_errors":
             return await diagnostics.get_integration_errors(domain)
+        if type == "references":
+            lookup_value = value or entity_id
+            if not lookup_value:
+                return {"error": "value or entity_id is required for reference lookup"}
+            return await references.find_references(lookup_value, ref_type)
         return {
-            "error": f"Invalid type: {type}. Valid types: entity, dependencies, automation_conflicts, integration_errors"
+            "error": f"Invalid type: {type}. Valid types: entity, dependencies, automation_conflicts, integration_errors, references"
         }
 
     except Exception as e:
@@ -981,6 +995,7 @@ async def get_system_data(
         data_type: Type of system data. Options:
             - "error_log": Get error log (supports level, integration, search_term, lines filters)
             - "cache_statistics": Get cache statistics
+            - "traces": Get the slowest tool call traces, request timings and saved profiles
             - "history": Get entity history (requires entity_id)
             - "domain_summary": Get domain summary (requires domain)
         entity_id: Entity ID (required for "history" type)
@@ -999,6 +1014,7 @@ async def get_system_data(
         data_type="error_log", integration="mqtt" - Filter by integration
         data_type="error_log", level="ERROR", integration="hue", lines=50 - Combined filters
         data_type="cache_statistics" - Get cache statistics
+        data_type="traces" - Find where slow tool calls spend their time
         data_type="history", entity_id="sensor.temperature" - Get entity history
         data_type="domain_summary", domain="light" - Get domain summary
     """
@@ -1011,6 +1027,8 @@ async def get_system_data(
             )
         if data_type == "cache_statistics":
             return await system.get_cache_statistics()
+        if data_type == "traces":
+            return await system.get_performance_traces()
         if data_type == "history":
             if not entity_id:
                 return {"error": "entity_id is required for history data type"}
@@ -1021,7 +1039,7 @@ async def get_system_data(
                 return {"error": "domain is required for domain_summary data type"}
             return await summarize_domain(domain)
         return {
-            "error": f"Invalid data_type: {data_type}. Valid types: error_log, cache_statistics, history, domain_summary"
+            "error": f"Invalid data_type: {data_type}. Valid types: error_log, cache_statistics, traces, history, domain_summary"
         }
 
     except Exception as e:
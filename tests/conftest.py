@@ -257,6 +257,46 @@ def clear_cache_before_test_sync(request):
     yield
 
 
+@pytest.fixture(autouse=True)
+def clear_segment_cache():
+    """Clear the history/logbook segment cache so buckets do not leak between tests."""
+    from app.core.cache.segments import get_segment_cache
+
+    get_segment_cache().clear()
+    yield
+    get_segment_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_error_log_index():
+    """Clear the error log index so parsed records and offsets do not leak between tests."""
+    from app.core.error_log import get_error_log_index
+
+    get_error_log_index().clear()
+    yield
+    get_error_log_index().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_area_index():
+    """Clear the area vocabulary index so areas do not leak between tests."""
+    from app.core.vectordb.areas import get_area_index
+
+    get_area_index().clear()
+    yield
+    get_area_index().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_entity_text_index():
+    """Clear the entity text index so indexed entities do not leak between tests."""
+    from app.core.text_index import get_entity_text_index
+
+    get_entity_text_index().clear()
+    yield
+    get_entity_text_index().clear()
+
+
 # Note: We don't use autouse for async fixture to avoid pytest-asyncio
 # trying to create event loops for sync tests. Async tests will use
 # their own cache clearing fixtures in their test files.
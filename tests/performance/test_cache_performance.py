@@ -0,0 +1,41 @@
+"""Performance tests for persistent cache backends."""
+
+import time
+
+import pytest
+
+
+async def _measure(label, operation, iterations):
+    """Run an async operation iterations times and print its rate."""
+    start_time = time.perf_counter()
+    for i in range(iterations):
+        await operation(i)
+    elapsed_time = time.perf_counter() - start_time
+    ops_per_second = iterations / elapsed_time if elapsed_time > 0 else 0
+    print(f"{label}: {iterations} ops in {elapsed_time:.2f}s, Rate: {ops_per_second:.0f} ops/s")
+    return ops_per_second
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_file_cache_throughput(tmp_path):
+    """Benchmark file cache backend set, hit and miss throughput (ops per second)."""
+    try:
+        from app.core.cache.file import FileCacheBackend
+    except ImportError:
+        pytest.skip("aiofiles not available for file backend tests")
+
+    backend = FileCacheBackend(cache_dir=str(tmp_path))
+    value = {"entity_id": "light.kitchen", "state": "on", "attributes": {"brightness": 255}}
+    iterations = 500
+
+    print()
+    await _measure(
+        "file set",
+        lambda i: backend.set(f"entities:state:id=light.l{i}", value, ttl=300),
+        iterations,
+    )
+    await _measure("file get", lambda i: backend.get(f"entities:state:id=light.l{i}"), iterations)
+    await _measure("file miss", lambda i: backend.get(f"entities:state:id=none{i}"), iterations)
+
+    assert await backend.get("entities:state:id=light.l0") == value
@@ -178,3 +178,50 @@ async def test_large_entity_set():
     print(f"\nLarge entity set: {len(entity_ids)} entities")
     print(f"Indexed: {result['succeeded']}, Failed: {result['failed']}")
     print(f"Time: {elapsed_time:.2f}s, Rate: {entities_per_second:.2f} entities/s")
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_process_query_throughput():
+    """Benchmark query classification throughput (queries per second)."""
+    from unittest.mock import MagicMock, patch
+
+    from app.core.vectordb.classification import process_query
+
+    queries = [
+        "turn on the living room lights",
+        "what is the temperature in the kitchen",
+        "set bedroom brightness to 50%",
+        "show me all motion sensors",
+        "analyze energy usage for the last 7 days",
+        "close the garage door lock",
+        "increase the fan speed in the office",
+        "which switches are on",
+    ]
+    areas = [
+        {"area_id": f"area_{i}", "name": f"Area {i}", "aliases": [f"zone {i}"]} for i in range(50)
+    ]
+    areas.append({"area_id": "living_room", "name": "Living Room", "aliases": ["lounge"]})
+
+    async def get_areas():
+        return areas
+
+    manager, config = MagicMock(), MagicMock()
+    iterations = 2000
+
+    async def get_all_states():
+        return []
+
+    with (
+        patch("app.core.vectordb.classification.get_areas", get_areas),
+        patch("app.core.vectordb.classification.get_all_states", get_all_states),
+    ):
+        start_time = time.perf_counter()
+        for i in range(iterations):
+            result = await process_query(queries[i % len(queries)], manager, config)
+        elapsed_time = time.perf_counter() - start_time
+
+    assert result["intent"]
+    queries_per_second = iterations / elapsed_time if elapsed_time > 0 else 0
+    print(f"\nprocess_query: {iterations} queries in {elapsed_time:.2f}s")
+    print(f"Rate: {queries_per_second:.0f} queries/s")
@@ -409,3 +409,29 @@ class TestMCPServer:
             result = await get_system_info(info_type="version")
             mock_get.assert_called_once()
             assert result == "2025.3.0"
+
+    @pytest.mark.asyncio
+    async def test_serve_restores_warms_and_saves_cache(self):
+        """Test that serve() wraps the transport with cache restore, warmup and save."""
+        from app import server
+
+        warmup_started = asyncio.Event()
+
+        async def fake_warm_cache():
+            warmup_started.set()
+
+        async def fake_run_stdio():
+            await warmup_started.wait()
+
+        with (
+            patch.object(server, "CACHE_WARMUP", ["default"]),
+            patch.object(server, "restore_cache_snapshot", new_callable=AsyncMock) as restore,
+            patch.object(server, "warm_cache", side_effect=fake_warm_cache),
+            patch.object(server, "save_cache_snapshot") as save,
+            patch.object(server.mcp, "run_stdio_async", side_effect=fake_run_stdio) as run,
+        ):
+            await server.serve("stdio")
+
+        restore.assert_awaited_once()
+        run.assert_called_once()
+        save.assert_called_once()
@@ -10,6 +10,7 @@ from app.api.automations import (
     disable_automation,
     enable_automation,
     get_automation_config,
+    get_automation_configs,
     get_automation_execution_log,
     get_automations,
     reload_automations,
@@ -175,6 +176,85 @@ class TestGetAutomationConfig:
             assert call_args[1]["headers"]["Authorization"] == "Bearer test_token"
 
 
+class TestGetAutomationConfigs:
+    """Test the get_automation_configs function."""
+
+    @pytest.fixture(autouse=True)
+    def mock_config(self):
+        """Mock HA_URL and HA_TOKEN for all tests in this class."""
+        with (
+            patch("app.config.HA_URL", "http://localhost:8123"),
+            patch("app.config.HA_TOKEN", "test_token"),
+            patch("app.core.decorators.HA_TOKEN", "test_token"),
+        ):
+            yield
+
+    @pytest.fixture(autouse=True)
+    async def clear_cache(self):
+        """Clear cache before each test to ensure isolation."""
+        cache = await get_cache_manager()
+        await cache.clear()
+        yield
+        await cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_get_automation_configs_success(self):
+        """Test that configs are keyed by entity_id and failures are skipped."""
+        mock_automations = [
+            {"entity_id": "automation.morning"},
+            {"entity_id": "automation.broken"},
+            {"entity_id": "automation.evening"},
+            {"state": "on"},
+        ]
+
+        async def config_side_effect(automation_id):
+            if automation_id == "broken":
+                return {"error": "Not found"}
+            return {"id": automation_id, "alias": automation_id.title()}
+
+        with (
+            patch("app.api.automations.get_automations", return_value=mock_automations),
+            patch(
+                "app.api.automations.get_automation_config", side_effect=config_side_effect
+            ) as mock_get_config,
+        ):
+            result = await get_automation_configs()
+
+            assert result == {
+                "automation.morning": {"id": "morning", "alias": "Morning"},
+                "automation.evening": {"id": "evening", "alias": "Evening"},
+            }
+            assert mock_get_config.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_automation_configs_skips_exceptions(self):
+        """Test that a config raising an exception does not fail the batch."""
+        mock_automations = [{"entity_id": "automation.ok"}, {"entity_id": "automation.bad"}]
+
+        async def config_side_effect(automation_id):
+            if automation_id == "bad":
+                raise RuntimeError("boom")
+            return {"id": automation_id}
+
+        with (
+            patch("app.api.automations.get_automations", return_value=mock_automations),
+            patch("app.api.automations.get_automation_config", side_effect=config_side_effect),
+        ):
+            result = await get_automation_configs(max_concurrency=1)
+
+            assert result == {"automation.ok": {"id": "ok"}}
+
+    @pytest.mark.asyncio
+    async def test_get_automation_configs_automations_error(self):
+        """Test that an error from get_automations is passed through."""
+        mock_error = {"error": "Could not get automations"}
+
+        with patch("app.api.automations.get_automations", return_value=mock_error):
+            result = await get_automation_configs()
+
+            assert result == mock_error
+
+
 class TestCreateAutomation:
     """Test the create_automation function."""
 
@@ -10,6 +10,15 @@ from app.api.diagnostics import (
     diagnose_entity,
     get_integration_errors,
 )
+from app.core.error_log import ErrorLogIndex, ErrorLogUnavailable
+from app.core.references import get_reference_index
+
+
+def error_log_index(log_text):
+    """Build an error log index from log text."""
+    index = ErrorLogIndex()
+    index.feed(log_text)
+    return index
 
 
 class TestDiagnoseEntity:
@@ -211,6 +220,13 @@ class TestCheckEntityDependencies:
         ):
             yield
 
+    @pytest.fixture(autouse=True)
+    def clear_reference_index(self):
+        """Start each test with an empty reference index."""
+        get_reference_index().clear()
+        yield
+        get_reference_index().clear()
+
     @pytest.mark.asyncio
     async def test_check_entity_dependencies_success(self):
         """Test successful dependency check."""
@@ -244,10 +260,17 @@ class TestCheckEntityDependencies:
 
         with (
             patch("app.api.diagnostics.get_automations", return_value=mock_automations),
-            patch("app.api.diagnostics.get_automation_config", return_value=mock_automation_config),
+            patch(
+                "app.api.references.get_automation_configs",
+                return_value={"automation.turn_on_lights": mock_automation_config},
+            ),
             patch("app.api.diagnostics.get_scripts", return_value=mock_scripts),
-            patch("app.api.diagnostics.get_script_config", return_value=mock_script_config),
+            patch(
+                "app.api.references.get_script_configs",
+                return_value={"script.lights_on": mock_script_config},
+            ),
             patch("app.api.diagnostics.get_scenes", return_value=mock_scenes),
+            patch("app.api.references.get_scenes", return_value=mock_scenes),
         ):
             result = await check_entity_dependencies("light.living_room")
 
@@ -260,6 +283,48 @@ class TestCheckEntityDependencies:
             assert len(result["scripts"]) == 1
             assert len(result["scenes"]) == 1
 
+    @pytest.mark.asyncio
+    async def test_check_entity_dependencies_template_reference(self):
+        """Test that entities only referenced inside templates are dependencies."""
+        mock_automations = [{"entity_id": "automation.too_hot", "alias": "Too hot"}]
+        mock_automation_config = {
+            "trigger": [
+                {
+                    "platform": "template",
+                    "value_template": "{{ states('sensor.temp') | float > 25 }}",
+                }
+            ],
+            "action": [{"service": "fan.turn_on", "target": {"entity_id": "fan.bedroom"}}],
+        }
+        mock_scripts = [{"entity_id": "script.report", "friendly_name": "Report"}]
+        mock_script_config = {
+            "sequence": [
+                {
+                    "service": "notify.mobile",
+                    "data": {"message": "It is {{ states.sensor.temp.state }} degrees"},
+                }
+            ]
+        }
+
+        with (
+            patch("app.api.diagnostics.get_automations", return_value=mock_automations),
+            patch(
+                "app.api.references.get_automation_configs",
+                return_value={"automation.too_hot": mock_automation_config},
+            ),
+            patch("app.api.diagnostics.get_scripts", return_value=mock_scripts),
+            patch(
+                "app.api.references.get_script_configs",
+                return_value={"script.report": mock_script_config},
+            ),
+            patch("app.api.diagnostics.get_scenes", return_value=[]),
+            patch("app.api.references.get_scenes", return_value=[]),
+        ):
+            result = await check_entity_dependencies("sensor.temp")
+
+        assert [a["entity_id"] for a in result["automations"]] == ["automation.too_hot"]
+        assert [s["entity_id"] for s in result["scripts"]] == ["script.report"]
+
     @pytest.mark.asyncio
     async def test_check_entity_dependencies_no_dependencies(self):
         """Test dependency check with no dependencies."""
@@ -269,8 +334,11 @@ class TestCheckEntityDependencies:
 
         with (
             patch("app.api.diagnostics.get_automations", return_value=mock_automations),
+            patch("app.api.references.get_automation_configs", return_value={}),
             patch("app.api.diagnostics.get_scripts", return_value=mock_scripts),
+            patch("app.api.references.get_script_configs", return_value={}),
             patch("app.api.diagnostics.get_scenes", return_value=mock_scenes),
+            patch("app.api.references.get_scenes", return_value=mock_scenes),
         ):
             result = await check_entity_dependencies("light.unused")
 
@@ -293,6 +361,29 @@ class TestCheckEntityDependencies:
             assert len(result["scripts"]) == 0
             assert len(result["scenes"]) == 0
 
+    @pytest.mark.asyncio
+    async def test_check_entity_dependencies_bulk_config_error(self):
+        """Test dependency check when the bulk config loader returns an error."""
+        mock_automations = [
+            {"entity_id": "automation.turn_on_lights", "alias": "Turn on lights"},
+        ]
+
+        with (
+            patch("app.api.diagnostics.get_automations", return_value=mock_automations),
+            patch(
+                "app.api.references.get_automation_configs",
+                return_value={"error": "Could not get automations"},
+            ),
+            patch("app.api.diagnostics.get_scripts", return_value=[]),
+            patch("app.api.references.get_script_configs", return_value={}),
+            patch("app.api.diagnostics.get_scenes", return_value=[]),
+            patch("app.api.references.get_scenes", return_value=[]),
+        ):
+            result = await check_entity_dependencies("light.living_room")
+
+            assert isinstance(result, dict)
+            assert result["automations"] == []
+
 
 class TestAnalyzeAutomationConflicts:
     """Test the analyze_automation_conflicts function."""
@@ -322,7 +413,10 @@ class TestAnalyzeAutomationConflicts:
 
         with (
             patch("app.api.diagnostics.get_automations", return_value=mock_automations),
-            patch("app.api.diagnostics.get_automation_config", return_value=mock_automation_config),
+            patch(
+                "app.api.diagnostics.get_automation_configs",
+                return_value={"automation.turn_on": mock_automation_config},
+            ),
         ):
             result = await analyze_automation_conflicts()
 
@@ -352,14 +446,14 @@ class TestAnalyzeAutomationConflicts:
             ]
         }
 
-        def get_config_side_effect(automation_id):
-            if "turn_on" in automation_id:
-                return mock_config_turn_on
-            return mock_config_turn_off
+        mock_configs = {
+            "automation.turn_on": mock_config_turn_on,
+            "automation.turn_off": mock_config_turn_off,
+        }
 
         with (
             patch("app.api.diagnostics.get_automations", return_value=mock_automations),
-            patch("app.api.diagnostics.get_automation_config", side_effect=get_config_side_effect),
+            patch("app.api.diagnostics.get_automation_configs", return_value=mock_configs),
         ):
             result = await analyze_automation_conflicts()
 
@@ -398,15 +492,13 @@ class TestGetIntegrationErrors:
     @pytest.mark.asyncio
     async def test_get_integration_errors_success(self):
         """Test successful retrieval of integration errors."""
-        mock_error_log = {
-            "log_text": """2024-01-01 12:00:00 ERROR (MainThread) [homeassistant.components.hue] Connection failed
+        mock_error_log = error_log_index(
+            """2024-01-01 12:00:00 ERROR (MainThread) [homeassistant.components.hue] Connection failed
 2024-01-01 12:00:01 ERROR (MainThread) [homeassistant.components.mqtt] Failed to connect
-2024-01-01 12:00:02 INFO (MainThread) [homeassistant.components.light] Loaded""",
-            "error_count": 2,
-            "warning_count": 0,
-        }
+2024-01-01 12:00:02 INFO (MainThread) [homeassistant.components.light] Loaded"""
+        )
 
-        with patch("app.api.diagnostics.get_hass_error_log", return_value=mock_error_log):
+        with patch("app.api.diagnostics.refresh_error_log", return_value=mock_error_log):
             result = await get_integration_errors()
 
             assert isinstance(result, dict)
@@ -420,14 +512,12 @@ class TestGetIntegrationErrors:
     @pytest.mark.asyncio
     async def test_get_integration_errors_filtered_by_domain(self):
         """Test integration errors filtered by domain."""
-        mock_error_log = {
-            "log_text": """2024-01-01 12:00:00 ERROR (MainThread) [homeassistant.components.hue] Connection failed
-2024-01-01 12:00:01 ERROR (MainThread) [homeassistant.components.mqtt] Failed to connect""",
-            "error_count": 2,
-            "warning_count": 0,
-        }
+        mock_error_log = error_log_index(
+            """2024-01-01 12:00:00 ERROR (MainThread) [homeassistant.components.hue] Connection failed
+2024-01-01 12:00:01 ERROR (MainThread) [homeassistant.components.mqtt] Failed to connect"""
+        )
 
-        with patch("app.api.diagnostics.get_hass_error_log", return_value=mock_error_log):
+        with patch("app.api.diagnostics.refresh_error_log", return_value=mock_error_log):
             result = await get_integration_errors(domain="hue")
 
             assert isinstance(result, dict)
@@ -438,14 +528,12 @@ class TestGetIntegrationErrors:
     @pytest.mark.asyncio
     async def test_get_integration_errors_no_errors(self):
         """Test integration errors with no errors in log."""
-        mock_error_log = {
-            "log_text": """2024-01-01 12:00:00 INFO (MainThread) [homeassistant.components.light] Loaded
-2024-01-01 12:00:01 INFO (MainThread) [homeassistant.components.sensor] Loaded""",
-            "error_count": 0,
-            "warning_count": 0,
-        }
+        mock_error_log = error_log_index(
+            """2024-01-01 12:00:00 INFO (MainThread) [homeassistant.components.light] Loaded
+2024-01-01 12:00:01 INFO (MainThread) [homeassistant.components.sensor] Loaded"""
+        )
 
-        with patch("app.api.diagnostics.get_hass_error_log", return_value=mock_error_log):
+        with patch("app.api.diagnostics.refresh_error_log", return_value=mock_error_log):
             result = await get_integration_errors()
 
             assert isinstance(result, dict)
@@ -455,9 +543,9 @@ class TestGetIntegrationErrors:
     @pytest.mark.asyncio
     async def test_get_integration_errors_error_log_error(self):
         """Test integration errors when error log API returns error."""
-        mock_error = {"error": "Could not get error log"}
+        mock_error = ErrorLogUnavailable("500 Internal Server Error")
 
-        with patch("app.api.diagnostics.get_hass_error_log", return_value=mock_error):
+        with patch("app.api.diagnostics.refresh_error_log", side_effect=mock_error):
             result = await get_integration_errors()
 
             assert isinstance(result, dict)
@@ -467,17 +555,15 @@ class TestGetIntegrationErrors:
     @pytest.mark.asyncio
     async def test_get_integration_errors_exception_in_line(self):
         """Test integration errors with exception in log line."""
-        mock_error_log = {
-            "log_text": """2024-01-01 12:00:00 ERROR (MainThread) [homeassistant.components.hue] Connection failed
+        mock_error_log = error_log_index(
+            """2024-01-01 12:00:00 ERROR (MainThread) [homeassistant.components.hue] Connection failed
 Exception: Traceback (most recent call last):
   File "homeassistant/components/hue/__init__.py", line 42, in setup
     raise ConnectionError
-ConnectionError""",
-            "error_count": 1,
-            "warning_count": 0,
-        }
+ConnectionError"""
+        )
 
-        with patch("app.api.diagnostics.get_hass_error_log", return_value=mock_error_log):
+        with patch("app.api.diagnostics.refresh_error_log", return_value=mock_error_log):
             result = await get_integration_errors()
 
             assert isinstance(result, dict)
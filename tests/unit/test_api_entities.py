@@ -1,5 +1,7 @@
 """Unit tests for app.api.entities module."""
 
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -10,6 +12,8 @@ from app.api.entities import (
     get_entities,
     get_entity_history,
     get_entity_state,
+    iter_entities_history,
+    iter_entity_history,
 )
 
 
@@ -302,6 +306,48 @@ class TestGetEntities:
             assert len(result) == 1
             assert "kitchen" in result[0]["entity_id"].lower()
 
+    @pytest.mark.asyncio
+    async def test_get_entities_search_reuses_indexed_snapshot(self):
+        """Test that repeated searches reuse the cached snapshot without re-syncing the index."""
+        from app.core.text_index import get_entity_text_index
+
+        get_entity_text_index().clear()
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.json.return_value = [
+            {
+                "entity_id": f"light.room_{i}",
+                "state": "on",
+                "last_updated": "2025-01-01T00:00:00Z",
+                "attributes": {"friendly_name": f"Room {i} Light"},
+            }
+            for i in range(50)
+        ]
+        mock_response.raise_for_status = MagicMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+
+        with (
+            patch("app.api.entities.get_client", return_value=mock_client),
+            patch("app.core.decorators.HA_TOKEN", "test_token"),
+        ):
+            first = await get_entities(search_query="room 1")
+            version = get_entity_text_index().version
+            with patch.object(
+                get_entity_text_index(), "add", side_effect=AssertionError("re-indexed")
+            ):
+                second = await get_entities(search_query="room 4", lean=False)
+
+        # One /api/states download; the second search only verifies its candidates
+        mock_client.get.assert_awaited_once()
+        assert get_entity_text_index().version == version
+        assert [e["entity_id"] for e in first] == ["light.room_1"] + [
+            f"light.room_{i}" for i in range(10, 20)
+        ]
+        assert [e["entity_id"] for e in second] == ["light.room_4"] + [
+            f"light.room_{i}" for i in range(40, 50)
+        ]
+        get_entity_text_index().clear()
+
     @pytest.mark.asyncio
     async def test_get_entities_with_limit(self):
         """Test get_entities with limit."""
@@ -402,6 +448,28 @@ class TestGetEntityHistory:
             assert isinstance(result, list)
             assert len(result) > 0
 
+    @pytest.mark.asyncio
+    async def test_get_entity_history_keeps_repeated_states(self):
+        """Test that consecutive rows with the same state (attribute changes) are kept."""
+        history = [
+            {"entity_id": "light.test", "state": "on", "last_changed": "2024-01-01T00:00:00Z"},
+            {"state": "on", "last_changed": "2024-01-01T01:00:00Z"},
+            {"state": "off", "last_changed": "2024-01-01T02:00:00Z"},
+        ]
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.json.return_value = [history]
+        mock_response.raise_for_status = MagicMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+
+        with (
+            patch("app.api.entities.get_client", return_value=mock_client),
+            patch("app.core.decorators.HA_TOKEN", "test_token"),
+        ):
+            result = await get_entity_history("light.test", hours=1)
+
+        assert result == [history]
+
     @pytest.mark.asyncio
     async def test_get_entity_history_with_params(self):
         """Test get_entity_history constructs correct URL and params."""
@@ -421,3 +489,130 @@ class TestGetEntityHistory:
             assert "/api/history/period/" in call_args[0][0]
             assert call_args[1]["params"]["filter_entity_id"] == "light.test"
             assert "end_time" in call_args[1]["params"]
+
+    @pytest.mark.asyncio
+    async def test_get_entity_history_reuses_closed_hours(self):
+        """Test that a repeated query only fetches the open tail from HA."""
+        now = datetime.now(UTC)
+        timeline = [
+            {"state": "on", "last_changed": (now - timedelta(hours=5)).isoformat()},
+            {"state": "off", "last_changed": (now - timedelta(hours=3)).isoformat()},
+        ]
+
+        async def get(url, headers=None, params=None):
+            start = datetime.fromisoformat(url.rsplit("/", 1)[-1])
+            end = datetime.fromisoformat(params["end_time"])
+            in_range = [
+                s for s in timeline if start <= datetime.fromisoformat(s["last_changed"]) < end
+            ]
+            mock_response = MagicMock()
+            mock_response.raise_for_status = MagicMock()
+            mock_response.json.return_value = [in_range] if in_range else []
+            return mock_response
+
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(side_effect=get)
+
+        with (
+            patch("app.api.entities.get_client", return_value=mock_client),
+            patch("app.core.decorators.HA_TOKEN", "test_token"),
+        ):
+            first = await get_entity_history("light.test", hours=24)
+            second = await get_entity_history("light.test", hours=24)
+
+        assert [s["state"] for s in first[0]] == ["on", "off"]
+        assert [s["state"] for s in second[0]] == ["on", "off"]
+        assert second[0][0]["entity_id"] == "light.test"
+        # The second call only requests the range after the last closed hour
+        tail_start = datetime.fromisoformat(
+            mock_client.get.call_args_list[-1][0][0].rsplit("/", 1)[-1]
+        )
+        assert now - tail_start < timedelta(hours=2)
+
+
+class TestIterEntityHistory:
+    """Test the iter_entity_history function."""
+
+    @staticmethod
+    def _mock_stream_client(mock_response):
+        """Build a client whose stream() context manager yields mock_response."""
+
+        @asynccontextmanager
+        async def stream(method, url, **kwargs):
+            stream.calls.append((method, url, kwargs))
+            yield mock_response
+
+        stream.calls = []
+        mock_client = MagicMock()
+        mock_client.stream = stream
+        return mock_client
+
+    @pytest.mark.asyncio
+    async def test_iter_entity_history_without_ijson(self):
+        """Test that states are flattened from the decoded body when ijson is missing."""
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.aread = AsyncMock()
+        mock_response.json.return_value = [[{"state": "1"}, {"state": "2"}], [{"state": "3"}]]
+        mock_client = self._mock_stream_client(mock_response)
+
+        with (
+            patch("app.api.entities.get_client", return_value=mock_client),
+            patch("app.api.entities.ijson", None),
+        ):
+            states = [state async for state in iter_entity_history("sensor.test", hours=24)]
+
+        assert [s["state"] for s in states] == ["1", "2", "3"]
+        method, url, kwargs = mock_client.stream.calls[0]
+        assert method == "GET"
+        assert "/api/history/period/" in url
+        assert kwargs["params"]["filter_entity_id"] == "sensor.test"
+        assert kwargs["params"]["no_attributes"] == "true"
+
+    @pytest.mark.asyncio
+    async def test_iter_entity_history_with_ijson(self):
+        """Test incremental parsing across chunk boundaries when ijson is available."""
+        pytest.importorskip("ijson")
+        body = b'[[{"state": "1.5"}, {"state": "2"}], [{"state": "on"}]]'
+
+        async def aiter_bytes():
+            for i in range(0, len(body), 7):
+                yield body[i : i + 7]
+
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.aiter_bytes = aiter_bytes
+        mock_client = self._mock_stream_client(mock_response)
+
+        with patch("app.api.entities.get_client", return_value=mock_client):
+            states = [state async for state in iter_entity_history("sensor.test", hours=24)]
+
+        assert [s["state"] for s in states] == ["1.5", "2", "on"]
+
+    @pytest.mark.asyncio
+    async def test_iter_entities_history_batched(self):
+        """Test one comma-separated request and entity_id carried over minimal states."""
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.aread = AsyncMock()
+        mock_response.json.return_value = [
+            [{"entity_id": "sensor.a", "state": "1"}, {"state": "2"}],
+            [{"entity_id": "sensor.b", "state": "3"}],
+        ]
+        mock_client = self._mock_stream_client(mock_response)
+
+        with (
+            patch("app.api.entities.get_client", return_value=mock_client),
+            patch("app.api.entities.ijson", None),
+        ):
+            states = [
+                (entity_id, state["state"])
+                async for entity_id, state in iter_entities_history(
+                    ["sensor.a", "sensor.b"], hours=24
+                )
+            ]
+
+        assert states == [("sensor.a", "1"), ("sensor.a", "2"), ("sensor.b", "3")]
+        assert len(mock_client.stream.calls) == 1
+        _, _, kwargs = mock_client.stream.calls[0]
+        assert kwargs["params"]["filter_entity_id"] == "sensor.a,sensor.b"
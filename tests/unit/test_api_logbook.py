@@ -114,6 +114,29 @@ class TestGetLogbook:
             call_args = mock_client.get.call_args
             assert call_args[1]["params"]["entity"] == "light.living_room"
 
+    @pytest.mark.asyncio
+    async def test_get_logbook_reuses_closed_hours(self):
+        """Test that a repeated hours-based query only fetches the open tail."""
+        mock_client = AsyncMock()
+        mock_get_response = MagicMock()
+        mock_get_response.json.return_value = []
+        mock_get_response.raise_for_status = MagicMock()
+        mock_client.get = AsyncMock(return_value=mock_get_response)
+
+        with patch("app.api.logbook._logbook_api._get_client", return_value=mock_client):
+            await get_logbook(entity_id="light.living_room", hours=24)
+            await get_logbook(entity_id="light.living_room", hours=24)
+
+        # One request for the cold query; the second only needs the head and tail
+        assert mock_client.get.call_count == 3
+        first_url = mock_client.get.call_args_list[0][0][0]
+        tail_url, tail_kwargs = (
+            mock_client.get.call_args_list[-1][0][0],
+            mock_client.get.call_args_list[-1][1],
+        )
+        assert "end_time" in tail_kwargs["params"]
+        assert tail_url > first_url
+
     @pytest.mark.asyncio
     async def test_get_logbook_empty(self):
         """Test retrieval when no entries are found."""
@@ -0,0 +1,88 @@
+"""Unit tests for app.api.references module."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.api.references import find_references, refresh_reference_index
+from app.core.references import get_reference_index
+
+
+class TestFindReferences:
+    """Test the find_references function."""
+
+    @pytest.fixture(autouse=True)
+    def mock_config(self):
+        """Mock HA_URL and HA_TOKEN for all tests in this class."""
+        with (
+            patch("app.config.HA_URL", "http://localhost:8123"),
+            patch("app.config.HA_TOKEN", "test_token"),
+            patch("app.core.decorators.HA_TOKEN", "test_token"),
+        ):
+            yield
+
+    @pytest.fixture(autouse=True)
+    def clear_reference_index(self):
+        """Start each test with an empty reference index."""
+        get_reference_index().clear()
+        yield
+        get_reference_index().clear()
+
+    @pytest.mark.asyncio
+    async def test_find_references_success(self):
+        """Test finding automations, scripts and scenes referencing an entity."""
+        mock_automation_configs = {
+            "automation.turn_on_lights": {
+                "trigger": [{"platform": "device", "device_id": "dev1"}],
+                "action": [{"service": "light.turn_on", "entity_id": "light.living_room"}],
+            }
+        }
+        mock_script_configs = {
+            "script.lights_on": {"sequence": [{"service": "light.turn_on", "area_id": "kitchen"}]}
+        }
+        mock_scenes = [
+            {"entity_id": "scene.dim", "entity_id_list": ["light.living_room"]},
+        ]
+
+        with (
+            patch(
+                "app.api.references.get_automation_configs",
+                return_value=mock_automation_configs,
+            ),
+            patch("app.api.references.get_script_configs", return_value=mock_script_configs),
+            patch("app.api.references.get_scenes", return_value=mock_scenes),
+        ):
+            by_entity = await find_references("light.living_room")
+            by_device = await find_references("dev1", ref_type="device_id")
+            by_service = await find_references("light.turn_on", ref_type="service")
+
+        assert by_entity["automations"] == ["automation.turn_on_lights"]
+        assert by_entity["scripts"] == []
+        assert by_entity["scenes"] == ["scene.dim"]
+        assert by_device["automations"] == ["automation.turn_on_lights"]
+        assert by_service["automations"] == ["automation.turn_on_lights"]
+        assert by_service["scripts"] == ["script.lights_on"]
+
+    @pytest.mark.asyncio
+    async def test_find_references_invalid_ref_type(self):
+        """Test that an unknown reference type returns an error."""
+        result = await find_references("x", ref_type="label_id")
+
+        assert "error" in result
+        assert "Invalid ref_type" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_drops_kind_on_load_error(self):
+        """Test that a failed load does not leave stale references behind."""
+        mock_configs = {"automation.a": {"action": [{"entity_id": "light.x"}]}}
+
+        with patch("app.api.references.get_automation_configs", return_value=mock_configs):
+            index = await refresh_reference_index(kinds=("automation",))
+            assert index.lookup("entity_id", "light.x", "automation") == {"automation.a"}
+
+        with patch(
+            "app.api.references.get_automation_configs",
+            return_value={"error": "Connection error"},
+        ):
+            index = await refresh_reference_index(kinds=("automation",))
+            assert index.lookup("entity_id", "light.x", "automation") == set()
@@ -7,6 +7,7 @@ import pytest
 
 from app.api.scripts import (
     get_script_config,
+    get_script_configs,
     get_scripts,
     reload_scripts,
     run_script,
@@ -190,6 +191,56 @@ class TestGetScriptConfig:
                 assert result == mock_entity
 
 
+class TestGetScriptConfigs:
+    """Test the get_script_configs function."""
+
+    @pytest.fixture(autouse=True)
+    def mock_config(self):
+        """Mock HA_URL and HA_TOKEN for all tests in this class."""
+        with (
+            patch("app.config.HA_URL", "http://localhost:8123"),
+            patch("app.config.HA_TOKEN", "test_token"),
+            patch("app.core.decorators.HA_TOKEN", "test_token"),
+        ):
+            yield
+
+    @pytest.fixture(autouse=True)
+    async def clear_cache(self):
+        """Clear cache before each test to ensure isolation."""
+        cache = await get_cache_manager()
+        await cache.clear()
+        yield
+        await cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_get_script_configs_success(self):
+        """Test that configs are keyed by entity_id and errors are skipped."""
+        mock_scripts = [{"entity_id": "script.lights_on"}, {"entity_id": "script.missing"}]
+
+        async def config_side_effect(script_id):
+            if script_id == "missing":
+                return {"error": "Not found"}
+            return {"sequence": [{"service": "light.turn_on"}]}
+
+        with (
+            patch("app.api.scripts.get_scripts", return_value=mock_scripts),
+            patch("app.api.scripts.get_script_config", side_effect=config_side_effect),
+        ):
+            result = await get_script_configs()
+
+            assert result == {"script.lights_on": {"sequence": [{"service": "light.turn_on"}]}}
+
+    @pytest.mark.asyncio
+    async def test_get_script_configs_scripts_error(self):
+        """Test that an error from get_scripts is passed through."""
+        mock_error = {"error": "Could not get scripts"}
+
+        with patch("app.api.scripts.get_scripts", return_value=mock_error):
+            result = await get_script_configs()
+
+            assert result == mock_error
+
+
 class TestRunScript:
     """Test the run_script function."""
 
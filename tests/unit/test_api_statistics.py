@@ -1,16 +1,41 @@
 """Unit tests for app.api.statistics module."""
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
 from app.api.statistics import (
     analyze_usage_patterns,
     get_domain_statistics,
     get_entity_statistics,
+    get_long_term_statistics,
+    select_statistics_period,
 )
 
 
+def mock_history_stream(history):
+    """Build an iter_entity_history replacement that streams the given history."""
+
+    async def _iter(entity_id, hours):
+        for state_list in history:
+            for state in state_list:
+                yield state
+
+    return _iter
+
+
+def mock_batch_history_stream(history_by_entity):
+    """Build an iter_entities_history replacement that streams per-entity history."""
+
+    async def _iter(entity_ids, hours):
+        for entity_id in entity_ids:
+            for state in history_by_entity.get(entity_id, []):
+                yield entity_id, state
+
+    return _iter
+
+
 class TestGetEntityStatistics:
     """Test the get_entity_statistics function."""
 
@@ -36,7 +61,9 @@ class TestGetEntityStatistics:
             ]
         ]
 
-        with patch("app.api.statistics.get_entity_history", return_value=mock_history):
+        with patch(
+            "app.api.statistics.iter_entity_history", side_effect=mock_history_stream(mock_history)
+        ):
             result = await get_entity_statistics("sensor.temperature", period_days=7)
 
             assert isinstance(result, dict)
@@ -57,7 +84,9 @@ class TestGetEntityStatistics:
         """Test statistics retrieval with no data."""
         mock_history = []
 
-        with patch("app.api.statistics.get_entity_history", return_value=mock_history):
+        with patch(
+            "app.api.statistics.iter_entity_history", side_effect=mock_history_stream(mock_history)
+        ):
             result = await get_entity_statistics("sensor.temperature", period_days=7)
 
             assert isinstance(result, dict)
@@ -75,7 +104,9 @@ class TestGetEntityStatistics:
             ]
         ]
 
-        with patch("app.api.statistics.get_entity_history", return_value=mock_history):
+        with patch(
+            "app.api.statistics.iter_entity_history", side_effect=mock_history_stream(mock_history)
+        ):
             result = await get_entity_statistics("light.living_room", period_days=7)
 
             assert isinstance(result, dict)
@@ -87,15 +118,21 @@ class TestGetEntityStatistics:
     @pytest.mark.asyncio
     async def test_get_entity_statistics_history_error(self):
         """Test statistics retrieval when history API returns error."""
-        mock_error = {"error": "Entity not found"}
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        mock_response.text = "Entity not found"
+
+        async def failing_stream(entity_id, hours):
+            raise httpx.HTTPStatusError("Not Found", request=MagicMock(), response=mock_response)
+            yield  # pragma: no cover
 
-        with patch("app.api.statistics.get_entity_history", return_value=mock_error):
+        with patch("app.api.statistics.iter_entity_history", side_effect=failing_stream):
             result = await get_entity_statistics("sensor.temperature", period_days=7)
 
             assert isinstance(result, dict)
             assert result["entity_id"] == "sensor.temperature"
             assert "error" in result
-            assert result["error"] == "Entity not found"
+            assert "404" in result["error"]
             assert result["statistics"] == {}
 
     @pytest.mark.asyncio
@@ -104,7 +141,10 @@ class TestGetEntityStatistics:
         # Test with odd number of values
         mock_history_odd = [[{"state": str(i)} for i in range(5)]]  # [0, 1, 2, 3, 4]
 
-        with patch("app.api.statistics.get_entity_history", return_value=mock_history_odd):
+        with patch(
+            "app.api.statistics.iter_entity_history",
+            side_effect=mock_history_stream(mock_history_odd),
+        ):
             result = await get_entity_statistics("sensor.temperature", period_days=7)
 
             assert result["statistics"]["median"] == 2.0
@@ -112,7 +152,10 @@ class TestGetEntityStatistics:
         # Test with even number of values
         mock_history_even = [[{"state": str(i)} for i in range(4)]]  # [0, 1, 2, 3]
 
-        with patch("app.api.statistics.get_entity_history", return_value=mock_history_even):
+        with patch(
+            "app.api.statistics.iter_entity_history",
+            side_effect=mock_history_stream(mock_history_even),
+        ):
             result = await get_entity_statistics("sensor.temperature", period_days=7)
 
             assert result["statistics"]["median"] == 1.5  # (1 + 2) / 2
@@ -139,24 +182,31 @@ class TestGetDomainStatistics:
             {"entity_id": "sensor.humidity"},
         ]
 
-        mock_entity_stats = {
-            "entity_id": "sensor.temperature",
-            "period_days": 7,
-            "statistics": {"min": 20.0, "max": 25.0, "mean": 22.5, "median": 22.5},
+        mock_history = {
+            "sensor.temperature": [{"state": "20.0"}, {"state": "25.0"}],
+            "sensor.humidity": [{"state": "40"}, {"state": "unavailable"}, {"state": "50"}],
         }
 
         with (
             patch("app.api.statistics.get_entities", return_value=mock_entities),
-            patch("app.api.statistics.get_entity_statistics", return_value=mock_entity_stats),
+            patch(
+                "app.api.statistics.iter_entities_history",
+                side_effect=mock_batch_history_stream(mock_history),
+            ) as mock_iter,
         ):
-            result = await get_domain_statistics("sensor", period_days=7)
+            result = await get_domain_statistics("sensor", period_days=1)
 
             assert isinstance(result, dict)
             assert result["domain"] == "sensor"
-            assert result["period_days"] == 7
+            assert result["period_days"] == 1
             assert result["total_entities"] == 2
             assert "entity_statistics" in result
             assert len(result["entity_statistics"]) == 2
+            assert result["entity_statistics"]["sensor.temperature"]["mean"] == 22.5
+            assert result["entity_statistics"]["sensor.humidity"]["max"] == 50.0
+            assert "incomplete" not in result
+            # Both entities are fetched with a single batched request
+            mock_iter.assert_called_once_with(["sensor.temperature", "sensor.humidity"], hours=24)
 
     @pytest.mark.asyncio
     async def test_get_domain_statistics_no_numeric_entities(self):
@@ -165,18 +215,16 @@ class TestGetDomainStatistics:
             {"entity_id": "sensor.temperature"},
         ]
 
-        mock_entity_stats = {
-            "entity_id": "sensor.temperature",
-            "period_days": 7,
-            "note": "Entity state is not numeric",
-            "statistics": {},
-        }
+        mock_history = {"sensor.temperature": [{"state": "on"}, {"state": "off"}]}
 
         with (
             patch("app.api.statistics.get_entities", return_value=mock_entities),
-            patch("app.api.statistics.get_entity_statistics", return_value=mock_entity_stats),
+            patch(
+                "app.api.statistics.iter_entities_history",
+                side_effect=mock_batch_history_stream(mock_history),
+            ),
         ):
-            result = await get_domain_statistics("sensor", period_days=7)
+            result = await get_domain_statistics("sensor", period_days=1)
 
             assert isinstance(result, dict)
             assert result["entity_statistics"] == {}
@@ -196,24 +244,224 @@ class TestGetDomainStatistics:
             assert result["total_entities"] == 0
 
     @pytest.mark.asyncio
-    async def test_get_domain_statistics_limit_to_10(self):
-        """Test that domain statistics limits to first 10 entities."""
-        mock_entities = [{"entity_id": f"sensor.entity_{i}"} for i in range(15)]
-
-        mock_entity_stats = {
-            "entity_id": "sensor.temperature",
-            "period_days": 7,
-            "statistics": {"min": 20.0, "max": 25.0, "mean": 22.5, "median": 22.5},
+    async def test_get_domain_statistics_all_entities(self):
+        """Test that domain statistics covers every entity in chunked batch requests."""
+        mock_entities = [{"entity_id": f"sensor.entity_{i}"} for i in range(60)]
+        mock_history = {e["entity_id"]: [{"state": "1"}, {"state": "2"}] for e in mock_entities}
+
+        with (
+            patch("app.api.statistics.get_entities", return_value=mock_entities),
+            patch(
+                "app.api.statistics.iter_entities_history",
+                side_effect=mock_batch_history_stream(mock_history),
+            ) as mock_iter,
+        ):
+            result = await get_domain_statistics("sensor", period_days=1)
+
+            assert len(result["entity_statistics"]) == 60
+            # 60 entities in chunks of HISTORY_BATCH_SIZE (25)
+            assert [len(c.args[0]) for c in mock_iter.call_args_list] == [25, 25, 10]
+
+    @pytest.mark.asyncio
+    async def test_get_domain_statistics_large_domain(self):
+        """Test that domains over the default get_entities limit are covered in full."""
+        mock_entities = [{"entity_id": f"sensor.entity_{i}"} for i in range(130)]
+        mock_history = {e["entity_id"]: [{"state": "1"}] for e in mock_entities}
+
+        async def _get_entities(domain=None, limit=100, lean=True):
+            return mock_entities[:limit] if limit > 0 else mock_entities
+
+        with (
+            patch("app.api.statistics.get_entities", side_effect=_get_entities),
+            patch(
+                "app.api.statistics.iter_entities_history",
+                side_effect=mock_batch_history_stream(mock_history),
+            ) as mock_iter,
+        ):
+            result = await get_domain_statistics("sensor", period_days=1)
+
+            assert result["total_entities"] == 130
+            assert len(result["entity_statistics"]) == 130
+            requested = [entity_id for c in mock_iter.call_args_list for entity_id in c.args[0]]
+            assert requested == [e["entity_id"] for e in mock_entities]
+            assert [len(c.args[0]) for c in mock_iter.call_args_list] == [25, 25, 25, 25, 25, 5]
+
+    @pytest.mark.asyncio
+    async def test_get_domain_statistics_failed_batch(self):
+        """Test that a failing batch only drops its own entities."""
+        mock_entities = [{"entity_id": f"sensor.entity_{i}"} for i in range(30)]
+        stream = mock_batch_history_stream(
+            {e["entity_id"]: [{"state": "1"}] for e in mock_entities}
+        )
+
+        async def _iter(entity_ids, hours):
+            if "sensor.entity_0" in entity_ids:
+                raise httpx.ConnectError("Connection failed")
+            async for item in stream(entity_ids, hours):
+                yield item
+
+        with (
+            patch("app.api.statistics.get_entities", return_value=mock_entities),
+            patch("app.api.statistics.iter_entities_history", side_effect=_iter),
+        ):
+            result = await get_domain_statistics("sensor", period_days=1)
+
+            assert "error" not in result
+            assert sorted(result["entity_statistics"]) == [
+                f"sensor.entity_{i}" for i in range(25, 30)
+            ]
+            # The failed batch is reported, so the aggregate isn't mistaken for complete
+            assert result["incomplete"] is True
+            assert len(result["errors"]) == 1
+            assert result["errors"][0]["entity_ids"] == [f"sensor.entity_{i}" for i in range(25)]
+            assert "Connection failed" in result["errors"][0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_get_domain_statistics_numpy(self):
+        """Test the NumPy reduction gives the same statistics as the streaming one."""
+        pytest.importorskip("numpy")
+        mock_entities = [{"entity_id": "sensor.temperature"}]
+        mock_history = {"sensor.temperature": [{"state": str(v)} for v in range(1, 102)]}
+
+        results = []
+        for use_numpy in (False, True):
+            with (
+                patch("app.api.statistics.get_entities", return_value=mock_entities),
+                patch(
+                    "app.api.statistics.iter_entities_history",
+                    side_effect=mock_batch_history_stream(mock_history),
+                ),
+            ):
+                results.append(
+                    await get_domain_statistics("sensor", period_days=1, use_numpy=use_numpy)
+                )
+
+        streaming, vectorized = (r["entity_statistics"]["sensor.temperature"] for r in results)
+        assert streaming.keys() == vectorized.keys()
+        for key, value in streaming.items():
+            assert vectorized[key] == pytest.approx(value)
+
+
+class TestLongTermStatistics:
+    """Test long-term statistics support in the statistics functions."""
+
+    @pytest.fixture(autouse=True)
+    def mock_config(self):
+        """Mock HA_URL and HA_TOKEN for all tests in this class."""
+        with (
+            patch("app.config.HA_URL", "http://localhost:8123"),
+            patch("app.config.HA_TOKEN", "test_token"),
+            patch("app.core.decorators.HA_TOKEN", "test_token"),
+            patch("app.api.statistics.websocket_available", return_value=True),
+        ):
+            yield
+
+    def test_select_statistics_period(self):
+        """Test that the resolution is picked from the period."""
+        assert select_statistics_period(2) == "5minute"
+        assert select_statistics_period(30) == "hour"
+        assert select_statistics_period(365) == "day"
+
+    @pytest.mark.asyncio
+    async def test_get_long_term_statistics_request(self):
+        """Test the recorder/statistics_during_period command payload."""
+        with patch("app.api.statistics.ws_command", return_value={}) as mock_ws:
+            result = await get_long_term_statistics(["sensor.temperature"], period_days=30)
+
+            message = mock_ws.call_args[0][0]
+            assert message["type"] == "recorder/statistics_during_period"
+            assert message["statistic_ids"] == ["sensor.temperature"]
+            assert message["period"] == "hour"
+            assert result == {"period": "hour", "statistics": {}}
+
+    @pytest.mark.asyncio
+    async def test_get_entity_statistics_uses_long_term_statistics(self):
+        """Test that long periods are served from long-term statistics."""
+        mock_lts = {
+            "sensor.temperature": [
+                {"start": 0, "mean": 20.0, "min": 18.0, "max": 21.0},
+                {"start": 1, "mean": 22.0, "min": 21.0, "max": 25.0},
+            ]
         }
 
+        with (
+            patch("app.api.statistics.ws_command", return_value=mock_lts),
+            patch("app.api.statistics.iter_entity_history") as mock_history,
+        ):
+            result = await get_entity_statistics("sensor.temperature", period_days=7)
+
+            assert result["source"] == "long_term_statistics"
+            assert result["resolution"] == "hour"
+            assert result["data_points"] == 2
+            assert result["statistics"]["min"] == 18.0
+            assert result["statistics"]["max"] == 25.0
+            assert result["statistics"]["mean"] == 21.0
+            mock_history.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_entity_statistics_falls_back_to_history(self):
+        """Test fallback to raw history when the entity has no long-term statistics."""
+        mock_history = [[{"state": "1"}, {"state": "3"}]]
+
+        with (
+            patch("app.api.statistics.ws_command", return_value={}),
+            patch(
+                "app.api.statistics.iter_entity_history",
+                side_effect=mock_history_stream(mock_history),
+            ),
+        ):
+            result = await get_entity_statistics("sensor.temperature", period_days=7)
+
+            assert result["source"] == "history"
+            assert result["statistics"]["mean"] == 2.0
+
+    @pytest.mark.asyncio
+    async def test_get_entity_statistics_short_period_skips_long_term(self):
+        """Test that periods of a day or less use raw history only."""
+        mock_history = [[{"state": "5"}]]
+
+        with (
+            patch("app.api.statistics.ws_command") as mock_ws,
+            patch(
+                "app.api.statistics.iter_entity_history",
+                side_effect=mock_history_stream(mock_history),
+            ),
+        ):
+            result = await get_entity_statistics("sensor.temperature", period_days=1)
+
+            assert result["source"] == "history"
+            mock_ws.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_domain_statistics_mixes_sources(self):
+        """Test one long-term request for the domain plus history fallback."""
+        mock_entities = [
+            {"entity_id": "sensor.temperature", "state": "21.5"},
+            {"entity_id": "sensor.legacy", "state": "3"},
+            {"entity_id": "sensor.status", "state": "ok"},
+        ]
+        mock_lts = {"sensor.temperature": [{"mean": 21.0, "min": 20.0, "max": 22.0}]}
+        mock_history = {"sensor.legacy": [{"state": "3"}]}
+
         with (
             patch("app.api.statistics.get_entities", return_value=mock_entities),
-            patch("app.api.statistics.get_entity_statistics", return_value=mock_entity_stats),
+            patch("app.api.statistics.ws_command", return_value=mock_lts) as mock_ws,
+            patch(
+                "app.api.statistics.iter_entities_history",
+                side_effect=mock_batch_history_stream(mock_history),
+            ) as mock_iter,
         ):
             result = await get_domain_statistics("sensor", period_days=7)
 
-            # Should only call get_entity_statistics 10 times (for first 10 entities)
-            assert len(result["entity_statistics"]) <= 10
+            assert mock_ws.call_count == 1
+            assert mock_ws.call_args[0][0]["statistic_ids"] == [
+                "sensor.temperature",
+                "sensor.legacy",
+            ]
+            assert result["entity_statistics"]["sensor.temperature"]["mean"] == 21.0
+            assert result["entity_statistics"]["sensor.legacy"]["mean"] == 3.0
+            assert "sensor.status" not in result["entity_statistics"]
+            mock_iter.assert_called_once_with(["sensor.legacy"], hours=168)
 
 
 class TestAnalyzeUsagePatterns:
@@ -257,6 +505,40 @@ class TestAnalyzeUsagePatterns:
             # Peak hour should be 18 (3 events)
             assert result["peak_hour"] == 18
 
+    @pytest.mark.asyncio
+    async def test_analyze_usage_patterns_heatmap(self):
+        """Test the hour x weekday heatmap and its consistency with the distributions."""
+        mock_logbook = [
+            # Wednesday 18:00 and 18:30 UTC
+            {"when": "2025-01-15T18:00:00Z"},
+            {"when": "2025-01-15T18:30:00+00:00"},
+            # Thursday 19:00 in its own offset
+            {"when": "2025-01-16T19:00:00+02:00"},
+            # Friday 07:00 as a naive timestamp
+            {"when": "2025-01-17T07:00:00"},
+        ]
+
+        with patch("app.api.statistics.get_entity_logbook", return_value=mock_logbook):
+            result = await analyze_usage_patterns("light.living_room", days=30)
+
+            heatmap = result["heatmap"]
+            assert list(heatmap) == [
+                "Monday",
+                "Tuesday",
+                "Wednesday",
+                "Thursday",
+                "Friday",
+                "Saturday",
+                "Sunday",
+            ]
+            assert all(len(hours) == 24 for hours in heatmap.values())
+            assert heatmap["Wednesday"][18] == 2
+            assert heatmap["Thursday"][19] == 1
+            assert heatmap["Friday"][7] == 1
+            assert result["hourly_distribution"] == {7: 1, 18: 2, 19: 1}
+            assert result["daily_distribution"] == {"Wednesday": 2, "Thursday": 1, "Friday": 1}
+            assert result["peak_day"] == "Wednesday"
+
     @pytest.mark.asyncio
     async def test_analyze_usage_patterns_no_events(self):
         """Test usage pattern analysis with no events."""
@@ -272,6 +554,7 @@ class TestAnalyzeUsagePatterns:
             assert result["daily_distribution"] == {}
             assert result["peak_hour"] is None
             assert result["peak_day"] is None
+            assert result["heatmap"] == {}
 
     @pytest.mark.asyncio
     async def test_analyze_usage_patterns_logbook_error(self):
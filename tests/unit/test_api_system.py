@@ -11,6 +11,7 @@ from app.api.system import (
     get_hass_version,
     get_system_health,
     get_system_overview,
+    refresh_error_log,
     restart_home_assistant,
 )
 from app.core.cache.manager import get_cache_manager
@@ -161,6 +162,134 @@ class TestGetHassErrorLog:
             assert "error" in result
             assert "Error retrieving error log: Connection failed" in result["error"]
 
+    @pytest.mark.asyncio
+    async def test_get_hass_error_log_filters(self):
+        """Test level, integration and search filters over whole records."""
+        mock_log_text = (
+            "2025-01-01 10:00:00 ERROR (MainThread) [homeassistant.components.hue] Offline\n"
+            "Traceback (most recent call last):\n"
+            "2025-01-01 10:00:01 WARNING (MainThread) [homeassistant.components.hue] Slow\n"
+            "2025-01-01 10:00:02 ERROR (MainThread) [homeassistant.components.mqtt] Refused\n"
+        )
+        mock_client = AsyncMock()
+        mock_response = MagicMock(status_code=200, text=mock_log_text)
+        mock_client.get = AsyncMock(return_value=mock_response)
+
+        with patch("app.api.system.get_client", return_value=mock_client):
+            result = await get_hass_error_log(level="ERROR", integration="hue")
+
+            assert result["log_text"].splitlines() == mock_log_text.splitlines()[:2]
+            assert result["error_count"] == 1
+            assert result["warning_count"] == 0
+            assert result["integration_mentions"] == {"hue": 1}
+            assert result["filters_applied"] == {"level": "ERROR", "integration": "hue"}
+
+            result = await get_hass_error_log(search_term="refused")
+            assert result["integration_mentions"] == {"mqtt": 1}
+
+    @pytest.mark.asyncio
+    async def test_get_hass_error_log_integration_mentions(self):
+        """Test that the integration filter matches records mentioning it anywhere."""
+        mock_log_text = (
+            "2025-01-01 10:00:00 ERROR (MainThread) [homeassistant.components.mqtt] Refused\n"
+            "2025-01-01 10:00:01 ERROR (MainThread) [homeassistant.core] Error in MQTT callback\n"
+            "2025-01-01 10:00:02 ERROR (MainThread) [homeassistant.components.hue] Offline\n"
+        )
+        mock_client = AsyncMock()
+        mock_response = MagicMock(status_code=200, text=mock_log_text)
+        mock_client.get = AsyncMock(return_value=mock_response)
+
+        with patch("app.api.system.get_client", return_value=mock_client):
+            result = await get_hass_error_log(integration="mqtt")
+
+        assert result["log_text"].splitlines() == mock_log_text.splitlines()[:2]
+        assert result["error_count"] == 2
+        assert result["integration_mentions"] == {"mqtt": 1}
+
+
+class TestRefreshErrorLog:
+    """Test the refresh_error_log function."""
+
+    LOG = (
+        "2025-01-01 10:00:00 ERROR (MainThread) [homeassistant.components.hue] Offline\n"
+        "2025-01-01 10:00:01 WARNING (MainThread) [homeassistant.components.mqtt] Slow\n"
+    )
+    NEW = "2025-01-01 10:00:02 ERROR (MainThread) [homeassistant.components.zwave] Failed\n"
+
+    @pytest.fixture(autouse=True)
+    def mock_config(self):
+        """Mock HA_URL and HA_TOKEN for all tests in this class."""
+        with (
+            patch("app.config.HA_URL", "http://localhost:8123"),
+            patch("app.config.HA_TOKEN", "test_token"),
+            patch("app.core.decorators.HA_TOKEN", "test_token"),
+        ):
+            yield
+
+    @staticmethod
+    def responses(*items):
+        """Build a mock client returning (status_code, text) responses in order."""
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(
+            side_effect=[MagicMock(status_code=code, text=text) for code, text in items]
+        )
+        return mock_client
+
+    @pytest.mark.asyncio
+    async def test_range_request_parses_only_new_lines(self):
+        """Test that the second refresh requests and parses only the new part of the log."""
+        last_line = self.LOG.splitlines(keepends=True)[-1]
+        mock_client = self.responses((200, self.LOG), (206, last_line + self.NEW))
+
+        with patch("app.api.system.get_client", return_value=mock_client):
+            await refresh_error_log()
+            index = await refresh_error_log()
+
+        headers = mock_client.get.call_args_list[1].kwargs["headers"]
+        assert headers["Range"] == f"bytes={len(self.LOG) - len(last_line)}-"
+        assert [r.integration for r in index.records()] == ["hue", "mqtt", "zwave"]
+        assert index.offset == len(self.LOG + self.NEW)
+
+    @pytest.mark.asyncio
+    async def test_range_ignored_full_log_returned(self):
+        """Test that a full response to a range request only parses the new part."""
+        mock_client = self.responses((200, self.LOG), (200, self.LOG + self.NEW))
+
+        with patch("app.api.system.get_client", return_value=mock_client):
+            await refresh_error_log()
+            index = await refresh_error_log()
+
+        assert len(index) == 3
+        assert index.level_counts == {"ERROR": 2, "WARNING": 1}
+
+    @pytest.mark.asyncio
+    async def test_new_log_detected(self):
+        """Test that a log that no longer matches the followed position is re-read."""
+        mock_client = self.responses(
+            (200, self.LOG),
+            (206, "2025-01-02 00:00:00 INFO (MainThread) [x] Restart\n"),
+            (200, self.NEW),
+        )
+
+        with patch("app.api.system.get_client", return_value=mock_client):
+            await refresh_error_log()
+            index = await refresh_error_log()
+
+        assert "Range" not in mock_client.get.call_args_list[2].kwargs["headers"]
+        assert [r.integration for r in index.records()] == ["zwave"]
+        assert index.offset == len(self.NEW)
+
+    @pytest.mark.asyncio
+    async def test_shorter_log_re_read(self):
+        """Test that a 416 response (log shorter than the offset) re-reads the log."""
+        mock_client = self.responses((200, self.LOG), (416, ""), (200, self.NEW))
+
+        with patch("app.api.system.get_client", return_value=mock_client):
+            await refresh_error_log()
+            index = await refresh_error_log()
+
+        assert [r.integration for r in index.records()] == ["zwave"]
+
 
 class TestGetSystemOverview:
     """Test the get_system_overview function."""
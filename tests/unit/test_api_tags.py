@@ -12,6 +12,7 @@ from app.api.tags import (
     list_tags,
 )
 from app.core.cache.manager import get_cache_manager
+from app.core.references import get_reference_index
 
 
 class TestListTags:
@@ -176,6 +177,13 @@ class TestGetTagAutomations:
         ):
             yield
 
+    @pytest.fixture(autouse=True)
+    def clear_reference_index(self):
+        """Start each test with an empty reference index."""
+        get_reference_index().clear()
+        yield
+        get_reference_index().clear()
+
     @pytest.mark.asyncio
     async def test_get_tag_automations_success(self):
         """Test successful retrieval of tag automations."""
@@ -200,7 +208,10 @@ class TestGetTagAutomations:
 
         with (
             patch("app.api.tags.get_automations", return_value=mock_automations),
-            patch("app.api.tags.get_automation_config", return_value=mock_config),
+            patch(
+                "app.api.references.get_automation_configs",
+                return_value={"automation.front_door_unlock": mock_config},
+            ),
         ):
             result = await get_tag_automations("ABC123")
 
@@ -234,13 +245,53 @@ class TestGetTagAutomations:
 
         with (
             patch("app.api.tags.get_automations", return_value=mock_automations),
-            patch("app.api.tags.get_automation_config", return_value=mock_config),
+            patch(
+                "app.api.references.get_automation_configs",
+                return_value={"automation.other": mock_config},
+            ),
         ):
             result = await get_tag_automations("ABC123")
 
             assert isinstance(result, list)
             assert len(result) == 0
 
+    @pytest.mark.asyncio
+    async def test_get_tag_automations_ignores_non_trigger_references(self):
+        """Test that automations only mentioning the tag outside their triggers are skipped."""
+        mock_automations = [
+            {
+                "entity_id": "automation.tag_scanned",
+                "state": "on",
+                "attributes": {"friendly_name": "Tag Scanned"},
+            },
+            {
+                "entity_id": "automation.fire_tag_event",
+                "state": "on",
+                "attributes": {"friendly_name": "Fire Tag Event"},
+            },
+        ]
+
+        configs = {
+            "automation.tag_scanned": {
+                "alias": "Tag Scanned",
+                "trigger": [{"platform": "tag", "tag_id": "ABC123"}],
+                "action": [],
+            },
+            "automation.fire_tag_event": {
+                "alias": "Fire Tag Event",
+                "trigger": [{"platform": "state", "entity_id": "binary_sensor.door"}],
+                "action": [{"event": "tag_scanned", "event_data": {"tag_id": "ABC123"}}],
+            },
+        }
+
+        with (
+            patch("app.api.tags.get_automations", return_value=mock_automations),
+            patch("app.api.references.get_automation_configs", return_value=configs),
+        ):
+            result = await get_tag_automations("ABC123")
+
+            assert [r["automation_id"] for r in result] == ["automation.tag_scanned"]
+
     @pytest.mark.asyncio
     async def test_get_tag_automations_multiple_triggers(self):
         """Test when automation has multiple triggers with one tag trigger."""
@@ -269,7 +320,10 @@ class TestGetTagAutomations:
 
         with (
             patch("app.api.tags.get_automations", return_value=mock_automations),
-            patch("app.api.tags.get_automation_config", return_value=mock_config),
+            patch(
+                "app.api.references.get_automation_configs",
+                return_value={"automation.multi_trigger": mock_config},
+            ),
         ):
             result = await get_tag_automations("ABC123")
 
@@ -279,7 +333,7 @@ class TestGetTagAutomations:
 
     @pytest.mark.asyncio
     async def test_get_tag_automations_config_error(self):
-        """Test when get_automation_config raises an exception."""
+        """Test when the bulk config loader returns an error."""
         mock_automations = [
             {
                 "entity_id": "automation.error",
@@ -290,7 +344,10 @@ class TestGetTagAutomations:
 
         with (
             patch("app.api.tags.get_automations", return_value=mock_automations),
-            patch("app.api.tags.get_automation_config", side_effect=Exception("Config error")),
+            patch(
+                "app.api.references.get_automation_configs",
+                return_value={"error": "Config error"},
+            ),
         ):
             result = await get_tag_automations("ABC123")
 
@@ -302,7 +359,10 @@ class TestGetTagAutomations:
         """Test when automation has no entity_id."""
         mock_automations = [{"state": "on", "attributes": {"friendly_name": "No Entity ID"}}]
 
-        with patch("app.api.tags.get_automations", return_value=mock_automations):
+        with (
+            patch("app.api.tags.get_automations", return_value=mock_automations),
+            patch("app.api.references.get_automation_configs", return_value={}),
+        ):
             result = await get_tag_automations("ABC123")
 
             assert isinstance(result, list)
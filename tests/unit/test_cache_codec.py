@@ -0,0 +1,174 @@
+"""Unit tests for the cache value codec."""
+
+import json
+import pickle
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+import app.core.cache.codec as codec_module
+from app.core.cache.codec import (
+    COMPRESSION_ZLIB,
+    FORMAT_JSON,
+    FORMAT_MSGPACK,
+    FORMAT_PICKLE,
+    Codec,
+    get_codec,
+)
+
+
+class Point:
+    """Value that is not JSON serializable."""
+
+    def __init__(self, x):
+        self.x = x
+
+    def __eq__(self, other):
+        return isinstance(other, Point) and self.x == other.x
+
+    def __hash__(self):
+        return hash(self.x)
+
+
+class TestCodec:
+    """Test the Codec class."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            {"entity_id": "light.kitchen", "attributes": {"brightness": 255}},
+            [1, 2.5, "three", None, True],
+            "text",
+            42,
+            None,
+        ],
+    )
+    def test_round_trip_json_types(self, value):
+        """JSON-compatible values are tagged as JSON and round-trip."""
+        codec = Codec(serializer="json", compression="none")
+        data = codec.encode(value)
+        assert data[0] == FORMAT_JSON
+        assert codec.decode(data) == value
+
+    def test_round_trip_pickle_types(self):
+        """Other values are pickled."""
+        codec = Codec(serializer="json", compression="none")
+        for value in ({1, 2, 3}, Point(3), (1, 2)):
+            data = codec.encode(value)
+            assert data[0] == FORMAT_PICKLE
+            assert codec.decode(data) == value
+
+    def test_default_str(self):
+        """Nested non-JSON values are stored as strings, as before."""
+        codec = Codec(serializer="json", compression="none")
+        decoded = codec.decode(codec.encode({"timestamp": datetime(2024, 1, 1)}))
+        assert isinstance(decoded["timestamp"], str)
+
+    def test_huge_int_falls_back_to_pickle(self):
+        """Values the JSON encoder rejects fall back to pickle."""
+        codec = Codec(serializer="json", compression="none")
+        value = {"big": 2**70}
+        data = codec.encode(value)
+        assert codec.decode(data) == value
+
+    def test_compression_above_threshold(self):
+        """Large values are compressed and flagged in the tag."""
+        codec = Codec(serializer="json", compression="zlib", compress_threshold=100)
+        small = codec.encode({"state": "on"})
+        assert small[0] == FORMAT_JSON
+
+        value = [{"entity_id": f"light.l{i}", "state": "on"} for i in range(200)]
+        large = codec.encode(value)
+        assert large[0] == FORMAT_JSON | COMPRESSION_ZLIB
+        assert len(large) < len(json.dumps(value))
+        assert codec.decode(large) == value
+
+    def test_incompressible_value_stays_uncompressed(self):
+        """Compression is skipped when it does not shrink the value."""
+        codec = Codec(serializer="json", compression="zlib", compress_threshold=1)
+        data = codec.encode("x")
+        assert data[0] == FORMAT_JSON
+
+    def test_decode_legacy_values(self):
+        """Untagged JSON and pickle values written by older versions still decode."""
+        codec = Codec(compression="none")
+        assert codec.decode(json.dumps({"a": 1}).encode()) == {"a": 1}
+        assert codec.decode(json.dumps(7).encode()) == 7
+        assert codec.decode(pickle.dumps({1, 2})) == {1, 2}
+
+    def test_decode_errors(self):
+        """Empty data and unknown tags raise ValueError."""
+        codec = Codec(compression="none")
+        with pytest.raises(ValueError, match="empty data"):
+            codec.decode(b"")
+        with pytest.raises(ValueError, match="Unknown format tag"):
+            codec.decode(b"\x07payload")
+
+    def test_decode_missing_library(self):
+        """Values encoded with a library that is not installed raise ValueError."""
+        codec = Codec(compression="none")
+        with (
+            patch.object(codec_module, "msgpack", None),
+            pytest.raises(ValueError, match="msgpack"),
+        ):
+            codec.decode(bytes((FORMAT_MSGPACK,)) + b"\x80")
+
+    def test_invalid_configuration(self):
+        """Unknown or unavailable serializers and compressors are rejected."""
+        with pytest.raises(ValueError, match="Unknown cache serializer"):
+            Codec(serializer="yaml")
+        with pytest.raises(ValueError, match="Unknown cache compression"):
+            Codec(compression="brotli")
+        with (
+            patch.object(codec_module, "lz4_frame", None),
+            pytest.raises(ValueError, match="lz4 compression selected"),
+        ):
+            Codec(compression="lz4")
+
+    def test_auto_compression_without_libraries(self):
+        """Auto compression is disabled when neither zstd nor lz4 is installed."""
+        with (
+            patch.object(codec_module, "zstd", None),
+            patch.object(codec_module, "lz4_frame", None),
+        ):
+            assert Codec(compression="auto").compression == 0
+
+    @pytest.mark.skipif(codec_module.msgpack is None, reason="msgpack not installed")
+    def test_msgpack_round_trip(self):
+        """msgpack keeps non-string dict keys."""
+        codec = Codec(serializer="msgpack", compression="none")
+        data = codec.encode({1: "one"})
+        assert data[0] == FORMAT_MSGPACK
+        assert codec.decode(data) == {1: "one"}
+
+    @pytest.mark.skipif(codec_module.zstd is None, reason="zstd not installed")
+    def test_zstd_round_trip(self):
+        """zstd-compressed values round-trip."""
+        codec = Codec(compression="zstd", compress_threshold=10)
+        value = ["light.kitchen"] * 100
+        assert codec.decode(codec.encode(value)) == value
+
+    @pytest.mark.skipif(codec_module.lz4_frame is None, reason="lz4 not installed")
+    def test_lz4_round_trip(self):
+        """lz4-compressed values round-trip."""
+        codec = Codec(compression="lz4", compress_threshold=10)
+        value = ["light.kitchen"] * 100
+        assert codec.decode(codec.encode(value)) == value
+
+
+class TestGetCodec:
+    """Test the get_codec function."""
+
+    def test_singleton(self):
+        """get_codec returns the same instance."""
+        assert get_codec() is get_codec()
+
+    def test_invalid_environment_falls_back(self):
+        """An invalid configured serializer falls back to the defaults."""
+        with (
+            patch.object(codec_module, "_codec", None),
+            patch.object(codec_module, "CACHE_SERIALIZER", "yaml"),
+        ):
+            codec = get_codec()
+            assert codec.format in (FORMAT_JSON, FORMAT_MSGPACK)
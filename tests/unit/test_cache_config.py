@@ -148,6 +148,20 @@ class TestCacheConfig:
         # Domain-level should still be available
         assert config.get_endpoint_ttl("entities") == 1800
 
+    def test_negative_ttl_configuration(self):
+        """Test that negative TTLs resolve operation, then domain, then global."""
+        config = CacheConfig()
+        config._config_data["negative_ttl"] = 30
+        config._config_data["endpoints"] = {
+            "entities": {"ttl": 60, "negative_ttl": 10, "get_entity_state": {"negative_ttl": 5}},
+            "automations.get_automation_config": {"negative_ttl": 0},
+        }
+
+        assert config.get_negative_ttl("entities", "get_entity_state") == 5
+        assert config.get_negative_ttl("entities", "get_entities") == 10
+        assert config.get_negative_ttl("automations", "get_automation_config") == 0
+        assert config.get_negative_ttl("areas", "get_areas") == 30
+
     def test_get_all_config(self):
         """Test getting all configuration."""
         config = CacheConfig()
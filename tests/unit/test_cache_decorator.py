@@ -4,6 +4,7 @@ import asyncio
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 from app.core.cache.decorator import cached, invalidate_cache
@@ -341,6 +342,141 @@ class TestCachedDecorator:
         result3 = await test_function(domain="light", limit=100)
         assert call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_decorator_records_end_to_end_latency(self):
+        """Test that hits and misses both record end-to-end latency."""
+        from app.core.cache.metrics import get_cache_metrics
+
+        @cached(ttl=60)
+        async def latency_function(value: str) -> str:
+            await asyncio.sleep(0.01)
+            return f"result_{value}"
+
+        metrics = get_cache_metrics()
+        metrics.reset()
+        await latency_function("a")
+        await latency_function("a")
+
+        latency = metrics.get_all_endpoint_stats()["test_cache_decorator:latency_function"][
+            "latency"
+        ]
+        assert latency["total"]["count"] == 2
+        assert latency["api"]["count"] == 1
+        assert latency["api"]["max_ms"] >= 10
+        assert latency["cache_hit"]["count"] == 1
+        assert latency["cache_miss"]["count"] == 1
+        metrics.reset()
+
+
+class TestNegativeCaching:
+    """Test caching of not-found outcomes."""
+
+    @staticmethod
+    def http_error(status_code: int) -> httpx.HTTPStatusError:
+        """Build an HTTP status error like raise_for_status() does."""
+        request = httpx.Request("GET", "http://ha.local/api/states/light.missing")
+        response = httpx.Response(
+            status_code, request=request, json={"message": "Entity not found."}
+        )
+        return httpx.HTTPStatusError(
+            f"Client error '{status_code}'", request=request, response=response
+        )
+
+    @pytest.mark.asyncio
+    async def test_not_found_error_is_cached_and_raised_again(self):
+        """Test that a 404 is cached and reported identically on a hit."""
+        from app.core.decorators import handle_api_errors
+
+        call_count = 0
+
+        @handle_api_errors
+        @cached(ttl=60, negative_ttl=30)
+        async def test_function(entity_id: str) -> dict[str, Any]:
+            nonlocal call_count
+            call_count += 1
+            raise self.http_error(404)
+
+        with patch("app.core.decorators.HA_TOKEN", "test_token"):
+            result1 = await test_function("light.missing")
+            result2 = await test_function("light.missing")
+
+        assert call_count == 1
+        assert result1 == result2 == {"error": "HTTP error: 404 Not Found - Entity not found."}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error",
+        [
+            httpx.TimeoutException("timed out"),
+            httpx.ConnectError("refused"),
+            "http_500",
+        ],
+    )
+    async def test_transient_errors_are_not_cached(self, error):
+        """Test that timeouts, connection errors and 5xx are never cached."""
+        if error == "http_500":
+            error = self.http_error(500)
+        call_count = 0
+
+        @cached(ttl=60, negative_ttl=30)
+        async def test_function(entity_id: str) -> dict[str, Any]:
+            nonlocal call_count
+            call_count += 1
+            raise error
+
+        for _ in range(2):
+            with pytest.raises(type(error)):
+                await test_function("light.kitchen")
+        assert call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_not_found_response_uses_negative_ttl(self):
+        """Test that "not found" error responses are cached for the negative TTL."""
+        call_count = 0
+
+        @cached(ttl=60, negative_ttl=30)
+        async def test_function(entity_id: str) -> dict[str, Any]:
+            nonlocal call_count
+            call_count += 1
+            if entity_id == "light.missing":
+                return {"error": f"Entity {entity_id} not found"}
+            return {"error": "Timeout error: Home Assistant did not respond in time"}
+
+        cache = await get_cache_manager()
+        with patch.object(cache, "set", wraps=cache.set) as cache_set:
+            await test_function("light.missing")
+            await test_function("light.missing")
+            await test_function("light.kitchen")
+            await test_function("light.kitchen")
+
+        assert call_count == 3
+        cache_set.assert_called_once()
+        assert cache_set.call_args.kwargs["ttl"] == 30
+
+    @pytest.mark.asyncio
+    async def test_negative_ttl_zero_disables(self):
+        """Test that a negative TTL of 0 keeps not-found outcomes uncached."""
+        call_count = 0
+
+        @cached(ttl=60)
+        async def test_function(entity_id: str) -> dict[str, Any]:
+            nonlocal call_count
+            call_count += 1
+            raise self.http_error(404)
+
+        with patch(
+            "app.core.cache.decorator.get_cache_config",
+        ) as get_config:
+            get_config.return_value.get_negative_ttl.return_value = 0
+            for _ in range(2):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await test_function("light.missing")
+
+        assert call_count == 2
+        get_config.return_value.get_negative_ttl.assert_called_with(
+            "test_cache_decorator", "test_function"
+        )
+
 
 class TestInvalidateCacheDecorator:
     """Test the @invalidate_cache decorator."""
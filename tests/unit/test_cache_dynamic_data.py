@@ -57,19 +57,25 @@ class TestEntityStateCaching:
 
     @pytest.mark.asyncio
     async def test_get_entity_state_conditional_caching_error(self):
-        """Test that error responses are not cached."""
+        """Test that 404s are cached briefly and server errors are not cached."""
         import httpx
 
+        def error_response(status_code: int, entity_id: str) -> MagicMock:
+            request = httpx.Request("GET", f"http://localhost:8123/api/states/{entity_id}")
+            mock_response = MagicMock()
+            mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+                "error",
+                request=request,
+                response=httpx.Response(status_code, request=request, text="Entity not found."),
+            )
+            return mock_response
+
         mock_client = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.reason_phrase = "Not Found"
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Not Found",
-            request=httpx.Request("GET", "http://localhost:8123/api/states/light.nonexistent"),
-            response=mock_response,
+        mock_client.get = AsyncMock(
+            side_effect=lambda url, **kwargs: error_response(
+                404 if url.endswith("nonexistent") else 500, url.rsplit("/", 1)[-1]
+            )
         )
-        mock_client.get = AsyncMock(return_value=mock_response)
 
         with (
             patch("app.api.entities.get_client", return_value=mock_client),
@@ -81,10 +87,16 @@ class TestEntityStateCaching:
             assert "error" in result1
             call_count = mock_client.get.call_count
 
-            # Second call - should call API again (not cached)
+            # Second call - the 404 is served from the negative cache
             result2 = await get_entity_state("light.nonexistent")
-            assert isinstance(result2, dict)
-            assert "error" in result2
+            assert result2 == result1
+            assert mock_client.get.call_count == call_count
+
+            # Server errors are transient - called again every time
+            await get_entity_state("light.broken")
+            call_count = mock_client.get.call_count
+            result3 = await get_entity_state("light.broken")
+            assert "error" in result3
             assert mock_client.get.call_count > call_count  # Called again
 
     @pytest.mark.asyncio
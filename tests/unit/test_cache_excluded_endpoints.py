@@ -1,5 +1,6 @@
 """Unit tests for explicitly excluded dynamic data endpoints (US-006)."""
 
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -13,6 +14,16 @@ from app.api.system import get_hass_error_log, get_system_overview
 from app.core.cache.manager import get_cache_manager
 
 
+def mock_stream(response):
+    """Build a client.stream() replacement whose context manager yields response."""
+
+    @asynccontextmanager
+    async def stream(*args, **kwargs):
+        yield response
+
+    return stream
+
+
 @pytest.fixture(autouse=True)
 async def clear_cache_fixture():
     """Clear cache before each test to ensure isolation."""
@@ -191,10 +202,12 @@ class TestStatisticsEndpointsNotCached:
         mock_response = MagicMock()
         mock_response.json.return_value = mock_history
         mock_response.raise_for_status = MagicMock()
-        mock_client.get = AsyncMock(return_value=mock_response)
+        mock_response.aread = AsyncMock()
+        mock_client.stream = mock_stream(mock_response)
 
         with (
             patch("app.api.entities.get_client", return_value=mock_client),
+            patch("app.api.entities.ijson", None),
             patch("app.core.decorators.HA_TOKEN", "test_token"),
         ):
             # First call
@@ -230,10 +243,13 @@ class TestStatisticsEndpointsNotCached:
         mock_response_history = MagicMock()
         mock_response_history.json.return_value = mock_history
         mock_response_history.raise_for_status = MagicMock()
-        mock_client.get = AsyncMock(side_effect=[mock_response_entities, mock_response_history])
+        mock_response_history.aread = AsyncMock()
+        mock_client.get = AsyncMock(return_value=mock_response_entities)
+        mock_client.stream = mock_stream(mock_response_history)
 
         with (
             patch("app.api.entities.get_client", return_value=mock_client),
+            patch("app.api.entities.ijson", None),
             patch("app.core.decorators.HA_TOKEN", "test_token"),
         ):
             # First call
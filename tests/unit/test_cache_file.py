@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import os
 import pickle
 import tempfile
 from contextlib import suppress
@@ -312,16 +313,12 @@ class TestFileCacheBackend:
         """Test file path generation."""
         key = "entities:state:id=light.living_room"
         file_path = file_backend._get_file_path(key)
-        metadata_path = file_backend._get_metadata_path(key)
 
-        # Check paths are correct
-        assert file_path.suffix == ".json"
-        assert metadata_path.name.endswith(".meta.json")
-        assert metadata_path.stem == f"{file_path.stem}.meta"
+        # Check path is correct
+        assert file_path.suffix == ".cache"
 
-        # Check that paths are within cache directory
+        # Check that path is within cache directory
         assert str(file_path).startswith(temp_cache_dir)
-        assert str(metadata_path).startswith(temp_cache_dir)
 
         # Check that prefix directory is included
         assert "entities" in str(file_path)
@@ -384,24 +381,76 @@ class TestFileCacheBackend:
         key = "test_key"
         await file_backend.set(key, "test_value", ttl=300)
 
-        # Check metadata file exists
+        # Metadata is the header line of the entry file
         file_path = file_backend._get_file_path(key)
-        metadata_path = file_backend._get_metadata_path(key)
+        assert list(file_path.parent.iterdir()) == [file_path]
 
-        assert metadata_path.exists()
-
-        # Read metadata
         import aiofiles
 
-        async with aiofiles.open(metadata_path) as f:
-            metadata_str = await f.read()
-            metadata = json.loads(metadata_str)
+        async with aiofiles.open(file_path, "rb") as f:
+            metadata = json.loads(await f.readline())
+            payload = await f.read()
 
         # Check metadata contains original key
         assert metadata["key"] == key
         assert "created_at" in metadata
         assert "expires_at" in metadata
         assert metadata["ttl"] == 300
+        assert metadata["size"] == len(payload)
+        assert file_backend._deserialize(payload) == "test_value"
+
+    @pytest.mark.asyncio
+    async def test_set_is_atomic(self, file_backend):
+        """Test that set replaces entries without leaving temporary files."""
+        key = "entities:state:id=light.kitchen"
+        await file_backend.set(key, "old")
+        await file_backend.set(key, "new")
+
+        file_path = file_backend._get_file_path(key)
+        assert list(file_path.parent.iterdir()) == [file_path]
+        assert await file_backend.get(key) == "new"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_during_set(self, file_backend):
+        """Test that readers never observe a partially written entry."""
+        key = "entities:list"
+        values = [{"index": i, "data": "x" * 20000} for i in range(20)]
+        await file_backend.set(key, values[0])
+
+        results = await asyncio.gather(
+            *[file_backend.set(key, value) for value in values],
+            *[file_backend.get(key) for _ in range(40)],
+        )
+        assert all(value in values for value in results[len(values) :])
+
+    @pytest.mark.asyncio
+    async def test_get_truncated_entry(self, file_backend):
+        """Test that a truncated entry is treated as a miss and removed."""
+        key = "entities:state:id=light.kitchen"
+        await file_backend.set(key, {"state": "on"})
+        file_path = file_backend._get_file_path(key)
+        file_path.write_bytes(file_path.read_bytes()[:-3])
+
+        assert await file_backend.get(key) is None
+        assert not file_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_legacy_and_stale_files(self, file_backend, temp_cache_dir):
+        """Test that cleanup removes old two-file entries and abandoned temporary files."""
+        await file_backend.set("entities:keep", "value")
+        prefix_dir = Path(temp_cache_dir) / "entities"
+        legacy = [prefix_dir / "abc.json", prefix_dir / "abc.meta.json"]
+        for path in legacy:
+            path.write_text("{}")
+        stale = prefix_dir / ".abandoned.tmp"
+        stale.write_bytes(b"partial")
+        os.utime(stale, (0, 0))
+
+        await file_backend.cleanup_expired()
+
+        assert not any(path.exists() for path in legacy)
+        assert not stale.exists()
+        assert await file_backend.get("entities:keep") == "value"
 
     @pytest.mark.asyncio
     async def test_pattern_matching_prefix(self, file_backend):
@@ -137,6 +137,7 @@ class TestMemoryCacheBackend:
         assert await cache.get("key0") is None
         # New key should exist
         assert await cache.get("new_key") == "new_value"
+        assert cache.evictions == 1
 
     @pytest.mark.asyncio
     async def test_concurrent_operations(self, cache):
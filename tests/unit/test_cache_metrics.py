@@ -3,7 +3,68 @@
 import pytest
 
 from app.core.cache.manager import get_cache_manager
-from app.core.cache.metrics import CacheMetrics, EndpointStats, get_cache_metrics
+from app.core.cache.metrics import (
+    CacheMetrics,
+    EndpointStats,
+    LatencyHistogram,
+    SlidingWindowCounter,
+    get_cache_metrics,
+)
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram class."""
+
+    def test_empty_histogram(self):
+        """Test that an empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        assert histogram.to_dict() == {
+            "count": 0,
+            "p50_ms": 0.0,
+            "p95_ms": 0.0,
+            "p99_ms": 0.0,
+            "max_ms": 0.0,
+        }
+
+    def test_percentiles_expose_the_tail(self):
+        """Test that percentiles separate the tail from the median."""
+        histogram = LatencyHistogram()
+        for _ in range(95):
+            histogram.record(2.0)
+        for _ in range(5):
+            histogram.record(800.0)
+
+        assert histogram.count == 100
+        assert 1.0 <= histogram.percentile(50) <= 2.5
+        assert histogram.percentile(99) > 500
+        assert histogram.percentile(100) == 800.0
+        assert histogram.to_dict()["max_ms"] == 800.0
+
+    def test_memory_is_bounded(self):
+        """Test that recording more values doesn't grow the histogram."""
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+        for i in range(10_000):
+            histogram.record(i * 7.3)
+        assert len(histogram.counts) == size
+        assert histogram.percentile(50) <= histogram.percentile(95) <= histogram.percentile(99)
+
+
+class TestSlidingWindowCounter:
+    """Test SlidingWindowCounter class."""
+
+    def test_events_leave_the_window(self):
+        """Test that only events within the window are counted."""
+        counter = SlidingWindowCounter(window_seconds=10)
+        counter.add(now=100.0)
+        counter.add(now=100.5)
+        counter.add(now=105.0)
+
+        assert counter.total(now=105.0) == 3
+        assert counter.total(now=110.2) == 1
+        assert counter.total(now=200.0) == 0
+        assert counter.rate(now=105.0) == 0.3
 
 
 class TestEndpointStats:
@@ -131,6 +192,47 @@ class TestCacheMetrics:
         assert stats.hits == 0
         assert stats.misses == 1
 
+    def test_record_latencies(self):
+        """Test that hit, miss, API, end-to-end and tool latencies are recorded."""
+        metrics = CacheMetrics()
+        metrics.record_hit("entities:get_entities", cache_time_ms=0.4)
+        metrics.record_miss("entities:get_entities", cache_time_ms=0.3)
+        metrics.record_api_call("entities:get_entities", api_time_ms=120.0)
+        metrics.record_request("entities:get_entities", total_time_ms=121.0)
+        metrics.record_tool_call("get_entity", duration_ms=130.0)
+
+        latency = metrics.get_all_endpoint_stats()["entities:get_entities"]["latency"]
+        assert latency["cache_hit"]["count"] == 1
+        assert latency["cache_miss"]["max_ms"] == 0.3
+        assert latency["api"]["p99_ms"] == 120.0
+        assert latency["total"]["count"] == 1
+        assert metrics.get_tool_stats()["get_entity"]["max_ms"] == 130.0
+        # Miss lookups don't skew the cache retrieval average
+        assert metrics.get_endpoint_stats("entities:get_entities").avg_cache_time_ms() == 0.4
+
+    def test_statistics_include_latency_and_rates(self):
+        """Test that overall statistics merge histograms and report window rates."""
+        metrics = CacheMetrics()
+        metrics.record_api_call("entities:get_entities", api_time_ms=10.0)
+        metrics.record_api_call("areas:get_areas", api_time_ms=1000.0)
+        metrics.record_hit("entities:get_entities", cache_time_ms=1.0)
+        metrics.record_hit("entities:get_entities", cache_time_ms=1.0)
+        metrics.record_miss("areas:get_areas")
+        metrics.record_tool_call("get_entity", duration_ms=5.0)
+
+        stats = metrics.get_statistics()
+        assert stats["latency"]["api"]["count"] == 2
+        assert stats["latency"]["api"]["max_ms"] == 1000.0
+        rates = stats["rates"]
+        assert rates["window_seconds"] == 60
+        assert rates["hits_per_second"] == round(2 / 60, 3)
+        assert rates["hit_rate"] == round(2 / 3, 3)
+        assert rates["tool_calls_per_second"] > 0
+
+        metrics.reset()
+        assert metrics.get_statistics()["rates"]["requests_per_second"] == 0.0
+        assert metrics.get_tool_stats() == {}
+
     def test_record_set(self):
         """Test recording a cache set."""
         metrics = CacheMetrics()
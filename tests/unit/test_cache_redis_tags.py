@@ -0,0 +1,153 @@
+"""Unit tests for Redis batch operations and tag-set invalidation."""
+
+from unittest.mock import patch
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.core.cache.redis import TAG_INDEX_KEY, TAG_KEY_PREFIX  # noqa: E402
+
+
+class TestRedisBatchOperations:
+    """Test pipelined batch operations and tag sets against fakeredis."""
+
+    @pytest.fixture
+    async def backend(self):
+        """Create a Redis backend backed by fakeredis."""
+        import redis.asyncio
+
+        import app.core.cache.redis as redis_module
+
+        # Other test modules swap the redis module for mocks
+        with patch.object(redis_module, "redis", redis.asyncio):
+            backend = redis_module.RedisCacheBackend(url="redis://localhost:6379/0")
+        backend._client = fakeredis.FakeAsyncRedis()
+        yield backend
+        await backend._client.flushdb()
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_set_adds_key_to_tag_set(self, backend):
+        """Test that set() tags keys by prefix and keys() hides tag sets."""
+        await backend.set("entities:state:id=light.kitchen", {"state": "on"}, ttl=60)
+
+        members = await backend._client.smembers(f"{TAG_KEY_PREFIX}entities")
+        assert members == {b"entities:state:id=light.kitchen"}
+        assert await backend.keys() == ["entities:state:id=light.kitchen"]
+
+        await backend.delete("entities:state:id=light.kitchen")
+        assert await backend._client.smembers(f"{TAG_KEY_PREFIX}entities") == set()
+
+    @pytest.mark.asyncio
+    async def test_get_many_set_many_delete_many(self, backend):
+        """Test batch round trips."""
+        await backend.set_many({"entities:a": 1, "entities:b": [2], "areas:x": {"n": 3}}, ttl=60)
+        assert await backend._client.ttl("entities:a") > 0
+
+        values = await backend.get_many(["entities:a", "entities:b", "areas:x", "missing"])
+        assert values == {"entities:a": 1, "entities:b": [2], "areas:x": {"n": 3}}
+
+        await backend.delete_many(["entities:a", "areas:x"])
+        assert await backend.get_many(["entities:a", "entities:b", "areas:x"]) == {
+            "entities:b": [2]
+        }
+        assert await backend._client.smembers(f"{TAG_KEY_PREFIX}areas") == set()
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_uses_tag_set(self, backend):
+        """Test that pattern deletion reads the tag set instead of scanning."""
+        await backend.set_many(
+            {
+                "entities:state:id=light.a": 1,
+                "entities:state:id=light.b": 2,
+                "entities:list:domain=light": 3,
+                "automations:list": 4,
+            }
+        )
+        await backend._client.set(TAG_INDEX_KEY, 1)
+
+        with patch.object(backend._client, "scan_iter", side_effect=AssertionError("SCAN")):
+            deleted = await backend.delete_pattern("entities:state:*")
+
+        assert sorted(deleted) == ["entities:state:id=light.a", "entities:state:id=light.b"]
+        assert sorted(await backend.keys()) == ["automations:list", "entities:list:domain=light"]
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_indexes_untagged_keys_once(self, backend):
+        """Test that keys written before tag sets existed are still invalidated."""
+        await backend._client.set("entities:legacy", b"\x01{}")
+        await backend.set("entities:new", 1)
+
+        deleted = await backend.delete_pattern("entities:*")
+
+        assert sorted(deleted) == ["entities:legacy", "entities:new"]
+        assert await backend._client.exists(TAG_INDEX_KEY)
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_drops_expired_members(self, backend):
+        """Test that tag set members whose keys expired are removed."""
+        await backend._client.set(TAG_INDEX_KEY, 1)
+        await backend._client.sadd(f"{TAG_KEY_PREFIX}entities", "entities:expired")
+
+        assert await backend.delete_pattern("entities:*") == []
+        assert await backend._client.smembers(f"{TAG_KEY_PREFIX}entities") == set()
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_wildcard_prefix_falls_back_to_scan(self, backend):
+        """Test patterns with a wildcard prefix."""
+        await backend.set_many({"entities:a": 1, "automations:a": 2})
+        deleted = await backend.delete_pattern("*:a")
+        assert sorted(deleted) == ["automations:a", "entities:a"]
+        assert await backend.keys() == []
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_batches(self, backend):
+        """Test that large invalidations are split into UNLINK batches."""
+        await backend.set_many({f"entities:k{i}": i for i in range(25)})
+        await backend._client.set(TAG_INDEX_KEY, 1)
+
+        with patch("app.core.cache.redis.DELETE_BATCH_SIZE", 10):
+            deleted = await backend.delete_pattern("entities:*")
+        assert len(deleted) == 25
+
+    @pytest.mark.asyncio
+    async def test_cleanup_prunes_tag_sets(self, backend):
+        """Test that cleanup_expired removes expired keys from tag sets."""
+        await backend.set("entities:live", 1)
+        await backend._client.sadd(f"{TAG_KEY_PREFIX}entities", "entities:expired")
+
+        assert await backend.cleanup_expired() == 0
+        assert await backend._client.smembers(f"{TAG_KEY_PREFIX}entities") == {b"entities:live"}
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern_prunes_unmatched_expired_members(self, backend):
+        """Test that invalidation also drops expired keys the pattern does not match."""
+        await backend.set_many({"entities:state:a": 1, "entities:list:live": 2})
+        await backend._client.set(TAG_INDEX_KEY, 1)
+        await backend._client.sadd(f"{TAG_KEY_PREFIX}entities", "entities:list:expired")
+
+        assert await backend.delete_pattern("entities:state:*") == ["entities:state:a"]
+        assert await backend._client.smembers(f"{TAG_KEY_PREFIX}entities") == {
+            b"entities:list:live"
+        }
+
+    @pytest.mark.asyncio
+    async def test_tag_sets_stay_bounded_without_invalidation(self, backend):
+        """Test that writes prune expired members of a tag set that is never invalidated."""
+        import app.core.cache.redis as redis_module
+
+        tag_key = f"{TAG_KEY_PREFIX}entities"
+        # Patch the module the fixture built the backend from
+        with patch.object(redis_module, "TAG_PRUNE_INTERVAL", 10):
+            for i in range(100):
+                await backend.set(f"entities:state:id=sensor.s{i}", i, ttl=5)
+                # Expire the key behind the backend's back
+                await backend._client.delete(f"entities:state:id=sensor.s{i}")
+                assert await backend._client.scard(tag_key) <= 10
+
+            await backend.set_many({f"entities:list:k{i}": i for i in range(10)}, ttl=5)
+
+        assert await backend._client.smembers(tag_key) == {
+            f"entities:list:k{i}".encode() for i in range(10)
+        }
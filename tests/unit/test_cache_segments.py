@@ -0,0 +1,252 @@
+"""Unit tests for app.core.cache.segments module."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.core.cache.segments import SegmentCache, parse_timestamp
+
+# 2025-01-10 12:30 UTC
+NOW = datetime(2025, 1, 10, 12, 30, tzinfo=UTC)
+
+
+def make_timeline(start, end, step_minutes=10):
+    """Build logbook-like records every step_minutes between start and end."""
+    records = []
+    t = start
+    while t < end:
+        records.append({"when": t.isoformat(), "value": t.strftime("%H:%M")})
+        t += timedelta(minutes=step_minutes)
+    return records
+
+
+class RecordingFetch:
+    """Fetch function serving a timeline and recording requested ranges."""
+
+    def __init__(self, records):
+        self.records = records
+        self.calls = []
+
+    async def __call__(self, start, end):
+        self.calls.append((start, end))
+        return [r for r in self.records if start <= datetime.fromisoformat(r["when"]) < end]
+
+
+class HistoryFetch(RecordingFetch):
+    """Fetch function behaving like HA's history API.
+
+    The state in effect at the start of the range comes first, dated at the
+    start of the range.
+    """
+
+    async def __call__(self, start, end):
+        self.calls.append((start, end))
+        before = [r for r in self.records if datetime.fromisoformat(r["when"]) < start]
+        start_state = [{**before[-1], "when": start.isoformat()}] if before else []
+        return start_state + [
+            r for r in self.records if start <= datetime.fromisoformat(r["when"]) < end
+        ]
+
+
+@pytest.fixture(autouse=True)
+def frozen_time():
+    """Freeze the segment cache clock at NOW."""
+    with patch("app.core.cache.segments.time.time", return_value=NOW.timestamp()):
+        yield
+
+
+class TestParseTimestamp:
+    """Test the parse_timestamp function."""
+
+    def test_formats(self):
+        """Test ISO strings with and without offsets, and Unix times."""
+        expected = datetime(2025, 1, 1, 10, tzinfo=UTC).timestamp()
+        assert parse_timestamp("2025-01-01T10:00:00Z") == expected
+        assert parse_timestamp("2025-01-01T10:00:00+00:00") == expected
+        assert parse_timestamp("2025-01-01T10:00:00") == expected
+        assert parse_timestamp(expected) == expected
+        assert parse_timestamp("not a date") is None
+        assert parse_timestamp(None) is None
+
+
+class TestSegmentCache:
+    """Test the SegmentCache class."""
+
+    @pytest.mark.asyncio
+    async def test_cold_query_single_fetch(self):
+        """Test that a cold query is one request and stores the closed buckets."""
+        start = NOW - timedelta(hours=6)
+        fetch = RecordingFetch(make_timeline(start - timedelta(hours=1), NOW))
+        cache = SegmentCache()
+
+        result = await cache.get_range(
+            "logbook:*", start, NOW, fetch, timestamp=lambda r: r["when"]
+        )
+
+        assert fetch.calls == [(start, NOW)]
+        assert result == await RecordingFetch(fetch.records)(start, NOW)
+        # 06:30-12:30: full closed buckets are 07:00 through 11:00
+        assert cache.get_statistics()["segments"] == 5
+
+    @pytest.mark.asyncio
+    async def test_warm_query_fetches_only_tail(self):
+        """Test that a repeated query only fetches the missing head and the open tail."""
+        start = NOW - timedelta(hours=6)
+        timeline = make_timeline(start - timedelta(hours=1), NOW)
+        cache = SegmentCache()
+        await cache.get_range(
+            "logbook:*", start, NOW, RecordingFetch(timeline), timestamp=lambda r: r["when"]
+        )
+
+        fetch = RecordingFetch(timeline)
+        later_start = start + timedelta(minutes=20)
+        result = await cache.get_range(
+            "logbook:*", later_start, NOW, fetch, timestamp=lambda r: r["when"]
+        )
+
+        # The partial 06:50-07:00 head was never cached; 07:00-12:00 comes from the cache
+        assert fetch.calls == [
+            (later_start, datetime(2025, 1, 10, 7, tzinfo=UTC)),
+            (datetime(2025, 1, 10, 12, tzinfo=UTC), NOW),
+        ]
+        assert result == await RecordingFetch(timeline)(later_start, NOW)
+        assert cache.get_statistics()["hits"] == 5
+
+    @pytest.mark.asyncio
+    async def test_carry_in_keeps_prior_state(self):
+        """Test that history-style queries keep the state in effect at the start."""
+        start = NOW - timedelta(hours=4)
+        timeline = [
+            {"when": "2025-01-10T08:05:00+00:00", "state": "on"},
+            {"when": "2025-01-10T09:40:00+00:00", "state": "off"},
+            {"when": "2025-01-10T12:10:00+00:00", "state": "on"},
+        ]
+        history_fetch = HistoryFetch(timeline)
+
+        cache = SegmentCache()
+        await cache.get_range(
+            "history:light.a",
+            start,
+            NOW,
+            history_fetch,
+            timestamp=lambda r: r["when"],
+            carry_in=True,
+        )
+
+        result = await cache.get_range(
+            "history:light.a",
+            datetime(2025, 1, 10, 9, 50, tzinfo=UTC),
+            NOW,
+            history_fetch,
+            timestamp=lambda r: r["when"],
+            carry_in=True,
+        )
+
+        # off is the state at 09:50; the tail's start state is dropped
+        assert [r["state"] for r in result] == ["off", "on"]
+
+    @pytest.mark.asyncio
+    async def test_carry_in_warm_matches_cold(self):
+        """Test that cached history ranges return exactly what a cold query returns."""
+        timeline = [
+            {"when": "2025-01-10T05:40:00+00:00", "state": "a"},
+            {"when": "2025-01-10T08:10:00+00:00", "state": "b"},
+            {"when": "2025-01-10T10:20:00+00:00", "state": "c"},
+            {"when": "2025-01-10T11:00:00+00:00", "state": "d"},
+            {"when": "2025-01-10T12:05:00+00:00", "state": "e"},
+        ]
+        history_fetch = HistoryFetch(timeline)
+        cache = SegmentCache()
+
+        # Partial-bucket starts, bucket-aligned starts and starts on a change
+        for hour, minute in ((8, 30), (9, 15), (10, 0), (7, 0), (9, 0), (10, 20), (6, 45)):
+            query_start = datetime(2025, 1, 10, hour, minute, tzinfo=UTC)
+
+            result = await cache.get_range(
+                "history:light.a",
+                query_start,
+                NOW,
+                history_fetch,
+                timestamp=lambda r: r["when"],
+                carry_in=True,
+            )
+
+            assert result == await history_fetch(query_start, NOW), query_start
+
+        assert cache.get_statistics()["hits"] > 0
+        # Clamped start states are never stored as changes
+        stored = [r for segment in cache._segments.values() for r in segment.records]
+        assert stored
+        assert all(r in timeline for r in stored)
+
+    @pytest.mark.asyncio
+    async def test_lru_byte_budget(self):
+        """Test that least recently used segments are evicted over the byte budget."""
+        start = NOW - timedelta(hours=6)
+        timeline = make_timeline(start, NOW)
+        cache = SegmentCache(max_bytes=1000)
+
+        await cache.get_range(
+            "logbook:a", start, NOW, RecordingFetch(timeline), timestamp=lambda r: r["when"]
+        )
+        await cache.get_range(
+            "logbook:b", start, NOW, RecordingFetch(timeline), timestamp=lambda r: r["when"]
+        )
+
+        stats = cache.get_statistics()
+        assert stats["bytes"] <= 1000
+        assert stats["evictions"] > 0
+        # The oldest buckets of the first namespace went first
+        assert ("logbook:a", int(datetime(2025, 1, 10, 7, tzinfo=UTC).timestamp())) not in (
+            cache._segments
+        )
+
+    @pytest.mark.asyncio
+    async def test_out_of_range_records_not_cached(self):
+        """Test that a run whose records fall outside it is not cached."""
+        start = NOW - timedelta(hours=6)
+        fetch = RecordingFetch([])
+        fetch.records = [{"when": "2030-01-01T00:00:00Z"}]
+
+        async def bad_fetch(a, b):
+            return fetch.records
+
+        cache = SegmentCache()
+        result = await cache.get_range(
+            "logbook:*", start, NOW, bad_fetch, timestamp=lambda r: r["when"]
+        )
+
+        assert result == fetch.records
+        assert cache.get_statistics()["segments"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_bypasses(self):
+        """Test that nothing is stored when caching is disabled."""
+        start = NOW - timedelta(hours=6)
+        fetch = RecordingFetch(make_timeline(start, NOW))
+        cache = SegmentCache()
+
+        with patch("app.core.cache.segments.get_cache_config") as mock_config:
+            mock_config.return_value.is_enabled.return_value = False
+            await cache.get_range("logbook:*", start, NOW, fetch, timestamp=lambda r: r["when"])
+
+        assert cache.get_statistics()["segments"] == 0
+
+    @pytest.mark.asyncio
+    async def test_clear_namespace(self):
+        """Test clearing a single namespace."""
+        start = NOW - timedelta(hours=3)
+        timeline = make_timeline(start, NOW)
+        cache = SegmentCache()
+        await cache.get_range(
+            "logbook:a", start, NOW, RecordingFetch(timeline), timestamp=lambda r: r["when"]
+        )
+        await cache.get_range(
+            "logbook:b", start, NOW, RecordingFetch(timeline), timestamp=lambda r: r["when"]
+        )
+
+        cache.clear("logbook:a")
+
+        assert all(key[0] == "logbook:b" for key in cache._segments)
+        assert cache.get_statistics()["bytes"] == sum(s.size for s in cache._segments.values())
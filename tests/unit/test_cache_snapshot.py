@@ -0,0 +1,88 @@
+"""Unit tests for memory cache snapshots."""
+
+import time
+
+import pytest
+
+from app.core.cache.memory import MemoryCacheBackend
+from app.core.cache.snapshot import (
+    load_snapshot,
+    restore_cache_snapshot,
+    save_cache_snapshot,
+    save_snapshot,
+)
+
+
+class TestMemoryCacheSnapshot:
+    """Test dumping and restoring the memory cache."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_keeps_remaining_ttl(self, tmp_path):
+        """Test that restored entries keep their absolute expiry times."""
+        backend = MemoryCacheBackend()
+        await backend.set("entities:a", {"state": "on"}, ttl=60)
+        await backend.set("areas:list", [{"area_id": "kitchen"}])
+        expires_at = backend._cache["entities:a"].expires_at
+
+        path = tmp_path / "snapshot.bin"
+        assert save_snapshot(backend, path) == 2
+
+        restored = MemoryCacheBackend()
+        assert await load_snapshot(restored, path) == 2
+        assert await restored.get("entities:a") == {"state": "on"}
+        assert await restored.get("areas:list") == [{"area_id": "kitchen"}]
+        assert restored._cache["entities:a"].expires_at == pytest.approx(expires_at)
+        assert restored._cache["areas:list"].expires_at is None
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_expired_and_existing_entries_are_skipped(self):
+        """Test that expired entries are dropped and live keys are not overwritten."""
+        backend = MemoryCacheBackend(max_size=3)
+        await backend.set("entities:live", "current")
+
+        now = time.time()
+        loaded = await backend.import_entries(
+            [
+                ("entities:expired", 1, now - 1),
+                ("entities:live", "stale", None),
+                ("entities:old", 2, now + 60),
+                ("entities:new", 3, now + 60),
+                ("entities:newest", 4, now + 60),
+            ]
+        )
+
+        # Only two slots are free: the newest entries win
+        assert loaded == 2
+        assert await backend.get("entities:live") == "current"
+        assert sorted(backend._cache) == ["entities:live", "entities:new", "entities:newest"]
+
+    @pytest.mark.asyncio
+    async def test_manager_snapshot_helpers(self, tmp_path):
+        """Test saving and restoring the cache manager's memory backend."""
+        import app.core.cache.manager as manager_module
+
+        path = str(tmp_path / "cache" / "snapshot.bin")
+        cache = await manager_module.get_cache_manager()
+        if not isinstance(await cache._get_backend(), MemoryCacheBackend):
+            pytest.skip("Memory backend not configured")
+
+        await cache.clear()
+        await cache.set("entities:snapshot", {"state": "on"}, ttl=60)
+        assert save_cache_snapshot(path) == 1
+
+        await cache.clear()
+        assert await restore_cache_snapshot(path) == 1
+        assert await cache.get("entities:snapshot") == {"state": "on"}
+        await cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_disabled_or_corrupt_snapshot(self, tmp_path):
+        """Test that a missing path or corrupt file leaves the cache cold."""
+        assert save_cache_snapshot("") == 0
+        assert await restore_cache_snapshot("") == 0
+        assert await restore_cache_snapshot(str(tmp_path / "missing.bin")) == 0
+
+        corrupt = tmp_path / "corrupt.bin"
+        corrupt.write_bytes(b"\x01not json")
+        assert await restore_cache_snapshot(str(corrupt)) == 0
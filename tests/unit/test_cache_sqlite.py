@@ -0,0 +1,180 @@
+"""Unit tests for the SQLite cache backend."""
+
+import asyncio
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from app.core.cache.sqlite import SQLiteCacheBackend
+
+
+class CustomValue:
+    """Value that is not JSON serializable."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, CustomValue) and self.value == other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+class TestSQLiteCacheBackend:
+    """Test the SQLiteCacheBackend class."""
+
+    @pytest.fixture
+    async def backend(self, tmp_path):
+        """Create a SQLite backend in a temporary directory."""
+        backend = SQLiteCacheBackend(cache_dir=str(tmp_path))
+        yield backend
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, backend):
+        """Test storing and retrieving JSON and pickled values."""
+        await backend.set("entities:state:id=light.kitchen", {"state": "on"})
+        await backend.set("custom", CustomValue(3))
+
+        assert await backend.get("entities:state:id=light.kitchen") == {"state": "on"}
+        assert await backend.get("custom") == CustomValue(3)
+        assert await backend.get("missing") is None
+        assert backend.size() == 2
+
+    @pytest.mark.asyncio
+    async def test_wal_mode(self, backend):
+        """Test that the database runs in WAL mode."""
+        rows = backend._execute("PRAGMA journal_mode")
+        assert rows[0][0] == "wal"
+
+    @pytest.mark.asyncio
+    async def test_miss_does_not_query_database(self, backend):
+        """Test that unknown keys are answered from the in-memory index."""
+        with patch.object(backend, "_execute") as mock_execute:
+            assert await backend.get("missing") is None
+            assert await backend.exists("missing") is False
+            mock_execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiration(self, backend):
+        """Test that expired entries are not returned and are removed."""
+        await backend.set("short", "value", ttl=10)
+        assert await backend.exists("short") is True
+
+        with patch("app.core.cache.sqlite.time.time", return_value=10**10):
+            assert await backend.get("short") is None
+        assert backend.size() == 0
+        assert backend._execute("SELECT COUNT(*) FROM entries")[0][0] == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_and_clear(self, backend):
+        """Test deleting single entries and clearing the cache."""
+        await backend.set("a", 1)
+        await backend.set("b", 2)
+
+        await backend.delete("a")
+        assert await backend.get("a") is None
+        assert await backend.get("b") == 2
+
+        await backend.clear()
+        assert await backend.keys() == []
+        assert backend._execute("SELECT COUNT(*) FROM entries")[0][0] == 0
+
+    @pytest.mark.asyncio
+    async def test_keys_pattern(self, backend):
+        """Test key listing with wildcard patterns."""
+        for key in ["entities:state:a", "entities:list", "automations:list"]:
+            await backend.set(key, 1)
+
+        assert sorted(await backend.keys("entities:*")) == ["entities:list", "entities:state:a"]
+        assert sorted(await backend.keys("*:list")) == ["automations:list", "entities:list"]
+        assert await backend.keys("*state*") == ["entities:state:a"]
+        assert await backend.keys("automations:list") == ["automations:list"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_expired(self, backend):
+        """Test removing expired entries in one pass."""
+        await backend.set("old1", 1, ttl=10)
+        await backend.set("old2", 2, ttl=10)
+        await backend.set("keep", 3)
+
+        with patch("app.core.cache.sqlite.time.time", return_value=10**10):
+            assert await backend.cleanup_expired() == 2
+        assert await backend.keys() == ["keep"]
+        assert backend._execute("SELECT key FROM entries") == [("keep",)]
+
+    @pytest.mark.asyncio
+    async def test_index_rebuilt_at_startup(self, tmp_path):
+        """Test that entries persist and the key index is rebuilt on reopen."""
+        backend = SQLiteCacheBackend(cache_dir=str(tmp_path))
+        await backend.set("persisted", {"value": 1})
+        await backend.set("expiring", 2, ttl=10)
+        await backend.close()
+
+        with patch("app.core.cache.sqlite.time.time", return_value=10**10):
+            reopened = SQLiteCacheBackend(cache_dir=str(tmp_path))
+        try:
+            assert await reopened.keys() == ["persisted"]
+            assert await reopened.get("persisted") == {"value": 1}
+        finally:
+            await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes(self, backend):
+        """Test that concurrent writes are serialized safely."""
+        await asyncio.gather(*(backend.set(f"key{i}", i) for i in range(50)))
+        assert backend.size() == 50
+        assert await backend.get("key42") == 42
+
+    @pytest.mark.asyncio
+    async def test_compact_truncates_wal(self, backend, tmp_path):
+        """Test that compaction checkpoints the write-ahead log."""
+        await backend.set("a", "x" * 10000)
+        await backend.compact()
+        wal = tmp_path / "cache.db-wal"
+        assert not wal.exists() or wal.stat().st_size == 0
+
+    def test_invalid_directory(self, tmp_path):
+        """Test that an unusable cache directory raises ValueError."""
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        with pytest.raises(ValueError, match="Failed to open SQLite cache"):
+            SQLiteCacheBackend(cache_dir=str(blocker))
+
+    @pytest.mark.asyncio
+    async def test_get_row_missing(self, backend):
+        """Test that an indexed key whose row disappeared is dropped from the index."""
+        await backend.set("gone", 1)
+        backend._execute("DELETE FROM entries")
+        assert await backend.get("gone") is None
+        assert backend.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_set_error_is_logged(self, backend):
+        """Test that database errors on set do not raise."""
+        with patch.object(backend, "_execute", side_effect=sqlite3.OperationalError("locked")):
+            await backend.set("a", 1)
+        assert await backend.exists("a") is False
+
+    @pytest.mark.asyncio
+    async def test_batch_operations(self, backend):
+        """Test get_many, set_many and delete_many."""
+        await backend.set_many({f"entities:k{i}": i for i in range(600)}, ttl=300)
+        assert backend.size() == 600
+
+        values = await backend.get_many(["entities:k1", "entities:k599", "missing"])
+        assert values == {"entities:k1": 1, "entities:k599": 599}
+
+        await backend.delete_many(["entities:k1", "missing"])
+        assert await backend.get("entities:k1") is None
+        assert backend._execute("SELECT COUNT(*) FROM entries")[0][0] == 599
+
+    @pytest.mark.asyncio
+    async def test_delete_pattern(self, backend):
+        """Test deleting keys by pattern."""
+        await backend.set_many({"entities:a": 1, "entities:b": 2, "automations:a": 3})
+        deleted = await backend.delete_pattern("entities:*")
+        assert sorted(deleted) == ["entities:a", "entities:b"]
+        assert await backend.keys() == ["automations:a"]
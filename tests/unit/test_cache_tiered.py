@@ -0,0 +1,182 @@
+"""Unit tests for the tiered (L1 + Redis) cache backend."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.core.cache.tiered import TieredCacheBackend  # noqa: E402
+
+
+async def wait_for(condition, timeout: float = 2.0) -> bool:
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+class TestTieredCacheBackend:
+    """Test the near cache against fakeredis."""
+
+    @pytest.fixture
+    async def replicas(self):
+        """Create two tiered backends (replicas) sharing one fake Redis server."""
+        import redis.asyncio
+
+        import app.core.cache.redis as redis_module
+
+        server = fakeredis.FakeServer()
+        backends = []
+        # Other test modules swap the redis module for mocks
+        with patch.object(redis_module, "redis", redis.asyncio):
+            for _ in range(2):
+                l2 = redis_module.RedisCacheBackend(url="redis://localhost:6379/0")
+                l2._client = fakeredis.FakeAsyncRedis(server=server)
+                backends.append(TieredCacheBackend(l2, l1_max_size=3, l1_ttl=60))
+        yield backends
+        for backend in backends:
+            await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_l1_serves_repeated_reads(self, replicas):
+        """Test that an L2 hit fills L1 and later reads skip Redis."""
+        a, b = replicas
+        await a.set("entities:state:id=light.kitchen", {"state": "on"}, ttl=60)
+
+        assert await b.get("entities:state:id=light.kitchen") == {"state": "on"}
+        with patch.object(b.l2, "get", AsyncMock()) as l2_get:
+            assert await b.get("entities:state:id=light.kitchen") == {"state": "on"}
+            l2_get.assert_not_called()
+
+        stats = b.get_tier_statistics()
+        assert stats["l1"]["hits"] == 1
+        assert stats["l1"]["misses"] == 1
+        assert stats["l2"]["hits"] == 1
+        assert stats["l2"]["hit_rate"] == 1.0
+        assert stats["subscribed"] is True
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates_other_replicas(self, replicas):
+        """Test that a delete on one replica drops the key from the other's L1."""
+        a, b = replicas
+        await a.set("entities:a", 1, ttl=60)
+        assert await b.get("entities:a") == 1
+        assert "entities:a" in b._l1
+
+        await a.delete("entities:a")
+
+        assert await wait_for(lambda: "entities:a" not in b._l1)
+        assert await b.get("entities:a") is None
+        assert b.get_tier_statistics()["invalidations_received"] == 1
+
+    @pytest.mark.asyncio
+    async def test_pattern_invalidation_reaches_other_replicas(self, replicas):
+        """Test that delete_pattern broadcasts the pattern, not just L2 matches."""
+        a, b = replicas
+        await a.set_many({"entities:a": 1, "entities:b": 2, "areas:x": 3}, ttl=60)
+        assert await b.get_many(["entities:a", "entities:b", "areas:x"]) == {
+            "entities:a": 1,
+            "entities:b": 2,
+            "areas:x": 3,
+        }
+
+        deleted = await a.delete_pattern("entities:*")
+
+        assert sorted(deleted) == ["entities:a", "entities:b"]
+        assert await wait_for(lambda: "entities:a" not in b._l1 and "entities:b" not in b._l1)
+        assert "areas:x" in b._l1
+
+    @pytest.mark.asyncio
+    async def test_clear_empties_other_replicas(self, replicas):
+        """Test that clear() empties every replica's L1."""
+        a, b = replicas
+        await a.set("entities:a", 1, ttl=60)
+        await b.get("entities:a")
+
+        await a.clear()
+
+        assert await wait_for(lambda: len(b._l1) == 0)
+
+    @pytest.mark.asyncio
+    async def test_l1_is_bounded_lru_with_ttl(self, replicas):
+        """Test LRU eviction and the L1 lifetime cap."""
+        a, _ = replicas
+        for key in ("entities:a", "entities:b", "entities:c"):
+            await a.set(key, key, ttl=60)
+        await a.get("entities:a")
+        await a.set("entities:d", "d", ttl=60)
+
+        assert list(a._l1) == ["entities:c", "entities:a", "entities:d"]
+
+        await a.set("entities:short", 1, ttl=1)
+        _, expires_at = a._l1["entities:short"]
+        assert expires_at - time.monotonic() <= 1.5
+
+    @pytest.mark.asyncio
+    async def test_l1_bypassed_without_subscription(self, replicas):
+        """Test that L1 is not filled while invalidations can't be received."""
+        a, _ = replicas
+        with patch.object(a.l2, "subscribe", AsyncMock(side_effect=ConnectionError("down"))):
+            await a.set("entities:a", 1, ttl=60)
+            assert await a.get("entities:a") == 1
+
+        assert len(a._l1) == 0
+        assert a.get_tier_statistics()["subscribed"] is False
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_l2_read_is_not_cached(self, replicas):
+        """Test that a value read before an invalidation arrives isn't put in L1."""
+        a, _ = replicas
+        await a.set("entities:a", 1, ttl=60)
+        a._l1.clear()
+        original_get = a.l2.get
+
+        async def get_then_invalidate(key):
+            value = await original_get(key)
+            a._apply_invalidation(b'{"origin": "other", "keys": ["entities:a"]}')
+            return value
+
+        with patch.object(a.l2, "get", get_then_invalidate):
+            assert await a.get("entities:a") == 1
+
+        assert "entities:a" not in a._l1
+
+    @pytest.mark.asyncio
+    async def test_manager_exposes_tier_statistics(self, replicas):
+        """Test that cache statistics include per-tier hit rates."""
+        from app.core.cache.manager import CacheManager
+
+        a, _ = replicas
+        manager = CacheManager()
+        manager._backend = a
+        await manager.set("entities:a", 1, ttl=60)
+        await manager.get("entities:a")
+
+        stats = manager.get_statistics()
+        assert stats["tiers"]["l1"]["hit_rate"] == 1.0
+        assert stats["tiers"]["l2"]["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_manager_initializes_tiered_backend(self):
+        """Test that the "tiered" backend type builds an L1 in front of Redis."""
+        import redis.asyncio
+
+        import app.core.cache.redis as redis_module
+        from app.core.cache.manager import CacheManager
+
+        manager = CacheManager()
+        with (
+            patch.object(redis_module, "redis", redis.asyncio),
+            patch.object(manager._config, "get_backend", return_value="tiered"),
+        ):
+            backend = await manager._get_backend()
+
+        assert isinstance(backend, TieredCacheBackend)
+        assert backend.l1_max_size == manager._config.get_l1_max_size()
+        assert backend.l1_ttl == manager._config.get_l1_ttl()
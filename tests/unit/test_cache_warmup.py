@@ -0,0 +1,115 @@
+"""Unit tests for cache warmup."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.cache.warmup import DEFAULT_WARMUP, WARMUP_ENDPOINTS, warm_cache
+
+
+class TestWarmCache:
+    """Test concurrent endpoint prefetching."""
+
+    @pytest.mark.asyncio
+    async def test_warms_endpoints_concurrently(self):
+        """Test that endpoints are fetched concurrently and reported."""
+        in_flight = 0
+        peak = 0
+
+        async def fetch(name):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [{"name": name}]
+
+        with patch("app.core.cache.warmup._fetch", side_effect=fetch):
+            result = await warm_cache(["default"])
+
+        assert result["warmed"] == DEFAULT_WARMUP
+        assert result["failed"] == {}
+        assert peak > 1
+
+    @pytest.mark.asyncio
+    async def test_reports_failures_and_unknown_endpoints(self):
+        """Test that error responses, exceptions and unknown names are reported."""
+
+        async def fetch(name):
+            if name == "areas":
+                return [{"error": "HTTP error: 401 Unauthorized"}]
+            if name == "devices":
+                raise RuntimeError("boom")
+            return {"ok": True}
+
+        with patch("app.core.cache.warmup._fetch", side_effect=fetch):
+            result = await warm_cache(["states", "areas", "devices", "bogus"])
+
+        assert result["warmed"] == ["states"]
+        assert result["failed"] == {"areas": "HTTP error: 401 Unauthorized", "devices": "boom"}
+        assert result["unknown"] == ["bogus"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_abandons_slow_endpoints(self):
+        """Test that endpoints still running at the timeout are reported as failed."""
+
+        async def fetch(name):
+            if name == "services":
+                await asyncio.sleep(10)
+            return {"ok": True}
+
+        with patch("app.core.cache.warmup._fetch", side_effect=fetch):
+            result = await warm_cache(["states", "services"], timeout=0.05)
+
+        assert result["warmed"] == ["states"]
+        assert result["failed"] == {"services": "timed out"}
+
+    @pytest.mark.asyncio
+    async def test_fetch_populates_cache(self):
+        """Test that warming calls the cached API function, filling the cache."""
+        mock_get_areas = AsyncMock(return_value=[{"area_id": "kitchen"}])
+        with patch("app.api.areas.get_areas", mock_get_areas):
+            result = await warm_cache(["areas"])
+
+        assert result["warmed"] == ["areas"]
+        mock_get_areas.assert_awaited_once_with()
+
+    def test_endpoints_resolve_to_functions(self):
+        """Test that every warmup endpoint names an existing async function."""
+        import importlib
+        import inspect
+
+        for target in WARMUP_ENDPOINTS.values():
+            module_name, function_name = target.split(":")
+            function = getattr(importlib.import_module(module_name), function_name)
+            assert inspect.iscoroutinefunction(function), target
+
+    @pytest.mark.asyncio
+    async def test_states_warms_the_shared_snapshot(self):
+        """Test that warming states serves the full entity list without another request."""
+        from app.api.entities import get_all_states, get_entities
+        from app.core.cache.manager import get_cache_manager
+
+        cache = await get_cache_manager()
+        await cache.clear()
+        states = [{"entity_id": "light.kitchen", "state": "on", "attributes": {}}]
+        mock_response = MagicMock()
+        mock_response.json.return_value = states
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+
+        try:
+            with (
+                patch("app.api.entities.get_client", return_value=mock_client),
+                patch("app.core.decorators.HA_TOKEN", "test_token"),
+            ):
+                result = await warm_cache(["states"])
+                snapshot = await get_all_states()
+                entities = await get_entities(limit=0, lean=False)
+        finally:
+            await cache.clear()
+
+        assert result["warmed"] == ["states"]
+        mock_client.get.assert_awaited_once()
+        assert entities is snapshot
@@ -1,7 +1,7 @@
 """Unit tests for app.core.client module."""
 
 import os
-from unittest.mock import AsyncMock, patch
+from unittest.mock import ANY, AsyncMock, patch
 
 import pytest
 
@@ -29,7 +29,7 @@ class TestCoreClient:
             # Verify AsyncClient was called with correct timeout and default SSL verify (True)
             import httpx
 
-            httpx.AsyncClient.assert_called_once_with(timeout=10.0, verify=True)
+            httpx.AsyncClient.assert_called_once_with(timeout=10.0, verify=True, transport=ANY)
 
     @pytest.mark.asyncio
     async def test_get_client_reuses_existing_client(self):
@@ -107,7 +107,7 @@ class TestCoreClient:
 
             client = await get_client()
 
-            mock_async_client.assert_called_once_with(timeout=10.0, verify=False)
+            mock_async_client.assert_called_once_with(timeout=10.0, verify=False, transport=ANY)
 
     @pytest.mark.asyncio
     async def test_get_client_with_custom_ca_cert(self, tmp_path):
@@ -127,6 +127,8 @@ class TestCoreClient:
             patch(
                 "app.core.client.httpx.AsyncClient", return_value=mock_client
             ) as mock_async_client,
+            # The fake CA can't be loaded by a real transport
+            patch("app.core.client.httpx.AsyncHTTPTransport") as mock_transport,
         ):
             import importlib
 
@@ -141,7 +143,10 @@ class TestCoreClient:
 
             client = await get_client()
 
-            mock_async_client.assert_called_once_with(timeout=10.0, verify=str(ca_file))
+            mock_async_client.assert_called_once_with(
+                timeout=10.0, verify=str(ca_file), transport=ANY
+            )
+            mock_transport.assert_called_once_with(verify=str(ca_file))
 
     @pytest.mark.asyncio
     async def test_get_client_with_invalid_ca_path_falls_back(self):
@@ -172,4 +177,4 @@ class TestCoreClient:
             client = await get_client()
 
             # Should fall back to True (system CAs)
-            mock_async_client.assert_called_once_with(timeout=10.0, verify=True)
+            mock_async_client.assert_called_once_with(timeout=10.0, verify=True, transport=ANY)
@@ -0,0 +1,72 @@
+"""Unit tests for app.core.concurrency module."""
+
+import asyncio
+
+import pytest
+
+from app.core.concurrency import gather_with_concurrency
+
+
+class TestGatherWithConcurrency:
+    """Test the gather_with_concurrency function."""
+
+    @pytest.mark.asyncio
+    async def test_preserves_input_order(self):
+        """Test that results are returned in input order."""
+
+        async def delayed(value, delay):
+            await asyncio.sleep(delay)
+            return value
+
+        result = await gather_with_concurrency(
+            [delayed(1, 0.03), delayed(2, 0.01), delayed(3, 0.0)], limit=3
+        )
+
+        assert result == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_respects_limit(self):
+        """Test that no more than `limit` awaitables run at once."""
+        in_flight = 0
+        peak = 0
+
+        async def track():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+
+        await gather_with_concurrency((track() for _ in range(10)), limit=3)
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_return_exceptions(self):
+        """Test that exceptions are returned in place when requested."""
+
+        async def ok():
+            return "ok"
+
+        async def fail():
+            raise ValueError("boom")
+
+        result = await gather_with_concurrency([ok(), fail()], limit=2, return_exceptions=True)
+
+        assert result[0] == "ok"
+        assert isinstance(result[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_raises_without_return_exceptions(self):
+        """Test that exceptions propagate by default."""
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            await gather_with_concurrency([fail()], limit=1)
+
+    @pytest.mark.asyncio
+    async def test_empty_input(self):
+        """Test with no awaitables."""
+        assert await gather_with_concurrency([]) == []
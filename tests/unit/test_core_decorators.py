@@ -243,3 +243,24 @@ class TestAsyncHandler:
 
         with pytest.raises(ValueError, match="Test error"):
             await test_function()
+
+    @pytest.mark.asyncio
+    async def test_async_handler_records_tool_latency(self):
+        """Test that async_handler records each call's latency, even on errors."""
+        from app.core.cache.metrics import get_cache_metrics
+
+        @async_handler("latency_test_command")
+        async def test_function(fail: bool) -> str:
+            """Test function."""
+            if fail:
+                raise ValueError("Test error")
+            return "success"
+
+        metrics = get_cache_metrics()
+        metrics.reset()
+        await test_function(False)
+        with pytest.raises(ValueError, match="Test error"):
+            await test_function(True)
+
+        assert metrics.get_tool_stats()["latency_test_command"]["count"] == 2
+        metrics.reset()
@@ -0,0 +1,110 @@
+"""Unit tests for app.core.error_log module."""
+
+from app.core.error_log import ErrorLogIndex, integration_from_logger
+
+LOG = (
+    "2025-01-01 10:00:00.001 ERROR (MainThread) [homeassistant.components.hue] Bridge offline\n"
+    "Traceback (most recent call last):\n"
+    '  File "hue/bridge.py", line 42, in connect\n'
+    "ConnectionError\n"
+    "2025-01-01 10:00:01.002 WARNING (MainThread) [custom_components.hacs] Slow update\n"
+    "2025-01-01 10:00:02.003 ERROR (SyncWorker_0) [homeassistant.components.mqtt] Broker refused\n"
+    "2025-01-01 10:00:03.004 INFO (MainThread) [homeassistant.core] Started\n"
+)
+
+
+class TestIntegrationFromLogger:
+    """Test the integration_from_logger function."""
+
+    def test_logger_names(self):
+        """Test component, custom component, short and core logger names."""
+        assert integration_from_logger("homeassistant.components.hue.light") == "hue"
+        assert integration_from_logger("custom_components.hacs") == "hacs"
+        assert integration_from_logger("MQTT") == "mqtt"
+        assert integration_from_logger("homeassistant.core") is None
+        assert integration_from_logger(None) is None
+
+
+class TestErrorLogIndex:
+    """Test the ErrorLogIndex class."""
+
+    def test_parses_records_and_continuation_lines(self):
+        """Test that tracebacks are attached to the record they belong to."""
+        index = ErrorLogIndex()
+        assert index.feed(LOG) == 4
+
+        first = index.records()[0]
+        assert first.to_dict() == {
+            "timestamp": "2025-01-01 10:00:00.001",
+            "level": "ERROR",
+            "logger": "homeassistant.components.hue",
+            "integration": "hue",
+            "message": "Bridge offline",
+        }
+        assert first.text.endswith("ConnectionError")
+        assert index.level_counts == {"ERROR": 2, "WARNING": 1, "INFO": 1}
+        assert index.integration_counts == {"hue": 1, "hacs": 1, "mqtt": 1}
+
+    def test_filters_intersect(self):
+        """Test filtering by level, integration and both."""
+        index = ErrorLogIndex()
+        index.feed(LOG)
+
+        assert [r.integration for r in index.records(level="error")] == ["hue", "mqtt"]
+        assert [r.level for r in index.records(integration="HACS")] == ["WARNING"]
+        assert index.records(level="ERROR", integration="hacs") == []
+
+    def test_incremental_feed_matches_full_feed(self):
+        """Test that feeding the log in pieces, including a partial line, gives the same records."""
+        index = ErrorLogIndex()
+        cut = LOG.index("Broker") + 3
+        index.feed(LOG[:cut])
+        assert index.records()[-1].message == "Bro"
+
+        # The partial line is fed again from its start
+        index.feed(LOG[LOG.index("2025-01-01 10:00:02") :])
+
+        full = ErrorLogIndex()
+        full.feed(LOG)
+        assert [r.to_dict() for r in index.records()] == [r.to_dict() for r in full.records()]
+        assert index.level_counts == full.level_counts
+
+    def test_partial_continuation_line_rolled_back(self):
+        """Test that an unterminated traceback line is not duplicated."""
+        index = ErrorLogIndex()
+        head = LOG[: LOG.index("ConnectionError")]
+        index.feed(head + "Connection")
+        index.feed("ConnectionError\n")
+
+        assert index.records()[0].lines[-1] == "ConnectionError"
+        assert len(index.records()[0].lines) == 4
+
+    def test_ring_eviction_updates_indexes(self):
+        """Test that the oldest records are evicted together with their index entries."""
+        index = ErrorLogIndex(max_records=2)
+        index.feed(LOG)
+
+        assert len(index) == 2
+        assert [r.integration for r in index.records()] == ["mqtt", None]
+        assert index.records(integration="hue") == []
+        assert index.level_counts == {"ERROR": 1, "INFO": 1}
+        assert index.integration_counts == {"mqtt": 1}
+
+    def test_fatal_maps_to_critical(self):
+        """Test that FATAL records are indexed as CRITICAL."""
+        index = ErrorLogIndex()
+        index.feed("2025-01-01 10:00:00 FATAL (MainThread) [zwave] Crashed\n")
+
+        assert index.records(level="CRITICAL")[0].integration == "zwave"
+
+    def test_clear_resets_offset(self):
+        """Test that clear removes records and the followed position."""
+        index = ErrorLogIndex()
+        index.feed(LOG)
+        index.offset, index.tail = 100, "line\n"
+
+        index.clear()
+
+        assert len(index) == 0
+        assert index.get_statistics()["offset"] == 0
+        assert index.tail == ""
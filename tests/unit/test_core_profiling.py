@@ -0,0 +1,105 @@
+"""Unit tests for app.core.profiling module."""
+
+import asyncio
+import pstats
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.profiling import ToolProfiler
+
+
+def busy(milliseconds: float) -> None:
+    """Burn CPU for a while, so the profile has something to show."""
+    deadline = time.perf_counter() + milliseconds / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestToolProfiler:
+    """Test ToolProfiler class."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_directory(self):
+        """Test that nothing is profiled when no directory is configured."""
+        profiler = ToolProfiler(None)
+        async with profiler.profile("get_entity"):
+            busy(1)
+
+        assert profiler.enabled is False
+        assert profiler.get_profiles() == []
+
+    @pytest.mark.asyncio
+    async def test_keeps_profiles_of_slowest_calls(self, tmp_path):
+        """Test that only the slowest N profiles stay on disk."""
+        profiler = ToolProfiler(tmp_path, top_n=2, sample_rate=1.0)
+        for tool, milliseconds in (("fast", 1), ("slow", 40), ("medium", 20), ("fastest", 0)):
+            async with profiler.profile(tool):
+                busy(milliseconds)
+
+        profiles = profiler.get_profiles()
+        assert [profile["tool"] for profile in profiles] == ["slow", "medium"]
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+            profile["path"].rsplit("/", 1)[-1] for profile in profiles
+        )
+        stats = pstats.Stats(profiles[0]["path"])
+        assert any(function[2] == "busy" for function in stats.stats)
+
+    @pytest.mark.asyncio
+    async def test_sample_rate_zero_profiles_nothing(self, tmp_path):
+        """Test that a zero sample rate disables profiling."""
+        profiler = ToolProfiler(tmp_path, top_n=2, sample_rate=0.0)
+        async with profiler.profile("get_entity"):
+            busy(1)
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_one_call_profiled_at_a_time(self, tmp_path):
+        """Test that concurrent calls don't start a second profiler."""
+        profiler = ToolProfiler(tmp_path, top_n=5, sample_rate=1.0)
+
+        async def call(tool: str) -> None:
+            async with profiler.profile(tool):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(call("first"), call("second"))
+
+        assert [profile["tool"] for profile in profiler.get_profiles()] == ["first"]
+
+    @pytest.mark.asyncio
+    async def test_write_does_not_block_event_loop(self, tmp_path):
+        """Test that profiles are written in a worker thread while other tasks keep running."""
+        profiler = ToolProfiler(tmp_path, top_n=2, sample_rate=1.0)
+        write = profiler._write
+        writer_threads = []
+
+        def slow_write(*args):
+            writer_threads.append(threading.current_thread())
+            time.sleep(0.1)
+            write(*args)
+
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        async def call() -> None:
+            async with profiler.profile("slow"):
+                busy(1)
+
+        with patch.object(profiler, "_write", side_effect=slow_write):
+            task = asyncio.create_task(ticker())
+            await call()
+            # The ticker ran to completion while the profile was being written
+            assert ticks == 5
+            await task
+
+        assert writer_threads
+        assert writer_threads[0] is not threading.main_thread()
+        assert [profile["tool"] for profile in profiler.get_profiles()] == ["slow"]
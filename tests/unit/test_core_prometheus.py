@@ -0,0 +1,109 @@
+"""Unit tests for app.core.prometheus module."""
+
+import re
+
+import pytest
+
+from app.core.cache.metrics import get_cache_metrics
+from app.core.prometheus import CONTENT_TYPE, render_metrics, write_metrics_textfile
+from app.core.telemetry import get_performance_metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Reset the global metrics around each test."""
+    get_cache_metrics().reset()
+    get_performance_metrics().reset()
+    yield
+    get_cache_metrics().reset()
+    get_performance_metrics().reset()
+
+
+def sample(text: str, line_start: str) -> float:
+    """Get the value of the first sample line starting with line_start."""
+    for line in text.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"No sample {line_start} in:\n{text}")
+
+
+class TestRenderMetrics:
+    """Test the text exposition."""
+
+    def test_exports_cache_request_vectordb_and_tool_metrics(self):
+        """Test that every metric family is exported with its labels."""
+        cache_metrics = get_cache_metrics()
+        cache_metrics.record_hit("entities:get_entities", cache_time_ms=0.2)
+        cache_metrics.record_hit("entities:get_entities", cache_time_ms=0.3)
+        cache_metrics.record_miss("entities:get_entities", cache_time_ms=0.1)
+        cache_metrics.record_api_call("entities:get_entities", api_time_ms=40.0)
+        cache_metrics.record_tool_call("get_entity", duration_ms=45.0)
+        performance = get_performance_metrics()
+        performance.request_started()
+        performance.request_started()
+        performance.request_finished("GET", "/api/states/*", "200", 38.0)
+        performance.record_vectordb("search", 12.0)
+
+        text = render_metrics()
+
+        assert sample(text, 'hass_mcp_cache_hits_total{endpoint="entities:get_entities"}') == 2
+        assert sample(text, 'hass_mcp_cache_misses_total{endpoint="entities:get_entities"}') == 1
+        assert (
+            sample(
+                text,
+                'hass_mcp_ha_request_duration_seconds_count{method="GET",endpoint="/api/states/*",status="200"}',
+            )
+            == 1
+        )
+        assert sample(text, "hass_mcp_ha_requests_in_flight") == 1
+        assert (
+            sample(text, 'hass_mcp_vectordb_operation_duration_seconds_sum{operation="search"}')
+            == 0.012
+        )
+        assert sample(text, 'hass_mcp_tool_call_duration_seconds_count{tool="get_entity"}') == 1
+        assert "# TYPE hass_mcp_cache_lookup_duration_seconds histogram" in text
+        performance.request_finished("GET", "/api/states/*", "200", 40.0)
+
+    def test_histogram_buckets_are_cumulative_seconds(self):
+        """Test that buckets are cumulative, in seconds, and end with +Inf."""
+        get_cache_metrics().record_tool_call("get_entity", duration_ms=3.0)
+        get_cache_metrics().record_tool_call("get_entity", duration_ms=300.0)
+
+        buckets = re.findall(
+            r'hass_mcp_tool_call_duration_seconds_bucket\{tool="get_entity",le="([^"]+)"\} (\d+)',
+            render_metrics(),
+        )
+        counts = [int(count) for _, count in buckets]
+        assert counts == sorted(counts)
+        assert dict(buckets)["0.0025"] == "0"
+        assert dict(buckets)["0.005"] == "1"
+        assert buckets[-1] == ("+Inf", "2")
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes and backslashes in label values are escaped."""
+        get_cache_metrics().record_tool_call('odd"tool\\', duration_ms=1.0)
+        assert 'tool="odd\\"tool\\\\"' in render_metrics()
+
+
+class TestMetricsExport:
+    """Test the textfile and HTTP exports."""
+
+    def test_write_textfile(self, tmp_path):
+        """Test that the textfile holds the exposition and no temporary files remain."""
+        path = tmp_path / "metrics" / "hass_mcp.prom"
+        get_cache_metrics().record_hit("entities:get_entities")
+
+        write_metrics_textfile(path)
+
+        assert "hass_mcp_cache_hits_total" in path.read_text()
+        assert [p.name for p in path.parent.iterdir()] == ["hass_mcp.prom"]
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self):
+        """Test the /metrics route handler."""
+        from app import server
+
+        response = await server.metrics_endpoint(None)
+
+        assert response.media_type == CONTENT_TYPE
+        assert b"hass_mcp_ha_requests_in_flight" in response.body
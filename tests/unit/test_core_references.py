@@ -0,0 +1,204 @@
+"""Unit tests for app.core.references module."""
+
+import pytest
+
+from app.core.references import ReferenceIndex, extract_references
+
+
+class TestExtractReferences:
+    """Test the extract_references function."""
+
+    def test_walks_trigger_condition_action_trees(self):
+        """Test that references are collected from every part of the config."""
+        config = {
+            "trigger": [
+                {"platform": "state", "entity_id": ["binary_sensor.door", "binary_sensor.window"]},
+                {"platform": "tag", "tag_id": "ABC123"},
+                {"platform": "device", "device_id": "dev1"},
+            ],
+            "condition": [{"condition": "state", "entity_id": "sun.sun", "state": "below_horizon"}],
+            "action": [
+                {"service": "light.turn_on", "target": {"area_id": "kitchen"}},
+                {
+                    "choose": [
+                        {"sequence": [{"action": "switch.turn_off", "entity_id": "switch.fan"}]}
+                    ]
+                },
+            ],
+        }
+
+        refs = extract_references(config)
+
+        assert refs["entity_id"] == {
+            "binary_sensor.door",
+            "binary_sensor.window",
+            "sun.sun",
+            "switch.fan",
+        }
+        assert refs["device_id"] == {"dev1"}
+        assert refs["area_id"] == {"kitchen"}
+        assert refs["tag_id"] == {"ABC123"}
+        assert refs["service"] == {"light.turn_on", "switch.turn_off"}
+
+    def test_comma_separated_and_templates(self):
+        """Test comma-separated IDs are split and templates are skipped."""
+        config = {
+            "action": [
+                {"service": "light.turn_on", "entity_id": "light.a, light.b"},
+                {"service": "{{ service }}", "entity_id": "{{ target }}"},
+            ]
+        }
+
+        refs = extract_references(config)
+
+        assert refs["entity_id"] == {"light.a", "light.b"}
+        assert refs["service"] == {"light.turn_on"}
+
+    def test_template_entities_are_referenced(self):
+        """Test that entity IDs mentioned inside templates are collected."""
+        config = {
+            "trigger": [
+                {
+                    "platform": "template",
+                    "value_template": "{{ states('sensor.temp') | float > 25 }}",
+                }
+            ],
+            "condition": [
+                {
+                    "condition": "template",
+                    "value_template": "{{ is_state('binary_sensor.door', 'on') and states.sun.sun.state == 'below_horizon' }}",
+                }
+            ],
+            "action": [
+                {
+                    "service": "notify.mobile",
+                    "data": {"message": ["{{ state_attr('weather.home', 'temperature') }}"]},
+                },
+                {"service": "light.turn_on", "entity_id": "{{ trigger.entity_id }}"},
+            ],
+        }
+
+        refs = extract_references(config)
+
+        assert refs["entity_id"] == {
+            "sensor.temp",
+            "binary_sensor.door",
+            "sun.sun",
+            "weather.home",
+        }
+
+    def test_script_and_scene_calls_reference_entities(self):
+        """Test that direct script calls and scene activations reference entities."""
+        config = {
+            "sequence": [
+                {"service": "script.bedtime"},
+                {"service": "script.turn_on", "entity_id": "script.wake_up"},
+                {"scene": "scene.movie"},
+            ]
+        }
+
+        refs = extract_references(config)
+
+        assert refs["entity_id"] == {"script.bedtime", "script.wake_up", "scene.movie"}
+
+    def test_skips_merged_entity_state(self):
+        """Test that the entity state merged into script configs is ignored."""
+        config = {
+            "sequence": [],
+            "entity": {"entity_id": "script.test", "attributes": {"entity_id": "light.x"}},
+        }
+
+        refs = extract_references(config)
+
+        assert refs["entity_id"] == set()
+
+
+class TestReferenceIndex:
+    """Test the ReferenceIndex class."""
+
+    def test_add_and_lookup(self):
+        """Test indexing items and looking them up."""
+        index = ReferenceIndex()
+        index.add_item("automation", "automation.a", {"action": [{"entity_id": "light.x"}]})
+        index.add_item("script", "script.b", {"sequence": [{"entity_id": "light.x"}]})
+
+        assert index.lookup("entity_id", "light.x", "automation") == {"automation.a"}
+        assert index.lookup("entity_id", "light.x", "script") == {"script.b"}
+        assert index.lookup("entity_id", "light.unused", "automation") == set()
+
+    def test_item_does_not_reference_itself(self):
+        """Test that self references are dropped."""
+        index = ReferenceIndex()
+        index.add_item("script", "script.b", {"entity_id": "script.b", "sequence": []})
+
+        assert index.lookup("entity_id", "script.b", "script") == set()
+
+    def test_re_add_replaces_old_references(self):
+        """Test that re-indexing an item removes its stale postings."""
+        index = ReferenceIndex()
+        index.add_item("automation", "automation.a", {"action": [{"entity_id": "light.old"}]})
+        index.add_item("automation", "automation.a", {"action": [{"entity_id": "light.new"}]})
+
+        assert index.lookup("entity_id", "light.old", "automation") == set()
+        assert index.lookup("entity_id", "light.new", "automation") == {"automation.a"}
+
+    def test_remove_item(self):
+        """Test removing an item."""
+        index = ReferenceIndex()
+        index.add_item("automation", "automation.a", {"action": [{"entity_id": "light.x"}]})
+        index.remove_item("automation", "automation.a")
+
+        assert index.lookup("entity_id", "light.x", "automation") == set()
+        assert index.get_config("automation", "automation.a") is None
+
+    def test_sync_is_incremental(self):
+        """Test that sync only re-indexes added, changed and removed items."""
+        index = ReferenceIndex()
+        snapshot = {
+            "automation.a": {"action": [{"entity_id": "light.x"}]},
+            "automation.b": {"action": [{"entity_id": "light.y"}]},
+        }
+        assert index.sync("automation", snapshot) == 2
+
+        # Same object: nothing to do
+        assert index.sync("automation", snapshot) == 0
+
+        updated = {
+            "automation.a": {"action": [{"entity_id": "light.x"}]},
+            "automation.c": {"action": [{"entity_id": "light.z"}]},
+        }
+        assert index.sync("automation", updated) == 2
+        assert index.lookup("entity_id", "light.y", "automation") == set()
+        assert index.lookup("entity_id", "light.z", "automation") == {"automation.c"}
+
+    def test_mark_stale_forces_diff(self):
+        """Test that mark_stale makes the next sync diff the same snapshot."""
+        index = ReferenceIndex()
+        snapshot = {"automation.a": {"action": [{"entity_id": "light.x"}]}}
+        index.sync("automation", snapshot)
+        snapshot["automation.a"] = {"action": [{"entity_id": "light.y"}]}
+
+        assert index.sync("automation", snapshot) == 0
+        index.mark_stale("automation")
+        assert index.sync("automation", snapshot) == 1
+        assert index.lookup("entity_id", "light.y", "automation") == {"automation.a"}
+
+    def test_clear_kind(self):
+        """Test dropping one kind leaves the others intact."""
+        index = ReferenceIndex()
+        index.add_item("automation", "automation.a", {"entity_id": "light.x"})
+        index.add_item("scene", "scene.b", {"entity_id": ["light.x"]})
+        index.clear_kind("automation")
+
+        assert index.lookup("entity_id", "light.x", "automation") == set()
+        assert index.lookup("entity_id", "light.x", "scene") == {"scene.b"}
+        assert index.get_statistics()["items"] == {"automation": 0, "script": 0, "scene": 1}
+
+    def test_invalid_kind_and_ref_type(self):
+        """Test that unknown kinds and reference types are rejected."""
+        index = ReferenceIndex()
+
+        with pytest.raises(ValueError, match="Invalid kind"):
+            index.add_item("sensor", "sensor.a", {})
+        with pytest.raises(ValueError, match="Invalid reference type"):
+            index.lookup("label_id", "x", "automation")
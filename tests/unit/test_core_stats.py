@@ -0,0 +1,202 @@
+"""Unit tests for app.core.stats module."""
+
+import random
+import statistics
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.core.stats import (
+    ArrayStatistics,
+    P2Quantile,
+    RunningStats,
+    StreamingStatistics,
+    create_statistics,
+    wall_clock_seconds,
+    weekly_heatmap,
+)
+
+
+class TestRunningStats:
+    """Test the RunningStats class."""
+
+    def test_matches_statistics_module(self):
+        """Test Welford moments against the standard library."""
+        rng = random.Random(42)
+        values = [rng.uniform(-50, 50) for _ in range(1000)]
+        running = RunningStats()
+        for value in values:
+            running.push(value)
+
+        assert running.count == 1000
+        assert running.min == min(values)
+        assert running.max == max(values)
+        assert running.mean == pytest.approx(statistics.fmean(values))
+        assert running.variance == pytest.approx(statistics.variance(values))
+        assert running.stddev == pytest.approx(statistics.stdev(values))
+
+    def test_single_value(self):
+        """Test that variance is zero with a single value."""
+        running = RunningStats()
+        running.push(3.0)
+
+        assert running.mean == 3.0
+        assert running.variance == 0.0
+
+
+class TestP2Quantile:
+    """Test the P2Quantile class."""
+
+    def test_exact_with_few_values(self):
+        """Test that five or fewer values give an exact result."""
+        estimator = P2Quantile(0.5)
+        for value in [4.0, 1.0, 3.0]:
+            estimator.push(value)
+
+        assert estimator.value() == 3.0
+
+    def test_estimate_on_large_stream(self):
+        """Test that estimates are close to the true quantiles."""
+        rng = random.Random(7)
+        values = [rng.gauss(20, 3) for _ in range(50_000)]
+        estimators = {p: P2Quantile(p) for p in (0.05, 0.5, 0.95)}
+        for value in values:
+            for estimator in estimators.values():
+                estimator.push(value)
+
+        ordered = sorted(values)
+        for p, estimator in estimators.items():
+            assert estimator.value() == pytest.approx(ordered[int(p * len(ordered))], abs=0.1)
+
+    def test_empty_and_invalid(self):
+        """Test empty estimator and invalid quantile."""
+        assert P2Quantile(0.5).value() is None
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            P2Quantile(1.5)
+
+
+class TestStreamingStatistics:
+    """Test the StreamingStatistics class."""
+
+    def test_exact_quantiles_below_limit(self):
+        """Test that quantiles are exact while under the retention limit."""
+        summary = StreamingStatistics()
+        for value in [0, 1, 2, 3]:
+            summary.push(value)
+
+        result = summary.to_dict()
+        assert summary.quantiles_exact is True
+        assert result["median"] == 1.5
+        assert result["min"] == 0
+        assert result["max"] == 3
+        assert result["mean"] == 1.5
+        assert set(result) == {"min", "max", "mean", "median", "stddev", "p5", "p95"}
+
+    def test_switches_to_estimates_above_limit(self):
+        """Test that retained values are dropped once the limit is exceeded."""
+        summary = StreamingStatistics(exact_limit=100)
+        for value in range(1001):
+            summary.push(float(value))
+
+        assert summary.quantiles_exact is False
+        assert summary.count == 1001
+        assert summary.quantile(0.5) == pytest.approx(500, abs=10)
+
+    def test_empty(self):
+        """Test that an empty summary has no statistics."""
+        summary = StreamingStatistics()
+
+        assert summary.to_dict() == {}
+        assert summary.quantile(0.5) is None
+
+
+class TestArrayStatistics:
+    """Test the ArrayStatistics class and create_statistics factory."""
+
+    def test_matches_streaming_statistics(self):
+        """Test that the NumPy reduction matches the exact streaming summary."""
+        pytest.importorskip("numpy")
+        values = [random.Random(7).uniform(-50, 50) for _ in range(500)]
+        streaming = StreamingStatistics()
+        vectorized = ArrayStatistics()
+        for value in values:
+            streaming.push(value)
+            vectorized.push(value)
+
+        assert vectorized.count == 500
+        assert vectorized.quantiles_exact is True
+        expected = streaming.to_dict()
+        result = vectorized.to_dict()
+        assert result.keys() == expected.keys()
+        for key, value in expected.items():
+            assert result[key] == pytest.approx(value)
+
+    def test_buffer_is_bounded(self):
+        """Test that past the buffer limit values are summarized with bounded memory."""
+        pytest.importorskip("numpy")
+        streaming = StreamingStatistics(exact_limit=100)
+        vectorized = ArrayStatistics(exact_limit=100)
+        for value in range(1001):
+            streaming.push(float(value))
+            vectorized.push(float(value))
+
+        assert vectorized._values is None
+        assert vectorized.count == 1001
+        assert vectorized.quantiles_exact is False
+        assert vectorized.to_dict() == pytest.approx(streaming.to_dict())
+
+    def test_empty(self):
+        """Test that an empty summary has no statistics."""
+        pytest.importorskip("numpy")
+        summary = ArrayStatistics()
+
+        assert summary.to_dict() == {}
+        assert summary.quantile(0.5) is None
+
+    def test_requires_numpy(self):
+        """Test that ArrayStatistics cannot be built without numpy."""
+        with (
+            patch("app.core.stats.np", None),
+            pytest.raises(RuntimeError, match="numpy"),
+        ):
+            ArrayStatistics()
+
+    def test_create_statistics_falls_back_without_numpy(self):
+        """Test that the factory returns the streaming summary without numpy."""
+        with patch("app.core.stats.np", None):
+            assert isinstance(create_statistics(use_numpy=True), StreamingStatistics)
+        assert isinstance(create_statistics(use_numpy=False), StreamingStatistics)
+
+
+class TestWeeklyHeatmap:
+    """Test wall_clock_seconds and weekly_heatmap."""
+
+    def test_matches_datetime_bucketing(self):
+        """Test integer bucketing against datetime.weekday() and hour."""
+        rng = random.Random(3)
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        moments = [base + timedelta(seconds=rng.randrange(0, 400 * 86400)) for _ in range(2000)]
+
+        heatmap = weekly_heatmap(wall_clock_seconds(m.isoformat() for m in moments))
+
+        expected = [[0] * 24 for _ in range(7)]
+        for moment in moments:
+            expected[moment.weekday()][moment.hour] += 1
+        assert heatmap == expected
+
+    def test_pure_python_fallback(self):
+        """Test that the result is the same without numpy."""
+        seconds = wall_clock_seconds(["2025-01-15T18:00:00Z", "2025-01-16T19:00:00+02:00"])
+        with patch("app.core.stats.np", None):
+            heatmap = weekly_heatmap(seconds)
+
+        assert heatmap[2][18] == 1  # Wednesday
+        assert heatmap[3][19] == 1  # Thursday, in its own offset
+        assert sum(map(sum, heatmap)) == 2
+
+    def test_skips_unparseable(self):
+        """Test that invalid timestamps are skipped."""
+        assert wall_clock_seconds(["invalid", None, "2025-01-15T18:00:00Z"]) == [
+            int(datetime(2025, 1, 15, 18, tzinfo=UTC).timestamp())
+        ]
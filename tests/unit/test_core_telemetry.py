@@ -0,0 +1,94 @@
+"""Unit tests for app.core.telemetry module."""
+
+import httpx
+import pytest
+
+from app.core.telemetry import (
+    InstrumentedTransport,
+    PerformanceMetrics,
+    get_performance_metrics,
+    normalize_endpoint,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_performance_metrics():
+    """Reset the global performance metrics around each test."""
+    get_performance_metrics().reset()
+    yield
+    get_performance_metrics().reset()
+
+
+class TestNormalizeEndpoint:
+    """Test endpoint label normalization."""
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("http://ha:8123/api/states/light.kitchen", "/api/states/*"),
+            ("http://ha:8123/api/states", "/api/states"),
+            ("/api/services/light/turn_on", "/api/services/light/*"),
+            ("/api/config/automation/config/123", "/api/config/automation/*"),
+            ("/api/history/period/2025-01-01T00:00:00+00:00", "/api/history/*"),
+            ("/api/", "/api"),
+            ("/auth/token", "/*"),
+        ],
+    )
+    def test_ids_are_collapsed(self, url, expected):
+        """Test that IDs and timestamps don't become label values."""
+        assert normalize_endpoint(url) == expected
+
+
+class TestInstrumentedTransport:
+    """Test the request-timing httpx transport."""
+
+    @pytest.mark.asyncio
+    async def test_records_requests_by_endpoint_and_status(self):
+        """Test that responses are recorded with their status and errors as "error"."""
+        seen_in_flight = []
+        in_flight = get_performance_metrics().get_in_flight()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_in_flight.append(get_performance_metrics().get_in_flight())
+            if request.url.path.endswith("offline"):
+                raise httpx.ConnectError("down")
+            return httpx.Response(404 if "missing" in request.url.path else 200, json={})
+
+        # Called directly: tests patch httpx.AsyncClient
+        transport = InstrumentedTransport(httpx.MockTransport(handler))
+        await transport.handle_async_request(
+            httpx.Request("GET", "http://ha:8123/api/states/light.kitchen")
+        )
+        await transport.handle_async_request(
+            httpx.Request("GET", "http://ha:8123/api/states/light.missing")
+        )
+        with pytest.raises(httpx.ConnectError):
+            await transport.handle_async_request(
+                httpx.Request("POST", "http://ha:8123/api/services/light/offline")
+            )
+
+        metrics = get_performance_metrics()
+        assert seen_in_flight == [in_flight + 1] * 3
+        assert metrics.get_in_flight() == in_flight
+        assert set(metrics.export_ha_requests()) == {
+            ("GET", "/api/states/*", "200"),
+            ("GET", "/api/states/*", "404"),
+            ("POST", "/api/services/light/*", "error"),
+        }
+        assert metrics.get_statistics()["ha_requests"]["GET /api/states/* 200"]["count"] == 1
+
+
+class TestPerformanceMetrics:
+    """Test PerformanceMetrics class."""
+
+    @pytest.mark.asyncio
+    async def test_time_vectordb_records_failures(self):
+        """Test that vector DB timings are recorded even when the operation fails."""
+        metrics = PerformanceMetrics()
+        with metrics.time_vectordb("search"):
+            pass
+        with pytest.raises(RuntimeError), metrics.time_vectordb("search"):
+            raise RuntimeError("backend down")
+
+        assert metrics.export_vectordb()["search"].count == 2
+        assert metrics.get_statistics()["vectordb"]["search"]["count"] == 2
@@ -0,0 +1,186 @@
+"""Unit tests for app.core.text_index module."""
+
+from app.core.text_index import EntityTextIndex, name_trigrams, ngrams, tokenize
+
+
+def make_entity(entity_id, name, state="on", updated="2025-01-01T00:00:00", **attributes):
+    """Build an entity state dictionary."""
+    return {
+        "entity_id": entity_id,
+        "state": state,
+        "last_updated": updated,
+        "attributes": {"friendly_name": name, **attributes},
+    }
+
+
+ENTITIES = [
+    make_entity("light.living_room", "Living Room Light", area_id="living_room"),
+    make_entity("light.kitchen", "Kitchen Light", area_id="kitchen"),
+    make_entity(
+        "sensor.kitchen_temperature", "Kitchen Temperature", state="21.5", area_id="kitchen"
+    ),
+    make_entity("switch.coffee_maker", "Coffee Maker", state="off", device_name="Barista 3000"),
+]
+
+
+class TestTokenize:
+    """Test the tokenize and ngrams functions."""
+
+    def test_tokenize_folds_case_and_plurals(self):
+        """Test that tokens are lowercased, split on punctuation and singularized."""
+        assert tokenize("light.Living_Room Lights") == ["light", "living", "room", "light"]
+        assert tokenize("glass bus") == ["glass", "bus"]
+
+    def test_ngrams(self):
+        """Test trigrams, including texts shorter than a trigram."""
+        assert ngrams("kitch") == {"kit", "itc", "tch"}
+        assert ngrams("on") == set()
+
+
+class TestEntityTextIndex:
+    """Test the EntityTextIndex class."""
+
+    def test_search_ranks_with_bm25(self):
+        """Test that entities matching more (and rarer) terms rank first."""
+        index = EntityTextIndex()
+        index.sync(ENTITIES)
+
+        results = index.search("kitchen lights")
+
+        assert results[0][0] == "light.kitchen"
+        assert results[0][2] == ["entity_id", "friendly_name", "area"]
+        assert {entity_id for entity_id, _, _ in results} == {
+            "light.kitchen",
+            "light.living_room",
+            "sensor.kitchen_temperature",
+        }
+
+    def test_search_filters_and_partial_words(self):
+        """Test domain/area filters and partial-word expansion."""
+        index = EntityTextIndex()
+        index.sync(ENTITIES)
+
+        assert [r[0] for r in index.search("kitchen", domain="sensor")] == [
+            "sensor.kitchen_temperature"
+        ]
+        assert [r[0] for r in index.search("light", area_id="Living_Room")] == ["light.living_room"]
+        assert [r[0] for r in index.search("temp")] == ["sensor.kitchen_temperature"]
+        assert [r[:1] + r[2:] for r in index.search("barista")] == [
+            ("switch.coffee_maker", ["device"])
+        ]
+        assert index.search("garage") == []
+
+    def test_substring_candidates_superset(self):
+        """Test that trigram candidates contain every substring match."""
+        index = EntityTextIndex()
+        index.sync(ENTITIES)
+
+        assert index.substring_candidates("itchen") == {
+            "light.kitchen",
+            "sensor.kitchen_temperature",
+        }
+        assert index.substring_candidates("21.5") == {"sensor.kitchen_temperature"}
+        assert index.substring_candidates("zzz") == set()
+        assert index.substring_candidates("on") is None
+
+    def test_entities_in_snapshot_order(self):
+        """Test that candidate entities come back in the order of the synced snapshot."""
+        index = EntityTextIndex()
+        index.sync(ENTITIES)
+
+        result = index.entities({"sensor.kitchen_temperature", "light.kitchen", "light.missing"})
+
+        assert [entity["entity_id"] for entity in result] == [
+            "light.kitchen",
+            "sensor.kitchen_temperature",
+        ]
+
+    def test_sync_reindexes_only_changed_entities(self):
+        """Test that sync diffs snapshots and removes missing entities."""
+        index = EntityTextIndex()
+        assert index.sync(ENTITIES) == 4
+        version = index.version
+
+        # Same snapshot object: no-op
+        assert index.sync(ENTITIES) == 0
+        # Equal copy: nothing changed
+        assert index.sync(list(ENTITIES)) == 0
+        assert index.version == version
+
+        renamed = make_entity("light.kitchen", "Pantry Light", updated="2025-01-01T00:01:00")
+        assert index.sync([ENTITIES[0], renamed, ENTITIES[2]]) == 2
+
+        assert "switch.coffee_maker" not in index
+        assert index.substring_candidates("barista") == set()
+        assert [r[0] for r in index.search("pantry")] == ["light.kitchen"]
+        assert index.search("coffee") == []
+        assert index.version == version + 1
+
+    def test_update_only_touches_indexed_entities(self):
+        """Test that single-entity updates refresh indexed entities only."""
+        index = EntityTextIndex()
+        index.sync(ENTITIES[:1])
+
+        assert not index.update(make_entity("light.kitchen", "Kitchen Light"))
+        assert index.update(
+            make_entity("light.living_room", "Lounge Light", updated="2025-01-02T00:00:00")
+        )
+        assert [r[0] for r in index.search("lounge")] == ["light.living_room"]
+        assert index.entity("light.living_room")["attributes"]["friendly_name"] == "Lounge Light"
+
+    def test_remove_cleans_postings(self):
+        """Test that removing every entity leaves no postings behind."""
+        index = EntityTextIndex()
+        index.sync(ENTITIES)
+        for entity in ENTITIES:
+            assert index.remove(entity["entity_id"])
+
+        stats = index.get_statistics()
+        assert (stats["entities"], stats["terms"], stats["grams"]) == (0, 0, 0)
+        assert index._term_grams == {}
+        assert not index.remove("light.kitchen")
+
+
+class TestFuzzyNames:
+    """Test fuzzy name matching in the EntityTextIndex class."""
+
+    def test_similar_names_tolerates_typos(self):
+        """Test that misspelled and reordered names match, most similar first."""
+        index = EntityTextIndex()
+        index.sync(ENTITIES)
+
+        results = index.similar_names("Livng Rom Lights")
+        assert results[0][0] == "light.living_room"
+        assert index.similar_names("Temperature Kitchen")[0][0] == "sensor.kitchen_temperature"
+        assert index.similar_names("Living Room Light", exclude="light.living_room") == []
+        assert index.similar_names("kitchen", domain="light", threshold=0.1)[0][0] == (
+            "light.kitchen"
+        )
+
+    def test_similar_names_matches_brute_force(self):
+        """Test that prefix filtering finds every name a full scan would find."""
+        names = ["Hall Lamp", "Hallway Lamp", "Small Lamp", "Lamp", "Hall", "Wall Plug", "Mall"]
+        entities = [make_entity(f"light.l{i}", name) for i, name in enumerate(names)]
+        index = EntityTextIndex()
+        index.sync(entities)
+
+        for query in ["hall lamp", "lamp", "hallway", "wal plug"]:
+            for threshold in (0.2, 0.3, 0.5):
+                query_grams = name_trigrams(query)
+                expected = set()
+                for entity in entities:
+                    grams = name_trigrams(entity["attributes"]["friendly_name"])
+                    if len(query_grams & grams) / len(query_grams | grams) >= threshold:
+                        expected.add(entity["entity_id"])
+                found = index.similar_names(query, limit=100, threshold=threshold)
+                assert {entity_id for entity_id, _ in found} == expected
+
+    def test_mentioned_names(self):
+        """Test that names occurring in free text are found, longest first."""
+        index = EntityTextIndex()
+        index.sync([*ENTITIES, make_entity("light.lights", "Lights")])
+
+        found = [r[0] for r in index.mentioned_names("turn on the kitchen lights please")]
+        assert found == ["light.kitchen", "light.lights"]
+        assert index.mentioned_names("turn on the kitchen lights", domain="sensor") == []
+        assert index.mentioned_names("open the garage") == []
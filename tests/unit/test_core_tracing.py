@@ -0,0 +1,145 @@
+"""Unit tests for app.core.tracing module."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.cache.decorator import cached
+from app.core.cache.manager import get_cache_manager
+from app.core.decorators import async_handler
+from app.core.tracing import (
+    MAX_CHILDREN,
+    Span,
+    TraceRecorder,
+    get_trace_recorder,
+    otel_available,
+    span,
+    trace_tool,
+)
+
+
+@pytest.fixture(autouse=True)
+async def reset_traces():
+    """Reset the global trace recorder and cache around each test."""
+    cache = await get_cache_manager()
+    await cache.clear()
+    get_trace_recorder().reset()
+    yield
+    get_trace_recorder().reset()
+    await cache.clear()
+
+
+class TestSpans:
+    """Test span trees."""
+
+    @pytest.mark.skipif(otel_available(), reason="spans are always created for OpenTelemetry")
+    def test_span_outside_tool_call_is_noop(self):
+        """Test that spans outside a traced tool call cost nothing."""
+        with span("cache.get", endpoint="entities:get_entities") as current:
+            assert current is None
+
+    @pytest.mark.asyncio
+    async def test_tool_trace_collects_nested_and_concurrent_spans(self):
+        """Test that spans from nested blocks and concurrent subtasks attach to their parent."""
+
+        async def fetch(name: str) -> None:
+            with span("ha.request", endpoint=name):
+                await asyncio.sleep(0.01)
+
+        with trace_tool("list_items") as root:
+            with span("cache.get", endpoint="automations:get_automations") as lookup:
+                lookup.set_attribute("hit", False)
+            await asyncio.gather(fetch("/api/states"), fetch("/api/config/automation/*"))
+
+        trace = root.to_dict()
+        assert trace["name"] == "tool.list_items"
+        assert trace["duration_ms"] >= 10
+        assert [child["name"] for child in trace["children"]] == [
+            "cache.get",
+            "ha.request",
+            "ha.request",
+        ]
+        assert trace["children"][0]["attributes"] == {
+            "endpoint": "automations:get_automations",
+            "hit": False,
+        }
+        assert get_trace_recorder().get_slowest() == [trace]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_recorded(self):
+        """Test that a failing span records the exception type and still finishes."""
+        with pytest.raises(ValueError, match="boom"), trace_tool("get_entity") as root:
+            with span("ha.request"):
+                raise ValueError("boom")
+
+        trace = root.to_dict()
+        assert trace["error"] == "ValueError"
+        assert trace["children"][0]["error"] == "ValueError"
+        assert trace["children"][0]["duration_ms"] is not None
+
+    def test_children_are_bounded(self):
+        """Test that spans keep at most MAX_CHILDREN children and count the rest."""
+        root = Span("tool.bulk")
+        for _ in range(MAX_CHILDREN + 5):
+            root.add_child(Span("ha.request"))
+
+        assert len(root.children) == MAX_CHILDREN
+        assert root.to_dict()["dropped_children"] == 5
+
+
+class TestTraceRecorder:
+    """Test TraceRecorder class."""
+
+    def test_keeps_slowest_traces(self):
+        """Test that only the slowest traces are kept, slowest first."""
+        recorder = TraceRecorder(keep=2)
+        for duration in (5.0, 50.0, 1.0, 20.0):
+            root = Span(f"tool.t{duration:.0f}")
+            root.duration_ms = duration
+            recorder.record(root)
+
+        assert [trace["name"] for trace in recorder.get_slowest()] == ["tool.t50", "tool.t20"]
+
+
+class TestAsyncHandlerTracing:
+    """Test tracing through async_handler."""
+
+    @pytest.mark.asyncio
+    async def test_tool_call_trace_includes_cache_spans(self):
+        """Test that a tool's cached API calls show up as cache spans."""
+
+        @cached(ttl=60)
+        async def get_things() -> list[str]:
+            return ["a"]
+
+        @async_handler("tracing_test_tool")
+        async def tool() -> list[str]:
+            return await get_things()
+
+        await tool()
+
+        [trace] = get_trace_recorder().get_slowest()
+        assert trace["name"] == "tool.tracing_test_tool"
+        assert [(child["name"], child["attributes"].get("hit")) for child in trace["children"]] == [
+            ("cache.get", False),
+            ("cache.set", None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_performance_traces_api(self):
+        """Test that the traces system data exposes the recorded traces."""
+        from app.api.system import get_performance_traces
+
+        @async_handler("tracing_test_tool")
+        async def tool() -> str:
+            return "ok"
+
+        await tool()
+        with patch("app.core.decorators.HA_TOKEN", "test_token"):
+            result = await get_performance_traces()
+
+        assert result["tracing_enabled"] is True
+        assert result["slowest_traces"][0]["name"] == "tool.tracing_test_tool"
+        assert "in_flight" in result["requests"]
+        assert result["profiling"]["enabled"] is False
@@ -0,0 +1,117 @@
+"""Unit tests for app.core.websocket module."""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.websocket import HomeAssistantWebSocketError, get_websocket_url, ws_command
+
+
+class FakeWebSocket:
+    """Minimal websocket connection replaying scripted server messages."""
+
+    def __init__(self, replies):
+        self._replies = [json.dumps(reply) for reply in replies]
+        self.sent = []
+
+    async def recv(self):
+        return self._replies.pop(0)
+
+    async def send(self, data):
+        self.sent.append(json.loads(data))
+
+
+def fake_websockets_module(ws):
+    """Build a stand-in for the websockets module whose connect() yields ws."""
+
+    @asynccontextmanager
+    async def connect(url, **kwargs):
+        connect.url = url
+        yield ws
+
+    module = MagicMock()
+    module.connect = connect
+    return module
+
+
+class TestGetWebsocketUrl:
+    """Test the get_websocket_url function."""
+
+    def test_http_to_ws(self):
+        """Test http URLs map to ws://."""
+        with patch("app.core.websocket.HA_URL", "http://localhost:8123/"):
+            assert get_websocket_url() == "ws://localhost:8123/api/websocket"
+
+    def test_https_to_wss(self):
+        """Test https URLs map to wss://."""
+        with patch("app.core.websocket.HA_URL", "https://ha.example.com"):
+            assert get_websocket_url() == "wss://ha.example.com/api/websocket"
+
+
+class TestWsCommand:
+    """Test the ws_command function."""
+
+    @pytest.mark.asyncio
+    async def test_ws_command_success(self):
+        """Test authentication and result matching."""
+        ws = FakeWebSocket(
+            [
+                {"type": "auth_required"},
+                {"type": "auth_ok"},
+                {"id": 1, "type": "result", "success": True, "result": {"ok": True}},
+            ]
+        )
+
+        with (
+            patch("app.core.websocket.websockets", fake_websockets_module(ws)),
+            patch("app.core.websocket.HA_TOKEN", "test_token"),
+        ):
+            result = await ws_command({"type": "get_config"})
+
+        assert result == {"ok": True}
+        assert ws.sent[0] == {"type": "auth", "access_token": "test_token"}
+        assert ws.sent[1] == {"id": 1, "type": "get_config"}
+
+    @pytest.mark.asyncio
+    async def test_ws_command_auth_failure(self):
+        """Test that failed authentication raises."""
+        ws = FakeWebSocket([{"type": "auth_required"}, {"type": "auth_invalid", "message": "bad"}])
+
+        with (
+            patch("app.core.websocket.websockets", fake_websockets_module(ws)),
+            pytest.raises(HomeAssistantWebSocketError, match="authentication failed"),
+        ):
+            await ws_command({"type": "get_config"})
+
+    @pytest.mark.asyncio
+    async def test_ws_command_error_result(self):
+        """Test that an unsuccessful result raises with the HA error."""
+        ws = FakeWebSocket(
+            [
+                {"type": "auth_required"},
+                {"type": "auth_ok"},
+                {
+                    "id": 1,
+                    "type": "result",
+                    "success": False,
+                    "error": {"code": "unknown_command", "message": "Unknown command."},
+                },
+            ]
+        )
+
+        with (
+            patch("app.core.websocket.websockets", fake_websockets_module(ws)),
+            pytest.raises(HomeAssistantWebSocketError, match="unknown_command"),
+        ):
+            await ws_command({"type": "bogus"})
+
+    @pytest.mark.asyncio
+    async def test_ws_command_without_package(self):
+        """Test that a missing websockets package raises a clear error."""
+        with (
+            patch("app.core.websocket.websockets", None),
+            pytest.raises(HomeAssistantWebSocketError, match="websockets"),
+        ):
+            await ws_command({"type": "get_config"})
@@ -1,10 +1,12 @@
 """Unit tests for app.api.entity_suggestions module."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from app.api.entity_suggestions import (
+    _build_suggestion_context,
     _build_suggestion_explanation,
     _find_entities_by_area,
     _find_entities_by_device,
@@ -164,6 +166,36 @@ class TestFindEntitiesBySimilarName:
             # Should find entities with "Living Room" in the name
             assert "living_room" in results[0]["entity_id"]
 
+    @pytest.mark.asyncio
+    async def test_find_entities_similar_name_typo(self):
+        """Test that misspelled names match and the entity itself is excluded."""
+        mock_entities = [
+            {
+                "entity_id": "light.living_room",
+                "state": "on",
+                "attributes": {"friendly_name": "Living Room Light"},
+            },
+            {
+                "entity_id": "light.livingroom_lamp",
+                "state": "off",
+                "attributes": {"friendly_name": "Livingroom Lights"},
+            },
+            {
+                "entity_id": "switch.coffee",
+                "state": "off",
+                "attributes": {"friendly_name": "Coffee Maker"},
+            },
+        ]
+
+        with patch("app.api.entity_suggestions.get_entities", return_value=mock_entities):
+            results = await _find_entities_by_similar_name(
+                "light.living_room", "Living Room Light", limit=10
+            )
+
+        assert [r["entity_id"] for r in results] == ["light.livingroom_lamp"]
+        assert results[0]["metadata"]["common_words"] == ["light"]
+        assert results[0]["entity"]["state"] == "off"
+
     @pytest.mark.asyncio
     async def test_find_entities_no_friendly_name(self):
         """Test finding entities with no friendly name."""
@@ -358,6 +390,7 @@ class TestGetEntitySuggestions:
                 "app.api.entity_suggestions.get_entity_state",
                 AsyncMock(return_value=mock_entity),
             ),
+            patch("app.api.entity_suggestions._build_suggestion_context", return_value=None),
             patch(
                 "app.api.entity_suggestions._find_entities_by_area",
                 return_value=[
@@ -399,6 +432,7 @@ class TestGetEntitySuggestions:
             patch(
                 "app.api.entity_suggestions.get_entity_state", AsyncMock(return_value=mock_entity)
             ),
+            patch("app.api.entity_suggestions._build_suggestion_context", return_value=None),
             patch(
                 "app.api.entity_suggestions._find_entities_by_area", return_value=[]
             ) as mock_area,
@@ -451,6 +485,7 @@ class TestGetEntitySuggestions:
                 "app.api.entity_suggestions._find_entities_by_domain",
                 return_value=mock_suggestions,
             ),
+            patch("app.api.entity_suggestions._build_suggestion_context", return_value=None),
             patch("app.api.entity_suggestions._find_entities_by_area", return_value=[]),
             patch("app.api.entity_suggestions._find_entities_by_device", return_value=[]),
             patch("app.api.entity_suggestions._find_entities_by_similar_name", return_value=[]),
@@ -462,3 +497,139 @@ class TestGetEntitySuggestions:
 
             # Should respect limit
             assert len(results) <= 5
+
+
+class TestSuggestionContext:
+    """Test the shared snapshot and concurrent strategies of get_entity_suggestions."""
+
+    STATES = [
+        {
+            "entity_id": "light.living_room",
+            "state": "on",
+            "attributes": {"friendly_name": "Living Room Light"},
+        },
+        {
+            "entity_id": "sensor.living_room_temp",
+            "state": "21",
+            "attributes": {"friendly_name": "Living Room Temperature"},
+        },
+        {
+            "entity_id": "switch.tv_plug",
+            "state": "off",
+            "attributes": {"friendly_name": "TV Plug", "area_id": "living_room"},
+        },
+        {
+            "entity_id": "light.kitchen",
+            "state": "off",
+            "attributes": {"friendly_name": "Kitchen Light"},
+        },
+    ]
+    DEVICES = [
+        {
+            "id": "device_1",
+            "area_id": "living_room",
+            "entities": ["light.living_room", "sensor.living_room_temp"],
+        }
+    ]
+
+    @pytest.mark.asyncio
+    async def test_strategies_share_one_snapshot(self):
+        """Test that states and devices are fetched once and used by every strategy."""
+        mock_config = MagicMock()
+        mock_config.is_enabled = MagicMock(return_value=False)
+
+        with (
+            patch("app.core.decorators.HA_TOKEN", "fake_token"),
+            patch(
+                "app.api.entity_suggestions.get_entity_state",
+                AsyncMock(return_value=self.STATES[0]),
+            ) as mock_state,
+            patch(
+                "app.api.entity_suggestions.get_entities", AsyncMock(return_value=self.STATES)
+            ) as mock_entities,
+            patch("app.api.entity_suggestions.get_devices", AsyncMock(return_value=self.DEVICES)),
+            patch("app.api.entity_suggestions.get_device_details") as mock_details,
+            patch("app.api.entity_suggestions.get_vectordb_config", return_value=mock_config),
+        ):
+            results = await get_entity_suggestions("light.living_room", limit=10)
+
+        mock_entities.assert_awaited_once_with(lean=False, limit=0)
+        mock_state.assert_awaited_once()
+        mock_details.assert_not_called()
+
+        by_id = {r["entity_id"]: r for r in results}
+        # Area comes from the device registry; the device's other entity is found too
+        assert by_id["sensor.living_room_temp"]["relationship_type"] in {
+            "same_area",
+            "same_device",
+        }
+        assert by_id["switch.tv_plug"]["relationship_type"] == "same_area"
+        assert by_id["light.kitchen"]["relationship_type"] == "same_domain"
+        assert "light.living_room" not in by_id
+
+    @pytest.mark.asyncio
+    async def test_slow_strategy_is_dropped(self):
+        """Test that a strategy missing its deadline does not fail the whole call."""
+
+        async def slow_vector_search(*args, **kwargs):
+            await asyncio.sleep(1)
+            return [{"entity_id": "light.never", "relationship_score": 1.0}]
+
+        with (
+            patch("app.core.decorators.HA_TOKEN", "fake_token"),
+            patch(
+                "app.api.entity_suggestions.get_entity_state",
+                AsyncMock(return_value=self.STATES[2]),
+            ),
+            patch("app.api.entity_suggestions.get_entities", AsyncMock(return_value=self.STATES)),
+            patch("app.api.entity_suggestions.get_devices", AsyncMock(return_value=self.DEVICES)),
+            patch(
+                "app.api.entity_suggestions._find_entities_by_vector_similarity",
+                side_effect=slow_vector_search,
+            ),
+            patch("app.api.entity_suggestions.STRATEGY_TIMEOUT", 0.05),
+        ):
+            results = await get_entity_suggestions(
+                "switch.tv_plug", relationship_types=["same_area", "similar_capabilities"]
+            )
+
+        assert {r["entity_id"] for r in results} == {
+            "light.living_room",
+            "sensor.living_room_temp",
+        }
+
+    @pytest.mark.asyncio
+    async def test_device_registry_failure_keeps_snapshot(self):
+        """Test that the states snapshot is still shared when only get_devices fails."""
+        mock_config = MagicMock()
+        mock_config.is_enabled = MagicMock(return_value=False)
+
+        with (
+            patch("app.core.decorators.HA_TOKEN", "fake_token"),
+            patch(
+                "app.api.entity_suggestions.get_entity_state",
+                AsyncMock(return_value=self.STATES[0]),
+            ),
+            patch(
+                "app.api.entity_suggestions.get_entities", AsyncMock(return_value=self.STATES)
+            ) as mock_entities,
+            patch(
+                "app.api.entity_suggestions.get_devices",
+                AsyncMock(side_effect=RuntimeError("device registry unavailable")),
+            ) as mock_devices,
+            patch("app.api.entity_suggestions.get_vectordb_config", return_value=mock_config),
+        ):
+            context = await _build_suggestion_context()
+            results = await get_entity_suggestions("light.living_room", limit=10)
+
+        assert context is not None
+        assert list(context.states) == [s["entity_id"] for s in self.STATES]
+        assert context.devices == {}
+        assert context.area_entities == {"living_room": ["switch.tv_plug"]}
+        # One snapshot and one registry attempt per call; no per-strategy refetches
+        assert mock_entities.await_count == 2
+        assert mock_devices.await_count == 2
+        by_id = {r["entity_id"]: r for r in results}
+        assert by_id["light.kitchen"]["relationship_type"] == "same_domain"
+        # The light's area is only known from the device registry
+        assert "switch.tv_plug" not in by_id
@@ -0,0 +1,109 @@
+"""Unit tests for app.core.vectordb.areas module."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.vectordb.areas import AreaIndex, get_area_index, normalize_area_text
+from app.core.vectordb.classification import refresh_area_index
+
+AREAS = [
+    {"area_id": "living_room", "name": "Living  Room", "aliases": ["Lounge"]},
+    {"area_id": "kitchen", "name": "Kitchen", "aliases": []},
+    {"area_id": "room", "name": "Room", "aliases": None},
+]
+
+
+class TestAreaIndex:
+    """Test the AreaIndex class."""
+
+    def test_normalize_area_text(self):
+        """Test case and whitespace normalization."""
+        assert normalize_area_text("  Living \t Room ") == "living room"
+
+    def test_match_names_and_aliases(self):
+        """Test that names and aliases match case- and whitespace-insensitively."""
+        index = AreaIndex()
+        index.sync(AREAS)
+
+        assert index.match("Turn on the LIVING   ROOM lights") == ["living_room", "room"]
+        assert index.match("is the lounge warm") == ["living_room"]
+        assert index.match("garage") == []
+        assert index.get_statistics() == {
+            "areas": 3,
+            "keywords": 4,
+            "version": 1,
+            "loaded": True,
+        }
+
+    def test_sync_rebuilds_only_on_change(self):
+        """Test that re-syncing an unchanged vocabulary does not rebuild the automaton."""
+        index = AreaIndex()
+        assert index.sync(AREAS) is True
+        assert index.sync([dict(area) for area in AREAS]) is False
+        assert index.version == 1
+
+        assert index.sync([*AREAS, {"area_id": "garage", "name": "Garage"}]) is True
+        assert index.version == 2
+        assert index.match("garage door") == ["garage"]
+
+
+class TestRefreshAreaIndex:
+    """Test the refresh_area_index function."""
+
+    @pytest.mark.asyncio
+    async def test_loads_once(self):
+        """Test that only the first lookup fetches the areas."""
+        mock_get_areas = AsyncMock(return_value=AREAS)
+        with patch("app.core.vectordb.classification.get_areas", mock_get_areas):
+            await refresh_area_index()
+            index = await refresh_area_index()
+
+        assert mock_get_areas.await_count == 1
+        assert index.match("kitchen") == ["kitchen"]
+
+    @pytest.mark.asyncio
+    async def test_stale_index_refreshed_in_background(self):
+        """Test that a stale index keeps serving while it is re-synced."""
+        get_area_index().sync(AREAS[:1])
+        mock_get_areas = AsyncMock(return_value=AREAS)
+
+        with patch("app.core.vectordb.classification.get_areas", mock_get_areas):
+            index = await refresh_area_index(max_age=0)
+            assert index.match("kitchen") == []
+            await asyncio.wait_for(index.refresh_task, timeout=1)
+
+        assert index.match("kitchen") == ["kitchen"]
+
+    @pytest.mark.asyncio
+    async def test_load_error_keeps_vocabulary(self):
+        """Test that failed loads do not drop known areas."""
+        get_area_index().sync(AREAS)
+        error = {"error": "Connection failed"}
+
+        with patch("app.core.vectordb.classification.get_areas", AsyncMock(return_value=error)):
+            index = await refresh_area_index(max_age=0)
+            await asyncio.wait_for(index.refresh_task, timeout=1)
+
+        assert index.match("lounge") == ["living_room"]
+
+    @pytest.mark.asyncio
+    async def test_list_error_keeps_vocabulary(self):
+        """Test that the list-shaped error of get_areas() is not synced as a vocabulary."""
+        index = get_area_index()
+        error = [{"error": "Connection failed"}]
+
+        with patch("app.core.vectordb.classification.get_areas", AsyncMock(return_value=error)):
+            await refresh_area_index()
+            assert index.loaded is False
+            assert index.is_fresh(3600) is False
+
+            index.sync(AREAS)
+            synced_at = index._synced_at
+            await refresh_area_index(max_age=0)
+            await asyncio.wait_for(index.refresh_task, timeout=1)
+
+        assert index.match("lounge") == ["living_room"]
+        # The failed refresh does not count as a sync
+        assert index._synced_at == synced_at
@@ -1,9 +1,10 @@
 """Unit tests for app.core.vectordb.classification module."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.core.text_index import get_entity_text_index
 from app.core.vectordb.classification import (
     classify_intent,
     extract_action,
@@ -181,6 +182,14 @@ class TestExtractAction:
 class TestExtractEntities:
     """Test the extract_entities function."""
 
+    @pytest.fixture(autouse=True)
+    def mock_states(self):
+        """Patch the states snapshot used for entity name matching."""
+        with patch(
+            "app.core.vectordb.classification.get_all_states", AsyncMock(return_value=[])
+        ) as mock:
+            yield mock
+
     @pytest.mark.asyncio
     async def test_extract_explicit_entity_ids(self):
         """Test extracting explicit entity IDs."""
@@ -220,6 +229,43 @@ class TestExtractEntities:
             assert "area_id" in filters
             assert filters["area_id"] == "living_room"
 
+    @pytest.mark.asyncio
+    async def test_extract_entities_by_friendly_name(self, mock_states):
+        """Test resolving entities mentioned by name through the entity text index."""
+        mock_states.return_value = [
+            {"entity_id": "light.hall", "attributes": {"friendly_name": "Hallway Lamp"}},
+            {"entity_id": "light.desk", "attributes": {"friendly_name": "Desk Lamp"}},
+        ]
+
+        # The index starts empty; it is synced before matching names
+        assert len(get_entity_text_index()) == 0
+        with patch("app.core.vectordb.classification.get_areas", return_value=[]):
+            entities, _ = await extract_entities("turn on light.desk and the hallway lamp")
+            assert entities == ["light.desk", "light.hall"]
+
+    @pytest.mark.asyncio
+    async def test_extract_entities_ignores_stale_index(self, mock_states):
+        """Test that entities missing from the current states are not resolved by name."""
+        get_entity_text_index().sync(
+            [{"entity_id": "light.hall", "attributes": {"friendly_name": "Hallway Lamp"}}]
+        )
+
+        with patch("app.core.vectordb.classification.get_areas", return_value=[]):
+            entities, _ = await extract_entities("turn on the hallway lamp")
+            assert entities == []
+
+    @pytest.mark.asyncio
+    async def test_extract_entities_states_error(self, mock_states):
+        """Test that explicit entity IDs are still extracted when states cannot be fetched."""
+        get_entity_text_index().sync(
+            [{"entity_id": "light.hall", "attributes": {"friendly_name": "Hallway Lamp"}}]
+        )
+        mock_states.side_effect = Exception("Connection refused")
+
+        with patch("app.core.vectordb.classification.get_areas", return_value=[]):
+            entities, _ = await extract_entities("turn on light.desk and the hallway lamp")
+            assert entities == ["light.desk"]
+
     @pytest.mark.asyncio
     async def test_extract_domain_filter(self):
         """Test extracting domain filter."""
@@ -317,6 +363,12 @@ class TestRefineQuery:
 class TestProcessQuery:
     """Test the process_query function."""
 
+    @pytest.fixture(autouse=True)
+    def mock_states(self):
+        """Patch the states snapshot used for entity name matching."""
+        with patch("app.core.vectordb.classification.get_all_states", AsyncMock(return_value=[])):
+            yield
+
     @pytest.fixture
     def mock_manager(self):
         """Create a mock VectorDBManager."""
@@ -0,0 +1,98 @@
+"""Unit tests for app.core.vectordb.hits module."""
+
+from unittest.mock import patch
+
+from app.core.vectordb.hits import VectorHitCache, normalize_query
+
+
+def _hits(count):
+    return [{"id": f"light.l{i}", "distance": i / 10, "metadata": {}} for i in range(count)]
+
+
+class TestNormalizeQuery:
+    """Test query normalization."""
+
+    def test_normalize_query(self):
+        """Case and whitespace differences normalize to the same query."""
+        assert normalize_query("  Kitchen   LIGHTS\t") == "kitchen lights"
+
+
+class TestVectorHitCache:
+    """Test the VectorHitCache class."""
+
+    def test_key_ignores_case_and_filter_order(self):
+        """Keys are built from the normalized query and sorted filters."""
+        first = VectorHitCache.key("entities", "Kitchen Lights", {"a": 1, "b": 2}, 3)
+        second = VectorHitCache.key("entities", "kitchen  lights", {"b": 2, "a": 1}, 3)
+        assert first == second
+        assert first != VectorHitCache.key("entities", "kitchen lights", {"a": 1, "b": 2}, 4)
+
+    def test_put_and_get(self):
+        """Cached hits are returned as copies."""
+        cache = VectorHitCache()
+        key = cache.key("entities", "lights", None, 0)
+        assert cache.get(key, 5) is None
+
+        cache.put(key, 5, _hits(5))
+        hits = cache.get(key, 5)
+        assert hits == _hits(5)
+
+        hits[0]["metadata"]["changed"] = True
+        assert cache.get(key, 5) == _hits(5)
+        assert cache.get_statistics()["hits"] == 2
+        assert cache.get_statistics()["misses"] == 1
+
+    def test_limits(self):
+        """A hit list serves smaller limits, and any limit when it is exhaustive."""
+        cache = VectorHitCache()
+        key = cache.key("entities", "lights", None, 0)
+        cache.put(key, 5, _hits(5))
+        assert cache.get(key, 3) == _hits(3)
+        assert cache.get(key, 10) is None
+
+        exhaustive = cache.key("entities", "lamps", None, 0)
+        cache.put(exhaustive, 10, _hits(2))
+        assert cache.get(exhaustive, 50) == _hits(2)
+
+    def test_put_keeps_larger_limit(self):
+        """A smaller search does not replace a larger cached hit list."""
+        cache = VectorHitCache()
+        key = cache.key("entities", "lights", None, 0)
+        cache.put(key, 10, _hits(10))
+        cache.put(key, 2, _hits(2))
+        assert cache.get(key, 10) == _hits(10)
+
+    def test_lru_eviction(self):
+        """The least recently used hit list is evicted first."""
+        cache = VectorHitCache(max_entries=2)
+        keys = [cache.key("entities", f"q{i}", None, 0) for i in range(3)]
+        cache.put(keys[0], 1, _hits(1))
+        cache.put(keys[1], 1, _hits(1))
+        cache.get(keys[0], 1)
+        cache.put(keys[2], 1, _hits(1))
+
+        assert len(cache) == 2
+        assert cache.get(keys[1], 1) is None
+        assert cache.get(keys[0], 1) is not None
+
+    def test_max_age(self):
+        """Hit lists older than max_age are searched again."""
+        cache = VectorHitCache(max_age=60)
+        key = cache.key("entities", "lights", None, 0)
+        with patch("app.core.vectordb.hits.time.monotonic", return_value=100.0):
+            cache.put(key, 1, _hits(1))
+        with patch("app.core.vectordb.hits.time.monotonic", return_value=200.0):
+            assert cache.get(key, 1) is None
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        """Invalidation drops one collection's hits, or all of them."""
+        cache = VectorHitCache()
+        cache.put(cache.key("entities", "a", None, 0), 1, _hits(1))
+        cache.put(cache.key("entities", "b", None, 0), 1, _hits(1))
+        cache.put(cache.key("other", "a", None, 0), 1, _hits(1))
+
+        assert cache.invalidate("entities") == 2
+        assert len(cache) == 1
+        assert cache.invalidate() == 1
+        assert len(cache) == 0
@@ -227,6 +227,57 @@ class TestVectorDBManager:
             assert len(results) == 1
             assert results[0]["id"] == "id1"
 
+    @pytest.mark.asyncio
+    async def test_search_vectors_hit_cache(self, config):
+        """Test that repeated searches are served from the hit cache until the index changes."""
+        mock_backend = MagicMock()
+        mock_backend.health_check = AsyncMock(return_value=True)
+        mock_backend.initialize = AsyncMock()
+        mock_backend.collection_exists = AsyncMock(return_value=True)
+        mock_backend.add_vectors = AsyncMock()
+        mock_backend.search_vectors = AsyncMock(
+            return_value=[{"id": "id1", "distance": 0.1, "metadata": {}}]
+        )
+
+        mock_embedding = MagicMock()
+        mock_embedding.initialize = AsyncMock()
+        mock_embedding.embed = AsyncMock(return_value=[[0.1, 0.2, 0.3]])
+
+        mock_sentence_transformers = MagicMock()
+        mock_sentence_transformers.SentenceTransformer = MagicMock(return_value=MagicMock())
+
+        def mock_import(name, *args, **kwargs):
+            if name == "sentence_transformers":
+                return mock_sentence_transformers
+            return __import__(name, *args, **kwargs)
+
+        with (
+            patch("builtins.__import__", side_effect=mock_import),
+            patch(
+                "app.core.vectordb.manager.ChromaBackend",
+                return_value=mock_backend,
+            ),
+            patch(
+                "app.core.vectordb.manager.EmbeddingModel",
+                return_value=mock_embedding,
+            ),
+        ):
+            manager = VectorDBManager(config)
+            await manager.initialize()
+            await manager.search_vectors("test_collection", "Query  text", limit=5)
+            results = await manager.search_vectors("test_collection", "query text", limit=3)
+            assert results[0]["id"] == "id1"
+            assert mock_embedding.embed.call_count == 1
+            assert mock_backend.search_vectors.call_count == 1
+
+            await manager.search_vectors("test_collection", "query text", use_cache=False)
+            assert mock_backend.search_vectors.call_count == 2
+
+            await manager.add_vectors("test_collection", ["text"], ["id2"])
+            assert manager.get_index_version("test_collection") == 1
+            await manager.search_vectors("test_collection", "query text", limit=3)
+            assert mock_backend.search_vectors.call_count == 3
+
     @pytest.mark.asyncio
     async def test_close(self, config):
         """Test closing the manager."""
@@ -0,0 +1,92 @@
+"""Unit tests for app.core.vectordb.matchers module."""
+
+import re
+
+from app.core.vectordb.classification import (
+    ACTION_PATTERNS,
+    ATTRIBUTE_PATTERNS,
+    DOMAIN_PATTERNS,
+    INTENT_PATTERNS,
+)
+from app.core.vectordb.matchers import KeywordMatcher, PatternTable
+
+QUERIES = [
+    "turn on the living room lights",
+    "what is the temperature in the kitchen and is the heater on",
+    "set up the door lock and lock the garage",
+    "dim up the lights, then dim down the lamp",
+    "show me all the other similar sensors from this room",
+    "set the color temperature to 3000 k",
+    "",
+]
+
+
+def findall_counts(patterns, text):
+    """Reference counts computed with one re.findall per pattern."""
+    counts = {}
+    for key, key_patterns in patterns.items():
+        matches = sum(len(re.findall(p, text, re.IGNORECASE)) for p in key_patterns)
+        if matches:
+            counts[key] = matches
+    return counts
+
+
+class TestPatternTable:
+    """Test the PatternTable class."""
+
+    def test_counts_match_findall(self):
+        """Test that the combined scan counts exactly like per-pattern findall."""
+        for patterns in (INTENT_PATTERNS, DOMAIN_PATTERNS, ACTION_PATTERNS, ATTRIBUTE_PATTERNS):
+            table = PatternTable(patterns)
+            for query in QUERIES:
+                assert dict(table.counts(query)) == findall_counts(patterns, query), query
+
+    def test_overlapping_patterns(self):
+        """Test that a word counts for every pattern it matches, without overlaps per pattern."""
+        table = PatternTable({"a": [r"\b(door lock|lock)\b"], "b": [r"\b(lock)\b"]})
+
+        assert dict(table.counts("door lock and lock")) == {"a": 2, "b": 2}
+
+    def test_first_and_last(self):
+        """Test table-order lookups of matching keys."""
+        table = PatternTable(ATTRIBUTE_PATTERNS)
+
+        assert table.first("set the color temperature") == "color"
+        assert table.last("set the color temperature") == "temperature"
+        assert table.first("nothing here") is None
+        assert table.last("nothing here") is None
+
+    def test_counts_cached_and_read_only(self):
+        """Test that repeated texts are served from the cache."""
+        table = PatternTable(INTENT_PATTERNS)
+        first = table.counts("turn on the lights")
+
+        assert table.counts("turn on the lights") is first
+        assert table.counts.cache_info().hits == 1
+
+
+class TestKeywordMatcher:
+    """Test the KeywordMatcher class."""
+
+    def test_overlapping_keywords(self):
+        """Test that keywords inside and across other keywords are all found."""
+        matcher = KeywordMatcher([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+
+        assert matcher.find("ushers") == [1, 2, 4]
+        assert matcher.find("ahishers") == [1, 2, 3, 4]
+        assert matcher.find("nothing") == []
+
+    def test_substring_semantics(self):
+        """Test that matching is case-insensitive substring matching like `in`."""
+        keywords = ["living room", "room", "kitchen", "temp", "Bedroom"]
+        matcher = KeywordMatcher((k, k) for k in keywords)
+
+        for text in ["Turn on the LIVING ROOM light", "bedroom temperature", "kitchenette"]:
+            assert matcher.find(text) == [k for k in keywords if k.lower() in text.lower()]
+
+    def test_shared_values_and_empty_keywords(self):
+        """Test several keywords per value; empty keywords are ignored."""
+        matcher = KeywordMatcher([("lounge", "living_room"), ("", "x"), ("den", "living_room")])
+
+        assert len(matcher) == 2
+        assert matcher.find("the lounge and the den") == ["living_room", "living_room"]
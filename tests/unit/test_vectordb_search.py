@@ -182,6 +182,29 @@ class TestSemanticSearch:
             assert len(results) > 0
             assert results[0]["entity_id"] == "light.living_room"
 
+    @pytest.mark.asyncio
+    async def test_semantic_search_vectordb_disabled_fuzzy_name(self, mock_manager):
+        """Test that keyword search falls back to fuzzy name matching for misspellings."""
+        config = MagicMock()
+        config.is_enabled = MagicMock(return_value=False)
+
+        entities = [
+            {
+                "entity_id": "light.living_room",
+                "state": "on",
+                "attributes": {"friendly_name": "Living Room Light"},
+            }
+        ]
+
+        with (
+            patch("app.core.vectordb.search.get_vectordb_manager", return_value=mock_manager),
+            patch("app.core.vectordb.search.get_vectordb_config", return_value=config),
+            patch("app.core.vectordb.search.get_entities", return_value=entities),
+        ):
+            results = await semantic_search("livng rom ligth")
+            assert [r["entity_id"] for r in results] == ["light.living_room"]
+            assert results[0]["explanation"] == "Fuzzy match in friendly_name"
+
     @pytest.mark.asyncio
     async def test_semantic_search_hybrid(self, mock_manager, mock_config):
         """Test hybrid search (semantic + keyword)."""
@@ -293,3 +316,98 @@ class TestSemanticSearch:
                 assert "explanation" in results[0]
                 assert isinstance(results[0]["explanation"], str)
                 assert "matched" in results[0]["explanation"].lower()
+
+
+class TestHybridSearch:
+    """Test hybrid search over the shared candidate pool."""
+
+    STATES = [
+        {
+            "entity_id": "light.living_room",
+            "state": "on",
+            "attributes": {"friendly_name": "Living Room Light", "area_id": "living_room"},
+        },
+        {
+            "entity_id": "light.kitchen",
+            "state": "off",
+            "attributes": {"friendly_name": "Kitchen Light", "area_id": "kitchen"},
+        },
+        {
+            "entity_id": "light.reading_lamp",
+            "state": "on",
+            "attributes": {"friendly_name": "Reading Lamp", "area_id": "living_room"},
+        },
+    ]
+
+    @pytest.fixture
+    def mock_manager(self):
+        """Create a mock VectorDBManager returning the reading lamp first."""
+        manager = MagicMock()
+        manager._initialized = True
+        manager.search_vectors = AsyncMock(
+            return_value=[
+                {"id": "light.reading_lamp", "distance": 0.2, "metadata": {}},
+                {"id": "light.kitchen", "distance": 0.4, "metadata": {}},
+                {"id": "light.removed", "distance": 0.1, "metadata": {}},
+            ]
+        )
+        return manager
+
+    @pytest.fixture
+    def mock_config(self):
+        """Create a mock VectorDBConfig with hybrid search enabled."""
+        config = MagicMock()
+        config.is_enabled = MagicMock(return_value=True)
+        config.get_search_similarity_threshold = MagicMock(return_value=0.5)
+        config.get_search_hybrid_search = MagicMock(return_value=True)
+        config.get_search_default_limit = MagicMock(return_value=10)
+        return config
+
+    @pytest.mark.asyncio
+    async def test_rank_fusion_over_shared_pool(self, mock_manager, mock_config):
+        """Test that both rankings are fused and hits are hydrated from the pool."""
+        with (
+            patch("app.core.vectordb.search.get_entities", AsyncMock(return_value=self.STATES)),
+            patch("app.core.vectordb.search.get_entity_state") as mock_state,
+        ):
+            results = await semantic_search(
+                "living room light", manager=mock_manager, config=mock_config
+            )
+
+        mock_state.assert_not_called()
+        by_id = {r["entity_id"]: r for r in results}
+        # Stale vector hits that are no longer in the states are dropped
+        assert "light.removed" not in by_id
+        # Entities ranked by both retrievers come before single-retriever hits
+        assert [r["entity_id"] for r in results] == [
+            "light.reading_lamp",
+            "light.kitchen",
+            "light.living_room",
+        ]
+        assert [r["source"] for r in results] == ["hybrid", "hybrid", "keyword"]
+        assert all(0.0 < r["similarity_score"] <= 1.0 for r in results)
+        assert "Keyword match in" in results[0]["explanation"]
+
+    @pytest.mark.asyncio
+    async def test_prefilter_before_scoring(self, mock_manager, mock_config):
+        """Test that state and manufacturer filters restrict both retrievers."""
+        devices = [
+            {"id": "d1", "manufacturer": "Signify", "entities": ["light.reading_lamp"]},
+            {"id": "d2", "manufacturer": "IKEA", "entities": ["light.kitchen"]},
+        ]
+        with (
+            patch("app.core.vectordb.search.get_entities", AsyncMock(return_value=self.STATES)),
+            patch("app.core.vectordb.search.get_devices", AsyncMock(return_value=devices)),
+        ):
+            on_results = await semantic_search(
+                "light", entity_state="on", manager=mock_manager, config=mock_config
+            )
+            signify_results = await semantic_search(
+                "light", device_manufacturer="signify", manager=mock_manager, config=mock_config
+            )
+
+        assert {r["entity_id"] for r in on_results} == {
+            "light.living_room",
+            "light.reading_lamp",
+        }
+        assert [r["entity_id"] for r in signify_results] == ["light.reading_lamp"]